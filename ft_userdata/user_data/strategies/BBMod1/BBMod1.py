@@ -10,16 +10,19 @@ from pandas import DataFrame, Series
 from datetime import datetime
 from freqtrade.strategy import merge_informative_pair, DecimalParameter, IntParameter, stoploss_from_open
 from functools import reduce
-from technical.indicators import RMI, zema, VIDYA
+from technical.indicators import RMI
 
 
 # --------------------------------
-def ha_typical_price(bars):
-    res = (bars['ha_high'] + bars['ha_low'] + bars['ha_close']) / 3.
-    return Series(index=bars.index, data=res)
 
 
 # Volume Weighted Moving Average
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.heikin_ashi import ha_typical_price, heikinashi as ha_candles
+from tradeboddy.protections import ProtectionFeatures
+from tradeboddy.moving_averages import pmax
 def vwma(dataframe: DataFrame, length: int = 10):
     """Indicator: Volume Weighted Moving Average (VWMA)"""
     # Calculate Result
@@ -50,14 +53,7 @@ def range_percent_change(dataframe: DataFrame, method, length: int) -> float:
     :param method: High to Low / Open to Close
     :param length: int The length to look back
     """
-    if method == 'HL':
-        return (dataframe['high'].rolling(length).max() - dataframe['low'].rolling(length).min()) / dataframe[
-            'low'].rolling(length).min()
-    elif method == 'OC':
-        return (dataframe['open'].rolling(length).max() - dataframe['close'].rolling(length).min()) / dataframe[
-            'close'].rolling(length).min()
-    else:
-        raise ValueError(f"Method {method} not defined!")
+    return ProtectionFeatures.of(dataframe).range_percent_change(method, length)
 
 
 # Williams %R
@@ -119,10 +115,7 @@ def top_percent_change(dataframe: DataFrame, length: int) -> float:
     :param dataframe: DataFrame The original OHLC dataframe
     :param length: int The length to look back
     """
-    if length == 0:
-        return (dataframe['open'] - dataframe['close']) / dataframe['close']
-    else:
-        return (dataframe['open'].rolling(length).max() - dataframe['close']) / dataframe['close']
+    return ProtectionFeatures.of(dataframe).top_percent_change(length)
 
 
 class BBMod1(IStrategy):
@@ -462,7 +455,7 @@ class BBMod1(IStrategy):
         informative_1h['cmf'] = chaikin_money_flow(informative_1h, 20)
 
         # Heikin Ashi
-        inf_heikinashi = qtpylib.heikinashi(informative_1h)
+        inf_heikinashi = ha_candles(informative_1h)
         informative_1h['ha_close'] = inf_heikinashi['close']
         informative_1h['rocr'] = ta.ROCR(informative_1h['ha_close'], timeperiod=168)
 
@@ -675,7 +668,7 @@ class BBMod1(IStrategy):
         dataframe['mfi'] = ta.MFI(dataframe)
 
         # Heiken Ashi
-        heikinashi = qtpylib.heikinashi(dataframe)
+        heikinashi = ha_candles(dataframe)
         dataframe['ha_open'] = heikinashi['open']
         dataframe['ha_close'] = heikinashi['close']
         dataframe['ha_high'] = heikinashi['high']
@@ -701,7 +694,7 @@ class BBMod1(IStrategy):
         dataframe['adx'] = ta.ADX(dataframe)
 
         # Profit Maximizer - PMAX
-        dataframe['pm'], dataframe['pmx'] = pmax(heikinashi, ma_type=1, length=9, multiplier=27, period=10, src=3)
+        dataframe['pm'], dataframe['pmx'] = pmax(heikinashi, MAtype=1, length=9, multiplier=27, period=10, src=3)
         dataframe['source'] = (dataframe['high'] + dataframe['low'] + dataframe['open'] + dataframe['close'])/4
         dataframe['pmax_thresh'] = ta.EMA(dataframe['source'], timeperiod=9)
 
@@ -1052,85 +1045,6 @@ class BBMod1(IStrategy):
         return dataframe
 
 
-# PMAX
-def pmax(df, period, multiplier, length, ma_type, src):
-
-    period = int(period)
-    multiplier = int(multiplier)
-    length = int(length)
-    ma_type = int(ma_type)
-    src = int(src)
-
-    mavalue = f'MA_{ma_type}_{length}'
-    atr = f'ATR_{period}'
-
-    if src == 1:
-        masrc = df["close"]
-    elif src == 2:
-        masrc = (df["high"] + df["low"]) / 2
-    elif src == 3:
-        masrc = (df["high"] + df["low"] + df["close"] + df["open"]) / 4
-
-    if ma_type == 1:
-        mavalue = ta.EMA(masrc, timeperiod=length)
-    elif ma_type == 2:
-        mavalue = ta.DEMA(masrc, timeperiod=length)
-    elif ma_type == 3:
-        mavalue = ta.T3(masrc, timeperiod=length)
-    elif ma_type == 4:
-        mavalue = ta.SMA(masrc, timeperiod=length)
-    elif ma_type == 5:
-        mavalue = VIDYA(df, length=length)
-    elif ma_type == 6:
-        mavalue = ta.TEMA(masrc, timeperiod=length)
-    elif ma_type == 7:
-        mavalue = ta.WMA(df, timeperiod=length)
-    elif ma_type == 8:
-        mavalue = vwma(df, length)
-    elif ma_type == 9:
-        mavalue = zema(df, period=length)
-
-    df[atr] = ta.ATR(df, timeperiod=period)
-    df['basic_ub'] = mavalue + ((multiplier/10) * df[atr])
-    df['basic_lb'] = mavalue - ((multiplier/10) * df[atr])
-
-    basic_ub = df['basic_ub'].values
-    final_ub = np.full(len(df), 0.00)
-    basic_lb = df['basic_lb'].values
-    final_lb = np.full(len(df), 0.00)
-
-    for i in range(period, len(df)):
-        final_ub[i] = basic_ub[i] if (
-            basic_ub[i] < final_ub[i - 1]
-            or mavalue[i - 1] > final_ub[i - 1]) else final_ub[i - 1]
-        final_lb[i] = basic_lb[i] if (
-            basic_lb[i] > final_lb[i - 1]
-            or mavalue[i - 1] < final_lb[i - 1]) else final_lb[i - 1]
-
-    df['final_ub'] = final_ub
-    df['final_lb'] = final_lb
-
-    pm_arr = np.full(len(df), 0.00)
-    for i in range(period, len(df)):
-        pm_arr[i] = (
-            final_ub[i] if (pm_arr[i - 1] == final_ub[i - 1]
-                            and mavalue[i] <= final_ub[i])
-            else final_lb[i] if (
-                    pm_arr[i - 1] == final_ub[i - 1]
-                    and mavalue[i] > final_ub[i]) else final_lb[i]
-            if (pm_arr[i - 1] == final_lb[i - 1]
-                and mavalue[i] >= final_lb[i]) else final_ub[i]
-            if (pm_arr[i - 1] == final_lb[i - 1]
-                and mavalue[i] < final_lb[i]) else 0.00)
-
-    pm = Series(pm_arr)
-
-    # Mark the trend direction up/down
-    pmx = np.where((pm_arr > 0.00), np.where((mavalue < pm_arr), 'down',  'up'), np.NaN)
-
-    return pm, pmx
-
-
 # Mom DIV
 def momdiv(dataframe: DataFrame, mom_length: int = 10, bb_length: int = 20, bb_dev: float = 2.0,
            lookback: int = 30) -> DataFrame:
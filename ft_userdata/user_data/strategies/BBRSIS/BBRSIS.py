@@ -1,6 +1,9 @@
 import talib.abstract as ta
 from pandas import DataFrame
-from technical.util import resample_to_interval, resampled_merge
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.resample import resample_to_interval, resampled_merge
 
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from freqtrade.strategy import IStrategy, merge_informative_pair
@@ -11,12 +11,16 @@ from datetime import datetime, timedelta
 from freqtrade.strategy import merge_informative_pair, CategoricalParameter, DecimalParameter, IntParameter, stoploss_from_open
 from freqtrade.exchange import timeframe_to_prev_date
 from functools import reduce
-from technical.indicators import RMI, zema, ichimoku
+from technical.indicators import RMI, ichimoku
 
 # --------------------------------
-def ha_typical_price(bars):
-    res = (bars['ha_high'] + bars['ha_low'] + bars['ha_close']) / 3.
-    return Series(index=bars.index, data=res)
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.heikin_ashi import ha_typical_price, heikinashi as ha_candles
+from tradeboddy.protections import ProtectionFeatures
+from tradeboddy.moving_averages import pmax
+
 
 def EWO(dataframe, ema_length=5, ema2_length=35):
     df = dataframe.copy()
@@ -42,12 +46,7 @@ def range_percent_change(dataframe: DataFrame, method, length: int) -> float:
         :param method: High to Low / Open to Close
         :param length: int The length to look back
         """
-        if method == 'HL':
-            return (dataframe['high'].rolling(length).max() - dataframe['low'].rolling(length).min()) / dataframe['low'].rolling(length).min()
-        elif method == 'OC':
-            return (dataframe['open'].rolling(length).max() - dataframe['close'].rolling(length).min()) / dataframe['close'].rolling(length).min()
-        else:
-            raise ValueError(f"Method {method} not defined!")
+        return ProtectionFeatures.of(dataframe).range_percent_change(method, length)
 
 # Williams %R
 def williams_r(dataframe: DataFrame, period: int = 14) -> Series:
@@ -504,7 +503,7 @@ class BB_RPB_TSL_2(IStrategy):
         informative_1h['cmf'] = chaikin_money_flow(informative_1h, 20)
 
         # Heikin Ashi
-        inf_heikinashi = qtpylib.heikinashi(informative_1h)
+        inf_heikinashi = ha_candles(informative_1h)
         informative_1h['ha_close'] = inf_heikinashi['close']
         informative_1h['rocr'] = ta.ROCR(informative_1h['ha_close'], timeperiod=168)
 
@@ -610,7 +609,7 @@ class BB_RPB_TSL_2(IStrategy):
         informative_5m['mfi'] = ta.MFI(informative_5m)
 
         # Heiken Ashi
-        heikinashi = qtpylib.heikinashi(informative_5m)
+        heikinashi = ha_candles(informative_5m)
         informative_5m['ha_open'] = heikinashi['open']
         informative_5m['ha_close'] = heikinashi['close']
         informative_5m['ha_high'] = heikinashi['high']
@@ -738,7 +737,7 @@ class BB_RPB_TSL_2(IStrategy):
         dataframe['mfi'] = ta.MFI(dataframe)
 
         # Heiken Ashi
-        heikinashi = qtpylib.heikinashi(dataframe)
+        heikinashi = ha_candles(dataframe)
         dataframe['ha_open'] = heikinashi['open']
         dataframe['ha_close'] = heikinashi['close']
         dataframe['ha_high'] = heikinashi['high']
@@ -1207,97 +1206,6 @@ class BB_RPB_TSL_2(IStrategy):
 
         return dataframe
 
-
-# PMAX
-def pmax(df, period, multiplier, length, MAtype, src):
-
-    period = int(period)
-    multiplier = int(multiplier)
-    length = int(length)
-    MAtype = int(MAtype)
-    src = int(src)
-
-    mavalue = f'MA_{MAtype}_{length}'
-    atr = f'ATR_{period}'
-    pm = f'pm_{period}_{multiplier}_{length}_{MAtype}'
-    pmx = f'pmX_{period}_{multiplier}_{length}_{MAtype}'
-
-    # MAtype==1 --> EMA
-    # MAtype==2 --> DEMA
-    # MAtype==3 --> T3
-    # MAtype==4 --> SMA
-    # MAtype==5 --> VIDYA
-    # MAtype==6 --> TEMA
-    # MAtype==7 --> WMA
-    # MAtype==8 --> VWMA
-    # MAtype==9 --> zema
-    if src == 1:
-        masrc = df["close"]
-    elif src == 2:
-        masrc = (df["high"] + df["low"]) / 2
-    elif src == 3:
-        masrc = (df["high"] + df["low"] + df["close"] + df["open"]) / 4
-
-    if MAtype == 1:
-        mavalue = ta.EMA(masrc, timeperiod=length)
-    elif MAtype == 2:
-        mavalue = ta.DEMA(masrc, timeperiod=length)
-    elif MAtype == 3:
-        mavalue = ta.T3(masrc, timeperiod=length)
-    elif MAtype == 4:
-        mavalue = ta.SMA(masrc, timeperiod=length)
-    elif MAtype == 5:
-        mavalue = VIDYA(df, length=length)
-    elif MAtype == 6:
-        mavalue = ta.TEMA(masrc, timeperiod=length)
-    elif MAtype == 7:
-        mavalue = ta.WMA(df, timeperiod=length)
-    elif MAtype == 8:
-        mavalue = vwma(df, length)
-    elif MAtype == 9:
-        mavalue = zema(df, period=length)
-
-    df[atr] = ta.ATR(df, timeperiod=period)
-    df['basic_ub'] = mavalue + ((multiplier/10) * df[atr])
-    df['basic_lb'] = mavalue - ((multiplier/10) * df[atr])
-
-
-    basic_ub = df['basic_ub'].values
-    final_ub = np.full(len(df), 0.00)
-    basic_lb = df['basic_lb'].values
-    final_lb = np.full(len(df), 0.00)
-
-    for i in range(period, len(df)):
-        final_ub[i] = basic_ub[i] if (
-            basic_ub[i] < final_ub[i - 1]
-            or mavalue[i - 1] > final_ub[i - 1]) else final_ub[i - 1]
-        final_lb[i] = basic_lb[i] if (
-            basic_lb[i] > final_lb[i - 1]
-            or mavalue[i - 1] < final_lb[i - 1]) else final_lb[i - 1]
-
-    df['final_ub'] = final_ub
-    df['final_lb'] = final_lb
-
-    pm_arr = np.full(len(df), 0.00)
-    for i in range(period, len(df)):
-        pm_arr[i] = (
-            final_ub[i] if (pm_arr[i - 1] == final_ub[i - 1]
-                                    and mavalue[i] <= final_ub[i])
-        else final_lb[i] if (
-            pm_arr[i - 1] == final_ub[i - 1]
-            and mavalue[i] > final_ub[i]) else final_lb[i]
-        if (pm_arr[i - 1] == final_lb[i - 1]
-            and mavalue[i] >= final_lb[i]) else final_ub[i]
-        if (pm_arr[i - 1] == final_lb[i - 1]
-            and mavalue[i] < final_lb[i]) else 0.00)
-
-    pm = Series(pm_arr)
-
-    # Mark the trend direction up/down
-    pmx = np.where((pm_arr > 0.00), np.where((mavalue < pm_arr), 'down',  'up'), np.NaN)
-
-    return pm, pmx
-
 # Mom DIV
 def momdiv(dataframe: DataFrame, mom_length: int = 10, bb_length: int = 20, bb_dev: float = 2.0, lookback: int = 30) -> DataFrame:
     mom: Series = ta.MOM(dataframe, timeperiod=mom_length)
@@ -12,6 +12,10 @@ from datetime import datetime, timedelta
 from freqtrade.strategy import merge_informative_pair, CategoricalParameter, DecimalParameter, IntParameter, stoploss_from_open
 from functools import reduce
 from technical.indicators import RMI, zema
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.trailing_replay import replay_trailing_buy, replayed_entry_signals, replayed_entry_tags, strategy_now, trailing_buy_step
 
 # --------------------------------
 def EWO(dataframe, ema_length=5, ema2_length=35):
@@ -501,7 +505,7 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
     # Trailing buy starts at any buy signal and will move to next candles if the trailing still active
     # Trailing buy stops  with BUY if : price decreases and rises again more than trailing_buy_offset
     # Trailing buy stops with NO BUY : current price is > initial price * (1 +  trailing_buy_max) OR custom_sell tag
-    # IT IS NOT COMPATIBLE WITH BACKTEST/HYPEROPT
+    # Backtest/hyperopt replay the trailing buy over trailing_replay_timeframe candles
     #
 
     process_only_new_candles = True
@@ -511,6 +515,7 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
     # Trailing buy parameters
     trailing_buy_order_enabled = True
     trailing_expire_seconds = 1800
+    trailing_replay_timeframe = '1m'  # detail candles for the backtest replay
 
     # If the current candle goes above min_uptrend_trailing_profit % before trailing_expire_seconds_uptrend seconds, buy the coin
     trailing_buy_uptrend_enabled = False
@@ -541,7 +546,7 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
 
     def trailing_buy_info(self, pair: str, current_price: float):
         # current_time live, dry run
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         if not self.debug_mode:
             return
         trailing_buy = self.trailing_buy(pair)
@@ -583,7 +588,7 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
         # example with duration and indicators
         # dry run, live only
         last_candle = dataframe.iloc[-1]
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         trailing_duration = current_time - trailing_buy['start_trailing_time']
         if trailing_duration.total_seconds() > self.trailing_expire_seconds:
             if ((current_trailing_profit_ratio > 0) and (last_candle['buy'] == 1)):
@@ -625,79 +630,8 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
         
         if val:
             if self.trailing_buy_order_enabled and self.config['runmode'].value in ('live', 'dry_run'):
-                val = False
                 dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-                if(len(dataframe) >= 1):
-                    last_candle = dataframe.iloc[-1].squeeze()
-                    current_price = rate
-                    trailing_buy = self.trailing_buy(pair)
-                    trailing_buy_offset = self.trailing_buy_offset(dataframe, pair, current_price)
-
-                    if trailing_buy['allow_trailing']:
-                        if (not trailing_buy['trailing_buy_order_started'] and (last_candle['buy'] == 1)):
-                            # start trailing buy
-                            
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_started'] = True
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'] = last_candle['close']
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['start_trailing_price'] = last_candle['close']
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['buy_tag'] = f"initial_buy_tag (strat trail price {last_candle['close']})"
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['start_trailing_time'] = datetime.now(timezone.utc)
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['offset'] = 0
-
-                            trailing_buy['trailing_buy_order_started'] = True
-                            trailing_buy['trailing_buy_order_uplimit'] = last_candle['close']
-                            trailing_buy['start_trailing_price'] = last_candle['close']
-                            trailing_buy['buy_tag'] = last_candle['buy_tag']
-                            trailing_buy['start_trailing_time'] = datetime.now(timezone.utc)
-                            trailing_buy['offset'] = 0
-                            
-                            self.trailing_buy_info(pair, current_price)
-                            logger.info(f'start trailing buy for {pair} at {last_candle["close"]}')
-
-                        elif trailing_buy['trailing_buy_order_started']:
-                            if trailing_buy_offset == 'forcebuy':
-                                # buy in custom conditions
-                                val = True
-                                ratio = "%.2f" % ((self.current_trailing_profit_ratio(pair, current_price)) * 100)
-                                self.trailing_buy_info(pair, current_price)
-                                logger.info(f"price OK for {pair} ({ratio} %, {current_price}), order may not be triggered if all slots are full")
-
-                            elif trailing_buy_offset is None:
-                                # stop trailing buy custom conditions
-                                self.trailing_buy(pair, reinit=True)
-                                logger.info(f'STOP trailing buy for {pair} because "trailing buy offset" returned None')
-
-                            elif current_price < trailing_buy['trailing_buy_order_uplimit']:
-                                # update uplimit
-                                old_uplimit = trailing_buy["trailing_buy_order_uplimit"]
-                                self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'] = min(current_price * (1 + trailing_buy_offset), self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'])
-                                self.custom_info_trail_buy[pair]['trailing_buy']['offset'] = trailing_buy_offset
-                                self.trailing_buy_info(pair, current_price)
-                                logger.info(f'update trailing buy for {pair} at {old_uplimit} -> {self.custom_info_trail_buy[pair]["trailing_buy"]["trailing_buy_order_uplimit"]}')
-                            elif current_price < (trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_buy)):
-                                # buy ! current price > uplimit && lower thant starting price
-                                val = True
-                                ratio = "%.2f" % ((self.current_trailing_profit_ratio(pair, current_price)) * 100)
-                                self.trailing_buy_info(pair, current_price)
-                                logger.info(f"current price ({current_price}) > uplimit ({trailing_buy['trailing_buy_order_uplimit']}) and lower than starting price price ({(trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_buy))}). OK for {pair} ({ratio} %), order may not be triggered if all slots are full")
-
-                            elif current_price > (trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_stop)):
-                                # stop trailing buy because price is too high
-                                self.trailing_buy(pair, reinit=True)
-                                self.trailing_buy_info(pair, current_price)
-                                logger.info(f'STOP trailing buy for {pair} because of the price is higher than starting price * {1 + self.trailing_buy_max_stop}')
-                            else:
-                                # uplimit > current_price > max_price, continue trailing and wait for the price to go down
-                                self.trailing_buy_info(pair, current_price)
-                                logger.info(f'price too high for {pair} !')
-
-                    else:
-                        logger.info(f"Wait for next buy signal for {pair}")
-
-                if (val == True):
-                    self.trailing_buy_info(pair, rate)
-                    self.trailing_buy(pair, reinit=True)
-                    logger.info(f'STOP trailing buy for {pair} because I buy it')
+                val = trailing_buy_step(self, pair, dataframe, rate)
         
         return val
 
@@ -722,6 +656,13 @@ class TrailingBuyStrat2(BB_RPB_TSL_RNG_TBS_GOLD):
                     dataframe.loc[:,'buy'] = 1
                     dataframe.loc[:, 'buy_tag'] = trailing_buy['buy_tag']
                     # dataframe['buy'] = 1
+        elif self.trailing_buy_order_enabled and self.config['runmode'].value in ('backtest', 'hyperopt'):
+            # replay the trailing buy over the detail candles
+            detail = self.dp.get_pair_dataframe(metadata['pair'], self.trailing_replay_timeframe)
+            if not detail.empty:
+                entries = replay_trailing_buy(self, metadata['pair'], dataframe, detail)
+                dataframe['buy'] = replayed_entry_signals(dataframe, entries)
+                dataframe['buy_tag'] = replayed_entry_tags(dataframe, entries)
 
         return dataframe
 
@@ -11,6 +11,10 @@ from datetime import datetime, timedelta
 from freqtrade.strategy import merge_informative_pair, CategoricalParameter, DecimalParameter, IntParameter, stoploss_from_open
 from functools import reduce
 from technical.indicators import RMI, zema
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.protections import ProtectionFeatures
 
 # --------------------------------
 def EWO(dataframe, ema_length=5, ema2_length=35):
@@ -59,10 +63,7 @@ def top_percent_change(dataframe: DataFrame, length: int) -> float:
     :param dataframe: DataFrame The original OHLC dataframe
     :param length: int The length to look back
     """
-    if length == 0:
-        return (dataframe['open'] - dataframe['close']) / dataframe['close']
-    else:
-        return (dataframe['open'].rolling(length).max() - dataframe['close']) / dataframe['close']
+    return ProtectionFeatures.of(dataframe).top_percent_change(length)
 
 ####################################################
 
@@ -18,13 +18,23 @@ from typing import Dict, List
 import technical.indicators as ftt
 from technical.util import resample_to_interval
 from freqtrade.persistence import Trade
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 from technical.util import resample_to_interval, resampled_merge
-from technical.indicators import RMI, zema, VIDYA, ichimoku
+from technical.indicators import RMI, zema, ichimoku
 from freqtrade.strategy import (BooleanParameter, CategoricalParameter, DecimalParameter, IStrategy, IntParameter)
 from skopt.space import Dimension, Integer, Real
 import time
-from finta import TA as fta
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy import finta_native as fta
+from tradeboddy.heikin_ashi import HA
+from tradeboddy.trailing_replay import replay_trailing_buy, replayed_entry_signals, replayed_entry_tags, strategy_now, trailing_buy_step, trailing_sell_step
+from tradeboddy.ohlcv_view import (EWO, OHLCVView, T3, VWAPB, attach, chaikin_money_flow, dump_warning, momdiv,
+                                   pump_warning, pump_warning2, williams_r)
+from tradeboddy.protections import ProtectionFeatures
+from tradeboddy.moving_averages import pmax
 
 log = logging.getLogger(__name__)
 
@@ -33,14 +43,6 @@ def ha_typical_price(bars):
     res = (bars['ha_high'] + bars['ha_low'] + bars['ha_close']) / 3
     return Series(index=bars.index, data=res)
 
-def VWAPB(dataframe, window_size=20, num_of_std=1):
-    df = dataframe.copy()
-    df['vwap'] = qtpylib.rolling_vwap(df,window=window_size)
-    rolling_std = df['vwap'].rolling(window=window_size).std()
-    df['vwap_low'] = df['vwap'] - (rolling_std * num_of_std)
-    df['vwap_high'] = df['vwap'] + (rolling_std * num_of_std)
-    return df['vwap_low'], df['vwap'], df['vwap_high']
-
 # Volume Weighted Moving Average
 def vwma(dataframe: DataFrame, length: int = 10):
     """Indicator: Volume Weighted Moving Average (VWMA)"""
@@ -54,13 +56,6 @@ def moderi(dataframe: DataFrame, len_slow_ma: int = 32) -> Series:
     slow_ma = Series(ta.EMA(vwma(dataframe, length=len_slow_ma), timeperiod=len_slow_ma))
     return slow_ma >= slow_ma.shift(1)  # we just need true & false for ERI trend
 
-def EWO(dataframe, ema_length=5, ema2_length=35):
-    df = dataframe.copy()
-    ema1 = ta.EMA(df, timeperiod=ema_length)
-    ema2 = ta.EMA(df, timeperiod=ema2_length)
-    emadif = (ema1 - ema2) / df['low'] * 100
-    return emadif
-
 def SROC(dataframe, roclen=21, emalen=13, smooth=21):
     df = dataframe.copy()
 
@@ -78,358 +73,16 @@ def range_percent_change(dataframe: DataFrame, method, length: int) -> float:
     :param method: High to Low / Open to Close
     :param length: int The length to look back
     """
-    if method == 'HL':
-        return (dataframe['high'].rolling(length).max() - dataframe['low'].rolling(length).min()) / dataframe['low'].rolling(length).min()
-    elif method == 'OC':
-        return (dataframe['open'].rolling(length).max() - dataframe['close'].rolling(length).min()) / dataframe['close'].rolling(length).min()
-    else:
-        raise ValueError(f"Method {method} not defined!")
-
-# Williams %R
-def williams_r(dataframe: DataFrame, period: int = 14) -> Series:
-    """Williams %R, or just %R, is a technical analysis oscillator showing the current closing price in relation to the high and low
-        of the past N days (for a given N). It was developed by a publisher and promoter of trading materials, Larry Williams.
-        Its purpose is to tell whether a stock or commodity market is trading near the high or the low, or somewhere in between,
-        of its recent trading range.
-        The oscillator is on a negative scale, from -100 (lowest) up to 0 (highest).
-    """
-
-    highest_high = dataframe["high"].rolling(center=False, window=period).max()
-    lowest_low = dataframe["low"].rolling(center=False, window=period).min()
-
-    WR = Series(
-        (highest_high - dataframe["close"]) / (highest_high - lowest_low),
-        name=f"{period} Williams %R",
-        )
-
-    return WR * -100
-
-# Chaikin Money Flow
-def chaikin_money_flow(dataframe, n=20, fillna=False) -> Series:
-    """Chaikin Money Flow (CMF)
-    It measures the amount of Money Flow Volume over a specific period.
-    http://stockcharts.com/school/doku.php?id=chart_school:technical_indicators:chaikin_money_flow_cmf
-    Args:
-        dataframe(pandas.Dataframe): dataframe containing ohlcv
-        n(int): n period.
-        fillna(bool): if fill nan values.
-    Returns:
-        pandas.Series: New feature generated.
-    """
-    mfv = ((dataframe['close'] - dataframe['low']) - (dataframe['high'] - dataframe['close'])) / (dataframe['high'] - dataframe['low'])
-    mfv = mfv.fillna(0.0)  # float division by zero
-    mfv *= dataframe['volume']
-    cmf = (mfv.rolling(n, min_periods=0).sum()
-           / dataframe['volume'].rolling(n, min_periods=0).sum())
-    if fillna:
-        cmf = cmf.replace([np.inf, -np.inf], np.nan).fillna(0)
-    return Series(cmf, name='cmf')
-
-def HA(dataframe, smoothing=None):
-    df = dataframe.copy()
-
-    df['HA_Close']=(df['open'] + df['high'] + df['low'] + df['close'])/4
-
-    df.reset_index(inplace=True)
-
-    ha_open = [ (df['open'][0] + df['close'][0]) / 2 ]
-    [ ha_open.append((ha_open[i] + df['HA_Close'].values[i]) / 2) for i in range(0, len(df)-1) ]
-    df['HA_Open'] = ha_open
-
-    df.set_index('index', inplace=True)
-
-    df['HA_High']=df[['HA_Open','HA_Close','high']].max(axis=1)
-    df['HA_Low']=df[['HA_Open','HA_Close','low']].min(axis=1)
-
-    if smoothing is not None:
-        sml = abs(int(smoothing))
-        if sml > 0:
-            df['Smooth_HA_O']=ta.EMA(df['HA_Open'], sml)
-            df['Smooth_HA_C']=ta.EMA(df['HA_Close'], sml)
-            df['Smooth_HA_H']=ta.EMA(df['HA_High'], sml)
-            df['Smooth_HA_L']=ta.EMA(df['HA_Low'], sml)
-
-    return df
-
-def pump_warning(dataframe, perc=15):
-    df = dataframe.copy()
-    df["change"] = df["high"] - df["low"]
-    df["test1"] = (df["close"] > df["open"])
-    df["test2"] = ((df["change"]/df["low"]) > (perc/100))
-    df["result"] = (df["test1"] & df["test2"]).astype('int')
-    return df['result']
-
-def pump_warning2(dataframe, params):
-    pct_change_timeframe=8
-    pct_change_max=0.15
-    pct_change_min=-0.15
-    pct_change_short_timeframe=8
-    pct_change_short_max=0.08
-    pct_change_short_min=-0.08
-    ispumping=0.4
-    islongpumping=0.48
-    isshortpumping=0.10
-    ispumping_rolling=20
-    islongpumping_rolling=30
-    isshortpumping_rolling=10
-    recentispumping_rolling=300
-    if 'pct_change_timeframe' in params:
-        pct_change_timeframe = params['pct_change_timeframe']
-    if 'pct_change_max' in params:
-        pct_change_max = params['pct_change_max']
-    if 'pct_change_min' in params:
-        pct_change_min = params['pct_change_min']
-    if 'pct_change_short_timeframe' in params:
-        pct_change_short_timeframe = params['pct_change_short_timeframe']
-    if 'pct_change_short_max' in params:
-        pct_change_short_max = params['pct_change_short_max']
-    if 'pct_change_short_min' in params:
-        pct_change_short_min = params['pct_change_short_min']
-    if 'ispumping' in params:
-        ispumping = params['ispumping']
-    if 'islongpumping' in params:
-        islongpumping = params['islongpumping']
-    if 'isshortpumping' in params:
-        isshortpumping = params['isshortpumping']
-    if 'ispumping_rolling' in params:
-        ispumping_rolling = params['ispumping_rolling']
-    if 'isshortpumping_rolling' in params:
-        isshortpumping_rolling = params['isshortpumping_rolling']
-    if 'recentispumping_rolling' in params:
-        recentispumping_rolling = params['recentispumping_rolling']
-    df = dataframe.copy()
-    df['pct_change'] = df['close'].pct_change(periods=pct_change_timeframe)
-    df['pct_change_int'] = ((df['pct_change'] > pct_change_max).astype('int') | (df['pct_change'] < pct_change_min).astype('int'))
-    df['pct_change_short'] = df['close'].pct_change(periods=pct_change_short_timeframe)
-    df['pct_change_int_short'] = ((df['pct_change_short'] > pct_change_short_max).astype('int') | (df['pct_change_short'] < pct_change_short_min).astype('int'))
-    df['ispumping'] = ((df['pct_change_int'].rolling(ispumping_rolling).sum() >= ispumping)).astype('int')
-    df['islongpumping'] = ((df['pct_change_int'].rolling(islongpumping_rolling).sum() >= islongpumping)).astype('int')
-    df['isshortpumping'] = ((df['pct_change_int_short'].rolling(isshortpumping_rolling).sum() >= isshortpumping)).astype('int')
-    df['recentispumping'] = (df['ispumping'].rolling(recentispumping_rolling).max() > 0) | (df['islongpumping'].rolling(recentispumping_rolling).max() > 0) | (df['isshortpumping'].rolling(recentispumping_rolling).max() > 0)
-
-    return df['recentispumping']
-
-def dump_warning(dataframe, buy_threshold):
-    df_past = dataframe.copy().shift(1)                                                                                                    # Get recent BTC info
-
-    # 5m dump protection
-    df_past_source = (df_past['open'] + df_past['close'] + df_past['high'] + df_past['low']) / 4        # Get BTC price
-    df_threshold = df_past_source * buy_threshold                                                                                 # BTC dump n% in 5 min
-    df_past_delta = df_past['close'].shift(1) - df_past['close']                                                          # should be positive if dump
-    df_diff = df_threshold - df_past_delta                                                                                # Need be larger than 0
-    dataframe['pair_threshold'] = df_threshold
-    dataframe['pair_diff'] = df_diff
-
-    # 1d dump protection
-    df_past_1d = dataframe.copy().shift(288)
-    df_past_source_1d = (df_past_1d['open'] + df_past_1d['close'] + df_past_1d['high'] + df_past_1d['low']) / 4
-    dataframe['pair_5m'] = df_past_source
-    dataframe['pair_1d'] = df_past_source_1d
-    dataframe['pair_5m_1d_diff'] = df_past_source - df_past_source_1d
-
-    return dataframe
-
-# Elliot Wave Oscillator
-def ewo(dataframe, sma1_length=5, sma2_length=35):
-    sma1 = ta.EMA(dataframe, timeperiod=sma1_length)
-    sma2 = ta.EMA(dataframe, timeperiod=sma2_length)
-    smadif = (sma1 - sma2) / dataframe['close'] * 100
-    return smadif
+    return ProtectionFeatures.of(dataframe).range_percent_change(method, length)
 
 # Exponential moving average of a volume weighted simple moving average
 def ema_vwma_osc(dataframe, len_slow_ma):
     slow_ema = Series(ta.EMA(vwma(dataframe, len_slow_ma), len_slow_ma))
     return ((slow_ema - slow_ema.shift(1)) / slow_ema.shift(1)) * 100
 
-def pivot_points(dataframe: DataFrame, mode = 'fibonacci') -> Series:
-    hlc3_pivot = (dataframe['high'] + dataframe['low'] + dataframe['close']).shift(1) / 3
-    hl_range = (dataframe['high'] - dataframe['low']).shift(1)
-    if mode == 'simple':
-        res1 = hlc3_pivot * 2 - dataframe['low'].shift(1)
-        sup1 = hlc3_pivot * 2 - dataframe['high'].shift(1)
-        res2 = hlc3_pivot + (dataframe['high'] - dataframe['low']).shift()
-        sup2 = hlc3_pivot - (dataframe['high'] - dataframe['low']).shift()
-        res3 = hlc3_pivot * 2 + (dataframe['high'] - 2 * dataframe['low']).shift()
-        sup3 = hlc3_pivot * 2 - (2 * dataframe['high'] - dataframe['low']).shift()
-    elif mode == 'fibonacci':
-        res1 = hlc3_pivot + 0.382 * hl_range
-        sup1 = hlc3_pivot - 0.382 * hl_range
-        res2 = hlc3_pivot + 0.618 * hl_range
-        sup2 = hlc3_pivot - 0.618 * hl_range
-        res3 = hlc3_pivot + 1 * hl_range
-        sup3 = hlc3_pivot - 1 * hl_range
-
-    return hlc3_pivot, res1, res2, res3, sup1, sup2, sup3
-
-def heikin_ashi(dataframe, smooth_inputs = False, smooth_outputs = False, length = 10):
-    df = dataframe[['open','close','high','low']].copy().fillna(0)
-    if smooth_inputs:
-        df['open_s']  = ta.EMA(df['open'], timeframe = length)
-        df['high_s']  = ta.EMA(df['high'], timeframe = length)
-        df['low_s']   = ta.EMA(df['low'],  timeframe = length)
-        df['close_s'] = ta.EMA(df['close'],timeframe = length)
-
-        open_ha  = (df['open_s'].shift(1) + df['close_s'].shift(1)) / 2
-        high_ha  = df.loc[:, ['high_s', 'open_s', 'close_s']].max(axis=1)
-        low_ha   = df.loc[:, ['low_s', 'open_s', 'close_s']].min(axis=1)
-        close_ha = (df['open_s'] + df['high_s'] + df['low_s'] + df['close_s'])/4
-    else:
-        open_ha  = (df['open'].shift(1) + df['close'].shift(1)) / 2
-        high_ha  = df.loc[:, ['high', 'open', 'close']].max(axis=1)
-        low_ha   = df.loc[:, ['low', 'open', 'close']].min(axis=1)
-        close_ha = (df['open'] + df['high'] + df['low'] + df['close'])/4
-
-    open_ha = open_ha.fillna(0)
-    high_ha = high_ha.fillna(0)
-    low_ha  = low_ha.fillna(0)
-    close_ha = close_ha.fillna(0)
-
-    if smooth_outputs:
-        open_sha  = ta.EMA(open_ha, timeframe = length)
-        high_sha  = ta.EMA(high_ha, timeframe = length)
-        low_sha   = ta.EMA(low_ha, timeframe = length)
-        close_sha = ta.EMA(close_ha, timeframe = length)
-
-        return open_sha, close_sha, low_sha
-    else:
-        return open_ha, close_ha, low_ha
-
-# PMAX
-def pmax(df, period, multiplier, length, MAtype, src):
-
-    period = int(period)
-    multiplier = int(multiplier)
-    length = int(length)
-    MAtype = int(MAtype)
-    src = int(src)
-
-    mavalue = f'MA_{MAtype}_{length}'
-    atr = f'ATR_{period}'
-    pm = f'pm_{period}_{multiplier}_{length}_{MAtype}'
-    pmx = f'pmX_{period}_{multiplier}_{length}_{MAtype}'
-
-    # MAtype==1 --> EMA
-    # MAtype==2 --> DEMA
-    # MAtype==3 --> T3
-    # MAtype==4 --> SMA
-    # MAtype==5 --> VIDYA
-    # MAtype==6 --> TEMA
-    # MAtype==7 --> WMA
-    # MAtype==8 --> VWMA
-    # MAtype==9 --> zema
-    if src == 1:
-        masrc = df["close"]
-    elif src == 2:
-        masrc = (df["high"] + df["low"]) / 2
-    elif src == 3:
-        masrc = (df["high"] + df["low"] + df["close"] + df["open"]) / 4
-
-    if MAtype == 1:
-        mavalue = ta.EMA(masrc, timeperiod=length)
-    elif MAtype == 2:
-        mavalue = ta.DEMA(masrc, timeperiod=length)
-    elif MAtype == 3:
-        mavalue = ta.T3(masrc, timeperiod=length)
-    elif MAtype == 4:
-        mavalue = ta.SMA(masrc, timeperiod=length)
-    elif MAtype == 5:
-        mavalue = VIDYA(df, length=length)
-    elif MAtype == 6:
-        mavalue = ta.TEMA(masrc, timeperiod=length)
-    elif MAtype == 7:
-        mavalue = ta.WMA(df, timeperiod=length)
-    elif MAtype == 8:
-        mavalue = vwma(df, length)
-    elif MAtype == 9:
-        mavalue = zema(df, period=length)
-
-    df[atr] = ta.ATR(df, timeperiod=period)
-    df['basic_ub'] = mavalue + ((multiplier/10) * df[atr])
-    df['basic_lb'] = mavalue - ((multiplier/10) * df[atr])
-
-
-    basic_ub = df['basic_ub'].values
-    final_ub = np.full(len(df), 0.00)
-    basic_lb = df['basic_lb'].values
-    final_lb = np.full(len(df), 0.00)
-
-    for i in range(period, len(df)):
-        final_ub[i] = basic_ub[i] if (
-            basic_ub[i] < final_ub[i - 1]
-            or mavalue[i - 1] > final_ub[i - 1]) else final_ub[i - 1]
-        final_lb[i] = basic_lb[i] if (
-            basic_lb[i] > final_lb[i - 1]
-            or mavalue[i - 1] < final_lb[i - 1]) else final_lb[i - 1]
-
-    df['final_ub'] = final_ub
-    df['final_lb'] = final_lb
-
-    pm_arr = np.full(len(df), 0.00)
-    for i in range(period, len(df)):
-        pm_arr[i] = (
-            final_ub[i] if (pm_arr[i - 1] == final_ub[i - 1]
-                                    and mavalue[i] <= final_ub[i])
-        else final_lb[i] if (
-            pm_arr[i - 1] == final_ub[i - 1]
-            and mavalue[i] > final_ub[i]) else final_lb[i]
-        if (pm_arr[i - 1] == final_lb[i - 1]
-            and mavalue[i] >= final_lb[i]) else final_ub[i]
-        if (pm_arr[i - 1] == final_lb[i - 1]
-            and mavalue[i] < final_lb[i]) else 0.00)
-
-    pm = Series(pm_arr)
-
-    # Mark the trend direction up/down
-    pmx = np.where((pm_arr > 0.00), np.where((mavalue < pm_arr), 'down',  'up'), np.NaN)
-
-    return pm, pmx
-
-# Mom DIV
-def momdiv(dataframe: DataFrame, mom_length: int = 10, bb_length: int = 20, bb_dev: float = 2.0, lookback: int = 30) -> DataFrame:
-    mom: Series = ta.MOM(dataframe, timeperiod=mom_length)
-    upperband, middleband, lowerband = ta.BBANDS(mom, timeperiod=bb_length, nbdevup=bb_dev, nbdevdn=bb_dev, matype=0)
-    buy = qtpylib.crossed_below(mom, lowerband)
-    sell = qtpylib.crossed_above(mom, upperband)
-    hh = dataframe['high'].rolling(lookback).max()
-    ll = dataframe['low'].rolling(lookback).min()
-    coh = dataframe['high'] >= hh
-    col = dataframe['low'] <= ll
-    df = DataFrame({
-            "momdiv_mom": mom,
-            "momdiv_upperb": upperband,
-            "momdiv_lowerb": lowerband,
-            "momdiv_buy": buy,
-            "momdiv_sell": sell,
-            "momdiv_coh": coh,
-            "momdiv_col": col,
-        }, index=dataframe['close'].index)
-    return df
-
 def pct_change(a, b):
     return (b - a) / a
 
-def T3(dataframe, length=5):
-    """
-    T3 Average by HPotter on Tradingview
-    https://www.tradingview.com/script/qzoC9H1I-T3-Average/
-    """
-    df = dataframe.copy()
-
-    df['xe1'] = ta.EMA(df['close'], timeperiod=length)
-    df['xe2'] = ta.EMA(df['xe1'], timeperiod=length)
-    df['xe3'] = ta.EMA(df['xe2'], timeperiod=length)
-    df['xe4'] = ta.EMA(df['xe3'], timeperiod=length)
-    df['xe5'] = ta.EMA(df['xe4'], timeperiod=length)
-    df['xe6'] = ta.EMA(df['xe5'], timeperiod=length)
-    b = 0.7
-    c1 = -b * b * b
-    c2 = 3 * b * b + 3 * b * b * b
-    c3 = -6 * b * b - 3 * b - 3 * b * b * b
-    c4 = 1 + 3 * b + b * b * b + 3 * b * b
-    df['T3Average'] = c1 * df['xe6'] + c2 * df['xe5'] + c3 * df['xe4'] + c4 * df['xe3']
-
-    return df['T3Average']
-
 class BB_RPB_TSL_SMA_Tranz(IStrategy):
     '''
         BB_RPB_TSL
@@ -1449,13 +1102,7 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
             :param method: High to Low / Open to Close
             :param length: int The length to look back
         """
-        df = dataframe.copy()
-        if method == 'HL':
-            return ((df['high'].rolling(length).max() - df['low'].rolling(length).min()) / df['low'].rolling(length).min())
-        elif method == 'OC':
-            return ((df['open'].rolling(length).max() - df['close'].rolling(length).min()) / df['close'].rolling(length).min())
-        else:
-            raise ValueError(f"Method {method} not defined!")
+        return ProtectionFeatures.of(dataframe).range_percent_change(method, length)
 
     def top_percent_change(self, dataframe: DataFrame, length: int) -> float:
         """
@@ -1464,11 +1111,7 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        if length == 0:
-            return ((df['open'] - df['close']) / df['close'])
-        else:
-            return ((df['open'].rolling(length).max() - df['close']) / df['close'])
+        return ProtectionFeatures.of(dataframe).top_percent_change(length)
 
     def range_maxgap(self, dataframe: DataFrame, length: int) -> float:
         """
@@ -1477,8 +1120,7 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        return (df['open'].rolling(length).max() - df['close'].rolling(length).min())
+        return ProtectionFeatures.of(dataframe).range_maxgap(length)
 
     def range_maxgap_adjusted(self, dataframe: DataFrame, length: int, adjustment: float) -> float:
         """
@@ -1497,8 +1139,7 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        return (df['close'] - df['close'].rolling(length).min())
+        return ProtectionFeatures.of(dataframe).range_height(length)
 
     def safe_pump(self, dataframe: DataFrame, length: int, thresh: float, pull_thresh: float) -> bool:
         """
@@ -1509,8 +1150,7 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         :param thresh: int Maximum percentage change threshold
         :param pull_thresh: int Pullback from interval maximum threshold
         """
-        df = dataframe.copy()
-        return (df[f'oc_pct_change_{length}'] < thresh) | (self.range_maxgap_adjusted(df, length, pull_thresh) > self.range_height(df, length))
+        return ProtectionFeatures.of(dataframe).safe_pump(length, thresh, pull_thresh)
 
     def safe_dips(self, dataframe: DataFrame, thresh_0, thresh_2, thresh_12, thresh_144) -> bool:
         """
@@ -1542,6 +1182,9 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         assert self.dp, "DataProvider is required for multiple timeframes."
         # Get the informative pair
         informative_1h = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.inf_1h)
+        # in live/dry_run only the new candle's rows of the protection windows get computed
+        ProtectionFeatures.for_pair(self, metadata['pair'], self.inf_1h, informative_1h)
+        candles = OHLCVView.of(informative_1h)
 
         # RSI
         informative_1h['rsi_14'] = ta.RSI(informative_1h, timeperiod=14)
@@ -1580,8 +1223,10 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         informative_1h['crsi'] =  (ta.RSI(informative_1h['close'], timeperiod=3) + ta.RSI(crsi_updown, timeperiod=2) + ta.ROC(informative_1h['close'], 100)) / 3
 
         # Williams %R
-        informative_1h['r_96'] = williams_r(informative_1h, period=96)
-        informative_1h['r_480'] = williams_r(informative_1h, period=480)
+        attach(informative_1h, {
+            'r_96': williams_r(candles, period=96),
+            'r_480': williams_r(candles, period=480),
+        })
 
         # Bollinger bands
         bollinger2 = qtpylib.bollinger_bands(qtpylib.typical_price(informative_1h), window=20, stds=2)
@@ -1594,16 +1239,13 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         informative_1h['roc'] = ta.ROC(dataframe, timeperiod=9)
 
         # MOMDIV
-        mom = momdiv(informative_1h)
-        informative_1h['momdiv_buy'] = mom['momdiv_buy']
-        informative_1h['momdiv_sell'] = mom['momdiv_sell']
-        informative_1h['momdiv_coh'] = mom['momdiv_coh']
-        informative_1h['momdiv_col'] = mom['momdiv_col']
+        mom = momdiv(candles)
+        attach(informative_1h, {col: mom[col] for col in ('momdiv_buy', 'momdiv_sell', 'momdiv_coh', 'momdiv_col')})
 
         informative_1h['rsi'] = ta.RSI(informative_1h, timeperiod=14)
 
         # CMF
-        informative_1h['cmf'] = chaikin_money_flow(informative_1h, 20)
+        informative_1h['cmf'] = chaikin_money_flow(candles, 20)
 
         # Heikin Ashi
         inf_heikinashi = qtpylib.heikinashi(informative_1h)
@@ -1611,10 +1253,10 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         informative_1h['rocr'] = ta.ROCR(informative_1h['ha_close'], timeperiod=168)
 
         # T3 Average
-        informative_1h['T3'] = T3(informative_1h)
+        informative_1h['T3'] = T3(candles)
 
         # Elliot
-        informative_1h['EWO'] = EWO(informative_1h, 50, 200)
+        informative_1h['EWO'] = EWO(candles, 50, 200)
 
         # nfi 37
         informative_1h['hl_pct_change_5'] = range_percent_change(informative_1h, 'HL', 5)
@@ -1704,6 +1346,7 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         assert self.dp, "DataProvider is required for multiple timeframes."
         # Get the informative pair
         informative_15m = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.inf_15m)
+        candles = OHLCVView.of(informative_15m)
 
         # RSI
         informative_15m['rsi_14'] = ta.RSI(informative_15m, timeperiod=14)
@@ -1740,18 +1383,20 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         informative_15m['tail'] = (informative_15m['close'] - informative_15m['bb40_2_low']).abs()
 
         # CMF
-        informative_15m['cmf'] = chaikin_money_flow(informative_15m, 20)
+        informative_15m['cmf'] = chaikin_money_flow(candles, 20)
 
         # CTI
         informative_15m['cti'] = pta.cti(informative_15m["close"], length=20)
 
         # Williams %R
-        informative_15m['r_14'] = williams_r(informative_15m, period=14)
-        informative_15m['r_64'] = williams_r(informative_15m, period=64)
-        informative_15m['r_96'] = williams_r(informative_15m, period=96)
+        attach(informative_15m, {
+            'r_14': williams_r(candles, period=14),
+            'r_64': williams_r(candles, period=64),
+            'r_96': williams_r(candles, period=96),
+        })
 
         # EWO
-        informative_15m['ewo'] = EWO(informative_15m, 50, 200)
+        informative_15m['ewo'] = EWO(candles, 50, 200)
 
         # CCI
         informative_15m['cci'] = ta.CCI(informative_15m, source='hlc3', timeperiod=20)
@@ -1986,10 +1631,12 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
 
     def normal_tf_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        dataframe = dump_warning(dataframe, self.buy_threshold.value)
-        # pump detector
-        dataframe['pump'] = pump_warning(dataframe, perc=int(self.max_change_pump)) #25% di pump
-        dataframe['recentispumping'] = pump_warning2(dataframe, {
+        candles = OHLCVView.of(dataframe)
+        attach(dataframe, {
+            **dump_warning(candles, self.buy_threshold.value),
+            # pump detector
+            'pump': pump_warning(candles, perc=int(self.max_change_pump)), #25% di pump
+            'recentispumping': pump_warning2(candles, {
                 'pct_change_timeframe':         self.pump_protection_01_pct_change_timeframe.value,
                 'pct_change_max':               self.pump_protection_01_pct_change_max.value,
                 'pct_change_min':               self.pump_protection_01_pct_change_min.value,
@@ -2003,7 +1650,8 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
                 'islongpumping_rolling':        12,
                 'isshortpumping_rolling':       3,
                 'recentispumping_rolling':      60
-            })
+            }),
+        })
         dataframe['rsi_4'] = ta.RSI(dataframe, timeperiod=4)
         dataframe['rsi_14'] = ta.RSI(dataframe, timeperiod=14)
         dataframe['rsi_20'] = ta.RSI(dataframe, timeperiod=20)
@@ -2021,7 +1669,7 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
 
         dataframe['sma_9'] = ta.SMA(dataframe, timeperiod=9)
         # Elliot
-        dataframe['EWO2'] = EWO(dataframe, self.fast_ewo, self.slow_ewo)
+        dataframe['EWO2'] = EWO(candles, self.fast_ewo, self.slow_ewo)
 
         # RSI
         dataframe['rsi_2'] = ta.RSI(dataframe, timeperiod=20)
@@ -2094,7 +1742,7 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         # CTI
         dataframe['cti'] = pta.cti(dataframe["close"], length=20)
         # CMF
-        dataframe['cmf'] = chaikin_money_flow(dataframe, 20)
+        dataframe['cmf'] = chaikin_money_flow(candles, 20)
 
         # CRSI (3, 2, 100)
         crsi_closechange = dataframe['close'] / dataframe['close'].shift(1)
@@ -2120,16 +1768,10 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         dataframe['rsi_slow'] = ta.RSI(dataframe, timeperiod=20)
 
         # Elliot
-        dataframe['EWO'] = EWO(dataframe, 50, 200)
+        dataframe['EWO'] = EWO(candles, 50, 200)
 
         # Williams %R
-        dataframe['r_14'] = williams_r(dataframe, period=14)
-        dataframe['r_32'] = williams_r(dataframe, period=32)
-        dataframe['r_64'] = williams_r(dataframe, period=64)
-        dataframe['r_84'] = williams_r(dataframe, period=84)
-        dataframe['r_96'] = williams_r(dataframe, period=96)
-        dataframe['r_112'] = williams_r(dataframe, period=112)
-        dataframe['r_480'] = williams_r(dataframe, period=480)
+        attach(dataframe, {f'r_{period}': williams_r(candles, period=period) for period in (14, 32, 64, 84, 96, 112, 480)})
 
         # Volume
         dataframe['volume_mean_4'] = dataframe['volume'].rolling(4).mean().shift(1)
@@ -2171,14 +1813,11 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
         dataframe['pmax_thresh'] = ta.EMA(dataframe['source'], timeperiod=9)
 
         # MOMDIV
-        mom = momdiv(dataframe)
-        dataframe['momdiv_buy'] = mom['momdiv_buy']
-        dataframe['momdiv_sell'] = mom['momdiv_sell']
-        dataframe['momdiv_coh'] = mom['momdiv_coh']
-        dataframe['momdiv_col'] = mom['momdiv_col']
+        mom = momdiv(candles)
+        attach(dataframe, {col: mom[col] for col in ('momdiv_buy', 'momdiv_sell', 'momdiv_coh', 'momdiv_col')})
 
         # T3 Average
-        dataframe['T3'] = T3(dataframe)
+        dataframe['T3'] = T3(candles)
 
         # True range
         dataframe['trange'] = ta.TRANGE(dataframe)
@@ -2290,12 +1929,9 @@ class BB_RPB_TSL_SMA_Tranz(IStrategy):
 
         # BTC info
         informative = self.dp.get_pair_dataframe('BTC/USDT', timeframe=self.timeframe)
-        informative = dump_warning(informative, self.buy_threshold.value)
-        dataframe['btc_threshold'] = informative['pair_threshold']
-        dataframe['btc_diff'] = informative['pair_diff']
-        dataframe['btc_5m'] = informative['pair_5m']
-        dataframe['btc_1d'] = informative['pair_1d']
-        dataframe['btc_5m_1d_diff'] = informative['pair_5m_1d_diff']
+        btc = dump_warning(informative, self.buy_threshold.value)
+        # aligned on the BTC frame's index, as the Series assignments were
+        attach(dataframe, {col.replace('pair_', 'btc_'): values for col, values in btc.items()}, index=informative.index)
 
         return dataframe
 
@@ -3470,6 +3106,7 @@ class UziChanTB2(BB_RPB_TSL_SMA_Tranz):
     trailing_expire_seconds = 1800      #NOTE 5m timeframe
     #trailing_expire_seconds = 1800/5    #NOTE 1m timeframe
     #trailing_expire_seconds = 1800*3    #NOTE 15m timeframe
+    trailing_replay_timeframe = '1m'  # detail candles for the backtest replay
 
     # If the current candle goes above min_uptrend_trailing_profit % before trailing_expire_seconds_uptrend seconds, buy the coin
     trailing_buy_uptrend_enabled = True
@@ -3526,7 +3163,7 @@ class UziChanTB2(BB_RPB_TSL_SMA_Tranz):
 
     def trailing_buy_info(self, pair: str, current_price: float):
         # current_time live, dry run
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         if not self.debug_mode:
             return
         trailing_buy = self.trailing_buy(pair)
@@ -3550,7 +3187,7 @@ class UziChanTB2(BB_RPB_TSL_SMA_Tranz):
 
     def trailing_sell_info(self, pair: str, current_price: float):
         # current_time live, dry run
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         if not self.debug_mode:
             return
         trailing_sell = self.trailing_sell(pair)
@@ -3604,7 +3241,7 @@ class UziChanTB2(BB_RPB_TSL_SMA_Tranz):
         # example with duration and indicators
         # dry run, live only
         last_candle = dataframe.iloc[-1]
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         trailing_duration = current_time - trailing_buy['start_trailing_time']
         if trailing_duration.total_seconds() > self.trailing_expire_seconds:
             if ((current_trailing_profit_ratio > 0) and (last_candle['buy'] == 1)):
@@ -3650,7 +3287,7 @@ class UziChanTB2(BB_RPB_TSL_SMA_Tranz):
         # example with duration and indicators
         # dry run, live only
         last_candle = dataframe.iloc[-1]
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         trailing_duration =  current_time - trailing_sell['start_trailing_time']
         if trailing_duration.total_seconds() > self.trailing_expire_seconds:
             if ((current_trailing_sell_profit_ratio > 0) and (last_candle['sell'] != 0)):
@@ -3693,72 +3330,8 @@ class UziChanTB2(BB_RPB_TSL_SMA_Tranz):
             
             if val:
                 if self.trailing_buy_order_enabled and self.config['runmode'].value in ('live', 'dry_run'):
-                    val = False
                     dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-                    if(len(dataframe) >= 1):
-                        last_candle = dataframe.iloc[-1].squeeze()
-                        current_price = rate
-                        trailing_buy = self.trailing_buy(pair)
-                        trailing_buy_offset = self.trailing_buy_offset(dataframe, pair, current_price)
-
-                        if trailing_buy['allow_trailing']:
-                            if (not trailing_buy['trailing_buy_order_started'] and (last_candle['buy'] == 1)):
-                                # start trailing buy
-                                
-                                trailing_buy['trailing_buy_order_started'] = True
-                                trailing_buy['trailing_buy_order_uplimit'] = last_candle['close']
-                                trailing_buy['start_trailing_price'] = last_candle['close']
-                                trailing_buy['buy_tag'] = last_candle['buy_tag']
-                                trailing_buy['start_trailing_time'] = datetime.now(timezone.utc)
-                                trailing_buy['offset'] = 0
-                                
-                                self.trailing_buy_info(pair, current_price)
-                                logger.info(f'start trailing buy for {pair} at {last_candle["close"]}')
-
-                            elif trailing_buy['trailing_buy_order_started']:
-                                if trailing_buy_offset == 'forcebuy':
-                                    # buy in custom conditions
-                                    val = True
-                                    ratio = "%.2f" % ((self.current_trailing_buy_profit_ratio(pair, current_price)) * 100)
-                                    self.trailing_buy_info(pair, current_price)
-                                    logger.info(f"price OK for {pair} ({ratio} %, {current_price}), order may not be triggered if all slots are full")
-
-                                elif trailing_buy_offset is None:
-                                    # stop trailing buy custom conditions
-                                    self.trailing_buy(pair, reinit=True)
-                                    logger.info(f'STOP trailing buy for {pair} because "trailing buy offset" returned None')
-
-                                elif current_price < trailing_buy['trailing_buy_order_uplimit']:
-                                    # update uplimit
-                                    old_uplimit = trailing_buy["trailing_buy_order_uplimit"]
-                                    self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'] = min(current_price * (1 + trailing_buy_offset), self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'])
-                                    self.custom_info_trail_buy[pair]['trailing_buy']['offset'] = trailing_buy_offset
-                                    self.trailing_buy_info(pair, current_price)
-                                    logger.info(f'update trailing buy for {pair} at {old_uplimit} -> {self.custom_info_trail_buy[pair]["trailing_buy"]["trailing_buy_order_uplimit"]}')
-                                elif current_price < (trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_buy)):
-                                    # buy ! current price > uplimit && lower thant starting price
-                                    val = True
-                                    ratio = "%.2f" % ((self.current_trailing_buy_profit_ratio(pair, current_price)) * 100)
-                                    self.trailing_buy_info(pair, current_price)
-                                    logger.info(f"current price ({current_price}) > uplimit ({trailing_buy['trailing_buy_order_uplimit']}) and lower than starting price price ({(trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_buy))}). OK for {pair} ({ratio} %), order may not be triggered if all slots are full")
-
-                                elif current_price > (trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_stop)):
-                                    # stop trailing buy because price is too high
-                                    self.trailing_buy(pair, reinit=True)
-                                    self.trailing_buy_info(pair, current_price)
-                                    logger.info(f'STOP trailing buy for {pair} because of the price is higher than starting price * {1 + self.trailing_buy_max_stop}')
-                                else:
-                                    # uplimit > current_price > max_price, continue trailing and wait for the price to go down
-                                    self.trailing_buy_info(pair, current_price)
-                                    logger.info(f'price too high for {pair} !')
-
-                        else:
-                            logger.info(f"Wait for next buy signal for {pair}")
-
-                    if (val == True):
-                        self.trailing_buy_info(pair, rate)
-                        self.trailing_buy(pair, reinit=True)
-                        logger.info(f'STOP trailing buy for {pair} because I buy it')
+                    val = trailing_buy_step(self, pair, dataframe, rate)
             
             return val
 
@@ -3769,71 +3342,8 @@ class UziChanTB2(BB_RPB_TSL_SMA_Tranz):
 
         if val:
             if self.trailing_sell_order_enabled and self.config['runmode'].value in ('live', 'dry_run'):
-                val = False
                 dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-                if(len(dataframe) >= 1):
-                    last_candle = dataframe.iloc[-1].squeeze()
-                    current_price = rate
-                    trailing_sell= self.trailing_sell(pair)
-                    trailing_sell_offset = self.trailing_sell_offset(dataframe, pair, current_price)
-
-                    if trailing_sell['allow_sell_trailing']:
-                        if (not trailing_sell['trailing_sell_order_started'] and (last_candle['sell'] != 0)):
-                            trailing_sell['trailing_sell_order_started'] = True
-                            trailing_sell['trailing_sell_order_downlimit'] = last_candle['close']
-                            trailing_sell['start_trailing_sell_price'] = last_candle['close']
-                            trailing_sell['sell_tag'] = last_candle['sell_tag']
-                            trailing_sell['start_trailing_time'] = datetime.now(timezone.utc)
-                            trailing_sell['offset'] = 0
-                            
-                            self.trailing_sell_info(pair, current_price)
-                            logger.info(f'start trailing sell for {pair} at {last_candle["close"]}')
-
-                        elif trailing_sell['trailing_sell_order_started']:
-                            if trailing_sell_offset == 'forcesell':
-                                # sell in custom conditions
-                                val = True
-                                ratio = "%.2f" % ((self.current_trailing_sell_profit_ratio(pair, current_price)) * 100)
-                                self.trailing_sell_info(pair, current_price)
-                                logger.info(f"FORCESELL for {pair} ({ratio} %, {current_price})")
-
-                            elif trailing_sell_offset is None:
-                                # stop trailing sell custom conditions
-                                self.trailing_sell(pair, reinit=True)
-                                logger.info(f'STOP trailing sell for {pair} because "trailing sell offset" returned None')
-
-                            elif current_price > trailing_sell['trailing_sell_order_downlimit']:
-                                # update downlimit
-                                old_downlimit = trailing_sell["trailing_sell_order_downlimit"]
-                                self.custom_info_trail_sell[pair]['trailing_sell']['trailing_sell_order_downlimit'] = max(current_price * (1 - trailing_sell_offset), self.custom_info_trail_sell[pair]['trailing_sell']['trailing_sell_order_downlimit'])
-                                self.custom_info_trail_sell[pair]['trailing_sell']['offset'] = trailing_sell_offset
-                                self.trailing_sell_info(pair, current_price)
-                                logger.info(f'update trailing sell for {pair} at {old_downlimit} -> {self.custom_info_trail_sell[pair]["trailing_sell"]["trailing_sell_order_downlimit"]}')
-
-                            elif current_price > (trailing_sell['start_trailing_sell_price'] * (1 - self.trailing_sell_max_sell)):
-                                # sell! current price < downlimit && higher than starting price
-                                val = True
-                                ratio = "%.2f" % ((self.current_trailing_sell_profit_ratio(pair, current_price)) * 100)
-                                self.trailing_sell_info(pair, current_price)
-                                logger.info(f"current price ({current_price}) < downlimit ({trailing_sell['trailing_sell_order_downlimit']}) but higher than starting price ({(trailing_sell['start_trailing_sell_price'] * (1 + self.trailing_sell_max_sell))}). OK for {pair} ({ratio} %)")
-
-                            elif current_price < (trailing_sell['start_trailing_sell_price'] * (1 - self.trailing_sell_max_stop)):
-                                # stop trailing, sell fast, price too low
-                                val = True                                
-                                self.trailing_sell_info(pair, current_price)
-                                logger.info(f'STOP trailing sell for {pair} because of the price is much lower than starting price * {1 + self.trailing_sell_max_stop}')
-                            else:
-                                # uplimit > current_price > max_price, continue trailing and wait for the price to go down
-                                self.trailing_sell_info(pair, current_price)
-                                logger.info(f'price too low for {pair} !')
-
-                    else:
-                        logger.info(f"Wait for next sell signal for {pair}")
-
-                if (val == True):
-                    self.trailing_sell_info(pair, rate)
-                    self.trailing_sell(pair, reinit=True)
-                    logger.info(f'STOP trailing sell for {pair} because I SOLD it')
+                val = trailing_sell_step(self, pair, dataframe, rate)
 
         #if (sell_reason != 'sell_signal') | (sell_reason!='force_sell'):
         if (sell_reason != 'sell_signal'):
@@ -3862,6 +3372,13 @@ class UziChanTB2(BB_RPB_TSL_SMA_Tranz):
                     logger.info(f"Continue trailing for {metadata['pair']}. Manually trigger buy signal!!")
                     dataframe.loc[:,'buy'] = 1
                     dataframe.loc[:, 'buy_tag'] = trailing_buy['buy_tag']
+        elif self.trailing_buy_order_enabled and self.config['runmode'].value in ('backtest', 'hyperopt'):
+            # replay the trailing buy over the detail candles
+            detail = self.dp.get_pair_dataframe(metadata['pair'], self.trailing_replay_timeframe)
+            if not detail.empty:
+                entries = replay_trailing_buy(self, metadata['pair'], dataframe, detail)
+                dataframe['buy'] = replayed_entry_signals(dataframe, entries)
+                dataframe['buy_tag'] = replayed_entry_tags(dataframe, entries)
 
         return dataframe
 
@@ -18,18 +18,23 @@ from typing import Dict, List
 import technical.indicators as ftt
 from technical.util import resample_to_interval
 from freqtrade.persistence import Trade
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from technical.util import resample_to_interval, resampled_merge
-from technical.indicators import RMI, zema, VIDYA, ichimoku
+from technical.indicators import RMI, zema, ichimoku
 from freqtrade.strategy import (BooleanParameter, CategoricalParameter, DecimalParameter, IStrategy, IntParameter)
 import time
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.heikin_ashi import HA, ha_typical_price, heikinashi as ha_candles
+from tradeboddy.trailing_replay import replay_trailing_buy, replayed_entry_signals, replayed_entry_tags, strategy_now, trailing_buy_step
+from tradeboddy.protections import ProtectionFeatures
+from tradeboddy.moving_averages import pmax
 
 log = logging.getLogger(__name__)
 
 # --------------------------------
-def ha_typical_price(bars):
-    res = (bars['ha_high'] + bars['ha_low'] + bars['ha_close']) / 3.
-    return Series(index=bars.index, data=res)
+
 
 # Volume Weighted Moving Average
 def vwma(dataframe: DataFrame, length: int = 10):
@@ -68,12 +73,7 @@ def range_percent_change(dataframe: DataFrame, method, length: int) -> float:
     :param method: High to Low / Open to Close
     :param length: int The length to look back
     """
-    if method == 'HL':
-        return (dataframe['high'].rolling(length).max() - dataframe['low'].rolling(length).min()) / dataframe['low'].rolling(length).min()
-    elif method == 'OC':
-        return (dataframe['open'].rolling(length).max() - dataframe['close'].rolling(length).min()) / dataframe['close'].rolling(length).min()
-    else:
-        raise ValueError(f"Method {method} not defined!")
+    return ProtectionFeatures.of(dataframe).range_percent_change(method, length)
 
 # Williams %R
 def williams_r(dataframe: DataFrame, period: int = 14) -> Series:
@@ -115,31 +115,6 @@ def chaikin_money_flow(dataframe, n=20, fillna=False) -> Series:
         cmf = cmf.replace([np.inf, -np.inf], np.nan).fillna(0)
     return Series(cmf, name='cmf')
 
-def HA(dataframe, smoothing=None):
-    df = dataframe.copy()
-
-    df['HA_Close']=(df['open'] + df['high'] + df['low'] + df['close'])/4
-
-    df.reset_index(inplace=True)
-
-    ha_open = [ (df['open'][0] + df['close'][0]) / 2 ]
-    [ ha_open.append((ha_open[i] + df['HA_Close'].values[i]) / 2) for i in range(0, len(df)-1) ]
-    df['HA_Open'] = ha_open
-
-    df.set_index('index', inplace=True)
-
-    df['HA_High']=df[['HA_Open','HA_Close','high']].max(axis=1)
-    df['HA_Low']=df[['HA_Open','HA_Close','low']].min(axis=1)
-
-    if smoothing is not None:
-        sml = abs(int(smoothing))
-        if sml > 0:
-            df['Smooth_HA_O']=ta.EMA(df['HA_Open'], sml)
-            df['Smooth_HA_C']=ta.EMA(df['HA_Close'], sml)
-            df['Smooth_HA_H']=ta.EMA(df['HA_High'], sml)
-            df['Smooth_HA_L']=ta.EMA(df['HA_Low'], sml)
-
-    return df
 
 def pump_warning(dataframe, perc=15):
     df = dataframe.copy()
@@ -162,149 +137,6 @@ def ema_vwma_osc(dataframe, len_slow_ma):
     slow_ema = Series(ta.EMA(vwma(dataframe, len_slow_ma), len_slow_ma))
     return ((slow_ema - slow_ema.shift(1)) / slow_ema.shift(1)) * 100
 
-def pivot_points(dataframe: DataFrame, mode = 'fibonacci') -> Series:
-    hlc3_pivot = (dataframe['high'] + dataframe['low'] + dataframe['close']).shift(1) / 3
-    hl_range = (dataframe['high'] - dataframe['low']).shift(1)
-    if mode == 'simple':
-        res1 = hlc3_pivot * 2 - dataframe['low'].shift(1)
-        sup1 = hlc3_pivot * 2 - dataframe['high'].shift(1)
-        res2 = hlc3_pivot + (dataframe['high'] - dataframe['low']).shift()
-        sup2 = hlc3_pivot - (dataframe['high'] - dataframe['low']).shift()
-        res3 = hlc3_pivot * 2 + (dataframe['high'] - 2 * dataframe['low']).shift()
-        sup3 = hlc3_pivot * 2 - (2 * dataframe['high'] - dataframe['low']).shift()
-    elif mode == 'fibonacci':
-        res1 = hlc3_pivot + 0.382 * hl_range
-        sup1 = hlc3_pivot - 0.382 * hl_range
-        res2 = hlc3_pivot + 0.618 * hl_range
-        sup2 = hlc3_pivot - 0.618 * hl_range
-        res3 = hlc3_pivot + 1 * hl_range
-        sup3 = hlc3_pivot - 1 * hl_range
-
-    return hlc3_pivot, res1, res2, res3, sup1, sup2, sup3
-
-def heikin_ashi(dataframe, smooth_inputs = False, smooth_outputs = False, length = 10):
-    df = dataframe[['open','close','high','low']].copy().fillna(0)
-    if smooth_inputs:
-        df['open_s']  = ta.EMA(df['open'], timeframe = length)
-        df['high_s']  = ta.EMA(df['high'], timeframe = length)
-        df['low_s']   = ta.EMA(df['low'],  timeframe = length)
-        df['close_s'] = ta.EMA(df['close'],timeframe = length)
-
-        open_ha  = (df['open_s'].shift(1) + df['close_s'].shift(1)) / 2
-        high_ha  = df.loc[:, ['high_s', 'open_s', 'close_s']].max(axis=1)
-        low_ha   = df.loc[:, ['low_s', 'open_s', 'close_s']].min(axis=1)
-        close_ha = (df['open_s'] + df['high_s'] + df['low_s'] + df['close_s'])/4
-    else:
-        open_ha  = (df['open'].shift(1) + df['close'].shift(1)) / 2
-        high_ha  = df.loc[:, ['high', 'open', 'close']].max(axis=1)
-        low_ha   = df.loc[:, ['low', 'open', 'close']].min(axis=1)
-        close_ha = (df['open'] + df['high'] + df['low'] + df['close'])/4
-
-    open_ha = open_ha.fillna(0)
-    high_ha = high_ha.fillna(0)
-    low_ha  = low_ha.fillna(0)
-    close_ha = close_ha.fillna(0)
-
-    if smooth_outputs:
-        open_sha  = ta.EMA(open_ha, timeframe = length)
-        high_sha  = ta.EMA(high_ha, timeframe = length)
-        low_sha   = ta.EMA(low_ha, timeframe = length)
-        close_sha = ta.EMA(close_ha, timeframe = length)
-
-        return open_sha, close_sha, low_sha
-    else:
-        return open_ha, close_ha, low_ha
-
-# PMAX
-def pmax(df, period, multiplier, length, MAtype, src):
-
-    period = int(period)
-    multiplier = int(multiplier)
-    length = int(length)
-    MAtype = int(MAtype)
-    src = int(src)
-
-    mavalue = f'MA_{MAtype}_{length}'
-    atr = f'ATR_{period}'
-    pm = f'pm_{period}_{multiplier}_{length}_{MAtype}'
-    pmx = f'pmX_{period}_{multiplier}_{length}_{MAtype}'
-
-    # MAtype==1 --> EMA
-    # MAtype==2 --> DEMA
-    # MAtype==3 --> T3
-    # MAtype==4 --> SMA
-    # MAtype==5 --> VIDYA
-    # MAtype==6 --> TEMA
-    # MAtype==7 --> WMA
-    # MAtype==8 --> VWMA
-    # MAtype==9 --> zema
-    if src == 1:
-        masrc = df["close"]
-    elif src == 2:
-        masrc = (df["high"] + df["low"]) / 2
-    elif src == 3:
-        masrc = (df["high"] + df["low"] + df["close"] + df["open"]) / 4
-
-    if MAtype == 1:
-        mavalue = ta.EMA(masrc, timeperiod=length)
-    elif MAtype == 2:
-        mavalue = ta.DEMA(masrc, timeperiod=length)
-    elif MAtype == 3:
-        mavalue = ta.T3(masrc, timeperiod=length)
-    elif MAtype == 4:
-        mavalue = ta.SMA(masrc, timeperiod=length)
-    elif MAtype == 5:
-        mavalue = VIDYA(df, length=length)
-    elif MAtype == 6:
-        mavalue = ta.TEMA(masrc, timeperiod=length)
-    elif MAtype == 7:
-        mavalue = ta.WMA(df, timeperiod=length)
-    elif MAtype == 8:
-        mavalue = vwma(df, length)
-    elif MAtype == 9:
-        mavalue = zema(df, period=length)
-
-    df[atr] = ta.ATR(df, timeperiod=period)
-    df['basic_ub'] = mavalue + ((multiplier/10) * df[atr])
-    df['basic_lb'] = mavalue - ((multiplier/10) * df[atr])
-
-
-    basic_ub = df['basic_ub'].values
-    final_ub = np.full(len(df), 0.00)
-    basic_lb = df['basic_lb'].values
-    final_lb = np.full(len(df), 0.00)
-
-    for i in range(period, len(df)):
-        final_ub[i] = basic_ub[i] if (
-            basic_ub[i] < final_ub[i - 1]
-            or mavalue[i - 1] > final_ub[i - 1]) else final_ub[i - 1]
-        final_lb[i] = basic_lb[i] if (
-            basic_lb[i] > final_lb[i - 1]
-            or mavalue[i - 1] < final_lb[i - 1]) else final_lb[i - 1]
-
-    df['final_ub'] = final_ub
-    df['final_lb'] = final_lb
-
-    pm_arr = np.full(len(df), 0.00)
-    for i in range(period, len(df)):
-        pm_arr[i] = (
-            final_ub[i] if (pm_arr[i - 1] == final_ub[i - 1]
-                                    and mavalue[i] <= final_ub[i])
-        else final_lb[i] if (
-            pm_arr[i - 1] == final_ub[i - 1]
-            and mavalue[i] > final_ub[i]) else final_lb[i]
-        if (pm_arr[i - 1] == final_lb[i - 1]
-            and mavalue[i] >= final_lb[i]) else final_ub[i]
-        if (pm_arr[i - 1] == final_lb[i - 1]
-            and mavalue[i] < final_lb[i]) else 0.00)
-
-    pm = Series(pm_arr)
-
-    # Mark the trend direction up/down
-    pmx = np.where((pm_arr > 0.00), np.where((mavalue < pm_arr), 'down',  'up'), np.NaN)
-
-    return pm, pmx
-
 # Mom DIV
 def momdiv(dataframe: DataFrame, mom_length: int = 10, bb_length: int = 20, bb_dev: float = 2.0, lookback: int = 30) -> DataFrame:
     mom: Series = ta.MOM(dataframe, timeperiod=mom_length)
@@ -1324,13 +1156,7 @@ class BB_RPB_TSL_SMA_Tranz_TB_MOD(IStrategy):
             :param method: High to Low / Open to Close
             :param length: int The length to look back
         """
-        df = dataframe.copy()
-        if method == 'HL':
-            return ((df['high'].rolling(length).max() - df['low'].rolling(length).min()) / df['low'].rolling(length).min())
-        elif method == 'OC':
-            return ((df['open'].rolling(length).max() - df['close'].rolling(length).min()) / df['close'].rolling(length).min())
-        else:
-            raise ValueError(f"Method {method} not defined!")
+        return ProtectionFeatures.of(dataframe).range_percent_change(method, length)
 
     def top_percent_change(self, dataframe: DataFrame, length: int) -> float:
         """
@@ -1339,11 +1165,7 @@ class BB_RPB_TSL_SMA_Tranz_TB_MOD(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        if length == 0:
-            return ((df['open'] - df['close']) / df['close'])
-        else:
-            return ((df['open'].rolling(length).max() - df['close']) / df['close'])
+        return ProtectionFeatures.of(dataframe).top_percent_change(length)
 
     def range_maxgap(self, dataframe: DataFrame, length: int) -> float:
         """
@@ -1352,8 +1174,7 @@ class BB_RPB_TSL_SMA_Tranz_TB_MOD(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        return (df['open'].rolling(length).max() - df['close'].rolling(length).min())
+        return ProtectionFeatures.of(dataframe).range_maxgap(length)
 
     def range_maxgap_adjusted(self, dataframe: DataFrame, length: int, adjustment: float) -> float:
         """
@@ -1372,8 +1193,7 @@ class BB_RPB_TSL_SMA_Tranz_TB_MOD(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        return (df['close'] - df['close'].rolling(length).min())
+        return ProtectionFeatures.of(dataframe).range_height(length)
 
     def safe_pump(self, dataframe: DataFrame, length: int, thresh: float, pull_thresh: float) -> bool:
         """
@@ -1384,8 +1204,7 @@ class BB_RPB_TSL_SMA_Tranz_TB_MOD(IStrategy):
         :param thresh: int Maximum percentage change threshold
         :param pull_thresh: int Pullback from interval maximum threshold
         """
-        df = dataframe.copy()
-        return (df[f'oc_pct_change_{length}'] < thresh) | (self.range_maxgap_adjusted(df, length, pull_thresh) > self.range_height(df, length))
+        return ProtectionFeatures.of(dataframe).safe_pump(length, thresh, pull_thresh)
 
     def safe_dips(self, dataframe: DataFrame, thresh_0, thresh_2, thresh_12, thresh_144) -> bool:
         """
@@ -1419,6 +1238,8 @@ class BB_RPB_TSL_SMA_Tranz_TB_MOD(IStrategy):
         assert self.dp, "DataProvider is required for multiple timeframes."
         # Get the informative pair
         informative_1h = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.inf_1h)
+        # in live/dry_run only the new candle's rows of the protection windows get computed
+        ProtectionFeatures.for_pair(self, metadata['pair'], self.inf_1h, informative_1h)
 
         # RSI
         informative_1h['rsi_14'] = ta.RSI(informative_1h, timeperiod=14)
@@ -1483,7 +1304,7 @@ class BB_RPB_TSL_SMA_Tranz_TB_MOD(IStrategy):
         informative_1h['cmf'] = chaikin_money_flow(informative_1h, 20)
 
         # Heikin Ashi
-        inf_heikinashi = qtpylib.heikinashi(informative_1h)
+        inf_heikinashi = ha_candles(informative_1h)
         informative_1h['ha_close'] = inf_heikinashi['close']
         informative_1h['rocr'] = ta.ROCR(informative_1h['ha_close'], timeperiod=168)
 
@@ -1983,7 +1804,7 @@ class BB_RPB_TSL_SMA_Tranz_TB_MOD(IStrategy):
         dataframe['mfi'] = ta.MFI(dataframe)
 
         # Heiken Ashi
-        heikinashi = qtpylib.heikinashi(dataframe)
+        heikinashi = ha_candles(dataframe)
         dataframe['ha_open'] = heikinashi['open']
         dataframe['ha_close'] = heikinashi['close']
         dataframe['ha_high'] = heikinashi['high']
@@ -3056,7 +2877,7 @@ class BB_RPB_TSL_Tranz_TrailingBuy(BB_RPB_TSL_SMA_Tranz_TB):
     # Trailing buy starts at any buy signal and will move to next candles if the trailing still active
     # Trailing buy stops  with BUY if : price decreases and rises again more than trailing_buy_offset
     # Trailing buy stops with NO BUY : current price is > initial price * (1 +  trailing_buy_max) OR custom_sell tag
-    # IT IS NOT COMPATIBLE WITH BACKTEST/HYPEROPT
+    # Backtest/hyperopt replay the trailing buy over trailing_replay_timeframe candles
     #
 
     process_only_new_candles = False
@@ -3066,6 +2887,7 @@ class BB_RPB_TSL_Tranz_TrailingBuy(BB_RPB_TSL_SMA_Tranz_TB):
     # Trailing buy parameters
     trailing_buy_order_enabled = True
     trailing_expire_seconds = 1800
+    trailing_replay_timeframe = '1m'  # detail candles for the backtest replay
 
     # If the current candle goes above min_uptrend_trailing_profit % before trailing_expire_seconds_uptrend seconds, buy the coin
     trailing_buy_uptrend_enabled = False
@@ -3096,7 +2918,7 @@ class BB_RPB_TSL_Tranz_TrailingBuy(BB_RPB_TSL_SMA_Tranz_TB):
 
     def trailing_buy_info(self, pair: str, current_price: float):
         # current_time live, dry run
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         if not self.debug_mode:
             return
         trailing_buy = self.trailing_buy(pair)
@@ -3138,7 +2960,7 @@ class BB_RPB_TSL_Tranz_TrailingBuy(BB_RPB_TSL_SMA_Tranz_TB):
         # example with duration and indicators
         # dry run, live only
         last_candle = dataframe.iloc[-1]
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         trailing_duration = current_time - trailing_buy['start_trailing_time']
         if trailing_duration.total_seconds() > self.trailing_expire_seconds:
             if ((current_trailing_profit_ratio > 0) and (last_candle['buy'] == 1)):
@@ -3180,79 +3002,8 @@ class BB_RPB_TSL_Tranz_TrailingBuy(BB_RPB_TSL_SMA_Tranz_TB):
 
         if val:
             if self.trailing_buy_order_enabled and self.config['runmode'].value in ('live', 'dry_run'):
-                val = False
                 dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-                if(len(dataframe) >= 1):
-                    last_candle = dataframe.iloc[-1].squeeze()
-                    current_price = rate
-                    trailing_buy = self.trailing_buy(pair)
-                    trailing_buy_offset = self.trailing_buy_offset(dataframe, pair, current_price)
-
-                    if trailing_buy['allow_trailing']:
-                        if (not trailing_buy['trailing_buy_order_started'] and (last_candle['buy'] == 1)):
-                            # start trailing buy
-
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_started'] = True
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'] = last_candle['close']
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['start_trailing_price'] = last_candle['close']
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['buy_tag'] = f"initial_buy_tag (strat trail price {last_candle['close']})"
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['start_trailing_time'] = datetime.now(timezone.utc)
-                            # self.custom_info_trail_buy[pair]['trailing_buy']['offset'] = 0
-
-                            trailing_buy['trailing_buy_order_started'] = True
-                            trailing_buy['trailing_buy_order_uplimit'] = last_candle['close']
-                            trailing_buy['start_trailing_price'] = last_candle['close']
-                            trailing_buy['buy_tag'] = last_candle['buy_tag']
-                            trailing_buy['start_trailing_time'] = datetime.now(timezone.utc)
-                            trailing_buy['offset'] = 0
-
-                            self.trailing_buy_info(pair, current_price)
-                            log.info(f'start trailing buy for {pair} at {last_candle["close"]}')
-
-                        elif trailing_buy['trailing_buy_order_started']:
-                            if trailing_buy_offset == 'forcebuy':
-                                # buy in custom conditions
-                                val = True
-                                ratio = "%.2f" % ((self.current_trailing_profit_ratio(pair, current_price)) * 100)
-                                self.trailing_buy_info(pair, current_price)
-                                log.info(f"price OK for {pair} ({ratio} %, {current_price}), order may not be triggered if all slots are full")
-
-                            elif trailing_buy_offset is None:
-                                # stop trailing buy custom conditions
-                                self.trailing_buy(pair, reinit=True)
-                                log.info(f'STOP trailing buy for {pair} because "trailing buy offset" returned None')
-
-                            elif current_price < trailing_buy['trailing_buy_order_uplimit']:
-                                # update uplimit
-                                old_uplimit = trailing_buy["trailing_buy_order_uplimit"]
-                                self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'] = min(current_price * (1 + trailing_buy_offset), self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'])
-                                self.custom_info_trail_buy[pair]['trailing_buy']['offset'] = trailing_buy_offset
-                                self.trailing_buy_info(pair, current_price)
-                                log.info(f'update trailing buy for {pair} at {old_uplimit} -> {self.custom_info_trail_buy[pair]["trailing_buy"]["trailing_buy_order_uplimit"]}')
-                            elif current_price < (trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_buy)):
-                                # buy ! current price > uplimit && lower thant starting price
-                                val = True
-                                ratio = "%.2f" % ((self.current_trailing_profit_ratio(pair, current_price)) * 100)
-                                self.trailing_buy_info(pair, current_price)
-                                log.info(f"current price ({current_price}) > uplimit ({trailing_buy['trailing_buy_order_uplimit']}) and lower than starting price price ({(trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_buy))}). OK for {pair} ({ratio} %), order may not be triggered if all slots are full")
-
-                            elif current_price > (trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_stop)):
-                                # stop trailing buy because price is too high
-                                self.trailing_buy(pair, reinit=True)
-                                self.trailing_buy_info(pair, current_price)
-                                log.info(f'STOP trailing buy for {pair} because of the price is higher than starting price * {1 + self.trailing_buy_max_stop}')
-                            else:
-                                # uplimit > current_price > max_price, continue trailing and wait for the price to go down
-                                self.trailing_buy_info(pair, current_price)
-                                log.info(f'price too high for {pair} !')
-
-                    else:
-                        log.info(f"Wait for next buy signal for {pair}")
-
-                if (val == True):
-                    self.trailing_buy_info(pair, rate)
-                    self.trailing_buy(pair, reinit=True)
-                    log.info(f'STOP trailing buy for {pair} because I buy it')
+                val = trailing_buy_step(self, pair, dataframe, rate)
 
         return val
 
@@ -3278,5 +3029,12 @@ class BB_RPB_TSL_Tranz_TrailingBuy(BB_RPB_TSL_SMA_Tranz_TB):
                     dataframe.loc[:, 'buy_tag'] = trailing_buy['buy_tag']
                     # dataframe['buy'] = 1
                     #idk its the right place here nut yea
+        elif self.trailing_buy_order_enabled and self.config['runmode'].value in ('backtest', 'hyperopt'):
+            # replay the trailing buy over the detail candles
+            detail = self.dp.get_pair_dataframe(metadata['pair'], self.trailing_replay_timeframe)
+            if not detail.empty:
+                entries = replay_trailing_buy(self, metadata['pair'], dataframe, detail)
+                dataframe['buy'] = replayed_entry_signals(dataframe, entries)
+                dataframe['buy_tag'] = replayed_entry_tags(dataframe, entries)
 
         return dataframe
@@ -10,7 +10,11 @@ from pandas import DataFrame, Series, DatetimeIndex, merge
 from datetime import datetime, timedelta
 from freqtrade.strategy import merge_informative_pair, CategoricalParameter, DecimalParameter, IntParameter, stoploss_from_open
 from functools import reduce
-from technical.indicators import RMI, zema, ichimoku
+from technical.indicators import RMI, zema
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 
 # --------------------------------
 def EWO(dataframe, ema_length=5, ema2_length=35):
@@ -218,7 +222,7 @@ class BB_RPB_TSL_c7c477d_20211030(IStrategy):
         informative_1h = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.inf_1h)
 
         # Ichimoku
-        ichi = ichimoku(informative_1h, conversion_line_period=20, base_line_periods=60, laggin_span=120, displacement=30)
+        ichi = Ichimoku.of(informative_1h).lines(conversion_line_period=20, base_line_periods=60, laggin_span=120, displacement=30, columns=['chikou_span', 'tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'leading_senkou_span_a', 'leading_senkou_span_b'], lookahead=True)
         informative_1h['chikou_span'] = ichi['chikou_span']
         informative_1h['tenkan_sen'] = ichi['tenkan_sen']
         informative_1h['kijun_sen'] = ichi['kijun_sen']
@@ -50,6 +50,10 @@ from technical.indicators import zema
 ##   ETH: 0x83D3cFb8001BDC5d2211cBeBB8cB3461E5f7Ec91                                                     ##
 ##                                                                                                       ##
 ###########################################################################################################
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.protections import ProtectionFeatures
 
 
 class BigZ0307HO(IStrategy):
@@ -655,13 +659,7 @@ class BigZ0307HO(IStrategy):
         :param method: High to Low / Open to Close
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        if method == 'HL':
-            return ((df['high'].rolling(length).max() - df['low'].rolling(length).min()) / df['low'].rolling(length).min())
-        elif method == 'OC':
-            return ((df['open'].rolling(length).max() - df['close'].rolling(length).min()) / df['close'].rolling(length).min())
-        else:
-            raise ValueError(f"Method {method} not defined!")
+        return ProtectionFeatures.of(dataframe).range_percent_change(method, length)
 
     def top_percent_change(self, dataframe: DataFrame, length: int) -> float:
         """
@@ -670,11 +668,7 @@ class BigZ0307HO(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        if length == 0:
-            return ((df['open'] - df['close']) / df['close'])
-        else:
-            return ((df['open'].rolling(length).max() - df['close']) / df['close'])
+        return ProtectionFeatures.of(dataframe).top_percent_change(length)
 
     def range_maxgap(self, dataframe: DataFrame, length: int) -> float:
         """
@@ -683,8 +677,7 @@ class BigZ0307HO(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        return (df['open'].rolling(length).max() - df['close'].rolling(length).min())
+        return ProtectionFeatures.of(dataframe).range_maxgap(length)
 
     def range_maxgap_adjusted(self, dataframe: DataFrame, length: int, adjustment: float) -> float:
         """
@@ -703,8 +696,7 @@ class BigZ0307HO(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        return (df['close'] - df['close'].rolling(length).min())
+        return ProtectionFeatures.of(dataframe).range_height(length)
 
     def safe_pump(self, dataframe: DataFrame, length: int, thresh: float, pull_thresh: float) -> bool:
         """
@@ -715,8 +707,7 @@ class BigZ0307HO(IStrategy):
         :param thresh: int Maximum percentage change threshold
         :param pull_thresh: int Pullback from interval maximum threshold
         """
-        df = dataframe.copy()
-        return (df[f'oc_pct_change_{length}'] < thresh) | (self.range_maxgap_adjusted(df, length, pull_thresh) > self.range_height(df, length))
+        return ProtectionFeatures.of(dataframe).safe_pump(length, thresh, pull_thresh)
 
     def safe_dips(self, dataframe: DataFrame, thresh_0, thresh_2, thresh_12, thresh_144) -> bool:
         """
@@ -742,6 +733,8 @@ class BigZ0307HO(IStrategy):
         assert self.dp, "DataProvider is required for multiple timeframes."
         # Get the informative pair
         informative_1h = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.inf_1h)
+        # in live/dry_run only the new candle's rows of the protection windows get computed
+        ProtectionFeatures.for_pair(self, metadata['pair'], self.inf_1h, informative_1h)
 
         bollinger = qtpylib.bollinger_bands(qtpylib.typical_price(dataframe), window=20, stds=2)
         informative_1h['bb_lowerband'] = bollinger['lower']
@@ -1,10 +1,13 @@
-import freqtrade.vendor.qtpylib.indicators as qtpylib
 import numpy as np
 import talib.abstract as ta
 from freqtrade.strategy.interface import IStrategy
 from freqtrade.strategy import merge_informative_pair, DecimalParameter, stoploss_from_open
-from pandas import DataFrame, Series
+from pandas import DataFrame
 from datetime import datetime
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.heikin_ashi import ha_typical_price, heikinashi as ha_candles
 
 
 def bollinger_bands(stock_price, window_size, num_of_std):
@@ -14,11 +17,6 @@ def bollinger_bands(stock_price, window_size, num_of_std):
     return np.nan_to_num(rolling_mean), np.nan_to_num(lower_band)
 
 
-def ha_typical_price(bars):
-    res = (bars['ha_high'] + bars['ha_low'] + bars['ha_close']) / 3.
-    return Series(index=bars.index, data=res)
-
-
 class ClucHAnix(IStrategy):
 
     """
@@ -135,7 +133,7 @@ class ClucHAnix(IStrategy):
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # # Heikin Ashi Candles
-        heikinashi = qtpylib.heikinashi(dataframe)
+        heikinashi = ha_candles(dataframe)
         dataframe['ha_open'] = heikinashi['open']
         dataframe['ha_close'] = heikinashi['close']
         dataframe['ha_high'] = heikinashi['high']
@@ -167,7 +165,7 @@ class ClucHAnix(IStrategy):
         
         informative = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=inf_tf)
         
-        inf_heikinashi = qtpylib.heikinashi(informative)
+        inf_heikinashi = ha_candles(informative)
 
         informative['ha_close'] = inf_heikinashi['close']
         informative['rocr'] = ta.ROCR(informative['ha_close'], timeperiod=168)
@@ -12,8 +12,12 @@ from freqtrade.persistence import Trade, PairLocks
 from freqtrade.strategy import (BooleanParameter, DecimalParameter,
                                 IntParameter, stoploss_from_open, merge_informative_pair)
 from freqtrade.strategy.interface import IStrategy
-from pandas import DataFrame, Series
+from pandas import DataFrame
 from skopt.space import Dimension, Integer
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.heikin_ashi import ha_typical_price, heikinashi as ha_candles
 
 def bollinger_bands(stock_price, window_size, num_of_std):
     rolling_mean = stock_price.rolling(window=window_size).mean()
@@ -21,9 +25,6 @@ def bollinger_bands(stock_price, window_size, num_of_std):
     lower_band = rolling_mean - (rolling_std * num_of_std)
     return np.nan_to_num(rolling_mean), np.nan_to_num(lower_band)
 
-def ha_typical_price(bars):
-    res = (bars['ha_high'] + bars['ha_low'] + bars['ha_close']) / 3.
-    return Series(index=bars.index, data=res)
 
 class ClucHAnix_BB_RPB_MOD(IStrategy):
 
@@ -242,7 +243,7 @@ class ClucHAnix_BB_RPB_MOD(IStrategy):
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # Heikin Ashi Candles
-        heikinashi = qtpylib.heikinashi(dataframe)
+        heikinashi = ha_candles(dataframe)
         dataframe['ha_open'] = heikinashi['open']
         dataframe['ha_close'] = heikinashi['close']
         dataframe['ha_high'] = heikinashi['high']
@@ -301,7 +302,7 @@ class ClucHAnix_BB_RPB_MOD(IStrategy):
 
         informative = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=inf_tf)
 
-        inf_heikinashi = qtpylib.heikinashi(informative)
+        inf_heikinashi = ha_candles(informative)
 
         informative['ha_close'] = inf_heikinashi['close']
         informative['rocr'] = ta.ROCR(informative['ha_close'], timeperiod=168)
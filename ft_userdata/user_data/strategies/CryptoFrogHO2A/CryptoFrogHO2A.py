@@ -8,7 +8,6 @@ import numpy as np
 
 ## Indicator libs
 import talib.abstract as ta
-from finta import TA as fta
 
 ## FT stuffs
 from freqtrade.strategy import IStrategy, merge_informative_pair, stoploss_from_open, IntParameter, DecimalParameter, CategoricalParameter
@@ -17,6 +16,13 @@ from freqtrade.exchange import timeframe_to_minutes
 from freqtrade.persistence import Trade
 from skopt.space import Dimension
 
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.finta_native import frog_indicators
+from tradeboddy import heikin_ashi
+from tradeboddy.rolling import exceeds_prev_max
+
 class CryptoFrogHO2A(IStrategy):
     # Sell hyperspace params:
     sell_params = {
@@ -150,30 +156,7 @@ class CryptoFrogHO2A(IStrategy):
 
     ## smoothed Heiken Ashi
     def HA(self, dataframe, smoothing=None):
-        df = dataframe.copy()
-
-        df['HA_Close']=(df['open'] + df['high'] + df['low'] + df['close'])/4
-
-        df.reset_index(inplace=True)
-
-        ha_open = [ (df['open'][0] + df['close'][0]) / 2 ]
-        [ ha_open.append((ha_open[i] + df['HA_Close'].values[i]) / 2) for i in range(0, len(df)-1) ]
-        df['HA_Open'] = ha_open
-
-        df.set_index('index', inplace=True)
-
-        df['HA_High']=df[['HA_Open','HA_Close','high']].max(axis=1)
-        df['HA_Low']=df[['HA_Open','HA_Close','low']].min(axis=1)
-
-        if smoothing is not None:
-            sml = abs(int(smoothing))
-            if sml > 0:
-                df['Smooth_HA_O']=ta.EMA(df['HA_Open'], sml)
-                df['Smooth_HA_C']=ta.EMA(df['HA_Close'], sml)
-                df['Smooth_HA_H']=ta.EMA(df['HA_High'], sml)
-                df['Smooth_HA_L']=ta.EMA(df['HA_Low'], sml)
-                
-        return df
+        return heikin_ashi.HA(dataframe, smoothing)
     
     def hansen_HA(self, informative_df, period=6):
         dataframe = informative_df.copy()
@@ -188,19 +171,6 @@ class CryptoFrogHO2A(IStrategy):
         
         return {'emac': dataframe['emac'], 'emao': dataframe['emao']}
     
-    ## detect BB width expansion to indicate possible volatility
-    def bbw_expansion(self, bbw_rolling, mult=1.1):
-        bbw = list(bbw_rolling)
-
-        m = 0.0
-        for i in range(len(bbw)-1):
-            if bbw[i] > m:
-                m = bbw[i]
-
-        if (bbw[-1] > (m * mult)):
-            return 1
-        return 0
-
     ## do_indicator style a la Obelisk strategies
     def do_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # Stoch fast - mainly due to 5m timeframes
@@ -228,7 +198,7 @@ class CryptoFrogHO2A(IStrategy):
         
         ## confirm wideboi variance signal with bbw expansion
         dataframe["bb_width"] = ((dataframe["bb_upperband"] - dataframe["bb_lowerband"]) / dataframe["bb_middleband"])
-        dataframe['bbw_expansion'] = dataframe['bb_width'].rolling(window=4).apply(self.bbw_expansion)
+        dataframe['bbw_expansion'] = exceeds_prev_max(dataframe['bb_width'], 4, 1.1)
 
         # confirm entry and exit on smoothed HA
         dataframe = self.HA(dataframe, 4)
@@ -240,18 +210,18 @@ class CryptoFrogHO2A(IStrategy):
         dataframe['emao'] = hansencalc['emao']
         
         # money flow index (MFI) for in/outflow of money, like RSI adjusted for vol
-        dataframe['mfi'] = fta.MFI(dataframe)
+        fi = frog_indicators(dataframe)
+        dataframe['mfi'] = fi['mfi']
         
         ## sqzmi to detect quiet periods
-        dataframe['sqzmi'] = fta.SQZMI(dataframe) #, MA=hansencalc['emac'])
+        dataframe['sqzmi'] = fi['sqzmi'] #, MA=hansencalc['emac'])
         
         # Volume Flow Indicator (MFI) for volume based on the direction of price movement
-        dataframe['vfi'] = fta.VFI(dataframe, period=14)
+        dataframe['vfi'] = fi['vfi']
         
-        dmi = fta.DMI(dataframe, period=14)
-        dataframe['dmi_plus'] = dmi['DI+']
-        dataframe['dmi_minus'] = dmi['DI-']
-        dataframe['adx'] = fta.ADX(dataframe, period=14)
+        dataframe['dmi_plus'] = fi['dmi_plus']
+        dataframe['dmi_minus'] = fi['dmi_minus']
+        dataframe['adx'] = fi['adx']
         
         ## for stoploss - all from Solipsis4
         ## simple ATR and ROC for stoploss
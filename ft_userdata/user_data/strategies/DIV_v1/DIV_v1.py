@@ -1,8 +1,10 @@
 from pandas import DataFrame
 import talib.abstract as ta
-from functools import reduce
-import numpy as np
 from freqtrade.strategy import (IStrategy)
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.divergence import low_divergences, swing_lows
 
 # DIV v1.0 - 2021-09-07
 # by Sanka 
@@ -98,27 +100,12 @@ def divergence(dataframe: DataFrame, source='rsi'):
     # Detect divergence between close price and source
 
     # Detect HL or LL
-    dataframe['ohlc_bottom'] = np.NaN
-    dataframe['rsi_bottom'] = np.NaN
-    dataframe.loc[(dataframe['close'].shift() <= dataframe['close'].shift(2)) & (dataframe['close'] >= dataframe['close'].shift()), 'ohlc_bottom'] = dataframe['close'].shift()
-    dataframe.loc[(dataframe[source].shift() <= dataframe[source].shift(2)) & (dataframe[source] >= dataframe[source].shift()), 'rsi_bottom'] = dataframe[source].shift()
-    dataframe["ohlc_bottom"].fillna(method='ffill', inplace=True)
-    dataframe["rsi_bottom"].fillna(method='ffill', inplace=True)
-
-    # Detect divergence
-    dataframe['bullish_divergence'] = np.NaN
-    dataframe['hidden_bullish_divergence'] = np.NaN
-    for i in range(2, 15):
-        # Check there is nothing between the 2 diverging points
-        conditional_array = []
-        for ii in range(1, i):
-            conditional_array.append(dataframe["ohlc_bottom"].shift(i).le(dataframe['ohlc_bottom'].shift(ii)))
-        res = reduce(lambda x, y: x & y, conditional_array)
-        dataframe.loc[(
-            (dataframe["ohlc_bottom"].lt(dataframe['ohlc_bottom'].shift(i))) &
-            (dataframe["rsi_bottom"].gt(dataframe['rsi_bottom'].shift(i))) &
-            (dataframe["ohlc_bottom"].le(dataframe['ohlc_bottom'].shift())) &
-            (res)
-            ), "bullish_divergence"] = True
+    dataframe['ohlc_bottom'] = swing_lows(dataframe['close'])
+    dataframe['rsi_bottom'] = swing_lows(dataframe[source])
+
+    # Detect divergence, with nothing lower between the 2 diverging points
+    flags = low_divergences(dataframe['ohlc_bottom'], dataframe['rsi_bottom'], lookback=14)
+    dataframe['bullish_divergence'] = flags['bullish_divergence']
+    dataframe['hidden_bullish_divergence'] = flags['hidden_bullish_divergence']
 
     return dataframe
@@ -12,6 +12,10 @@ import talib.abstract as taa
 import ta
 from functools import reduce
 import numpy as np
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.levels import resistance_levels, support_levels
 
 
 ###########################################################################################################
@@ -65,50 +69,6 @@ def chaikin_money_flow(dataframe, n=20, fillna=False):
         cmf = cmf.replace([np.inf, -np.inf], np.nan).fillna(0)
     return Series(cmf, name='cmf')
 
-class SupResFinder():
-    def isSupport(self, df, i):
-        support = df['bb_bbl_i'][i] == 1 and (
-            df['bb_bbl_i'][i+1] == 0 or df['close'][i+1] > df['open'][i+1]) and df['close'][i] < df['open'][i]
-
-        return support
-
-    def isResistance(self, df, i):
-        resistance = df['bb_bbh_i'][i] == 1 and (
-            df['bb_bbh_i'][i+1] == 0 or df['close'][i+1] < df['open'][i+1]) and df['close'][i] > df['open'][i]
-
-        return resistance
-
-    def getSupport(self, df):
-        levels = [df['close'][0]]
-
-        for i in range(1, df.shape[0]-2):
-            if self.isSupport(df, i):
-                o = df['open'][i]
-                c = df['close'][i]
-                l = c if c < o else o
-                levels.append(l)
-            else:
-                levels.append(levels[-1])
-        levels.append(levels[-1])
-        levels.append(levels[-1])
-        return levels
-
-    def getResistance(self, df):
-        levels = [df['open'][0]]
-
-        for i in range(1, df.shape[0]-2):
-            if self.isResistance(df, i):
-                o = df['open'][i]
-                c = df['close'][i]
-                l = c if c > o else o
-                levels.append(l)
-            else:
-                levels.append(levels[-1])
-        levels.append(levels[-1])
-        levels.append(levels[-1])
-        return levels
-
-
 class Dracula(IStrategy):
 
     # Buy hyperspace params:
@@ -147,7 +107,6 @@ class Dracula(IStrategy):
     trailing_stop_positive = 0.01
     trailing_stop_positive_offset = 0.03
     custom_info = {}
-    supResFinder = SupResFinder()
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         dataframe['bb_bbh'] = ta.volatility.bollinger_hband(close=dataframe["close"], window=20)
@@ -159,8 +118,9 @@ class Dracula(IStrategy):
         dataframe['bb_bbt'] = (dataframe['bb_bbh'] - dataframe['bb_bbl']) / dataframe['bb_bbh']
 
         dataframe['ema'] = taa.EMA(dataframe, timeperiod=150)
-        dataframe['resistance'] = self.supResFinder.getResistance(dataframe)
-        dataframe['support'] = self.supResFinder.getSupport(dataframe)
+        # confirmed at the close of the candle after the band touch
+        dataframe['resistance'] = resistance_levels(dataframe)
+        dataframe['support'] = support_levels(dataframe)
 
         dataframe['cmf'] = chaikin_money_flow(dataframe, 20)
 
@@ -171,14 +131,13 @@ class Dracula(IStrategy):
 
     def populate_buy_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         prev = dataframe.shift(1)
-        prev1 = dataframe.shift(2)
         lost_protect = (dataframe['ema'] > (dataframe['close'] * 1.07)).rolling(10).sum() == 0
 
         item_buy_logic = []
         item_buy_logic.append(dataframe['volume'] > 0)
         item_buy_logic.append(dataframe['cmf'] > 0)
         item_buy_logic.append(prev['bb_bbl_i'] == 1)
-        item_buy_logic.append(prev['close'] >= prev1['support'])
+        item_buy_logic.append(prev['close'] >= prev['support'])
         item_buy_logic.append(prev['ema'] < prev['close'])
         item_buy_logic.append((dataframe['open'] < dataframe['close']))
         item_buy_logic.append(prev['open'] > prev['close'])
@@ -192,7 +151,7 @@ class Dracula(IStrategy):
         item_buy_logic.append(dataframe['volume'] > 0)
         item_buy_logic.append(dataframe['cmf'] > 0)
         item_buy_logic.append(dataframe['bb_bbl_i'] == 1)
-        item_buy_logic.append(dataframe['open'] >= prev1['support'])
+        item_buy_logic.append(dataframe['open'] >= prev['support'])
         item_buy_logic.append(prev['ema'] < prev['close'])
         item_buy_logic.append((dataframe['open'] < dataframe['close']))
         item_buy_logic.append((dataframe['bb_bbt'] > self.buy_bbt.value))
@@ -208,16 +167,15 @@ class Dracula(IStrategy):
         dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
         last_candle = dataframe.iloc[-1].squeeze()
         prev_candle = dataframe.iloc[-2].squeeze()
-        prev1_candle = dataframe.iloc[-3].squeeze()
         if prev_candle['bb_bbh_i'] == 1 \
                 and last_candle['close'] < last_candle['open'] \
                 and prev_candle['close'] > prev_candle['open'] \
-                and prev_candle['close'] < prev1_candle['resistance'] \
+                and prev_candle['close'] < prev_candle['resistance'] \
                 and last_candle['volume'] > 0:
             return 'sell_signal_1_'+trade.buy_tag
         elif last_candle['bb_bbh_i'] == 1 \
                 and last_candle['close'] < last_candle['open'] \
-                and last_candle['open'] < prev1_candle['resistance'] \
+                and last_candle['open'] < prev_candle['resistance'] \
                 and last_candle['volume'] > 0:
             return 'sell_signal_2_'+trade.buy_tag
         elif last_candle['close'] < last_candle['open'] \
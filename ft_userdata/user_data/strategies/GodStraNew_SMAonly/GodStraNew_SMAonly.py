@@ -19,6 +19,10 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 from functools import reduce
 import numpy as np
 from random import shuffle
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.candle_patterns import add_pattern_masks, pattern_values
 #  TODO: this gene is removed 'MAVP' cuz or error on periods
 all_god_genes = {
     'Overlap Studies': {
@@ -274,7 +278,10 @@ def gene_calculator(dataframe, indicator):
     else:
         result = None
         # For Pattern Recognations
-        if gene_len == 1:
+        if gene_name.startswith('CDL'):
+            # read back from the masks scanned once in populate_indicators
+            return normalize(pattern_values(dataframe, gene_name))
+        elif gene_len == 1:
             # print('gene_len == 1\t', indicator)
             result = getattr(ta, gene_name)(
                 dataframe
@@ -559,7 +566,7 @@ class GodStraNew_SMAonly(IStrategy):
         Also, this method (populate_indicators) just calculates default value of hyperoptable params
         so using this method have not big benefits instade of calculating useable things inside buy and sell trand populators
         '''
-        return dataframe
+        return add_pattern_masks(dataframe)
 
     def populate_buy_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
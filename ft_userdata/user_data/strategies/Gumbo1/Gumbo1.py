@@ -20,6 +20,9 @@ from freqtrade.strategy.interface import IStrategy
 from pandas import DataFrame
 
 sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.moving_averages import MovingAverages
+from tradeboddy.ohlcv_view import attach
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +59,7 @@ class Gumbo1(IStrategy):
             pair=metadata['pair'], timeframe=self.inf_timeframe
         )
         # t3 from custom_indicators
-        informative['T3'] = T3(informative)
+        informative['T3'] = MovingAverages(informative['close']).get('t3', 5)
         # bollinger bands
         bbands = ta.BBANDS(informative, timeperiod=20)
         informative['bb_lowerband'] = bbands['lowerband']
@@ -70,13 +73,13 @@ class Gumbo1(IStrategy):
         return dataframe
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        averages = MovingAverages(dataframe['close'])
         # ewo
         dataframe['EWO'] = EWO(dataframe)
         # ema
-        dataframe['EMA'] = ta.EMA(dataframe)
+        dataframe['EMA'] = averages.ema(30)
         # t3
-        for i in self.t3_periods.range:
-            dataframe[f'T3_{i}'] = T3(dataframe, i)
+        attach(dataframe, averages.columns('t3', self.t3_periods.range, name='T3_{length}'))
         # bollinger bands 40
         bbands = ta.BBANDS(dataframe, timeperiod=40)
         dataframe['bb_lowerband_40'] = bbands['lowerband']
@@ -116,29 +119,6 @@ class Gumbo1(IStrategy):
         return dataframe
 
 
-def T3(dataframe, length=5):
-    """
-    T3 Average by HPotter on Tradingview
-    https://www.tradingview.com/script/qzoC9H1I-T3-Average/
-    """
-    df = dataframe.copy()
-
-    df['xe1'] = ta.EMA(df['close'], timeperiod=length)
-    df['xe2'] = ta.EMA(df['xe1'], timeperiod=length)
-    df['xe3'] = ta.EMA(df['xe2'], timeperiod=length)
-    df['xe4'] = ta.EMA(df['xe3'], timeperiod=length)
-    df['xe5'] = ta.EMA(df['xe4'], timeperiod=length)
-    df['xe6'] = ta.EMA(df['xe5'], timeperiod=length)
-    b = 0.7
-    c1 = -b * b * b
-    c2 = 3 * b * b + 3 * b * b * b
-    c3 = -6 * b * b - 3 * b - 3 * b * b * b
-    c4 = 1 + 3 * b + b * b * b + 3 * b * b
-    df['T3Average'] = c1 * df['xe6'] + c2 * df['xe5'] + c3 * df['xe4'] + c4 * df['xe3']
-
-    return df['T3Average']
-
-
 def EWO(dataframe, ema_length=5, ema2_length=35):
     df = dataframe.copy()
     ema1 = ta.EMA(df, timeperiod=ema_length)
@@ -8,7 +8,10 @@ import numpy as np  # noqa
 import pandas as pd  # noqa
 pd.options.mode.chained_assignment = None
 from pandas import DataFrame, Series
-from technical.util import resample_to_interval, resampled_merge
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.resample import resample_to_interval, resampled_merge
 from freqtrade.strategy import IStrategy, merge_informative_pair
 from freqtrade.strategy import CategoricalParameter, DecimalParameter, IntParameter
 
@@ -7,7 +7,6 @@ from pandas import DataFrame, Series
 from freqtrade.strategy.interface import IStrategy
 from freqtrade.strategy import stoploss_from_open, merge_informative_pair, DecimalParameter, IntParameter, \
     CategoricalParameter
-from technical.indicators import ichimoku
 
 # --------------------------------
 # Add your lib to import here
@@ -20,6 +19,10 @@ from functools import reduce
 # from freqtrade.state import RunMode
 import logging
 import os
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +60,7 @@ class Ichi(IStrategy):
     INTERFACE_VERSION = 2
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        ichi = ichimoku(dataframe)
+        ichi = Ichimoku.of(dataframe).lines(columns=['tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'cloud_green', 'cloud_red', 'chikou_span'], lookahead=True)
         dataframe['tenkan'] = ichi['tenkan_sen']
         dataframe['kijun'] = ichi['kijun_sen']
         dataframe['senkou_a'] = ichi['senkou_span_a']
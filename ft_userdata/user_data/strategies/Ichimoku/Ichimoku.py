@@ -2,10 +2,13 @@ from freqtrade.strategy.interface import IStrategy
 from typing import Dict, List
 from functools import reduce
 from pandas import DataFrame
-from technical.indicators import ichimoku
 
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku as IchimokuEngine
 
 class Ichimoku(IStrategy):
     """
@@ -53,7 +56,7 @@ class Ichimoku(IStrategy):
         """
         """
 
-        ichi = ichimoku(dataframe)
+        ichi = IchimokuEngine.of(dataframe).lines(columns=['tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'cloud_green', 'cloud_red'])
         dataframe['tenkan'] = ichi['tenkan_sen']
         dataframe['kijun'] = ichi['kijun_sen']
         dataframe['senkou_a'] = ichi['senkou_span_a']
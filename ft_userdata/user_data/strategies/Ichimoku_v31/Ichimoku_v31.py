@@ -10,7 +10,10 @@ import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from technical.util import resample_to_interval, resampled_merge
 from freqtrade.strategy import IStrategy, merge_informative_pair
-from technical.indicators import ichimoku
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 
 class Ichimoku_v31(IStrategy):
   # ROI table:
@@ -71,11 +74,12 @@ class Ichimoku_v31(IStrategy):
     dataframe_inf['ha_high'] = heikinashi['high']
     dataframe_inf['ha_low'] = heikinashi['low']
 
-    ha_ichi = ichimoku(heikinashi,
+    ha_ichi = Ichimoku.of(heikinashi).lines(
       conversion_line_period=20,
       base_line_periods=60,
       laggin_span=120,
-      displacement=30
+      displacement=30,
+      columns=['senkou_span_a', 'senkou_span_b', 'cloud_green', 'cloud_red']
     )
 
     #Required Ichi Parameters
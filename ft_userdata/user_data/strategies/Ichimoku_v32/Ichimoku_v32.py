@@ -5,7 +5,10 @@ from technical.util import resample_to_interval, resampled_merge
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 import numpy
-from technical.indicators import ichimoku
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 
 class Ichimoku_v32(IStrategy):
     """
@@ -32,7 +35,7 @@ class Ichimoku_v32(IStrategy):
         return []
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        ichi = ichimoku(dataframe, conversion_line_period=20, base_line_periods=60, laggin_span=120, displacement=30)
+        ichi = Ichimoku.of(dataframe).lines(conversion_line_period=20, base_line_periods=60, laggin_span=120, displacement=30, columns=['tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'cloud_green', 'cloud_red'])
         # dataframe['chikou_span'] = ichi['chikou_span']
         dataframe['tenkan'] = ichi['tenkan_sen']
         dataframe['kijun'] = ichi['kijun_sen']
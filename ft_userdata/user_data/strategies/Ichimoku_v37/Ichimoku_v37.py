@@ -10,7 +10,12 @@ import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from technical.util import resample_to_interval, resampled_merge
 from freqtrade.strategy import IStrategy, merge_informative_pair
-from technical.indicators import ichimoku
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.informative_cache import InformativeCache
+from tradeboddy.ichimoku import Ichimoku
 
 class Ichimoku_v37(IStrategy):
   # ROI table:
@@ -25,6 +30,7 @@ class Ichimoku_v37(IStrategy):
   timeframe = '4h'
 
   inf_tf = '1d'
+  informative_cache = InformativeCache()
 
   # Run "populate_indicators()" only for new candle.
   process_only_new_candles = True
@@ -55,33 +61,21 @@ class Ichimoku_v37(IStrategy):
     informative_pairs =  [(pair, '1d') for pair in pairs]
     return informative_pairs
 
-  def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-
-    if not self.dp:
-      # Don't do anything if DataProvider is not available.
-      return dataframe
-
-    dataframe_inf = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.inf_tf)
-
+  def informative_indicators(self, dataframe_inf: DataFrame) -> DataFrame:
     #Heiken Ashi Candlestick Data
     heikinashi = qtpylib.heikinashi(dataframe_inf)
-    heik = qtpylib.heikinashi(dataframe)
 
     dataframe_inf['ha_open'] = heikinashi['open']
     dataframe_inf['ha_close'] = heikinashi['close']
     dataframe_inf['ha_high'] = heikinashi['high']
     dataframe_inf['ha_low'] = heikinashi['low']
 
-    dataframe['ha_4h_open'] = heik['open']
-    dataframe['ha_4h_close'] = heik['close']
-    dataframe['ha_4h_high'] = heik['high']
-    dataframe['ha_4h_low'] = heik['low']
-
-    ha_ichi = ichimoku(heikinashi,
+    ha_ichi = Ichimoku.of(heikinashi).lines(
       conversion_line_period=20,
       base_line_periods=60,
       laggin_span=120,
-      displacement=30
+      displacement=30,
+      columns=['senkou_span_a', 'senkou_span_b', 'cloud_green', 'cloud_red']
     )
 
     #Required Ichi Parameters
@@ -90,6 +84,25 @@ class Ichimoku_v37(IStrategy):
     dataframe_inf['cloud_green'] = ha_ichi['cloud_green']
     dataframe_inf['cloud_red'] = ha_ichi['cloud_red']
 
+    return dataframe_inf
+
+  def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+
+    if not self.dp:
+      # Don't do anything if DataProvider is not available.
+      return dataframe
+
+    dataframe_inf = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.inf_tf)
+    # The 1d indicators only change once a day
+    dataframe_inf = self.informative_cache.get(metadata['pair'], self.inf_tf, dataframe_inf, self.informative_indicators)
+
+    heik = qtpylib.heikinashi(dataframe)
+
+    dataframe['ha_4h_open'] = heik['open']
+    dataframe['ha_4h_close'] = heik['close']
+    dataframe['ha_4h_high'] = heik['high']
+    dataframe['ha_4h_low'] = heik['low']
+
     # Merge timeframes
     dataframe = merge_informative_pair(dataframe, dataframe_inf, self.timeframe, self.inf_tf, ffill=True)
 
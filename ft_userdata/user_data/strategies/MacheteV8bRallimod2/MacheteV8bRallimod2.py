@@ -8,7 +8,6 @@ import numpy as np
 ## Indicator libs
 import talib.abstract as ta
 from finta import TA as fta
-import technical.indicators as ftt
 from technical.indicators import hull_moving_average
 from technical.indicators import PMAX, zema
 from technical.indicators import cmf
@@ -25,6 +24,10 @@ from skopt.space import Dimension
 NOTE:
 docker-compose run --rm freqtrade hyperopt -c user_data/config-backtesting.json --strategy IchimokuHaulingV8a --hyperopt-loss SortinoHyperOptLossDaily --spaces roi buy sell --timerange=1624940400-1630447200 -j 4 -e 1000
 """
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 class MacheteV8bRallimod2(IStrategy):
 
     # Buy hyperspace params:
@@ -211,7 +214,7 @@ class MacheteV8bRallimod2(IStrategy):
     def get_market_condition_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
         displacement = 30
-        ichimoku = ftt.ichimoku(dataframe, conversion_line_period=20, base_line_periods=60, laggin_span=120, displacement=displacement)
+        ichimoku = Ichimoku.of(dataframe).lines(conversion_line_period=20, base_line_periods=60, laggin_span=120, displacement=displacement, columns=['chikou_span', 'tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'leading_senkou_span_a', 'leading_senkou_span_b', 'cloud_green', 'cloud_red'], lookahead=True)
         dataframe['chikou_span'] = ichimoku['chikou_span']
         dataframe['tenkan_sen'] = ichimoku['tenkan_sen']
         dataframe['kijun_sen'] = ichimoku['kijun_sen']
@@ -7,6 +7,10 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 from freqtrade.strategy.interface import IStrategy
 from freqtrade.strategy.hyper import (CategoricalParameter, DecimalParameter, IntParameter,
                                       RealParameter)
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.pruning import IndicatorPruner
 
 # ^ TA-Lib Autofill mostly broken in JetBrains Products,
 # ta._ta_lib.<function_name> can temporarily be used while writing as a workaround
@@ -244,6 +248,10 @@ class MarketChyperHyperStrategy(IStrategy):
     #     def stoploss_space():
     #         return [Real(-0.01, -0.35, name='stoploss')]
 
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        IndicatorPruner.apply(self)
+
     def informative_pairs(self):
         """
         Define additional, informative pair/interval combinations to be cached from the exchange.
@@ -3,7 +3,10 @@ from freqtrade.strategy.interface import IStrategy
 from pandas import DataFrame
 # --------------------------------
 import talib.abstract as ta
-from technical.util import resample_to_interval, resampled_merge
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.resample import resample_to_interval, resampled_merge
 
 
 class MultiRSI(IStrategy):
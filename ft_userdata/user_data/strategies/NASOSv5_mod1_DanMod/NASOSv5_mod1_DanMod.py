@@ -14,6 +14,10 @@ from logging import FATAL
 from pandas import DataFrame
 from technical.util import resample_to_interval, resampled_merge
 from typing import Dict, List
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.protections import ProtectionFeatures
 
 logger = logging.getLogger(__name__)
 
@@ -33,10 +37,7 @@ def VWAPB(dataframe, window_size=20, num_of_std=1):
     return df['vwap_low'], df['vwap'], df['vwap_high']
 
 def top_percent_change(dataframe: DataFrame, length: int) -> float:
-    if length == 0:
-        return (dataframe['open'] - dataframe['close']) / dataframe['close']
-    else:
-        return (dataframe['open'].rolling(length).max() - dataframe['close']) / dataframe['close']
+    return ProtectionFeatures.of(dataframe).top_percent_change(length)
 
 class NASOSv5_mod1_DanMod(IStrategy):
     INTERFACE_VERSION = 2
@@ -7,7 +7,6 @@ from functools import reduce
 from pandas import DataFrame
 # --------------------------------
 import talib.abstract as ta
-import numpy as np
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 import datetime
 from technical.util import resample_to_interval, resampled_merge
@@ -16,7 +15,10 @@ from freqtrade.persistence import Trade
 from freqtrade.strategy import stoploss_from_open, merge_informative_pair, DecimalParameter, IntParameter, CategoricalParameter
 import technical.indicators as ftt
 import logging
-import pandas as pd
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.trailing_replay import trailing_buy_signals
 
 
 logger = logging.getLogger(__name__)
@@ -613,11 +615,6 @@ class TrailingBuyStrat(NASOSv5_mod2):
         return val
 
     def populate_buy_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        def get_local_min(x):
-            win = dataframe.loc[:, 'barssince_last_buy'].iloc[x.shape[0] - 1].astype('int')
-            win = max(win, 0)
-            return pd.Series(x).rolling(window=win).min().iloc[-1]
-
         dataframe = super(TrailingBuyStrat, self).populate_buy_trend(dataframe, metadata)
         dataframe = dataframe.rename(columns={"buy": "pre_buy"})
 
@@ -650,41 +647,8 @@ class TrailingBuyStrat(NASOSv5_mod2):
                 else:
                     logger.info(f'price to high for {metadata["pair"]} at {current_price} vs {self.custom_info[metadata["pair"]]["trailing_buy"]["trailing_buy_order_uplimit"]}')
         elif self.trailing_buy_order_enabled:
-            # FOR BACKTEST
-            # PROBABLY STILL NOT WORKING
-            dataframe.loc[
-                (dataframe['pre_buy'] == 1) &
-                (dataframe['pre_buy'].shift() == 0)
-            , 'pre_buy_switch'] = 1
-            dataframe['pre_buy_switch'] = dataframe['pre_buy_switch'].fillna(0)
-
-            dataframe['barssince_last_buy'] = dataframe['pre_buy_switch'].groupby(dataframe['pre_buy_switch'].cumsum()).cumcount()
-
-            # Create integer positions of each row
-            idx_positions = np.arange(len(dataframe))
-            # "shift" those integer positions by the amount in shift col
-            shifted_idx_positions = idx_positions - dataframe["barssince_last_buy"]
-            # get the label based index from our DatetimeIndex
-            shifted_loc_index = dataframe.index[shifted_idx_positions]
-            # Retrieve the "shifted" values and assign them as a new column
-            dataframe["close_5m_last_buy"] = dataframe.loc[shifted_loc_index, "close_5m"].values
-
-            dataframe.loc[:, 'close_lower'] = dataframe.loc[:, 'close'].expanding().apply(get_local_min)
-            dataframe['close_lower'] = np.where(dataframe['close_lower'].isna() == True, dataframe['close'], dataframe['close_lower'])
-            dataframe['close_lower_offset'] = dataframe['close_lower'] * (1 + self.trailing_buy_offset)
-            dataframe['trailing_buy_order_uplimit'] = np.where(dataframe['barssince_last_buy'] < 20, pd.DataFrame([dataframe['close_5m_last_buy'], dataframe['close_lower_offset']]).min(), np.nan)
-
-            dataframe.loc[
-                (dataframe['barssince_last_buy'] < 20) & # must buy within last 20 candles after signal
-                (dataframe['close'] > dataframe['trailing_buy_order_uplimit'])
-            , 'trailing_buy'] = 1
-
-            dataframe['trailing_buy_count'] = dataframe['trailing_buy'].rolling(20).sum()
-
-            dataframe.log[
-                (dataframe['trailing_buy'] == 1) &
-                (dataframe['trailing_buy_count'] == 1)
-            , 'buy'] = 1
+            # FOR BACKTEST: the same ratchet over the candle closes
+            dataframe['buy'] = trailing_buy_signals(dataframe['pre_buy'], dataframe['close'], self.trailing_buy_offset)
         else: # No but trailing
             dataframe.loc[
                 (dataframe['pre_buy'] == 1)
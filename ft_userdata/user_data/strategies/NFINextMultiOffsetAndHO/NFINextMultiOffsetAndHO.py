@@ -13,9 +13,13 @@ from functools import reduce
 import math
 from freqtrade.persistence import Trade
 from datetime import datetime, timedelta
-from technical.util import resample_to_interval, resampled_merge
 from technical.indicators import zema
 import pandas_ta as pta
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.protections import ProtectionFeatures
+from tradeboddy.resample import Resampler
 
 log = logging.getLogger(__name__)
 
@@ -3029,13 +3033,7 @@ class NFINextMultiOffsetAndHO(IStrategy):
         :param method: High to Low / Open to Close
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        if method == 'HL':
-            return (df['high'].rolling(length).max() - df['low'].rolling(length).min()) / df['low'].rolling(length).min()
-        elif method == 'OC':
-            return (df['open'].rolling(length).max() - df['close'].rolling(length).min()) / df['close'].rolling(length).min()
-        else:
-            raise ValueError(f"Method {method} not defined!")
+        return ProtectionFeatures.of(dataframe).range_percent_change(method, length)
 
     def top_percent_change(self, dataframe: DataFrame, length: int) -> float:
         """
@@ -3044,11 +3042,7 @@ class NFINextMultiOffsetAndHO(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        if length == 0:
-            return (df['open'] - df['close']) / df['close']
-        else:
-            return (df['open'].rolling(length).max() - df['close']) / df['close']
+        return ProtectionFeatures.of(dataframe).top_percent_change(length)
 
     def range_maxgap(self, dataframe: DataFrame, length: int) -> float:
         """
@@ -3057,8 +3051,7 @@ class NFINextMultiOffsetAndHO(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        return df['open'].rolling(length).max() - df['close'].rolling(length).min()
+        return ProtectionFeatures.of(dataframe).range_maxgap(length)
 
     def range_maxgap_adjusted(self, dataframe: DataFrame, length: int, adjustment: float) -> float:
         """
@@ -3077,8 +3070,7 @@ class NFINextMultiOffsetAndHO(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        df = dataframe.copy()
-        return df['close'] - df['close'].rolling(length).min()
+        return ProtectionFeatures.of(dataframe).range_height(length)
 
     def safe_pump(self, dataframe: DataFrame, length: int, thresh: float, pull_thresh: float) -> bool:
         """
@@ -3089,8 +3081,7 @@ class NFINextMultiOffsetAndHO(IStrategy):
         :param thresh: int Maximum percentage change threshold
         :param pull_thresh: int Pullback from interval maximum threshold
         """
-        df = dataframe.copy()
-        return (df[f'oc_pct_change_{length}'] < thresh) | (self.range_maxgap_adjusted(df, length, pull_thresh) > self.range_height(df, length))
+        return ProtectionFeatures.of(dataframe).safe_pump(length, thresh, pull_thresh)
 
     def safe_dips(self, dataframe: DataFrame, thresh_0, thresh_2, thresh_12, thresh_144) -> bool:
         """
@@ -3492,10 +3483,11 @@ class NFINextMultiOffsetAndHO(IStrategy):
         ___________________________________________________________________________________________
         '''
         if self.res_timeframe != 'none':
-            resampled = resample_to_interval(dataframe, timeframe_to_minutes(self.res_timeframe))
-            resampled = self.resampled_tf_indicators(resampled, metadata)
+            resampler = Resampler.for_pair(self, metadata['pair'], self.timeframe, dataframe,
+                                           timeframe_to_minutes(self.res_timeframe))
+            resampled = self.resampled_tf_indicators(resampler.bars(), metadata)
             # Merge resampled info dataframe
-            dataframe = resampled_merge(dataframe, resampled, fill_na=True)
+            dataframe = resampler.merge(dataframe, resampled, fill_na=True)
             dataframe.rename(columns=lambda s: s+"_{}".format(self.res_timeframe)
                              if "resample_" in s else s, inplace=True)
             dataframe.rename(columns=lambda s: s.replace("resample_{}_".format(
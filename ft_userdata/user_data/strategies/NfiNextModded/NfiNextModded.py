@@ -8,15 +8,23 @@ import talib.abstract as ta
 from freqtrade.strategy.interface import IStrategy
 from freqtrade.strategy import merge_informative_pair, timeframe_to_minutes
 from freqtrade.exchange import timeframe_to_prev_date
-from pandas import DataFrame, Series, concat
+from pandas import DataFrame, Series
 from functools import reduce
 import math
 from typing import Dict
 from freqtrade.persistence import Trade
 from datetime import datetime, timedelta
-from technical.util import resample_to_interval, resampled_merge
-from technical.indicators import zema, VIDYA, ichimoku
+from technical.indicators import zema
 import time
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.state_store import JournaledStore
+from tradeboddy.protections import ProtectionFeatures
+from tradeboddy.ichimoku import Ichimoku
+from tradeboddy.resample import Resampler
+from tradeboddy.pivots import pivot_points
+from tradeboddy.moving_averages import pmax
 
 log = logging.getLogger(__name__)
 # log.setLevel(logging.DEBUG)
@@ -2285,13 +2293,11 @@ class NfiNextModded(IStrategy):
     def __init__(self, config: dict) -> None:
         super().__init__(config)
         if self.target_profit_cache is None:
-            self.target_profit_cache = Cache(
-                self.config["user_data_dir"] / "data-nfi-profit_target_by_pair.json"
+            # memory only in backtest/hyperopt, journaled in the background for live/dry_run
+            self.target_profit_cache = JournaledStore.for_strategy(
+                self, "data-nfi-profit_target_by_pair.json"
             )
 
-        # If the cached data hasn't changed, it's a no-op
-        self.target_profit_cache.save()
-
     def get_hold_trades_config_file(self):
         proper_holds_file_path = self.config["user_data_dir"].resolve() / "nfi-hold-trades.json"
         if proper_holds_file_path.is_file():
@@ -2322,7 +2328,7 @@ class NfiNextModded(IStrategy):
             hold_trades_config_file = self.get_hold_trades_config_file()
             if hold_trades_config_file:
                 log.warning("Loading hold support data from %s", hold_trades_config_file)
-                self.hold_trades_cache = HoldsCache(hold_trades_config_file)
+                self.hold_trades_cache = HoldsCache(hold_trades_config_file, check_interval=30)
 
         if self.hold_trades_cache:
             self.hold_trades_cache.load()
@@ -4281,14 +4287,7 @@ class NfiNextModded(IStrategy):
         :param method: High to Low / Open to Close
         :param length: int The length to look back
         """
-        if method == 'HL':
-            return (dataframe['high'].rolling(length).max() - dataframe['low'].rolling(length).min()) / dataframe[
-                'low'].rolling(length).min()
-        elif method == 'OC':
-            return (dataframe['open'].rolling(length).max() - dataframe['close'].rolling(length).min()) / dataframe[
-                'close'].rolling(length).min()
-        else:
-            raise ValueError(f"Method {method} not defined!")
+        return ProtectionFeatures.of(dataframe).range_percent_change(method, length)
 
     def top_percent_change(self, dataframe: DataFrame, length: int) -> float:
         """
@@ -4297,10 +4296,7 @@ class NfiNextModded(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        if length == 0:
-            return (dataframe['open'] - dataframe['close']) / dataframe['close']
-        else:
-            return (dataframe['open'].rolling(length).max() - dataframe['close']) / dataframe['close']
+        return ProtectionFeatures.of(dataframe).top_percent_change(length)
 
     def range_maxgap(self, dataframe: DataFrame, length: int) -> float:
         """
@@ -4309,7 +4305,7 @@ class NfiNextModded(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        return dataframe['open'].rolling(length).max() - dataframe['close'].rolling(length).min()
+        return ProtectionFeatures.of(dataframe).range_maxgap(length)
 
     def range_maxgap_adjusted(self, dataframe: DataFrame, length: int, adjustment: float) -> float:
         """
@@ -4328,7 +4324,7 @@ class NfiNextModded(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        return dataframe['close'] - dataframe['close'].rolling(length).min()
+        return ProtectionFeatures.of(dataframe).range_height(length)
 
     def safe_pump(self, dataframe: DataFrame, length: int, thresh: float, pull_thresh: float) -> bool:
         """
@@ -4339,8 +4335,7 @@ class NfiNextModded(IStrategy):
         :param thresh: int Maximum percentage change threshold
         :param pull_thresh: int Pullback from interval maximum threshold
         """
-        return (dataframe[f'oc_pct_change_{length}'] < thresh) | (
-                self.range_maxgap_adjusted(dataframe, length, pull_thresh) > self.range_height(dataframe, length))
+        return ProtectionFeatures.of(dataframe).safe_pump(length, thresh, pull_thresh)
 
     def safe_dips(self, dataframe: DataFrame, thresh_0, thresh_2, thresh_12, thresh_144) -> bool:
         """
@@ -4397,7 +4392,7 @@ class NfiNextModded(IStrategy):
 
         # Pivots
         informative_1d['pivot'], informative_1d['res1'], informative_1d['res2'], informative_1d['res3'], informative_1d[
-            'sup1'], informative_1d['sup2'], informative_1d['sup3'] = pivot_points(informative_1d, mode='fibonacci')
+            'sup1'], informative_1d['sup2'], informative_1d['sup3'] = pivot_points(informative_1d, mode='fibonacci', pair=metadata['pair'], timeframe=self.info_timeframe_1d)
 
         # Smoothed Heikin-Ashi
         informative_1d['open_sha'], informative_1d['close_sha'], informative_1d['low_sha'] = HeikinAshi(informative_1d,
@@ -4415,6 +4410,8 @@ class NfiNextModded(IStrategy):
         assert self.dp, "DataProvider is required for multiple timeframes."
         # Get the informative pair
         informative_1h = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.info_timeframe_1h)
+        # in live/dry_run only the new candle's rows of the protection windows get computed
+        ProtectionFeatures.for_pair(self, metadata['pair'], self.info_timeframe_1h, informative_1h)
 
         # EMA
         informative_1h['ema_12'] = ta.EMA(informative_1h, timeperiod=12)
@@ -4460,8 +4457,10 @@ class NfiNextModded(IStrategy):
             informative_1h['close'], 100)) / 3
 
         # Ichimoku
-        ichi = ichimoku(informative_1h, conversion_line_period=20, base_line_periods=60, laggin_span=120,
-                        displacement=30)
+        ichi = Ichimoku.of(informative_1h).lines(conversion_line_period=20, base_line_periods=60, laggin_span=120,
+                        displacement=30,
+                        columns=['chikou_span', 'tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'leading_senkou_span_a', 'leading_senkou_span_b'],
+                        lookahead=True)
         informative_1h['chikou_span'] = ichi['chikou_span']
         informative_1h['tenkan_sen'] = ichi['tenkan_sen']
         informative_1h['kijun_sen'] = ichi['kijun_sen']
@@ -4791,10 +4790,15 @@ class NfiNextModded(IStrategy):
 
     def daily_tf_btc_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         tik = time.perf_counter()
+        if self.config['stake_currency'] in ['USDT', 'BUSD', 'USDC', 'DAI', 'TUSD', 'PAX', 'USD', 'EUR', 'GBP']:
+            btc_info_pair = f"BTC/{self.config['stake_currency']}"
+        else:
+            btc_info_pair = "BTC/USDT"
+
         # Indicators
         # -----------------------------------------------------------------------------------------
         dataframe['pivot'], dataframe['res1'], dataframe['res2'], dataframe['res3'], dataframe['sup1'], dataframe[
-            'sup2'], dataframe['sup3'] = pivot_points(dataframe, mode='fibonacci')
+            'sup2'], dataframe['sup3'] = pivot_points(dataframe, mode='fibonacci', pair=btc_info_pair, timeframe='1d')
 
         # Add prefix
         # -----------------------------------------------------------------------------------------
@@ -4862,10 +4866,11 @@ class NfiNextModded(IStrategy):
         ___________________________________________________________________________________________
         '''
         if self.res_timeframe != 'none':
-            resampled = resample_to_interval(dataframe, timeframe_to_minutes(self.res_timeframe))
-            resampled = self.resampled_tf_indicators(resampled, metadata)
+            resampler = Resampler.for_pair(self, metadata['pair'], self.timeframe, dataframe,
+                                           timeframe_to_minutes(self.res_timeframe))
+            resampled = self.resampled_tf_indicators(resampler.bars(), metadata)
             # Merge resampled info dataframe
-            dataframe = resampled_merge(dataframe, resampled, fill_na=True)
+            dataframe = resampler.merge(dataframe, resampled, fill_na=True)
             dataframe.rename(columns=lambda s: f"{s}_{self.res_timeframe}" if "resample_" in s else s, inplace=True)
             dataframe.rename(
                 columns=lambda s: s.replace("resample_{}_".format(self.res_timeframe.replace("m", "")), ""),
@@ -4932,17 +4937,15 @@ class NfiNextModded(IStrategy):
         return True
 
     def _set_profit_target(self, pair: str, sell_reason: str, rate: float, current_time: "datetime"):
-        self.target_profit_cache.data[pair] = {
+        self.target_profit_cache.set(pair, {
             "rate": rate,
             "sell_reason": sell_reason,
             "time_profit_reached": current_time.isoformat()
-        }
-        self.target_profit_cache.save()
+        })
 
     def _remove_profit_target(self, pair: str):
         if self.target_profit_cache is not None:
-            self.target_profit_cache.data.pop(pair, None)
-            self.target_profit_cache.save()
+            self.target_profit_cache.pop(pair)
 
     def _should_hold_trade(self, trade: "Trade", rate: float, sell_reason: str) -> bool:
         if self.config['runmode'].value not in ('live', 'dry_run'):
@@ -5136,118 +5139,6 @@ def hull(dataframe, timeperiod):
         )
 
 
-# PMAX
-def pmax(df, period, multiplier, length, MAtype, src):
-    period = int(period)
-    multiplier = int(multiplier)
-    length = int(length)
-    MAtype = int(MAtype)
-    src = int(src)
-
-    mavalue = f'MA_{MAtype}_{length}'
-    atr = f'ATR_{period}'
-    pm = f'pm_{period}_{multiplier}_{length}_{MAtype}'
-    pmx = f'pmX_{period}_{multiplier}_{length}_{MAtype}'
-
-    # MAtype==1 --> EMA
-    # MAtype==2 --> DEMA
-    # MAtype==3 --> T3
-    # MAtype==4 --> SMA
-    # MAtype==5 --> VIDYA
-    # MAtype==6 --> TEMA
-    # MAtype==7 --> WMA
-    # MAtype==8 --> VWMA
-    # MAtype==9 --> zema
-    if src == 1:
-        masrc = df["close"]
-    elif src == 2:
-        masrc = (df["high"] + df["low"]) / 2
-    elif src == 3:
-        masrc = (df["high"] + df["low"] + df["close"] + df["open"]) / 4
-
-    if MAtype == 1:
-        mavalue = ta.EMA(masrc, timeperiod=length)
-    elif MAtype == 2:
-        mavalue = ta.DEMA(masrc, timeperiod=length)
-    elif MAtype == 3:
-        mavalue = ta.T3(masrc, timeperiod=length)
-    elif MAtype == 4:
-        mavalue = ta.SMA(masrc, timeperiod=length)
-    elif MAtype == 5:
-        mavalue = VIDYA(df, length=length)
-    elif MAtype == 6:
-        mavalue = ta.TEMA(masrc, timeperiod=length)
-    elif MAtype == 7:
-        mavalue = ta.WMA(df, timeperiod=length)
-    elif MAtype == 8:
-        mavalue = vwma(df, length)
-    elif MAtype == 9:
-        mavalue = zema(df, period=length)
-
-    df[atr] = ta.ATR(df, timeperiod=period)
-    df['basic_ub'] = mavalue + ((multiplier / 10) * df[atr])
-    df['basic_lb'] = mavalue - ((multiplier / 10) * df[atr])
-
-    basic_ub = df['basic_ub'].values
-    final_ub = np.full(len(df), 0.00)
-    basic_lb = df['basic_lb'].values
-    final_lb = np.full(len(df), 0.00)
-
-    for i in range(period, len(df)):
-        final_ub[i] = basic_ub[i] if (
-                basic_ub[i] < final_ub[i - 1]
-                or mavalue[i - 1] > final_ub[i - 1]) else final_ub[i - 1]
-        final_lb[i] = basic_lb[i] if (
-                basic_lb[i] > final_lb[i - 1]
-                or mavalue[i - 1] < final_lb[i - 1]) else final_lb[i - 1]
-
-    df['final_ub'] = final_ub
-    df['final_lb'] = final_lb
-
-    pm_arr = np.full(len(df), 0.00)
-    for i in range(period, len(df)):
-        pm_arr[i] = (
-            final_ub[i] if (pm_arr[i - 1] == final_ub[i - 1]
-                            and mavalue[i] <= final_ub[i])
-            else final_lb[i] if (
-                    pm_arr[i - 1] == final_ub[i - 1]
-                    and mavalue[i] > final_ub[i]) else final_lb[i]
-            if (pm_arr[i - 1] == final_lb[i - 1]
-                and mavalue[i] >= final_lb[i]) else final_ub[i]
-            if (pm_arr[i - 1] == final_lb[i - 1]
-                and mavalue[i] < final_lb[i]) else 0.00)
-
-    pm = Series(pm_arr)
-
-    # Mark the trend direction up/down
-    pmx = np.where((pm_arr > 0.00), np.where((mavalue < pm_arr), 'down', 'up'), np.NaN)
-
-    return pm, pmx
-
-
-def calc_streaks(series: Series):
-    # logic tables
-    geq = series >= series.shift(1)  # True if rising
-    eq = series == series.shift(1)  # True if equal
-    logic_table = concat([geq, eq], axis=1)
-
-    streaks = [0]  # holds the streak duration, starts with 0
-
-    for row in logic_table.iloc[1:].itertuples():  # iterate through logic table
-        if row[2]:  # same value as before
-            streaks.append(0)
-            continue
-        last_value = streaks[-1]
-        if row[1]:  # higher value than before
-            streaks.append(last_value + 1 if last_value >=
-                                             0 else 1)  # increase or reset to +1
-        else:  # lower value than before
-            streaks.append(last_value - 1 if last_value <
-                                             0 else -1)  # decrease or reset to -1
-
-    return streaks
-
-
 # SSL Channels
 def SSLChannels(dataframe, length=7):
     ATR = ta.ATR(dataframe, timeperiod=14)
@@ -5260,27 +5151,6 @@ def SSLChannels(dataframe, length=7):
     return sslDown, sslUp
 
 
-def pivot_points(dataframe: DataFrame, mode='fibonacci') -> Series:
-    hlc3_pivot = (dataframe['high'] + dataframe['low'] + dataframe['close']).shift(1) / 3
-    hl_range = (dataframe['high'] - dataframe['low']).shift(1)
-    if mode == 'simple':
-        res1 = hlc3_pivot * 2 - dataframe['low'].shift(1)
-        sup1 = hlc3_pivot * 2 - dataframe['high'].shift(1)
-        res2 = hlc3_pivot + (dataframe['high'] - dataframe['low']).shift()
-        sup2 = hlc3_pivot - (dataframe['high'] - dataframe['low']).shift()
-        res3 = hlc3_pivot * 2 + (dataframe['high'] - 2 * dataframe['low']).shift()
-        sup3 = hlc3_pivot * 2 - (2 * dataframe['high'] - dataframe['low']).shift()
-    elif mode == 'fibonacci':
-        res1 = hlc3_pivot + 0.382 * hl_range
-        sup1 = hlc3_pivot - 0.382 * hl_range
-        res2 = hlc3_pivot + 0.618 * hl_range
-        sup2 = hlc3_pivot - 0.618 * hl_range
-        res3 = hlc3_pivot + 1 * hl_range
-        sup3 = hlc3_pivot - 1 * hl_range
-
-    return hlc3_pivot, res1, res2, res3, sup1, sup2, sup3
-
-
 def HeikinAshi(dataframe, smooth_inputs=False, smooth_outputs=False, length=10):
     df = dataframe[['open', 'close', 'high', 'low']].copy().fillna(0)
     if smooth_inputs:
@@ -5340,9 +5210,11 @@ def momdiv(dataframe: DataFrame, mom_length: int = 10, bb_length: int = 20, bb_d
 
 class Cache:
 
-    def __init__(self, path):
+    def __init__(self, path, check_interval=0):
         self.path = path
         self.data = {}
+        self.check_interval = check_interval
+        self._checked = None
         self._mtime = None
         self._previous_data = {}
         try:
@@ -5359,6 +5231,11 @@ class Cache:
         return {"number_mode": rapidjson.NM_NATIVE}
 
     def load(self):
+        # Stat the file at most once every check_interval seconds
+        now = time.monotonic()
+        if self._checked is not None and now - self._checked < self.check_interval:
+            return
+        self._checked = now
         if not self._mtime or self.path.stat().st_mtime_ns != self._mtime:
             self._load()
 
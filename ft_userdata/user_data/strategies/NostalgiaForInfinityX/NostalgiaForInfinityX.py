@@ -14,11 +14,22 @@ import math
 from typing import Dict
 from freqtrade.persistence import Trade
 from datetime import datetime, timedelta
-from technical.util import resample_to_interval, resampled_merge
-from technical.indicators import RMI, zema, VIDYA, ichimoku
+from technical.indicators import RMI, ichimoku
 from freqtrade.strategy import (BooleanParameter, CategoricalParameter, DecimalParameter,
                                 IStrategy, IntParameter)
 import time
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.heikin_ashi import heikin_ashi
+from tradeboddy.rolling import turning_point
+from tradeboddy.dataprep import AnalyzedCache
+from tradeboddy.ohlcv_view import OHLCVView, T3, attach, chaikin_money_flow, ewo, momdiv, williams_r
+from tradeboddy.protections import ProtectionFeatures
+from tradeboddy.resample import Resampler
+from tradeboddy.pruning import IndicatorPruner
+from tradeboddy.pivots import pivot_points
+from tradeboddy.moving_averages import MovingAverages, pmax
 
 log = logging.getLogger(__name__)
 #log.setLevel(logging.DEBUG)
@@ -166,6 +177,9 @@ class NostalgiaForInfinityX(IStrategy):
     # Number of candles the strategy requires before producing valid signals
     startup_candle_count: int = 480
 
+    # analyzed frames prepared by tradeboddy.dataprep (backtest/hyperopt only)
+    analyzed_cache = None
+
     # Optional order type mapping.
     order_types = {
         'buy': 'limit',
@@ -2274,6 +2288,7 @@ class NostalgiaForInfinityX(IStrategy):
 
         # If the cached data hasn't changed, it's a no-op
         self.target_profit_cache.save()
+        IndicatorPruner.apply(self)
 
     def get_hold_trades_config_file(self):
         proper_holds_file_path = self.config["user_data_dir"].resolve() / "nfi-hold-trades.json"
@@ -6848,12 +6863,7 @@ class NostalgiaForInfinityX(IStrategy):
         :param method: High to Low / Open to Close
         :param length: int The length to look back
         """
-        if method == 'HL':
-            return (dataframe['high'].rolling(length).max() - dataframe['low'].rolling(length).min()) / dataframe['low'].rolling(length).min()
-        elif method == 'OC':
-            return (dataframe['open'].rolling(length).max() - dataframe['close'].rolling(length).min()) / dataframe['close'].rolling(length).min()
-        else:
-            raise ValueError(f"Method {method} not defined!")
+        return ProtectionFeatures.of(dataframe).range_percent_change(method, length)
 
     def top_percent_change(self, dataframe: DataFrame, length: int) -> float:
         """
@@ -6862,10 +6872,7 @@ class NostalgiaForInfinityX(IStrategy):
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        if length == 0:
-            return (dataframe['open'] - dataframe['close']) / dataframe['close']
-        else:
-            return (dataframe['open'].rolling(length).max() - dataframe['close']) / dataframe['close']
+        return ProtectionFeatures.of(dataframe).top_percent_change(length)
 
     def informative_pairs(self):
         # get access to all pairs available in whitelist.
@@ -6906,14 +6913,14 @@ class NostalgiaForInfinityX(IStrategy):
             informative_1d.drop(columns = column_names, inplace=True)
 
         # Pivots
-        informative_1d['pivot'], informative_1d['res1'], informative_1d['res2'], informative_1d['res3'], informative_1d['sup1'], informative_1d['sup2'], informative_1d['sup3'] = pivot_points(informative_1d, mode='fibonacci')
+        informative_1d['pivot'], informative_1d['res1'], informative_1d['res2'], informative_1d['res3'], informative_1d['sup1'], informative_1d['sup2'], informative_1d['sup3'] = pivot_points(informative_1d, mode='fibonacci', pair=metadata['pair'], timeframe=self.info_timeframe_1d)
 
         # Smoothed Heikin-Ashi
-        informative_1d['open_sha'], informative_1d['close_sha'], informative_1d['low_sha'] = heikin_ashi(informative_1d, smooth_inputs=True, smooth_outputs=False, length=10)
+        informative_1d['open_sha'], informative_1d['close_sha'], informative_1d['low_sha'] = heikin_ashi(informative_1d, smooth_inputs=True, smooth_outputs=False, length=30)
 
         # S/R
-        res_series = informative_1d['high'].rolling(window = 5, center=True).apply(lambda row: self.is_resistance(row), raw=True).shift(2)
-        sup_series = informative_1d['low'].rolling(window = 5, center=True).apply(lambda row: self.is_support(row), raw=True).shift(2)
+        res_series = turning_point(informative_1d['high'], 5, support=False, center=True).shift(2)
+        sup_series = turning_point(informative_1d['low'], 5, support=True, center=True).shift(2)
         informative_1d['res_level'] = Series(np.where(res_series, np.where(informative_1d['close'] > informative_1d['open'], informative_1d['close'], informative_1d['open']), float('NaN'))).ffill()
         informative_1d['res_hlevel'] = Series(np.where(res_series, informative_1d['high'], float('NaN'))).ffill()
         informative_1d['sup_level'] = Series(np.where(sup_series, np.where(informative_1d['close'] < informative_1d['open'], informative_1d['close'], informative_1d['open']), float('NaN'))).ffill()
@@ -6928,22 +6935,17 @@ class NostalgiaForInfinityX(IStrategy):
         assert self.dp, "DataProvider is required for multiple timeframes."
         # Get the informative pair
         informative_1h = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.info_timeframe_1h)
+        candles = OHLCVView.of(informative_1h)
+        averages = MovingAverages(candles.close, candles.index)
 
         # RSI
         informative_1h['rsi_14'] = ta.RSI(informative_1h, timeperiod=14)
 
         # EMAs
-        informative_1h['ema_12'] = ta.EMA(informative_1h, timeperiod=12)
-        informative_1h['ema_20'] = ta.EMA(informative_1h, timeperiod=20)
-        informative_1h['ema_25'] = ta.EMA(informative_1h, timeperiod=25)
-        informative_1h['ema_26'] = ta.EMA(informative_1h, timeperiod=26)
-        informative_1h['ema_35'] = ta.EMA(informative_1h, timeperiod=35)
-        informative_1h['ema_50'] = ta.EMA(informative_1h, timeperiod=50)
-        informative_1h['ema_100'] = ta.EMA(informative_1h, timeperiod=100)
-        informative_1h['ema_200'] = ta.EMA(informative_1h, timeperiod=200)
+        attach(informative_1h, averages.columns('ema', (12, 20, 25, 26, 35, 50, 100, 200)))
 
         # SMA
-        informative_1h['sma_200'] = ta.SMA(informative_1h, timeperiod=200)
+        informative_1h['sma_200'] = averages.get('sma', 200)
 
         informative_1h['sma_200_dec_20'] = informative_1h['sma_200'] < informative_1h['sma_200'].shift(20)
         informative_1h['sma_200_dec_24'] = informative_1h['sma_200'] < informative_1h['sma_200'].shift(24) 
@@ -6956,7 +6958,7 @@ class NostalgiaForInfinityX(IStrategy):
         informative_1h['bb20_width'] = ((informative_1h['bb20_2_upp'] - informative_1h['bb20_2_low']) / informative_1h['bb20_2_mid'])
 
         # CMF
-        informative_1h['cmf'] = chaikin_money_flow(informative_1h, 20)
+        informative_1h['cmf'] = chaikin_money_flow(candles, 20)
 
         # CTI
         informative_1h['cti'] = pta.cti(informative_1h["close"], length=20)
@@ -6967,28 +6969,29 @@ class NostalgiaForInfinityX(IStrategy):
         informative_1h['crsi'] =  (ta.RSI(informative_1h['close'], timeperiod=3) + ta.RSI(crsi_updown, timeperiod=2) + ta.ROC(informative_1h['close'], 100)) / 3
 
         # Williams %R
-        informative_1h['r_14'] = williams_r(informative_1h, period=14)
-        informative_1h['r_480'] = williams_r(informative_1h, period=480)
+        attach(informative_1h, {
+            'r_14': williams_r(candles, period=14),
+            'r_480': williams_r(candles, period=480),
+        })
 
         # EWO
-        informative_1h['ewo'] = ewo(informative_1h, 50, 200)
+        informative_1h['ewo'] = ewo(candles, 50, 200, averages=averages)
         
         # ROC
         informative_1h['roc'] = ta.ROC(informative_1h, timeperiod=9)
 
         # MOMDIV
         mom = momdiv(dataframe)
-        informative_1h['momdiv_buy'] = mom['momdiv_buy']
-        informative_1h['momdiv_sell'] = mom['momdiv_sell']
-        informative_1h['momdiv_coh'] = mom['momdiv_coh']
-        informative_1h['momdiv_col'] = mom['momdiv_col']
+        # computed on the base timeframe, aligned on its index like the Series assignments were
+        attach(informative_1h, {col: mom[col] for col in ('momdiv_buy', 'momdiv_sell', 'momdiv_coh', 'momdiv_col')},
+               index=dataframe.index)
 
         # T3 Average
-        informative_1h['T3'] = T3(informative_1h)
+        informative_1h['T3'] = T3(candles, averages=averages)
         
         # S/R
-        res_series = informative_1h['high'].rolling(window = 5, center=True).apply(lambda row: self.is_resistance(row), raw=True).shift(2)
-        sup_series = informative_1h['low'].rolling(window = 5, center=True).apply(lambda row: self.is_support(row), raw=True).shift(2)
+        res_series = turning_point(informative_1h['high'], 5, support=False, center=True).shift(2)
+        sup_series = turning_point(informative_1h['low'], 5, support=True, center=True).shift(2)
         informative_1h['res_level'] = Series(np.where(res_series, np.where(informative_1h['close'] > informative_1h['open'], informative_1h['close'], informative_1h['open']), float('NaN'))).ffill()
         informative_1h['res_hlevel'] = Series(np.where(res_series, informative_1h['high'], float('NaN'))).ffill()
         informative_1h['sup_level'] = Series(np.where(sup_series, np.where(informative_1h['close'] < informative_1h['open'], informative_1h['close'], informative_1h['open']), float('NaN'))).ffill()
@@ -7015,23 +7018,25 @@ class NostalgiaForInfinityX(IStrategy):
         assert self.dp, "DataProvider is required for multiple timeframes."
         # Get the informative pair
         informative_15m = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.info_timeframe_15m)
+        candles = OHLCVView.of(informative_15m)
+        averages = MovingAverages(candles.close, candles.index)
 
         # RSI
         informative_15m['rsi_14'] = ta.RSI(informative_15m, timeperiod=14)
 
         # EMAs
-        informative_15m['ema_12'] = ta.EMA(informative_15m, timeperiod=12)
-        informative_15m['ema_16'] = ta.EMA(informative_15m, timeperiod=16)
-        informative_15m['ema_20'] = ta.EMA(informative_15m, timeperiod=20)
-        informative_15m['ema_26'] = ta.EMA(informative_15m, timeperiod=25)
-        informative_15m['ema_50'] = ta.EMA(informative_15m, timeperiod=50)
-        informative_15m['ema_100'] = ta.EMA(informative_15m, timeperiod=100)
-        informative_15m['ema_200'] = ta.EMA(informative_15m, timeperiod=200)
+        attach(informative_15m, {
+            'ema_12': averages.ema(12),
+            'ema_16': averages.ema(16),
+            'ema_20': averages.ema(20),
+            'ema_26': averages.ema(25),
+            'ema_50': averages.ema(50),
+            'ema_100': averages.ema(100),
+            'ema_200': averages.ema(200),
+        })
 
         # SMA
-        informative_15m['sma_15'] = ta.SMA(informative_15m, timeperiod=15)
-        informative_15m['sma_30'] = ta.SMA(informative_15m, timeperiod=30)
-        informative_15m['sma_200'] = ta.SMA(informative_15m, timeperiod=200)
+        attach(informative_15m, averages.columns('sma', (15, 30, 200)))
 
         informative_15m['sma_200_dec_20'] = informative_15m['sma_200'] < informative_15m['sma_200'].shift(20)
 
@@ -7050,18 +7055,20 @@ class NostalgiaForInfinityX(IStrategy):
         informative_15m['tail'] = (informative_15m['close'] - informative_15m['bb40_2_low']).abs()
 
         # CMF
-        informative_15m['cmf'] = chaikin_money_flow(informative_15m, 20)
+        informative_15m['cmf'] = chaikin_money_flow(candles, 20)
 
         # CTI
         informative_15m['cti'] = pta.cti(informative_15m["close"], length=20)
 
         # Williams %R
-        informative_15m['r_14'] = williams_r(informative_15m, period=14)
-        informative_15m['r_64'] = williams_r(informative_15m, period=64)
-        informative_15m['r_96'] = williams_r(informative_15m, period=96)
+        attach(informative_15m, {
+            'r_14': williams_r(candles, period=14),
+            'r_64': williams_r(candles, period=64),
+            'r_96': williams_r(candles, period=96),
+        })
 
         # EWO
-        informative_15m['ewo'] = ewo(informative_15m, 50, 200)
+        informative_15m['ewo'] = ewo(candles, 50, 200)
 
         # CCI
         informative_15m['cci'] = ta.CCI(informative_15m, source='hlc3', timeperiod=20)
@@ -7078,6 +7085,8 @@ class NostalgiaForInfinityX(IStrategy):
 
     def normal_tf_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         tik = time.perf_counter()
+        candles = OHLCVView.of(dataframe)
+        averages = MovingAverages(candles.close, candles.index)
 
         # RSI
         dataframe['rsi_4'] = ta.RSI(dataframe, timeperiod=4)
@@ -7085,24 +7094,10 @@ class NostalgiaForInfinityX(IStrategy):
         dataframe['rsi_20'] = ta.RSI(dataframe, timeperiod=20)
 
         # EMAs
-        dataframe['ema_8'] = ta.EMA(dataframe, timeperiod=8)
-        dataframe['ema_12'] = ta.EMA(dataframe, timeperiod=12)
-        dataframe['ema_13'] = ta.EMA(dataframe, timeperiod=13)
-        dataframe['ema_16'] = ta.EMA(dataframe, timeperiod=16)
-        dataframe['ema_20'] = ta.EMA(dataframe, timeperiod=20)
-        dataframe['ema_25'] = ta.EMA(dataframe, timeperiod=25)
-        dataframe['ema_26'] = ta.EMA(dataframe, timeperiod=26)
-        dataframe['ema_50'] = ta.EMA(dataframe, timeperiod=50)
-        dataframe['ema_100'] = ta.EMA(dataframe, timeperiod=100)
-        dataframe['ema_200'] = ta.EMA(dataframe, timeperiod=200)
+        attach(dataframe, averages.columns('ema', (8, 12, 13, 16, 20, 25, 26, 50, 100, 200)))
 
         # SMA
-        dataframe['sma_15'] = ta.SMA(dataframe, timeperiod=15)
-        dataframe['sma_21'] = ta.SMA(dataframe, timeperiod=21)
-        dataframe['sma_28'] = ta.SMA(dataframe, timeperiod=28)
-        dataframe['sma_30'] = ta.SMA(dataframe, timeperiod=30)
-        dataframe['sma_75'] = ta.SMA(dataframe, timeperiod=75)
-        dataframe['sma_200'] = ta.SMA(dataframe, timeperiod=200)
+        attach(dataframe, averages.columns('sma', (15, 21, 28, 30, 75, 200)))
 
         dataframe['sma_200_dec_20'] = dataframe['sma_200'] < dataframe['sma_200'].shift(20)
         dataframe['sma_200_dec_24'] = dataframe['sma_200'] < dataframe['sma_200'].shift(24)
@@ -7132,15 +7127,10 @@ class NostalgiaForInfinityX(IStrategy):
         dataframe['bb20_delta'] = ((dataframe['bb20_2_low'] - dataframe['bb20_3_low']) / dataframe['bb20_2_low'])
 
         # CMF
-        dataframe['cmf'] = chaikin_money_flow(dataframe, 20)
+        dataframe['cmf'] = chaikin_money_flow(candles, 20)
 
         # Williams %R
-        dataframe['r_14'] = williams_r(dataframe, period=14)
-        dataframe['r_24'] = williams_r(dataframe, period=24)
-        dataframe['r_32'] = williams_r(dataframe, period=32)
-        dataframe['r_64'] = williams_r(dataframe, period=64)
-        dataframe['r_96'] = williams_r(dataframe, period=96)
-        dataframe['r_480'] = williams_r(dataframe, period=480)
+        attach(dataframe, {f'r_{period}': williams_r(candles, period=period) for period in (14, 24, 32, 64, 96, 480)})
 
         # CTI
         dataframe['cti'] = pta.cti(dataframe["close"], length=20)
@@ -7156,7 +7146,7 @@ class NostalgiaForInfinityX(IStrategy):
         dataframe['ema_vwma_osc_96'] = ema_vwma_osc(dataframe, 96)
 
         # EWO
-        dataframe['ewo'] = ewo(dataframe, 50, 200)
+        dataframe['ewo'] = ewo(candles, 50, 200, averages=averages)
 
         # CCI
         dataframe['cci'] = ta.CCI(dataframe, source='hlc3', timeperiod=20)
@@ -7203,11 +7193,8 @@ class NostalgiaForInfinityX(IStrategy):
         dataframe['pmax_thresh'] = ta.EMA(dataframe['source'], timeperiod=9)
 
         # MOMDIV
-        mom = momdiv(dataframe)
-        dataframe['momdiv_buy'] = mom['momdiv_buy']
-        dataframe['momdiv_sell'] = mom['momdiv_sell']
-        dataframe['momdiv_coh'] = mom['momdiv_coh']
-        dataframe['momdiv_col'] = mom['momdiv_col']
+        mom = momdiv(candles)
+        attach(dataframe, {col: mom[col] for col in ('momdiv_buy', 'momdiv_sell', 'momdiv_coh', 'momdiv_col')})
 
         # Cofi
         stoch_fast = ta.STOCHF(dataframe, 5, 3, 0, 3, 0)
@@ -7216,7 +7203,7 @@ class NostalgiaForInfinityX(IStrategy):
         dataframe['adx'] = ta.ADX(dataframe)
 
         # T3 Average
-        dataframe['T3'] = T3(dataframe)
+        dataframe['T3'] = T3(candles, averages=averages)
 
         # Modified Elder Ray Index
         dataframe['moderi_32'] = moderi(dataframe, 32)
@@ -7224,7 +7211,7 @@ class NostalgiaForInfinityX(IStrategy):
         dataframe['moderi_96'] = moderi(dataframe, 96)
 
         # Zero-Lag EMA
-        dataframe['zema_61'] = zema(dataframe, period=61)
+        dataframe['zema_61'] = averages.get('zema', 61)
 
         # Dip protection
         dataframe['tpct_change_0']   = self.top_percent_change(dataframe,0)
@@ -7287,9 +7274,14 @@ class NostalgiaForInfinityX(IStrategy):
 
     def daily_tf_btc_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         tik = time.perf_counter()
+        if self.config['stake_currency'] in ['USDT','BUSD','USDC','DAI','TUSD','PAX','USD','EUR','GBP']:
+            btc_info_pair = f"BTC/{self.config['stake_currency']}"
+        else:
+            btc_info_pair = "BTC/USDT"
+
         # Indicators
         # -----------------------------------------------------------------------------------------
-        dataframe['pivot'], dataframe['res1'], dataframe['res2'], dataframe['res3'], dataframe['sup1'], dataframe['sup2'], dataframe['sup3'] = pivot_points(dataframe, mode='fibonacci')
+        dataframe['pivot'], dataframe['res1'], dataframe['res2'], dataframe['res3'], dataframe['sup1'], dataframe['sup2'], dataframe['sup3'] = pivot_points(dataframe, mode='fibonacci', pair=btc_info_pair, timeframe='1d')
 
         # Add prefix
         # -----------------------------------------------------------------------------------------
@@ -7302,6 +7294,14 @@ class NostalgiaForInfinityX(IStrategy):
         return dataframe
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        if self.config['runmode'].value in ('backtest', 'hyperopt'):
+            if self.analyzed_cache is None:
+                self.analyzed_cache = AnalyzedCache.for_strategy(self)
+            return self.analyzed_cache.populate(metadata['pair'], self.timeframe, dataframe,
+                                                lambda df: self.do_indicators(df, metadata))
+        return self.do_indicators(dataframe, metadata)
+
+    def do_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         tik = time.perf_counter()
         '''
         --> BTC informative (5m/1h)
@@ -7360,10 +7360,11 @@ class NostalgiaForInfinityX(IStrategy):
         ___________________________________________________________________________________________
         '''
         if self.res_timeframe != 'none':
-            resampled = resample_to_interval(dataframe, timeframe_to_minutes(self.res_timeframe))
-            resampled = self.resampled_tf_indicators(resampled, metadata)
+            resampler = Resampler.for_pair(self, metadata['pair'], self.timeframe, dataframe,
+                                           timeframe_to_minutes(self.res_timeframe))
+            resampled = self.resampled_tf_indicators(resampler.bars(), metadata)
             # Merge resampled info dataframe
-            dataframe = resampled_merge(dataframe, resampled, fill_na=True)
+            dataframe = resampler.merge(dataframe, resampled, fill_na=True)
             dataframe.rename(columns=lambda s: f"{s}_{self.res_timeframe}" if "resample_" in s else s, inplace=True)
             dataframe.rename(columns=lambda s: s.replace("resample_{}_".format(self.res_timeframe.replace("m","")), ""), inplace=True)
             drop_columns = [f"{s}_{self.res_timeframe}" for s in ['date']]
@@ -8430,53 +8431,6 @@ class NostalgiaForInfinityX(IStrategy):
 
         return hold_trade
 
-# Elliot Wave Oscillator
-def ewo(dataframe, sma1_length=5, sma2_length=35):
-    sma1 = ta.EMA(dataframe, timeperiod=sma1_length)
-    sma2 = ta.EMA(dataframe, timeperiod=sma2_length)
-    smadif = (sma1 - sma2) / dataframe['close'] * 100
-    return smadif
-
-# Chaikin Money Flow
-def chaikin_money_flow(dataframe, n=20, fillna=False) -> Series:
-    """Chaikin Money Flow (CMF)
-    It measures the amount of Money Flow Volume over a specific period.
-    http://stockcharts.com/school/doku.php?id=chart_school:technical_indicators:chaikin_money_flow_cmf
-    Args:
-        dataframe(pandas.Dataframe): dataframe containing ohlcv
-        n(int): n period.
-        fillna(bool): if True, fill nan values.
-    Returns:
-        pandas.Series: New feature generated.
-    """
-    mfv = ((dataframe['close'] - dataframe['low']) - (dataframe['high'] - dataframe['close'])) / (dataframe['high'] - dataframe['low'])
-    mfv = mfv.fillna(0.0)  # float division by zero
-    mfv *= dataframe['volume']
-    cmf = (mfv.rolling(n, min_periods=0).sum()
-           / dataframe['volume'].rolling(n, min_periods=0).sum())
-    if fillna:
-        cmf = cmf.replace([np.inf, -np.inf], np.nan).fillna(0)
-    return Series(cmf, name='cmf')
-
-# Williams %R
-def williams_r(dataframe: DataFrame, period: int = 14) -> Series:
-    """Williams %R, or just %R, is a technical analysis oscillator showing the current closing price in relation to the high and low
-        of the past N days (for a given N). It was developed by a publisher and promoter of trading materials, Larry Williams.
-        Its purpose is to tell whether a stock or commodity market is trading near the high or the low, or somewhere in between,
-        of its recent trading range.
-        The oscillator is on a negative scale, from −100 (lowest) up to 0 (highest).
-    """
-
-    highest_high = dataframe["high"].rolling(center=False, window=period).max()
-    lowest_low = dataframe["low"].rolling(center=False, window=period).min()
-
-    WR = Series(
-        (highest_high - dataframe["close"]) / (highest_high - lowest_low),
-        name=f"{period} Williams %R",
-        )
-
-    return WR * -100
-
 # Volume Weighted Moving Average
 def vwma(dataframe: DataFrame, length: int = 10):
     """Indicator: Volume Weighted Moving Average (VWMA)"""
@@ -8491,192 +8445,6 @@ def ema_vwma_osc(dataframe, len_slow_ma):
     slow_ema = Series(ta.EMA(vwma(dataframe, len_slow_ma), len_slow_ma))
     return ((slow_ema - slow_ema.shift(1)) / slow_ema.shift(1)) * 100
 
-def pivot_points(dataframe: DataFrame, mode = 'fibonacci') -> Series:
-    hlc3_pivot = (dataframe['high'] + dataframe['low'] + dataframe['close']).shift(1) / 3
-    hl_range = (dataframe['high'] - dataframe['low']).shift(1)
-    if mode == 'simple':
-        res1 = hlc3_pivot * 2 - dataframe['low'].shift(1)
-        sup1 = hlc3_pivot * 2 - dataframe['high'].shift(1)
-        res2 = hlc3_pivot + (dataframe['high'] - dataframe['low']).shift()
-        sup2 = hlc3_pivot - (dataframe['high'] - dataframe['low']).shift()
-        res3 = hlc3_pivot * 2 + (dataframe['high'] - 2 * dataframe['low']).shift()
-        sup3 = hlc3_pivot * 2 - (2 * dataframe['high'] - dataframe['low']).shift()
-    elif mode == 'fibonacci':
-        res1 = hlc3_pivot + 0.382 * hl_range
-        sup1 = hlc3_pivot - 0.382 * hl_range
-        res2 = hlc3_pivot + 0.618 * hl_range
-        sup2 = hlc3_pivot - 0.618 * hl_range
-        res3 = hlc3_pivot + 1 * hl_range
-        sup3 = hlc3_pivot - 1 * hl_range
-
-    return hlc3_pivot, res1, res2, res3, sup1, sup2, sup3
-
-def heikin_ashi(dataframe, smooth_inputs = False, smooth_outputs = False, length = 10):
-    df = dataframe[['open','close','high','low']].copy().fillna(0)
-    if smooth_inputs:
-        df['open_s']  = ta.EMA(df['open'], timeframe = length)
-        df['high_s']  = ta.EMA(df['high'], timeframe = length)
-        df['low_s']   = ta.EMA(df['low'],  timeframe = length)
-        df['close_s'] = ta.EMA(df['close'],timeframe = length)
-
-        open_ha  = (df['open_s'].shift(1) + df['close_s'].shift(1)) / 2
-        high_ha  = df.loc[:, ['high_s', 'open_s', 'close_s']].max(axis=1)
-        low_ha   = df.loc[:, ['low_s', 'open_s', 'close_s']].min(axis=1)
-        close_ha = (df['open_s'] + df['high_s'] + df['low_s'] + df['close_s'])/4
-    else:
-        open_ha  = (df['open'].shift(1) + df['close'].shift(1)) / 2
-        high_ha  = df.loc[:, ['high', 'open', 'close']].max(axis=1)
-        low_ha   = df.loc[:, ['low', 'open', 'close']].min(axis=1)
-        close_ha = (df['open'] + df['high'] + df['low'] + df['close'])/4
-
-    open_ha = open_ha.fillna(0)
-    high_ha = high_ha.fillna(0)
-    low_ha  = low_ha.fillna(0)
-    close_ha = close_ha.fillna(0)
-
-    if smooth_outputs:
-        open_sha  = ta.EMA(open_ha, timeframe = length)
-        high_sha  = ta.EMA(high_ha, timeframe = length)
-        low_sha   = ta.EMA(low_ha, timeframe = length)
-        close_sha = ta.EMA(close_ha, timeframe = length)
-
-        return open_sha, close_sha, low_sha
-    else:
-        return open_ha, close_ha, low_ha
-
-# PMAX
-def pmax(df, period, multiplier, length, MAtype, src):
-
-    period = int(period)
-    multiplier = int(multiplier)
-    length = int(length)
-    MAtype = int(MAtype)
-    src = int(src)
-
-    mavalue = f'MA_{MAtype}_{length}'
-    atr = f'ATR_{period}'
-    pm = f'pm_{period}_{multiplier}_{length}_{MAtype}'
-    pmx = f'pmX_{period}_{multiplier}_{length}_{MAtype}'
-
-    # MAtype==1 --> EMA
-    # MAtype==2 --> DEMA
-    # MAtype==3 --> T3
-    # MAtype==4 --> SMA
-    # MAtype==5 --> VIDYA
-    # MAtype==6 --> TEMA
-    # MAtype==7 --> WMA
-    # MAtype==8 --> VWMA
-    # MAtype==9 --> zema
-    if src == 1:
-        masrc = df["close"]
-    elif src == 2:
-        masrc = (df["high"] + df["low"]) / 2
-    elif src == 3:
-        masrc = (df["high"] + df["low"] + df["close"] + df["open"]) / 4
-
-    if MAtype == 1:
-        mavalue = ta.EMA(masrc, timeperiod=length)
-    elif MAtype == 2:
-        mavalue = ta.DEMA(masrc, timeperiod=length)
-    elif MAtype == 3:
-        mavalue = ta.T3(masrc, timeperiod=length)
-    elif MAtype == 4:
-        mavalue = ta.SMA(masrc, timeperiod=length)
-    elif MAtype == 5:
-        mavalue = VIDYA(df, length=length)
-    elif MAtype == 6:
-        mavalue = ta.TEMA(masrc, timeperiod=length)
-    elif MAtype == 7:
-        mavalue = ta.WMA(df, timeperiod=length)
-    elif MAtype == 8:
-        mavalue = vwma(df, length)
-    elif MAtype == 9:
-        mavalue = zema(df, period=length)
-
-    df[atr] = ta.ATR(df, timeperiod=period)
-    df['basic_ub'] = mavalue + ((multiplier/10) * df[atr])
-    df['basic_lb'] = mavalue - ((multiplier/10) * df[atr])
-
-
-    basic_ub = df['basic_ub'].values
-    final_ub = np.full(len(df), 0.00)
-    basic_lb = df['basic_lb'].values
-    final_lb = np.full(len(df), 0.00)
-
-    for i in range(period, len(df)):
-        final_ub[i] = basic_ub[i] if (
-            basic_ub[i] < final_ub[i - 1]
-            or mavalue[i - 1] > final_ub[i - 1]) else final_ub[i - 1]
-        final_lb[i] = basic_lb[i] if (
-            basic_lb[i] > final_lb[i - 1]
-            or mavalue[i - 1] < final_lb[i - 1]) else final_lb[i - 1]
-
-    df['final_ub'] = final_ub
-    df['final_lb'] = final_lb
-
-    pm_arr = np.full(len(df), 0.00)
-    for i in range(period, len(df)):
-        pm_arr[i] = (
-            final_ub[i] if (pm_arr[i - 1] == final_ub[i - 1]
-                                    and mavalue[i] <= final_ub[i])
-        else final_lb[i] if (
-            pm_arr[i - 1] == final_ub[i - 1]
-            and mavalue[i] > final_ub[i]) else final_lb[i]
-        if (pm_arr[i - 1] == final_lb[i - 1]
-            and mavalue[i] >= final_lb[i]) else final_ub[i]
-        if (pm_arr[i - 1] == final_lb[i - 1]
-            and mavalue[i] < final_lb[i]) else 0.00)
-
-    pm = Series(pm_arr)
-
-    # Mark the trend direction up/down
-    pmx = np.where((pm_arr > 0.00), np.where((mavalue < pm_arr), 'down',  'up'), np.NaN)
-
-    return pm, pmx
-
-# Mom DIV
-def momdiv(dataframe: DataFrame, mom_length: int = 10, bb_length: int = 20, bb_dev: float = 2.0, lookback: int = 30) -> DataFrame:
-    mom: Series = ta.MOM(dataframe, timeperiod=mom_length)
-    upperband, middleband, lowerband = ta.BBANDS(mom, timeperiod=bb_length, nbdevup=bb_dev, nbdevdn=bb_dev, matype=0)
-    buy = qtpylib.crossed_below(mom, lowerband)
-    sell = qtpylib.crossed_above(mom, upperband)
-    hh = dataframe['high'].rolling(lookback).max()
-    ll = dataframe['low'].rolling(lookback).min()
-    coh = dataframe['high'] >= hh
-    col = dataframe['low'] <= ll
-    df = DataFrame({
-            "momdiv_mom": mom,
-            "momdiv_upperb": upperband,
-            "momdiv_lowerb": lowerband,
-            "momdiv_buy": buy,
-            "momdiv_sell": sell,
-            "momdiv_coh": coh,
-            "momdiv_col": col,
-        }, index=dataframe['close'].index)
-    return df
-
-def T3(dataframe, length=5):
-    """
-    T3 Average by HPotter on Tradingview
-    https://www.tradingview.com/script/qzoC9H1I-T3-Average/
-    """
-    df = dataframe.copy()
-
-    df['xe1'] = ta.EMA(df['close'], timeperiod=length)
-    df['xe2'] = ta.EMA(df['xe1'], timeperiod=length)
-    df['xe3'] = ta.EMA(df['xe2'], timeperiod=length)
-    df['xe4'] = ta.EMA(df['xe3'], timeperiod=length)
-    df['xe5'] = ta.EMA(df['xe4'], timeperiod=length)
-    df['xe6'] = ta.EMA(df['xe5'], timeperiod=length)
-    b = 0.7
-    c1 = -b * b * b
-    c2 = 3 * b * b + 3 * b * b * b
-    c3 = -6 * b * b - 3 * b - 3 * b * b * b
-    c4 = 1 + 3 * b + b * b * b + 3 * b * b
-    df['T3Average'] = c1 * df['xe6'] + c2 * df['xe5'] + c3 * df['xe4'] + c4 * df['xe3']
-
-    return df['T3Average']
-
 # Modified Elder Ray Index
 def moderi(dataframe: DataFrame, len_slow_ma: int = 32) -> Series:
     slow_ma = Series(ta.EMA(vwma(dataframe, length=len_slow_ma), timeperiod=len_slow_ma))
@@ -9,6 +9,11 @@ from functools import reduce, partial
 from freqtrade.persistence import Trade
 from datetime import datetime, timedelta
 import time
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.dataprep import AnalyzedCache
+from tradeboddy.protections import ProtectionFeatures
 
 log = logging.getLogger(__name__)
 #log.setLevel(logging.DEBUG)
@@ -95,6 +100,9 @@ class NostalgiaForInfinityX2(IStrategy):
     # Number of candles the strategy requires before producing valid signals
     startup_candle_count: int = 480
 
+    # analyzed frames prepared by tradeboddy.dataprep (backtest/hyperopt only)
+    analyzed_cache = None
+
     # Optional order type mapping.
     order_types = {
         'buy': 'limit',
@@ -987,6 +995,14 @@ class NostalgiaForInfinityX2(IStrategy):
             raise RuntimeError(f"{btc_info_timeframe} not supported as informative timeframe for BTC pair.")
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        if self.config['runmode'].value in ('backtest', 'hyperopt'):
+            if self.analyzed_cache is None:
+                self.analyzed_cache = AnalyzedCache.for_strategy(self)
+            return self.analyzed_cache.populate(metadata['pair'], self.timeframe, dataframe,
+                                                lambda df: self.do_indicators(df, metadata))
+        return self.do_indicators(dataframe, metadata)
+
+    def do_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         tik = time.perf_counter()
         '''
         --> BTC informative indicators
@@ -1246,40 +1262,6 @@ def pivot_points(dataframe: DataFrame, mode = 'fibonacci') -> Series:
         dm_sup = demark_pivot / 2 - dataframe['high']
         return dm_pivot, dm_res, dm_sup
 
-# Heikin Ashi candles
-def heikin_ashi(dataframe, smooth_inputs = False, smooth_outputs = False, length = 10):
-    df = dataframe[['open','close','high','low']].copy().fillna(0)
-    if smooth_inputs:
-        df['open_s']  = ta.EMA(df['open'], timeframe = length)
-        df['high_s']  = ta.EMA(df['high'], timeframe = length)
-        df['low_s']   = ta.EMA(df['low'],  timeframe = length)
-        df['close_s'] = ta.EMA(df['close'],timeframe = length)
-
-        open_ha  = (df['open_s'].shift(1) + df['close_s'].shift(1)) / 2
-        high_ha  = df.loc[:, ['high_s', 'open_s', 'close_s']].max(axis=1)
-        low_ha   = df.loc[:, ['low_s', 'open_s', 'close_s']].min(axis=1)
-        close_ha = (df['open_s'] + df['high_s'] + df['low_s'] + df['close_s'])/4
-    else:
-        open_ha  = (df['open'].shift(1) + df['close'].shift(1)) / 2
-        high_ha  = df.loc[:, ['high', 'open', 'close']].max(axis=1)
-        low_ha   = df.loc[:, ['low', 'open', 'close']].min(axis=1)
-        close_ha = (df['open'] + df['high'] + df['low'] + df['close'])/4
-
-    open_ha = open_ha.fillna(0)
-    high_ha = high_ha.fillna(0)
-    low_ha  = low_ha.fillna(0)
-    close_ha = close_ha.fillna(0)
-
-    if smooth_outputs:
-        open_sha  = ta.EMA(open_ha, timeframe = length)
-        high_sha  = ta.EMA(high_ha, timeframe = length)
-        low_sha   = ta.EMA(low_ha, timeframe = length)
-        close_sha = ta.EMA(close_ha, timeframe = length)
-
-        return open_sha, close_sha, low_sha
-    else:
-        return open_ha, close_ha, low_ha
-
 # Peak Percentage Change
 def range_percent_change(self, dataframe: DataFrame, method, length: int) -> float:
     """
@@ -1289,12 +1271,7 @@ def range_percent_change(self, dataframe: DataFrame, method, length: int) -> flo
     :param method: High to Low / Open to Close
     :param length: int The length to look back
     """
-    if method == 'HL':
-        return (dataframe['high'].rolling(length).max() - dataframe['low'].rolling(length).min()) / dataframe['low'].rolling(length).min()
-    elif method == 'OC':
-        return (dataframe['open'].rolling(length).max() - dataframe['close'].rolling(length).min()) / dataframe['close'].rolling(length).min()
-    else:
-        raise ValueError(f"Method {method} not defined!")
+    return ProtectionFeatures.of(dataframe).range_percent_change(method, length)
 
 # Percentage distance to top peak
 def top_percent_change(self, dataframe: DataFrame, length: int) -> float:
@@ -1304,7 +1281,4 @@ def top_percent_change(self, dataframe: DataFrame, length: int) -> float:
     :param dataframe: DataFrame The original OHLC dataframe
     :param length: int The length to look back
     """
-    if length == 0:
-        return (dataframe['open'] - dataframe['close']) / dataframe['close']
-    else:
-        return (dataframe['open'].rolling(length).max() - dataframe['close']) / dataframe['close']
+    return ProtectionFeatures.of(dataframe).top_percent_change(length)
@@ -21,9 +21,12 @@ from freqtrade.strategy import IntParameter
 from pandas import Series
 from numpy.typing import ArrayLike
 from datetime import datetime, timedelta
-import technical.indicators as indicators
 from freqtrade.exchange import timeframe_to_prev_date
 from finta import TA
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 
 
 def wma(series: Series, length: int) -> Series:
@@ -132,7 +135,7 @@ class NowoIchimoku1hV1(IStrategy):
     def populate_indicators(self, df: DataFrame, metadata: dict) -> DataFrame:
         df['upper'] = bollinger_bands(df['close'], moving_average='hma', length=20, mult=2.5)['upper']
 
-        ichi = indicators.ichimoku(df)
+        ichi = Ichimoku.of(df).lines(columns=['tenkan_sen', 'kijun_sen', 'leading_senkou_span_a', 'leading_senkou_span_b', 'cloud_green'])
 
         df['conversion_line'] = ichi['tenkan_sen']
         df['base_line'] = ichi['kijun_sen']
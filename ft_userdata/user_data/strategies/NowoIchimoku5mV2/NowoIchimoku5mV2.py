@@ -23,9 +23,12 @@ from freqtrade.strategy import IntParameter
 from pandas import Series
 from numpy.typing import ArrayLike
 from datetime import datetime, timedelta
-import technical.indicators as indicators
 from freqtrade.exchange import timeframe_to_prev_date
 from finta import TA
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 
 
 def merge_informative_pair(dataframe: pd.DataFrame, informative: pd.DataFrame,
@@ -193,7 +196,7 @@ class NowoIchimoku5mV2(IStrategy):
 
         df_1h['upper'] = bollinger_bands(df_1h['close'], moving_average='hma', length=20, mult=2.5)['upper']
 
-        ichi_1h = indicators.ichimoku(df_1h)
+        ichi_1h = Ichimoku.of(df_1h).lines(columns=['tenkan_sen', 'kijun_sen', 'leading_senkou_span_a', 'leading_senkou_span_b', 'cloud_green'])
 
         df_1h['conversion_line'] = ichi_1h['tenkan_sen']
         df_1h['base_line'] = ichi_1h['kijun_sen']
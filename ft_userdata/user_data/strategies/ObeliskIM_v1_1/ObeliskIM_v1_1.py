@@ -9,7 +9,6 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 import pandas as pd  # noqa
 pd.options.mode.chained_assignment = None  # default='warn'
 
-import technical.indicators as ftt
 from technical.util import resample_to_interval, resampled_merge
 
 from functools import reduce
@@ -29,6 +28,10 @@ from datetime import datetime, timedelta
 # Potential areas of improvement:
 # - reduce buying small peaks during sideways ranges
 # - additional entry trigger(s) for strong up trends / breakouts if tk cross happened in/below cloud
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 
 class ObeliskIM_v1_1(IStrategy):
 
@@ -86,11 +89,12 @@ class ObeliskIM_v1_1(IStrategy):
 
         dataframe['rsi'] = ta.RSI(dataframe, timeperiod=14)
 
-        ichimoku = ftt.ichimoku(dataframe, 
+        ichimoku = Ichimoku.of(dataframe).lines( 
             conversion_line_period=20, 
             base_line_periods=60,
             laggin_span=120, 
-            displacement=30
+            displacement=30,
+            columns=['tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'cloud_green', 'cloud_red']
             )
 
         # cross indicators
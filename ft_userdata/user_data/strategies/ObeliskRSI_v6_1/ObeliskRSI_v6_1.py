@@ -9,7 +9,10 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 import pandas as pd  # noqa
 pd.options.mode.chained_assignment = None  # default='warn'
 
-from technical.util import resample_to_interval, resampled_merge
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.resample import resample_to_interval, resampled_merge
 
 from functools import reduce
 from datetime import datetime, timedelta
@@ -7,7 +7,6 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 # --------------------------------
 import pandas as pd
 import numpy as np
-import technical.indicators as ftt
 from freqtrade.exchange import timeframe_to_minutes
 
 # Obelisk_Ichimoku_Slow v1.3 - 2021-04-20
@@ -56,6 +55,10 @@ from freqtrade.exchange import timeframe_to_minutes
 #             "refresh_period": 1440
 #         },
 #     ],
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 
 def ssl_atr(dataframe, length = 7):
     df = dataframe.copy()
@@ -114,11 +117,13 @@ class Obelisk_Ichimoku_Slow_v1_3(IStrategy):
     def slow_tf_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
         displacement = 30
-        ichimoku = ftt.ichimoku(dataframe, 
+        ichimoku = Ichimoku.of(dataframe).lines( 
             conversion_line_period=20, 
             base_line_periods=60,
             laggin_span=120, 
-            displacement=displacement
+            displacement=displacement,
+            columns=['chikou_span', 'tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'leading_senkou_span_a', 'leading_senkou_span_b', 'cloud_green', 'cloud_red'],
+            lookahead=True
             )
 
         dataframe['chikou_span'] = ichimoku['chikou_span']
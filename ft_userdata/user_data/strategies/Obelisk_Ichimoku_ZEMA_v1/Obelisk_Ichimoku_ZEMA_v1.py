@@ -10,6 +10,12 @@ import numpy as np
 import technical.indicators as ftt
 from freqtrade.exchange import timeframe_to_minutes
 import logging
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.informative_cache import InformativeCache, parameters_key
+from tradeboddy.ichimoku import Ichimoku
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +79,9 @@ class Obelisk_Ichimoku_ZEMA_v1(IStrategy):
     zema_len_buy = IntParameter(30, 90, default=72, space='buy', optimize=True)
     zema_len_sell = IntParameter(30, 90, default=51, space='sell', optimize=True)
 
+    # slow_tf_indicators only needs to run when a new 1h candle closes
+    informative_cache = InformativeCache()
+
     def informative_pairs(self):
         pairs = self.dp.current_whitelist()
         informative_pairs = [(pair, self.informative_timeframe) for pair in pairs]
@@ -81,11 +90,13 @@ class Obelisk_Ichimoku_ZEMA_v1(IStrategy):
     def slow_tf_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
         displacement = 30
-        ichimoku = ftt.ichimoku(dataframe, 
+        ichimoku = Ichimoku.of(dataframe).lines( 
             conversion_line_period=20, 
             base_line_periods=60,
             laggin_span=120, 
-            displacement=displacement
+            displacement=displacement,
+            columns=['chikou_span', 'tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'leading_senkou_span_a', 'leading_senkou_span_b', 'cloud_green', 'cloud_red'],
+            lookahead=True
             )
 
         dataframe['chikou_span'] = ichimoku['chikou_span']
@@ -207,7 +218,10 @@ class Obelisk_Ichimoku_ZEMA_v1(IStrategy):
             assert self.dp, "DataProvider is required for multiple timeframes."
 
             informative = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.informative_timeframe)
-            informative = self.slow_tf_indicators(informative.copy(), metadata)
+            informative = self.informative_cache.get(
+                metadata['pair'], self.informative_timeframe, informative,
+                lambda df: self.slow_tf_indicators(df, metadata),
+                params_key=parameters_key(self))
 
             dataframe = merge_informative_pair(dataframe, informative, self.timeframe, self.informative_timeframe, ffill=True)
             # don't overwrite the base dataframe's OHLCV information
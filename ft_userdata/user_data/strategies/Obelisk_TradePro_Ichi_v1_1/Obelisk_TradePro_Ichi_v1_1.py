@@ -9,7 +9,6 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 import pandas as pd  # noqa
 pd.options.mode.chained_assignment = None  # default='warn'
 
-import technical.indicators as ftt
 from technical.util import resample_to_interval, resampled_merge
 
 from functools import reduce
@@ -24,6 +23,10 @@ from datetime import datetime, timedelta
 # https://www.youtube.com/watch?v=8gWIykJgMNY
 #
 # Does not attempt to emulate the risk/reward take-profit/stop-loss, so the sell criteria are mine.
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 
 class Obelisk_TradePro_Ichi_v1_1(IStrategy):
 
@@ -81,11 +84,13 @@ class Obelisk_TradePro_Ichi_v1_1(IStrategy):
 
         # Crypto Settings
         displacement = 30
-        ichimoku = ftt.ichimoku(dataframe, 
+        ichimoku = Ichimoku.of(dataframe).lines( 
             conversion_line_period=20, 
             base_line_periods=60,
             laggin_span=120, 
-            displacement=displacement
+            displacement=displacement,
+            columns=['chikou_span', 'tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'leading_senkou_span_a', 'leading_senkou_span_b', 'cloud_green', 'cloud_red'],
+            lookahead=True
             )
 
         dataframe['chikou_span'] = ichimoku['chikou_span']
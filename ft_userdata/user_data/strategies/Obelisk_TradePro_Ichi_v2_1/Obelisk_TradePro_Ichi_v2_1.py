@@ -48,6 +48,10 @@ pd.options.mode.chained_assignment = None  # default='warn'
 #         "refresh_period": 1440
 #     },
 # ],
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 
 
 def SSLChannels(dataframe, length = 7):
@@ -133,11 +137,13 @@ class Obelisk_TradePro_Ichi_v2_1(IStrategy):
 
         # Crypto Settings
         displacement = 30
-        ichimoku = ftt.ichimoku(dataframe,
+        ichimoku = Ichimoku.of(dataframe).lines(
             conversion_line_period=20,
             base_line_periods=60,
             laggin_span=120,
-            displacement=displacement
+            displacement=displacement,
+            columns=['chikou_span', 'tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'leading_senkou_span_a', 'leading_senkou_span_b', 'cloud_green', 'cloud_red'],
+            lookahead=True
             )
 
         dataframe['chikou_span'] = ichimoku['chikou_span']
@@ -20,6 +20,10 @@ import talib.abstract as ta
 from functools import reduce
 import pandas as pd
 import numpy as np
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.pruning import IndicatorPruner
 ###################################### SETINGS ######################################
 
 # INDICATORS
@@ -2554,6 +2558,10 @@ class Persia(IStrategy):
         reals[0], reals[-1], default=reals[0], decimals=DECIMALS, optimize=99 < CONDITIONS, space='sell')
     ###############################################################
 
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        IndicatorPruner.apply(self)
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         dataframe1 = dataframe.shift(1)
         # print(timeframes)
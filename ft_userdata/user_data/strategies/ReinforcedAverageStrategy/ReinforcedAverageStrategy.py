@@ -7,7 +7,10 @@ from pandas import DataFrame, merge, DatetimeIndex
 
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
-from technical.util import resample_to_interval, resampled_merge
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.resample import resample_to_interval, resampled_merge
 from freqtrade.exchange import timeframe_to_minutes
 
 
@@ -12,6 +12,11 @@ from technical.indicators import RMI
 from statistics import mean
 from cachetools import TTLCache
 
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.market_data import MarketSnapshot, book_side, use_order_book
+
 
 class Schism(IStrategy):
 
@@ -47,6 +52,15 @@ class Schism(IStrategy):
 
     custom_trade_info = {}
     custom_current_price_cache: TTLCache = TTLCache(maxsize=100, ttl=300)
+    # order book / ticker requests shared by all callbacks within a bot loop
+    market = MarketSnapshot(ttl=5)
+
+    def bot_loop_start(self, **kwargs) -> None:
+        self.market.bind(self.dp)
+        self.market.new_loop()
+        # exit prices from the ticker: one bulk request for the whitelist, order books stay on demand
+        if self.dp.runmode.value in ('live', 'dry_run') and not use_order_book(self.config, 'exit'):
+            self.market.prefetch(self.dp.current_whitelist(), orderbook=False, single_tickers=False)
 
     def informative_pairs(self):
         pairs = self.dp.current_whitelist()
@@ -194,13 +208,7 @@ class Schism(IStrategy):
             if rate:
                 return rate
 
-        ask_strategy = self.config.get('ask_strategy', {})
-        if ask_strategy.get('use_order_book', False):
-            ob = self.dp.orderbook(pair, 1)
-            rate = ob[f"{ask_strategy['price_side']}s"][0][0]
-        else:
-            ticker = self.dp.ticker(pair)
-            rate = ticker['last']
+        rate = self.market.current_rate(pair, self.config, 'exit')
 
         self.custom_current_price_cache[pair] = rate
         return rate
@@ -211,25 +219,19 @@ class Schism(IStrategy):
         return min(end, start + (rate * trade_time))
 
     def check_buy_timeout(self, pair: str, trade: Trade, order: dict, **kwargs) -> bool:
-        bid_strategy = self.config.get('bid_strategy', {})
-        ob = self.dp.orderbook(pair, 1)
-        current_price = ob[f"{bid_strategy['price_side']}s"][0][0]
+        current_price = self.market.top_of_book(pair, book_side(self.config, 'entry'))
         if current_price > order['price'] * 1.01:
             return True
         return False
 
     def check_sell_timeout(self, pair: str, trade: Trade, order: dict, **kwargs) -> bool:
-        ask_strategy = self.config.get('ask_strategy', {})
-        ob = self.dp.orderbook(pair, 1)
-        current_price = ob[f"{ask_strategy['price_side']}s"][0][0]
+        current_price = self.market.top_of_book(pair, book_side(self.config, 'exit'))
         if current_price < order['price'] * 0.99:
             return True
         return False
 
     def confirm_trade_entry(self, pair: str, order_type: str, amount: float, rate: float, time_in_force: str, **kwargs) -> bool:
-        bid_strategy = self.config.get('bid_strategy', {})
-        ob = self.dp.orderbook(pair, 1)
-        current_price = ob[f"{bid_strategy['price_side']}s"][0][0]
+        current_price = self.market.top_of_book(pair, book_side(self.config, 'entry'))
         if current_price > rate * 1.01:
             return False
         return True
\ No newline at end of file
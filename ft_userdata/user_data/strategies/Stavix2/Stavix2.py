@@ -1,7 +1,10 @@
 from freqtrade.strategy.interface import IStrategy
 from pandas import DataFrame
-from technical.indicators import ichimoku
 import freqtrade.vendor.qtpylib.indicators as qtpylib
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.ichimoku import Ichimoku
 
 
 class Stavix2(IStrategy):
@@ -13,7 +16,7 @@ class Stavix2(IStrategy):
     ticker_interval = '1m'
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        cloud = ichimoku(dataframe, conversion_line_period=200, base_line_periods=350, laggin_span=150, displacement=75)
+        cloud = Ichimoku.of(dataframe).lines(conversion_line_period=200, base_line_periods=350, laggin_span=150, displacement=75, columns=['tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'chikou_span'], lookahead=True)
         dataframe['tenkan_sen'] = cloud['tenkan_sen']
         dataframe['kijun_sen'] = cloud['kijun_sen']
         dataframe['senkou_span_a'] = cloud['senkou_span_a']
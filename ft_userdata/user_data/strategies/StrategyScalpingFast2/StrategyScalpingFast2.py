@@ -2,7 +2,10 @@
 from freqtrade.strategy.interface import IStrategy
 from freqtrade.strategy import timeframe_to_minutes
 from pandas import DataFrame
-from technical.util import resample_to_interval, resampled_merge
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.resample import resample_to_interval, resampled_merge
 from functools import reduce
 import numpy  # noqa
 # --------------------------------
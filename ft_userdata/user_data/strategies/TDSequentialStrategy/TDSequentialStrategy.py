@@ -3,6 +3,10 @@ from pandas import DataFrame
 import scipy.signal
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from freqtrade.strategy.interface import IStrategy
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.streaks import consecutive_count
 
 
 class TDSequentialStrategy(IStrategy):
@@ -90,13 +94,11 @@ class TDSequentialStrategy(IStrategy):
 
         # count consecutive closes “lower” than the close 4 bars prior.
         dataframe['seq_buy'] = dataframe['close'] < dataframe['close'].shift(4)
-        dataframe['seq_buy'] = dataframe['seq_buy'] * (dataframe['seq_buy'].groupby(
-            (dataframe['seq_buy'] != dataframe['seq_buy'].shift()).cumsum()).cumcount() + 1)
+        dataframe['seq_buy'] = consecutive_count(dataframe['seq_buy'])
 
         # count consecutive closes “higher” than the close 4 bars prior.
         dataframe['seq_sell'] = dataframe['close'] > dataframe['close'].shift(4)
-        dataframe['seq_sell'] = dataframe['seq_sell'] * (dataframe['seq_sell'].groupby(
-            (dataframe['seq_sell'] != dataframe['seq_sell'].shift()).cumsum()).cumcount() + 1)
+        dataframe['seq_sell'] = consecutive_count(dataframe['seq_sell'])
 
         for index, row in dataframe.iterrows():
             # check if the low of bars 6 and 7 in the count are exceeded by the low of bars 8 or 9.
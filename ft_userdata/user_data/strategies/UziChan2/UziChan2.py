@@ -7,8 +7,11 @@ import logging
 import pandas_ta as pta
 
 from pandas import DataFrame, Series
-from datetime import datetime, timezone
 from freqtrade.persistence import Trade
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.trailing_replay import replay_trailing_buy, replayed_entry_signals, replayed_entry_tags, strategy_now, trailing_buy_step, trailing_sell_step
 
 
 logger = logging.getLogger(__name__)
@@ -81,6 +84,7 @@ class UziChanTB2(UziChan2):
     #trailing_expire_seconds = 1800      #NOTE 5m timeframe
     trailing_expire_seconds = 1800/5    #NOTE 1m timeframe
     #trailing_expire_seconds = 1800*3    #NOTE 15m timeframe
+    trailing_replay_timeframe = '1m'  # detail candles for the backtest replay
 
     # If the current candle goes above min_uptrend_trailing_profit % before trailing_expire_seconds_uptrend seconds, buy the coin
     trailing_buy_uptrend_enabled = True
@@ -137,7 +141,7 @@ class UziChanTB2(UziChan2):
 
     def trailing_buy_info(self, pair: str, current_price: float):
         # current_time live, dry run
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         if not self.debug_mode:
             return
         trailing_buy = self.trailing_buy(pair)
@@ -161,7 +165,7 @@ class UziChanTB2(UziChan2):
 
     def trailing_sell_info(self, pair: str, current_price: float):
         # current_time live, dry run
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         if not self.debug_mode:
             return
         trailing_sell = self.trailing_sell(pair)
@@ -215,7 +219,7 @@ class UziChanTB2(UziChan2):
         # example with duration and indicators
         # dry run, live only
         last_candle = dataframe.iloc[-1]
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         trailing_duration = current_time - trailing_buy['start_trailing_time']
         if trailing_duration.total_seconds() > self.trailing_expire_seconds:
             if ((current_trailing_profit_ratio > 0) and (last_candle['buy'] == 1)):
@@ -261,7 +265,7 @@ class UziChanTB2(UziChan2):
         # example with duration and indicators
         # dry run, live only
         last_candle = dataframe.iloc[-1]
-        current_time = datetime.now(timezone.utc)
+        current_time = strategy_now(self)
         trailing_duration =  current_time - trailing_sell['start_trailing_time']
         if trailing_duration.total_seconds() > self.trailing_expire_seconds:
             if ((current_trailing_sell_profit_ratio > 0) and (last_candle['sell'] != 0)):
@@ -304,72 +308,8 @@ class UziChanTB2(UziChan2):
             
             if val:
                 if self.trailing_buy_order_enabled and self.config['runmode'].value in ('live', 'dry_run'):
-                    val = False
                     dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-                    if(len(dataframe) >= 1):
-                        last_candle = dataframe.iloc[-1].squeeze()
-                        current_price = rate
-                        trailing_buy = self.trailing_buy(pair)
-                        trailing_buy_offset = self.trailing_buy_offset(dataframe, pair, current_price)
-
-                        if trailing_buy['allow_trailing']:
-                            if (not trailing_buy['trailing_buy_order_started'] and (last_candle['buy'] == 1)):
-                                # start trailing buy
-                                
-                                trailing_buy['trailing_buy_order_started'] = True
-                                trailing_buy['trailing_buy_order_uplimit'] = last_candle['close']
-                                trailing_buy['start_trailing_price'] = last_candle['close']
-                                trailing_buy['buy_tag'] = last_candle['buy_tag']
-                                trailing_buy['start_trailing_time'] = datetime.now(timezone.utc)
-                                trailing_buy['offset'] = 0
-                                
-                                self.trailing_buy_info(pair, current_price)
-                                logger.info(f'start trailing buy for {pair} at {last_candle["close"]}')
-
-                            elif trailing_buy['trailing_buy_order_started']:
-                                if trailing_buy_offset == 'forcebuy':
-                                    # buy in custom conditions
-                                    val = True
-                                    ratio = "%.2f" % ((self.current_trailing_buy_profit_ratio(pair, current_price)) * 100)
-                                    self.trailing_buy_info(pair, current_price)
-                                    logger.info(f"price OK for {pair} ({ratio} %, {current_price}), order may not be triggered if all slots are full")
-
-                                elif trailing_buy_offset is None:
-                                    # stop trailing buy custom conditions
-                                    self.trailing_buy(pair, reinit=True)
-                                    logger.info(f'STOP trailing buy for {pair} because "trailing buy offset" returned None')
-
-                                elif current_price < trailing_buy['trailing_buy_order_uplimit']:
-                                    # update uplimit
-                                    old_uplimit = trailing_buy["trailing_buy_order_uplimit"]
-                                    self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'] = min(current_price * (1 + trailing_buy_offset), self.custom_info_trail_buy[pair]['trailing_buy']['trailing_buy_order_uplimit'])
-                                    self.custom_info_trail_buy[pair]['trailing_buy']['offset'] = trailing_buy_offset
-                                    self.trailing_buy_info(pair, current_price)
-                                    logger.info(f'update trailing buy for {pair} at {old_uplimit} -> {self.custom_info_trail_buy[pair]["trailing_buy"]["trailing_buy_order_uplimit"]}')
-                                elif current_price < (trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_buy)):
-                                    # buy ! current price > uplimit && lower thant starting price
-                                    val = True
-                                    ratio = "%.2f" % ((self.current_trailing_buy_profit_ratio(pair, current_price)) * 100)
-                                    self.trailing_buy_info(pair, current_price)
-                                    logger.info(f"current price ({current_price}) > uplimit ({trailing_buy['trailing_buy_order_uplimit']}) and lower than starting price price ({(trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_buy))}). OK for {pair} ({ratio} %), order may not be triggered if all slots are full")
-
-                                elif current_price > (trailing_buy['start_trailing_price'] * (1 + self.trailing_buy_max_stop)):
-                                    # stop trailing buy because price is too high
-                                    self.trailing_buy(pair, reinit=True)
-                                    self.trailing_buy_info(pair, current_price)
-                                    logger.info(f'STOP trailing buy for {pair} because of the price is higher than starting price * {1 + self.trailing_buy_max_stop}')
-                                else:
-                                    # uplimit > current_price > max_price, continue trailing and wait for the price to go down
-                                    self.trailing_buy_info(pair, current_price)
-                                    logger.info(f'price too high for {pair} !')
-
-                        else:
-                            logger.info(f"Wait for next buy signal for {pair}")
-
-                    if (val == True):
-                        self.trailing_buy_info(pair, rate)
-                        self.trailing_buy(pair, reinit=True)
-                        logger.info(f'STOP trailing buy for {pair} because I buy it')
+                    val = trailing_buy_step(self, pair, dataframe, rate)
             
             return val
 
@@ -380,71 +320,8 @@ class UziChanTB2(UziChan2):
         
         if val:
             if self.trailing_sell_order_enabled and self.config['runmode'].value in ('live', 'dry_run'):
-                val = False
                 dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
-                if(len(dataframe) >= 1):
-                    last_candle = dataframe.iloc[-1].squeeze()
-                    current_price = rate
-                    trailing_sell= self.trailing_sell(pair)
-                    trailing_sell_offset = self.trailing_sell_offset(dataframe, pair, current_price)
-
-                    if trailing_sell['allow_sell_trailing']:
-                        if (not trailing_sell['trailing_sell_order_started'] and (last_candle['sell'] != 0)):
-                            trailing_sell['trailing_sell_order_started'] = True
-                            trailing_sell['trailing_sell_order_downlimit'] = last_candle['close']
-                            trailing_sell['start_trailing_sell_price'] = last_candle['close']
-                            trailing_sell['sell_tag'] = last_candle['sell_tag']
-                            trailing_sell['start_trailing_time'] = datetime.now(timezone.utc)
-                            trailing_sell['offset'] = 0
-                            
-                            self.trailing_sell_info(pair, current_price)
-                            logger.info(f'start trailing sell for {pair} at {last_candle["close"]}')
-
-                        elif trailing_sell['trailing_sell_order_started']:
-                            if trailing_sell_offset == 'forcesell':
-                                # sell in custom conditions
-                                val = True
-                                ratio = "%.2f" % ((self.current_trailing_sell_profit_ratio(pair, current_price)) * 100)
-                                self.trailing_sell_info(pair, current_price)
-                                logger.info(f"FORCESELL for {pair} ({ratio} %, {current_price})")
-
-                            elif trailing_sell_offset is None:
-                                # stop trailing sell custom conditions
-                                self.trailing_sell(pair, reinit=True)
-                                logger.info(f'STOP trailing sell for {pair} because "trailing sell offset" returned None')
-
-                            elif current_price > trailing_sell['trailing_sell_order_downlimit']:
-                                # update downlimit
-                                old_downlimit = trailing_sell["trailing_sell_order_downlimit"]
-                                self.custom_info_trail_sell[pair]['trailing_sell']['trailing_sell_order_downlimit'] = max(current_price * (1 - trailing_sell_offset), self.custom_info_trail_sell[pair]['trailing_sell']['trailing_sell_order_downlimit'])
-                                self.custom_info_trail_sell[pair]['trailing_sell']['offset'] = trailing_sell_offset
-                                self.trailing_sell_info(pair, current_price)
-                                logger.info(f'update trailing sell for {pair} at {old_downlimit} -> {self.custom_info_trail_sell[pair]["trailing_sell"]["trailing_sell_order_downlimit"]}')
-
-                            elif current_price > (trailing_sell['start_trailing_sell_price'] * (1 - self.trailing_sell_max_sell)):
-                                # sell! current price < downlimit && higher than starting price
-                                val = True
-                                ratio = "%.2f" % ((self.current_trailing_sell_profit_ratio(pair, current_price)) * 100)
-                                self.trailing_sell_info(pair, current_price)
-                                logger.info(f"current price ({current_price}) < downlimit ({trailing_sell['trailing_sell_order_downlimit']}) but higher than starting price ({(trailing_sell['start_trailing_sell_price'] * (1 + self.trailing_sell_max_sell))}). OK for {pair} ({ratio} %)")
-
-                            elif current_price < (trailing_sell['start_trailing_sell_price'] * (1 - self.trailing_sell_max_stop)):
-                                # stop trailing, sell fast, price too low
-                                val = True                                
-                                self.trailing_sell_info(pair, current_price)
-                                logger.info(f'STOP trailing sell for {pair} because of the price is much lower than starting price * {1 + self.trailing_sell_max_stop}')
-                            else:
-                                # uplimit > current_price > max_price, continue trailing and wait for the price to go down
-                                self.trailing_sell_info(pair, current_price)
-                                logger.info(f'price too low for {pair} !')
-
-                    else:
-                        logger.info(f"Wait for next sell signal for {pair}")
-
-                if (val == True):
-                    self.trailing_sell_info(pair, rate)
-                    self.trailing_sell(pair, reinit=True)
-                    logger.info(f'STOP trailing sell for {pair} because I SOLD it')
+                val = trailing_sell_step(self, pair, dataframe, rate)
 
         if sell_reason != 'sell_signal':
             val = True
@@ -472,6 +349,13 @@ class UziChanTB2(UziChan2):
                     logger.info(f"Continue trailing for {metadata['pair']}. Manually trigger buy signal!!")
                     dataframe.loc[:,'buy'] = 1
                     dataframe.loc[:, 'buy_tag'] = trailing_buy['buy_tag']
+        elif self.trailing_buy_order_enabled and self.config['runmode'].value in ('backtest', 'hyperopt'):
+            # replay the trailing buy over the detail candles
+            detail = self.dp.get_pair_dataframe(metadata['pair'], self.trailing_replay_timeframe)
+            if not detail.empty:
+                entries = replay_trailing_buy(self, metadata['pair'], dataframe, detail)
+                dataframe['buy'] = replayed_entry_signals(dataframe, entries)
+                dataframe['buy_tag'] = replayed_entry_tags(dataframe, entries)
 
         return dataframe
 
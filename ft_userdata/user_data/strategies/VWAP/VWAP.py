@@ -5,6 +5,10 @@ import freqtrade.vendor.qtpylib.indicators as qtpylib
 import pandas_ta as pta
 import talib.abstract as ta
 # --------------------------------
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.protections import ProtectionFeatures
 
 # VWAP bands
 def VWAPB(dataframe, window_size=20, num_of_std=1):
@@ -22,10 +26,7 @@ def top_percent_change(dataframe: DataFrame, length: int) -> float:
         :param dataframe: DataFrame The original OHLC dataframe
         :param length: int The length to look back
         """
-        if length == 0:
-            return (dataframe['open'] - dataframe['close']) / dataframe['close']
-        else:
-            return (dataframe['open'].rolling(length).max() - dataframe['close']) / dataframe['close']
+        return ProtectionFeatures.of(dataframe).top_percent_change(length)
 
 class VWAP(IStrategy):
     """
@@ -15,6 +15,11 @@ from freqtrade.persistence import Trade
 from freqtrade.strategy import stoploss_from_open, merge_informative_pair, DecimalParameter, IntParameter, CategoricalParameter
 import technical.indicators as ftt
 
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.rolling import weighted_lag
+
 # Buy hyperspace params:
 buy_params = {
     "base_nb_candles_buy": 31,
@@ -39,9 +44,9 @@ def Kalman(dataframe: DataFrame):
     src = dataframe['close']
     tr = ta.TRANGE(dataframe)
     df['value1'] = 0.2 * (src - src.shift(1, fill_value=0)) 
-    df['value1'] = df['value1'].rolling(2, min_periods=1).apply(lambda x: x.iloc[0] + 0.8 * x.iloc[-1])
+    df['value1'] = weighted_lag(df['value1'], 2, 1.0, 0.8, min_periods=1)
     df['value2'] = 0.1 * (tr)
-    df['value2'] = df['value2'].rolling(2, min_periods=1).apply(lambda x: x.iloc[0] + 0.8 * x.iloc[-1])
+    df['value2'] = weighted_lag(df['value2'], 2, 1.0, 0.8, min_periods=1)
 
     L = abs(df['value1'] / df['value2'])
     # Alpha filter
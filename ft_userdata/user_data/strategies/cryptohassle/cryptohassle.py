@@ -10,6 +10,10 @@ from typing import Dict, List
 import numpy as np
 # --------------------------------
 # 11-Aug-20  - seems to be good making a few trades  5 days 33 wins 7 losses AVE 0.41% tot ROI 17.14%
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.rolling import rolling_any
 
 class cryptohassle(IStrategy):
     """
@@ -133,11 +137,11 @@ class cryptohassle(IStrategy):
             (
                     
                     # Heikin Ashi SSL Channels
-                    (dataframe['ha_ssl_cross_above'].rolling(5).apply(lambda x: x.any(), raw=False) == 1) &
+                    (rolling_any(dataframe['ha_ssl_cross_above'], 5) == 1) &
                     # Momentum
-                    (dataframe['ha_mom_cross_above'].rolling(5).apply(lambda x: x.any(), raw=False) == 1) &
+                    (rolling_any(dataframe['ha_mom_cross_above'], 5) == 1) &
                     # Heikin Ashi MacD
-                    (dataframe['ha_macd_cross_above'].rolling(5).apply(lambda x: x.any(), raw=False) == 1) &
+                    (rolling_any(dataframe['ha_macd_cross_above'], 5) == 1) &
                     # Volume
                     (dataframe['volume'] > 1000)
                     
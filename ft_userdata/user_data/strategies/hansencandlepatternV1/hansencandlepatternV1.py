@@ -13,6 +13,10 @@ from pandas import DataFrame, DatetimeIndex, merge
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 import numpy  # noqa
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.candle_patterns import pattern_values, scan_patterns
 
 
 class hansencandlepatternV1(IStrategy):
@@ -26,12 +30,16 @@ class hansencandlepatternV1(IStrategy):
     }
     stoploss = -0.1
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:   
-        dataframe['3LINESTRIKE'] = ta.CDL3LINESTRIKE(dataframe['open'], dataframe['high'], dataframe['low'], dataframe['close'])
-        dataframe['EVENINGSTAR'] = ta.CDLEVENINGSTAR(dataframe['open'], dataframe['high'], dataframe['low'], dataframe['close'])
-        dataframe['ABANDONEDBABY'] = ta.CDLEVENINGSTAR(dataframe['open'], dataframe['high'], dataframe['low'], dataframe['close'])
-        dataframe['HARAMI'] = ta.CDLHARAMI(dataframe['open'], dataframe['high'], dataframe['low'], dataframe['close'])
-        dataframe['INVERTEDHAMMER'] = ta.CDLINVERTEDHAMMER(dataframe['open'], dataframe['high'], dataframe['low'], dataframe['close'])
-        dataframe['ENGULFING'] = ta.CDLENGULFING(dataframe['open'], dataframe['high'], dataframe['low'], dataframe['close'])
+        # scan only the patterns read below
+        patterns = ['CDL3LINESTRIKE', 'CDLEVENINGSTAR', 'CDLHARAMI', 'CDLINVERTEDHAMMER', 'CDLENGULFING']
+        for col, values in scan_patterns(dataframe, patterns=patterns).items():
+            dataframe[col] = values
+        dataframe['3LINESTRIKE'] = pattern_values(dataframe, 'CDL3LINESTRIKE')
+        dataframe['EVENINGSTAR'] = pattern_values(dataframe, 'CDLEVENINGSTAR')
+        dataframe['ABANDONEDBABY'] = pattern_values(dataframe, 'CDLEVENINGSTAR')
+        dataframe['HARAMI'] = pattern_values(dataframe, 'CDLHARAMI')
+        dataframe['INVERTEDHAMMER'] = pattern_values(dataframe, 'CDLINVERTEDHAMMER')
+        dataframe['ENGULFING'] = pattern_values(dataframe, 'CDLENGULFING')
         dataframe['hclose']=(dataframe['open'] + dataframe['high'] + dataframe['low'] + dataframe['close']) / 4
         dataframe['hopen']= ((dataframe['open'].shift(2) + dataframe['close'].shift(2))/ 2)
         dataframe['hhigh']=dataframe[['open','close','high']].max(axis=1)
@@ -12,7 +12,11 @@ from freqtrade.strategy import (BooleanParameter, CategoricalParameter, DecimalP
 # --------------------------------
 # Add your lib to import here
 import talib.abstract as ta
-import freqtrade.vendor.qtpylib.indicators as qtpylib
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from tradeboddy.broadcast import All, Compare, CrossedAbove, P
 
 
 # This class is a sample. Feel free to customize it.
@@ -59,6 +63,22 @@ class stratfib(IStrategy):
     buy_rsi = IntParameter(low=1, high=50, default=30, space='buy', optimize=True, load=True)
     sell_rsi = IntParameter(low=50, high=100, default=70, space='sell', optimize=True, load=True)
 
+    # Signal conditions, declared once so hyperopt batches can evaluate them for many parameter values
+    buy_spec = All(
+        # Signal: RSI crosses above 30
+        CrossedAbove('rsi', P('buy_rsi')),
+        Compare('dema8', '>', 'dema21'),
+        Compare('dema8', '>', 'dema89'),
+        Compare('volume', '>', 0),  # Make sure Volume is not 0
+    )
+    sell_spec = All(
+        # Signal: RSI crosses above 70
+        CrossedAbove('rsi', P('sell_rsi')),
+        Compare('dema8', '<', 'dema21'),
+        Compare('dema8', '<', 'dema89'),
+        Compare('volume', '>', 0),  # Make sure Volume is not 0
+    )
+
     # Optimal timeframe for the strategy.
     timeframe = '1h'
 
@@ -150,15 +170,7 @@ class stratfib(IStrategy):
         :param metadata: Additional information, like the currently traded pair
         :return: DataFrame with buy column
         """
-        dataframe.loc[
-            (
-                # Signal: RSI crosses above 30
-                (qtpylib.crossed_above(dataframe['rsi'], self.buy_rsi.value)) &
-                (dataframe['dema8'] > dataframe['dema21']) &
-                (dataframe['dema8'] > dataframe['dema89']) &
-                (dataframe['volume'] > 0)  # Make sure Volume is not 0
-            ),
-            'buy'] = 1
+        dataframe.loc[self.buy_spec.mask(dataframe, self), 'buy'] = 1
 
         return dataframe
 
@@ -169,13 +181,5 @@ class stratfib(IStrategy):
         :param metadata: Additional information, like the currently traded pair
         :return: DataFrame with sell column
         """
-        dataframe.loc[
-            (
-                # Signal: RSI crosses above 70
-                (qtpylib.crossed_above(dataframe['rsi'], self.sell_rsi.value)) &
-                (dataframe['dema8'] < dataframe['dema21']) &
-                (dataframe['dema8'] < dataframe['dema89']) &
-                (dataframe['volume'] > 0)  # Make sure Volume is not 0
-            ),
-            'sell'] = 1
+        dataframe.loc[self.sell_spec.mask(dataframe, self), 'sell'] = 1
         return dataframe
@@ -0,0 +1,12 @@
+"""
+Shared helpers for the strategies in ``user_data/strategies``.
+
+Strategies live one per folder, so this package is not on the import path by
+default. Add ``user_data`` to ``sys.path`` before importing from it:
+
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+    from tradeboddy.informative_cache import InformativeCache
+"""
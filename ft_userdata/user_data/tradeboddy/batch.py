@@ -0,0 +1,545 @@
+"""
+Batch comparison of many strategies on candle data loaded once.
+
+Comparing the ``BB_RPB_TSL*`` or ``NostalgiaForInfinity*`` variants on the same
+pairs and timerange with one ``freqtrade-backtest`` container per strategy reads
+the same feather history from disk for every run, and every run computes the
+same EMAs, RSIs and Bollinger bands again. The batch runner:
+
+* loads the candles of every (pair, timeframe) the strategies need, their
+  ``informative_pairs()`` included, once into shared memory (``SharedCandles``);
+  worker processes map the blocks instead of reading files, and ``self.dp`` serves
+  informative frames from them,
+* fans the strategies out over a process pool, each running the pre-screen
+  (populate, buy/sell, ``Simulator``) of ``tradeboddy.prescreen`` on all pairs,
+* puts a content-addressed cache in front of the TA-Lib functions the strategy
+  modules call (``IndicatorCache``): a call on the unchanged candle columns is keyed
+  by the function, its parameters and the hash of the candle data, so
+  ``ta.EMA(dataframe, timeperiod=50)`` is computed by the first strategy and read
+  from ``user_data/indicator_cache/`` by all others, and by the next batch,
+* writes one comparison report of all strategies to ``user_data/batch/``.
+
+    python -m tradeboddy.batch --filter 'BB_RPB_TSL*' 'NostalgiaForInfinity*' --days 180 --workers 8
+
+Each run gets its own copy of the candle columns, so strategies writing into
+their frame do not affect each other. Under pandas Copy-on-Write (pandas 3, or
+enabled on 2.x) the registered columns are recognised by their data pointer, a
+write copies them first; without it they are recognised by a hash of their values. Calls on anything but the untouched
+candle columns (Heikin-Ashi frames, other indicators, copies) are not cached.
+The indicator cache can be deleted at any time.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+from tradeboddy.dataprep import data_key
+from tradeboddy.prescreen import (USER_DATA, Simulator, backtest_config, discover, load_candles, load_strategy,
+                                  trade_stats)
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = 'indicator_cache'
+REPORT_DIR = 'batch'
+# results computed faster than this are not worth a file
+MIN_SECONDS = 0.002
+
+# (kind, pair, timeframe): 'candles' are the pre-screen candles, 'dp' what DataProvider returns
+FrameKey = Tuple[str, str, str]
+
+# set in the worker processes by _init_worker()
+_candles: Optional['SharedCandles'] = None
+_cache_dir: Optional[Path] = None
+
+
+class SharedCandles:
+    """
+    Candle frames in shared memory blocks: int64 dates followed by the float64 columns.
+    """
+
+    def __init__(self, manifest: List[dict], blocks: Dict[FrameKey, SharedMemory]):
+        self.manifest = manifest
+        self.blocks = blocks
+        self.entries = {tuple(entry['key']): entry for entry in manifest}
+
+    @classmethod
+    def create(cls, frames: Dict[FrameKey, DataFrame]) -> 'SharedCandles':
+        manifest, blocks = [], {}
+        for key, frame in frames.items():
+            columns = [col for col in frame.columns if col != 'date']
+            n = len(frame)
+            block = SharedMemory(create=True, size=max(n * 8 * (len(columns) + 1), 1))
+            tz = frame['date'].dt.tz
+            # stored as UTC wall time, the time zone is restored on read
+            dates = (frame['date'].dt.tz_convert('UTC').dt.tz_localize(None) if tz else frame['date']).to_numpy()
+            np.ndarray(n, np.int64, block.buf)[:] = dates.view(np.int64)
+            np.ndarray((len(columns), n), np.float64, block.buf, offset=n * 8)[:] = \
+                frame[columns].to_numpy(np.float64).T
+            blocks[key] = block
+            manifest.append({
+                'key': key, 'block': block.name, 'rows': n, 'columns': columns,
+                'date_unit': str(dates.dtype), 'tz': str(tz) if tz else None,
+                'dtypes': [str(frame[col].dtype) for col in columns], 'data_key': data_key(frame),
+            })
+        return cls(manifest, blocks)
+
+    @classmethod
+    def attach(cls, manifest: List[dict]) -> 'SharedCandles':
+        blocks = {}
+        for entry in manifest:
+            blocks[tuple(entry['key'])] = SharedMemory(name=entry['block'])
+        return cls(manifest, blocks)
+
+    def close(self, unlink: bool = False) -> None:
+        for block in self.blocks.values():
+            block.close()
+            if unlink:
+                block.unlink()
+        self.blocks = {}
+
+    def nbytes(self) -> int:
+        return sum(block.size for block in self.blocks.values())
+
+    def data_key(self, key: FrameKey) -> Optional[str]:
+        entry = self.entries.get(key)
+        return None if entry is None else entry['data_key']
+
+    def frame(self, key: FrameKey) -> Optional[DataFrame]:
+        """
+        A copy of the frame stored under ``key``, or None.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        n, columns, block = entry['rows'], entry['columns'], self.blocks[key]
+        dates = pd.Series(np.ndarray(n, np.int64, block.buf).view(entry['date_unit']), copy=True)
+        if entry['tz']:
+            dates = dates.dt.tz_localize('UTC').dt.tz_convert(entry['tz'])
+        values = np.ndarray((len(columns), n), np.float64, block.buf, offset=n * 8)
+        frame = DataFrame({'date': dates, **{col: values[i] for i, col in enumerate(columns)}}, copy=True)
+        for col, dtype in zip(columns, entry['dtypes']):
+            if dtype != 'float64':
+                frame[col] = frame[col].astype(dtype)
+        return frame
+
+
+class SharedDataProvider:
+    """
+    ``strategy.dp`` serving the preloaded frames, anything else from the real DataProvider.
+    """
+
+    def __init__(self, dp, candles: SharedCandles, cache: Optional['IndicatorCache'] = None):
+        self._dp = dp
+        self._candles = candles
+        self._cache = cache
+
+    def get_pair_dataframe(self, pair: str, timeframe: Optional[str] = None, candle_type: str = '') -> DataFrame:
+        key = ('dp', pair, timeframe)
+        frame = self._candles.frame(key)
+        if frame is None:
+            return self._dp.get_pair_dataframe(pair, timeframe, candle_type) if candle_type \
+                else self._dp.get_pair_dataframe(pair, timeframe)
+        if self._cache is not None:
+            self._cache.register(frame, self._candles.data_key(key))
+        return frame
+
+    def historic_ohlcv(self, pair: str, timeframe: Optional[str] = None, candle_type: str = '') -> DataFrame:
+        frame = self._candles.frame(('dp', pair, timeframe))
+        if frame is None:
+            return self._dp.historic_ohlcv(pair, timeframe, candle_type) if candle_type \
+                else self._dp.historic_ohlcv(pair, timeframe)
+        return frame
+
+    def __getattr__(self, name: str):
+        return getattr(self._dp, name)
+
+
+def _copy_on_write() -> bool:
+    # always on from pandas 3; before it only if enabled, which the freqtrade images do not
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+
+def _pointer(values) -> Optional[Tuple[int, int]]:
+    # identity of a float64 column: where its data starts and how long it is
+    if isinstance(values, Series):
+        values = values.to_numpy(copy=False)
+    if not isinstance(values, np.ndarray) or values.dtype != np.float64 or values.ndim != 1 \
+            or not values.flags.c_contiguous:
+        return None
+    return values.__array_interface__['data'][0], len(values)
+
+
+def _content(values) -> Optional[Tuple[str, int]]:
+    # hash of a float64 column's values and its length
+    if _pointer(values) is None:
+        return None
+    values = values.to_numpy(copy=False) if isinstance(values, Series) else values
+    return hashlib.sha1(values).hexdigest(), len(values)
+
+
+def _scalar(value) -> bool:
+    return value is None or isinstance(value, (bool, int, float, str, np.integer, np.floating))
+
+
+class IndicatorCache:
+    """
+    TA-Lib results on registered candle columns, keyed by function, parameters and data hash.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+        # Without Copy-on-Write a .loc/.iloc write into a candle column keeps its data
+        # pointer, so the columns are identified by a hash of their values instead
+        self._identity = _pointer if _copy_on_write() else _content
+        # (data pointer or hash, length) -> (data key, column) of the registered candle columns
+        self._columns: Dict[Tuple[object, int], Tuple[str, str]] = {}
+        # keeps the registered columns referenced, so under Copy-on-Write a write copies them first
+        self._views: List[Series] = []
+        self._memory: Dict[str, tuple] = {}
+        self._input_names: Dict[str, dict] = {}
+
+    def register(self, frame: DataFrame, key: Optional[str]) -> None:
+        if key is None:
+            return
+        for col in ('open', 'high', 'low', 'close', 'volume'):
+            if col in frame.columns:
+                view = frame[col]
+                identity = self._identity(view)
+                if identity is not None:
+                    self._views.append(view)
+                    self._columns[identity] = (key, col)
+
+    def release(self) -> None:
+        self._columns, self._views, self._memory = {}, [], {}
+
+    def _source(self, values) -> Optional[Tuple[str, str]]:
+        identity = self._identity(values)
+        return None if identity is None else self._columns.get(identity)
+
+    def _abstract_inputs(self, name: str, frame: DataFrame, kwargs: dict) -> Optional[list]:
+        # the columns talib.abstract reads from a frame, after price=/prices= overrides
+        if name not in self._input_names:
+            import talib.abstract
+
+            self._input_names[name] = dict(talib.abstract.Function(name).input_names)
+        inputs = []
+        for input_name, default in self._input_names[name].items():
+            columns = kwargs.pop(input_name, default)
+            for col in [columns] if isinstance(columns, str) else columns:
+                source = self._source(frame[col]) if col in frame.columns else None
+                if source is None:
+                    return None
+                inputs.append(source)
+        return inputs
+
+    def key(self, api: str, name: str, args: tuple, kwargs: dict) -> Tuple[Optional[str], Optional[object]]:
+        """
+        Content key of a call and the pandas object its output is aligned to, or (None, None).
+        """
+        kwargs = dict(kwargs)
+        args = list(args)
+        inputs, index_source = [], None
+        if api == 'abstract' and args and isinstance(args[0], DataFrame):
+            index_source = args.pop(0)
+            inputs = self._abstract_inputs(name, index_source, kwargs)
+            if inputs is None:
+                return None, None
+        else:
+            while args and isinstance(args[0], (np.ndarray, Series)):
+                source = self._source(args[0])
+                if source is None:
+                    return None, None
+                inputs.append(source)
+                if index_source is None and isinstance(args[0], Series):
+                    index_source = args[0]
+                args.pop(0)
+        if not inputs or not all(_scalar(arg) for arg in args) or not all(_scalar(v) for v in kwargs.values()):
+            return None, None
+        description = repr((api, name, inputs, args, sorted(kwargs.items())))
+        return hashlib.sha1(description.encode()).hexdigest(), index_source
+
+    def call(self, api: str, name: str, func, args: tuple, kwargs: dict):
+        key, index_source = self.key(api, name, args, kwargs)
+        if key is None:
+            return func(*args, **kwargs)
+        packed = self._memory.get(key) or self._load(key)
+        if packed is not None:
+            self.hits += 1
+            self._memory[key] = packed
+            return _unpack(packed, None if index_source is None else index_source.index)
+        self.misses += 1
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        packed = _pack(result)
+        if packed is not None:
+            self._memory[key] = packed
+            if time.perf_counter() - started >= MIN_SECONDS:
+                self._store(key, packed)
+        return result
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.npz"
+
+    def _load(self, key: str) -> Optional[tuple]:
+        try:
+            with np.load(self.path(key), allow_pickle=False) as data:
+                kind, names = str(data['kind']), [str(name) for name in data['names']]
+                return kind, names, [data[f"a{i}"] for i in range(len(names))]
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            return None
+
+    def _store(self, key: str, packed: tuple) -> None:
+        kind, names, arrays = packed
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, 'wb') as f:
+                np.savez(f, kind=kind, names=np.array(names, dtype=str),
+                         **{f"a{i}": array for i, array in enumerate(arrays)})
+            os.replace(tmp, path)
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            logger.warning(f"Indicator cache: could not write {path.name}: {e}")
+
+    @contextmanager
+    def installed(self, strategy):
+        """
+        Route the TA-Lib calls of the strategy's modules through the cache while active.
+        """
+        import talib
+        import talib.abstract
+
+        apis = {id(talib): 'func', id(talib.abstract): 'abstract'}
+        modules = {sys.modules[cls.__module__] for cls in type(strategy).__mro__
+                   if not cls.__module__.startswith(('freqtrade', 'builtins', 'abc')) and cls.__module__ in sys.modules}
+        patched = []
+        for module in modules:
+            for name, value in list(vars(module).items()):
+                if id(value) in apis:
+                    patched.append((module, name, value))
+                    setattr(module, name, _CachedTalib(value, apis[id(value)], self))
+        try:
+            yield self
+        finally:
+            for module, name, value in patched:
+                setattr(module, name, value)
+
+
+def _pack(result) -> Optional[tuple]:
+    # (kind, names, arrays) of a TA-Lib result
+    if isinstance(result, Series):
+        return 'series', ['' if result.name is None else str(result.name)], [result.to_numpy()]
+    if isinstance(result, DataFrame):
+        return 'frame', [str(col) for col in result.columns], [result[col].to_numpy() for col in result.columns]
+    if isinstance(result, np.ndarray):
+        return 'array', [''], [result]
+    if isinstance(result, (list, tuple)) and result and all(isinstance(item, np.ndarray) for item in result):
+        return type(result).__name__, [''] * len(result), list(result)
+    return None
+
+
+def _unpack(packed: tuple, index) -> object:
+    kind, names, arrays = packed
+    arrays = [array.copy() for array in arrays]
+    if kind == 'series':
+        return Series(arrays[0], index=index, name=names[0] or None)
+    if kind == 'frame':
+        return DataFrame(dict(zip(names, arrays)), index=index)
+    if kind == 'array':
+        return arrays[0]
+    return tuple(arrays) if kind == 'tuple' else arrays
+
+
+class _CachedTalib:
+    """
+    Stand-in for the ``talib`` / ``talib.abstract`` module of a strategy, TA-Lib functions go through the cache.
+    """
+
+    def __init__(self, module, api: str, cache: IndicatorCache):
+        self._module = module
+        self._api = api
+        self._cache = cache
+        self._functions = {}
+
+    def __getattr__(self, name: str):
+        value = getattr(self._module, name)
+        if not (name.isupper() and callable(value)):
+            return value
+        if name not in self._functions:
+            def cached(*args, _name=name, _func=value, **kwargs):
+                return self._cache.call(self._api, _name, _func, args, kwargs)
+
+            self._functions[name] = cached
+        return self._functions[name]
+
+
+def _init_worker(manifest: List[dict], cache_dir: str) -> None:
+    global _candles, _cache_dir
+    _candles = SharedCandles.attach(manifest)
+    _cache_dir = Path(cache_dir)
+
+
+def run_strategy(name: str, strategy_path: Path, pairs: List[str], base_config: dict,
+                 days: Optional[int] = None, fee: float = 0.001) -> dict:
+    """
+    Pre-screen one strategy on the shared candles. Never raises, errors are reported in the result.
+    """
+    result = {'strategy': name, 'timeframe': None, 'error': None}
+    started = time.perf_counter()
+    cache = IndicatorCache(_cache_dir)
+    try:
+        strategy = load_strategy(name, strategy_path, base_config)
+        strategy.dp = SharedDataProvider(strategy.dp, _candles, cache)
+        result['timeframe'] = strategy.timeframe
+        simulator = Simulator.from_strategy(strategy, fee=fee)
+        all_trades = []
+        with cache.installed(strategy):
+            for pair in pairs:
+                key = ('candles', pair, strategy.timeframe)
+                candles = _candles.frame(key)
+                if candles is None:
+                    candles = load_candles(base_config['datadir'], pair, strategy.timeframe, days)
+                    if candles is None:
+                        continue
+                cache.register(candles, _candles.data_key(key))
+                try:
+                    metadata = {'pair': pair}
+                    df = strategy.advise_indicators(candles, metadata)
+                    df = strategy.advise_entry(df, metadata)
+                    df = strategy.advise_exit(df, metadata)
+                finally:
+                    cache.release()
+                all_trades.append(simulator.run(df, pair=pair))
+        if not all_trades:
+            result['error'] = f"no {strategy.timeframe} data"
+        else:
+            result.update(trade_stats(pd.concat(all_trades, ignore_index=True)))
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['cache_hits'] = cache.hits
+    result['cache_misses'] = cache.misses
+    result['seconds'] = round(time.perf_counter() - started, 2)
+    return result
+
+
+def required_frames(files: List[Path], pairs: List[str], base_config: dict) -> Tuple[set, set]:
+    """
+    The (pair, timeframe) candles and informative frames the strategies will ask for.
+    """
+    candles, informative = set(), set()
+    for f in files:
+        try:
+            strategy = load_strategy(f.stem, f.parent, base_config)
+        except Exception as e:
+            logger.warning(f"{f.stem}: could not load ({type(e).__name__}: {e}), its data is read from disk")
+            continue
+        candles.update((pair, strategy.timeframe) for pair in pairs)
+        try:
+            informative.update((inf[0], inf[1]) for inf in strategy.informative_pairs())
+        except Exception:
+            # informative_pairs() reading the whitelist or exchange, the frames are loaded on demand instead
+            pass
+    return candles, informative
+
+
+def load_shared(files: List[Path], pairs: List[str], base_config: dict, days: Optional[int] = None) -> SharedCandles:
+    from freqtrade.data.dataprovider import DataProvider
+
+    candle_keys, informative_keys = required_frames(files, pairs, base_config)
+    frames = {}
+    for pair, timeframe in sorted(candle_keys):
+        frame = load_candles(base_config['datadir'], pair, timeframe, days)
+        if frame is not None:
+            frames[('candles', pair, timeframe)] = frame
+    dp = DataProvider(base_config, None)
+    for pair, timeframe in sorted(informative_keys):
+        try:
+            frame = dp.get_pair_dataframe(pair, timeframe)
+        except Exception as e:
+            logger.warning(f"{pair} {timeframe}: {type(e).__name__}: {e}")
+            continue
+        if frame is not None and not frame.empty:
+            frames[('dp', pair, timeframe)] = frame
+    return SharedCandles.create(frames)
+
+
+def run_batch(files: List[Path], pairs: List[str], base_config: dict, workers: int = 4,
+              days: Optional[int] = None, fee: float = 0.001) -> DataFrame:
+    started = time.perf_counter()
+    candles = load_shared(files, pairs, base_config, days)
+    logger.info(f"{len(candles.manifest)} frames ({candles.nbytes() / 2 ** 20:.1f} MB) loaded into shared memory "
+                f"in {time.perf_counter() - started:.1f}s")
+    cache_dir = Path(base_config.get('user_data_dir', USER_DATA)) / CACHE_DIR
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(candles.manifest, str(cache_dir))) as pool:
+            futures = [pool.submit(run_strategy, f.stem, f.parent, pairs, base_config, days, fee) for f in files]
+            for future in as_completed(futures):
+                res = future.result()
+                results.append(res)
+                logger.info(f"{res['strategy']}: {res.get('trades', 0)} trades, "
+                            f"{res.get('profit_pct', 0):.2f}% ({res['seconds']}s, "
+                            f"{res['cache_hits']} cached indicators)"
+                            + (f" - {res['error']}" if res['error'] else ''))
+    finally:
+        candles.close(unlink=True)
+    report = DataFrame(results)
+    if 'profit_pct' in report:
+        report = report.sort_values('profit_pct', ascending=False, na_position='last')
+    return report.reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pre-screen many strategies on candles loaded once.')
+    parser.add_argument('--config', default=str(USER_DATA / 'config.json'))
+    parser.add_argument('--strategies-dir', default=str(USER_DATA / 'strategies'))
+    parser.add_argument('--datadir', default=None, help='defaults to the datadir of the config')
+    parser.add_argument('--pairs', nargs='+', default=None, help='defaults to the config whitelist')
+    parser.add_argument('--filter', nargs='+', default=None, help='strategy name patterns')
+    parser.add_argument('--days', type=int, default=None)
+    parser.add_argument('--fee', type=float, default=0.001)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--export', default=None,
+                        help='.csv or .json report, defaults to user_data/batch/<time>.csv')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    base_config = backtest_config(Path(args.config), Path(args.datadir) if args.datadir else None)
+    pairs = args.pairs or base_config['exchange']['pair_whitelist']
+    files = discover(Path(args.strategies_dir), args.filter)
+    started = time.perf_counter()
+    report = run_batch(files, pairs, base_config, args.workers, args.days, args.fee)
+    elapsed = time.perf_counter() - started
+
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(report.to_string(index=False))
+    print(f"\n{len(files)} strategies compared in {elapsed:.1f}s")
+    export = Path(args.export) if args.export else \
+        Path(base_config.get('user_data_dir', USER_DATA)) / REPORT_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.csv"
+    export.parent.mkdir(parents=True, exist_ok=True)
+    if export.suffix == '.json':
+        report.to_json(export, orient='records', indent=2)
+    else:
+        report.to_csv(export, index=False)
+    print(f"Report written to {export}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+"""
+Broadcast-parameter signal evaluation for threshold hyperopt spaces.
+
+Strategies like BBRSI, stratfib, ClucHAnix or NotAnotherSMAOffsetStrategy mostly
+compare precomputed indicators against hyperoptable thresholds, yet hyperopt
+calls ``populate_buy_trend`` once per epoch. A strategy can instead declare its
+conditions once:
+
+    buy_spec = All(
+        CrossedAbove('rsi', P('buy_rsi')),
+        Compare('dema8', '>', 'dema21'),
+        Compare('close', '<', Col('ma_buy_{base_nb_candles_buy}', scale=P('low_offset'))),
+    )
+
+    def populate_buy_trend(self, dataframe, metadata):
+        dataframe.loc[self.buy_spec.mask(dataframe, self), 'buy'] = 1
+        return dataframe
+
+``spec.masks(dataframe, candidates)`` evaluates a whole batch of parameter
+vectors in one broadcasted pass and returns an ``(candles, batch)`` boolean
+block. Column names may contain ``{param}`` placeholders to select a
+precomputed column per candidate (``ma_buy_{base_nb_candles_buy}``).
+
+``batch_epochs()`` feeds the blocks to the pre-screen simulator, and running the
+module benchmarks epochs/second against the per-epoch ``populate_*_trend`` path:
+
+    python -m tradeboddy.broadcast --strategy stratfib --pair BTC/USDT:USDT --epochs 500
+"""
+import argparse
+import logging
+import operator
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+from pandas import DataFrame, Series
+
+logger = logging.getLogger(__name__)
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+class P:
+    """
+    Reference to a strategy parameter, e.g. ``P('buy_rsi')``.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def evaluate(self, dataframe: DataFrame, params: Dict[str, np.ndarray]) -> np.ndarray:
+        return np.asarray(params[self.name], dtype=float)[None, :]
+
+    def names(self) -> set:
+        return {self.name}
+
+
+class Col:
+    """
+    Dataframe column, optionally selected by a parameter (``'ma_buy_{base_nb_candles_buy}'``)
+    and multiplied by a parameter or constant (``scale=P('low_offset')``).
+    """
+
+    def __init__(self, name: str, scale: Union[P, float, None] = None):
+        self.name = name
+        self.scale = scale
+        self.fields = [f.split('}')[0] for f in name.split('{')[1:]]
+
+    def evaluate(self, dataframe: DataFrame, params: Dict[str, np.ndarray]) -> np.ndarray:
+        if not self.fields:
+            values = dataframe[self.name].to_numpy(float)[:, None]
+        else:
+            # one column per distinct parameter combination, then gather per candidate
+            keys = list(zip(*(np.asarray(params[f]) for f in self.fields)))
+            unique = list(dict.fromkeys(keys))
+            block = np.column_stack([
+                dataframe[self.name.format(**dict(zip(self.fields, key)))].to_numpy(float)
+                for key in unique
+            ])
+            index = {key: i for i, key in enumerate(unique)}
+            values = block[:, [index[key] for key in keys]]
+        if isinstance(self.scale, P):
+            values = values * self.scale.evaluate(dataframe, params)
+        elif self.scale is not None:
+            values = values * self.scale
+        return values
+
+    def names(self) -> set:
+        names = set(self.fields)
+        if isinstance(self.scale, P):
+            names |= self.scale.names()
+        return names
+
+
+def _operand(value) -> Union[P, Col, float]:
+    return Col(value) if isinstance(value, str) else value
+
+
+def _evaluate(operand, dataframe: DataFrame, params: Dict[str, np.ndarray]) -> np.ndarray:
+    if isinstance(operand, (P, Col)):
+        return operand.evaluate(dataframe, params)
+    return np.asarray(operand, dtype=float).reshape(1, 1)
+
+
+def _names(operand) -> set:
+    return operand.names() if isinstance(operand, (P, Col)) else set()
+
+
+def _previous(values: np.ndarray) -> np.ndarray:
+    if values.shape[0] == 1:
+        return values
+    return np.vstack([np.full((1, values.shape[1]), np.nan), values[:-1]])
+
+
+class Condition(ABC):
+
+    @abstractmethod
+    def evaluate(self, dataframe: DataFrame, params: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        The condition for every parameter candidate, candles x candidates.
+        """
+
+    @abstractmethod
+    def names(self) -> set:
+        """
+        Names of the parameters the condition reads.
+        """
+
+    def masks(self, dataframe: DataFrame, candidates: Dict[str, np.ndarray],
+              defaults: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Boolean block of shape (len(dataframe), batch) for a batch of candidate parameter vectors.
+        Parameters missing from ``candidates`` are taken from ``defaults``.
+        """
+        batch = len(next(iter(candidates.values()))) if candidates else 1
+        params = {name: np.full(batch, (defaults or {})[name]) for name in self.names() - set(candidates)}
+        params.update({name: np.asarray(values) for name, values in candidates.items()})
+        result = self.evaluate(dataframe, params)
+        return np.broadcast_to(result, (len(dataframe), batch))
+
+    def mask(self, dataframe: DataFrame, strategy) -> Series:
+        """
+        Signal for the strategy's current parameter values, as used by ``populate_*_trend``.
+        """
+        values = current_values(strategy, self.names())
+        return Series(self.masks(dataframe, {}, values)[:, 0], index=dataframe.index)
+
+
+class Compare(Condition):
+
+    def __init__(self, left, op: str, right):
+        self.left = _operand(left)
+        self.right = _operand(right)
+        self.op = OPERATORS[op]
+
+    def evaluate(self, dataframe, params):
+        return self.op(_evaluate(self.left, dataframe, params), _evaluate(self.right, dataframe, params))
+
+    def names(self):
+        return _names(self.left) | _names(self.right)
+
+
+class CrossedAbove(Condition):
+    """
+    Same as ``qtpylib.crossed_above``: above now, at or below on the previous candle.
+    """
+
+    def __init__(self, left, right):
+        self.left = _operand(left)
+        self.right = _operand(right)
+
+    def evaluate(self, dataframe, params):
+        left = _evaluate(self.left, dataframe, params)
+        right = _evaluate(self.right, dataframe, params)
+        return (left > right) & (_previous(left) <= _previous(right))
+
+    def names(self):
+        return _names(self.left) | _names(self.right)
+
+
+class CrossedBelow(CrossedAbove):
+
+    def evaluate(self, dataframe, params):
+        left = _evaluate(self.left, dataframe, params)
+        right = _evaluate(self.right, dataframe, params)
+        return (left < right) & (_previous(left) >= _previous(right))
+
+
+class All(Condition):
+
+    def __init__(self, *conditions: Condition):
+        self.conditions = conditions
+
+    def evaluate(self, dataframe, params):
+        result = self.conditions[0].evaluate(dataframe, params)
+        for condition in self.conditions[1:]:
+            result = result & condition.evaluate(dataframe, params)
+        return result
+
+    def names(self):
+        return set().union(*(c.names() for c in self.conditions))
+
+
+class Any(All):
+
+    def evaluate(self, dataframe, params):
+        result = self.conditions[0].evaluate(dataframe, params)
+        for condition in self.conditions[1:]:
+            result = result | condition.evaluate(dataframe, params)
+        return result
+
+
+def current_values(strategy, names) -> Dict[str, float]:
+    return {name: getattr(strategy, name).value for name in names}
+
+
+def sample_candidates(strategy, names, size: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Random candidate values for the given hyperoptable parameters of a strategy.
+    """
+    rng = np.random.default_rng(seed)
+    candidates = {}
+    for name in sorted(names):
+        param = getattr(strategy, name)
+        if hasattr(param, 'opt_range') and not hasattr(param, 'low'):
+            choices = list(param.opt_range)
+            candidates[name] = np.array([choices[i] for i in rng.integers(0, len(choices), size)])
+        elif hasattr(param, 'decimals'):
+            candidates[name] = np.round(rng.uniform(param.low, param.high, size), param.decimals)
+        else:
+            candidates[name] = rng.integers(param.low, param.high + 1, size)
+    return candidates
+
+
+def batch_epochs(dataframe: DataFrame, buy_spec: Condition, sell_spec: Optional[Condition],
+                 candidates: Dict[str, np.ndarray], simulator, defaults: Dict[str, float],
+                 batch_size: int = 256) -> Iterator[Tuple[dict, dict]]:
+    """
+    Yield (parameters, trade stats) per candidate, evaluating the signals ``batch_size`` candidates at a time.
+    """
+    from tradeboddy.prescreen import trade_stats
+
+    total = len(next(iter(candidates.values())))
+    for start in range(0, total, batch_size):
+        chunk = {name: values[start:start + batch_size] for name, values in candidates.items()}
+        buy = buy_spec.masks(dataframe, {k: v for k, v in chunk.items() if k in buy_spec.names()}, defaults)
+        sell = None
+        if sell_spec is not None:
+            sell = sell_spec.masks(dataframe, {k: v for k, v in chunk.items() if k in sell_spec.names()}, defaults)
+        for k in range(buy.shape[1]):
+            trades = simulator.run(dataframe, enter=buy[:, k], exit_signal=sell[:, k] if sell is not None else None)
+            yield {name: values[k].item() for name, values in chunk.items()}, trade_stats(trades)
+
+
+def benchmark(strategy, dataframe: DataFrame, epochs: int, batch_size: int = 256) -> dict:
+    """
+    Compare epochs/second of the per-epoch populate_*_trend path against broadcast evaluation.
+    """
+    from tradeboddy.prescreen import Simulator
+
+    metadata = {'pair': 'benchmark'}
+    buy_spec = strategy.buy_spec
+    sell_spec = getattr(strategy, 'sell_spec', None)
+    names = buy_spec.names() | (sell_spec.names() if sell_spec is not None else set())
+    candidates = sample_candidates(strategy, names, epochs)
+    defaults = current_values(strategy, names)
+    simulator = Simulator.from_strategy(strategy)
+    base = dataframe[[c for c in dataframe.columns if c not in ('buy', 'sell', 'enter_long', 'exit_long')]]
+
+    started = time.perf_counter()
+    per_epoch = []
+    signal_time = 0.0
+    for k in range(epochs):
+        for name in names:
+            getattr(strategy, name).value = candidates[name][k].item()
+        t = time.perf_counter()
+        df = strategy.advise_exit(strategy.advise_entry(base.copy(), metadata), metadata)
+        signal_time += time.perf_counter() - t
+        per_epoch.append(simulator.run(df))
+    per_epoch_time = time.perf_counter() - started
+    for name, value in defaults.items():
+        getattr(strategy, name).value = value
+
+    started = time.perf_counter()
+    t = time.perf_counter()
+    for start in range(0, epochs, batch_size):
+        chunk = {name: values[start:start + batch_size] for name, values in candidates.items()}
+        buy_spec.masks(base, {k: v for k, v in chunk.items() if k in buy_spec.names()}, defaults)
+        if sell_spec is not None:
+            sell_spec.masks(base, {k: v for k, v in chunk.items() if k in sell_spec.names()}, defaults)
+    batch_signal_time = time.perf_counter() - t
+    batched = list(batch_epochs(base, buy_spec, sell_spec, candidates, simulator, defaults, batch_size))
+    batched_time = time.perf_counter() - started
+
+    mismatches = sum(len(a) != b[1]['trades'] for a, b in zip(per_epoch, batched))
+    return {
+        'epochs': epochs,
+        'per_epoch_epochs_per_s': epochs / per_epoch_time,
+        'batched_epochs_per_s': epochs / batched_time,
+        'per_epoch_signal_s': signal_time,
+        'batched_signal_s': batch_signal_time,
+        'trade_count_mismatches': mismatches,
+    }
+
+
+def main(argv=None):
+    from tradeboddy.prescreen import USER_DATA, backtest_config, load_candles, load_strategy
+
+    parser = argparse.ArgumentParser(description='Benchmark broadcast signal evaluation against per-epoch populate calls.')
+    parser.add_argument('--config', default=str(USER_DATA / 'config.json'))
+    parser.add_argument('--strategy', required=True)
+    parser.add_argument('--pair', required=True)
+    parser.add_argument('--days', type=int, default=None)
+    parser.add_argument('--epochs', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    config = backtest_config(Path(args.config), None)
+    strategy = load_strategy(args.strategy, USER_DATA / 'strategies' / args.strategy, config)
+    if getattr(strategy, 'buy_spec', None) is None:
+        raise SystemExit(f"{args.strategy} does not declare a buy_spec")
+    candles = load_candles(config['datadir'], args.pair, strategy.timeframe, args.days)
+    if candles is None:
+        raise SystemExit(f"No {strategy.timeframe} data for {args.pair}")
+    dataframe = strategy.advise_indicators(candles, {'pair': args.pair})
+    for key, value in benchmark(strategy, dataframe, args.epochs, args.batch_size).items():
+        print(f"{key:>26}: {value:.3f}" if isinstance(value, float) else f"{key:>26}: {value}")
+
+
+if __name__ == '__main__':
+    main()
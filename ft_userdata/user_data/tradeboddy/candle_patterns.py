@@ -0,0 +1,112 @@
+"""
+All TA-Lib candlestick patterns in one scan, packed into bitmask columns.
+
+GodStra-style strategies call ``getattr(ta, 'CDL...')(dataframe)`` for every
+pattern gene of every hyperopt epoch, each call converting the OHLC columns again
+through the abstract API, and hansencandlepatternV1 does the same once per
+pattern. ``scan_patterns()`` converts the OHLC columns once and runs the whole
+pattern set over the same arrays, then packs the results into four ``uint64``
+columns with one bit per pattern (bit ``i`` is ``PATTERNS[i]``):
+
+    cdl_bull     the pattern fired bullish (value > 0)
+    cdl_bear     the pattern fired bearish (value < 0)
+    cdl_strong   magnitude 200 (confirmed hikkake)
+    cdl_weak     magnitude 80 (engulfing/harami with equal open or close, TA-Lib >= 0.6)
+
+From those the original TA-Lib values come back exactly, and any selection of
+patterns is a single ``&`` on a column:
+
+    dataframe = add_pattern_masks(dataframe)           # once, in populate_indicators
+    dataframe['HARAMI'] = pattern_values(dataframe, 'CDLHARAMI')
+    bullish = any_pattern(dataframe, ['CDLHAMMER', 'CDLENGULFING'], 'bull')
+"""
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+import talib
+from pandas import DataFrame, Series
+
+# Bit positions are fixed here rather than taken from talib, so masks stored in
+# caches stay valid across TA-Lib versions.
+PATTERNS = (
+    'CDL2CROWS', 'CDL3BLACKCROWS', 'CDL3INSIDE', 'CDL3LINESTRIKE', 'CDL3OUTSIDE',
+    'CDL3STARSINSOUTH', 'CDL3WHITESOLDIERS', 'CDLABANDONEDBABY', 'CDLADVANCEBLOCK',
+    'CDLBELTHOLD', 'CDLBREAKAWAY', 'CDLCLOSINGMARUBOZU', 'CDLCONCEALBABYSWALL',
+    'CDLCOUNTERATTACK', 'CDLDARKCLOUDCOVER', 'CDLDOJI', 'CDLDOJISTAR', 'CDLDRAGONFLYDOJI',
+    'CDLENGULFING', 'CDLEVENINGDOJISTAR', 'CDLEVENINGSTAR', 'CDLGAPSIDESIDEWHITE',
+    'CDLGRAVESTONEDOJI', 'CDLHAMMER', 'CDLHANGINGMAN', 'CDLHARAMI', 'CDLHARAMICROSS',
+    'CDLHIGHWAVE', 'CDLHIKKAKE', 'CDLHIKKAKEMOD', 'CDLHOMINGPIGEON', 'CDLIDENTICAL3CROWS',
+    'CDLINNECK', 'CDLINVERTEDHAMMER', 'CDLKICKING', 'CDLKICKINGBYLENGTH', 'CDLLADDERBOTTOM',
+    'CDLLONGLEGGEDDOJI', 'CDLLONGLINE', 'CDLMARUBOZU', 'CDLMATCHINGLOW', 'CDLMATHOLD',
+    'CDLMORNINGDOJISTAR', 'CDLMORNINGSTAR', 'CDLONNECK', 'CDLPIERCING', 'CDLRICKSHAWMAN',
+    'CDLRISEFALL3METHODS', 'CDLSEPARATINGLINES', 'CDLSHOOTINGSTAR', 'CDLSHORTLINE',
+    'CDLSPINNINGTOP', 'CDLSTALLEDPATTERN', 'CDLSTICKSANDWICH', 'CDLTAKURI', 'CDLTASUKIGAP',
+    'CDLTHRUSTING', 'CDLTRISTAR', 'CDLUNIQUE3RIVER', 'CDLUPSIDEGAP2CROWS', 'CDLXSIDEGAP3METHODS',
+)
+BITS = {name: i for i, name in enumerate(PATTERNS)}
+MASK_COLUMNS = ('cdl_bull', 'cdl_bear', 'cdl_strong', 'cdl_weak')
+
+
+def pattern_mask(names: Iterable[str]) -> np.uint64:
+    """
+    Bitmask selecting ``names`` (``CDLHAMMER`` or ``CDLHAMMER-50`` gene names).
+    """
+    mask = 0
+    for name in names:
+        mask |= 1 << BITS[name.split('-')[0]]
+    return np.uint64(mask)
+
+
+def scan_patterns(dataframe: DataFrame, patterns: Sequence[str] = PATTERNS) -> DataFrame:
+    """
+    Run ``patterns`` over the OHLC columns and return the packed MASK_COLUMNS frame.
+    """
+    ohlc = [np.ascontiguousarray(dataframe[col].to_numpy(float)) for col in ('open', 'high', 'low', 'close')]
+    masks = {col: np.zeros(len(dataframe), dtype=np.uint64) for col in MASK_COLUMNS}
+    for name in patterns:
+        values = getattr(talib, name)(*ohlc)
+        if not values.any():
+            continue
+        bit = np.uint64(1 << BITS[name])
+        magnitude = np.abs(values)
+        masks['cdl_bull'] |= np.where(values > 0, bit, np.uint64(0))
+        masks['cdl_bear'] |= np.where(values < 0, bit, np.uint64(0))
+        masks['cdl_strong'] |= np.where(magnitude > 100, bit, np.uint64(0))
+        masks['cdl_weak'] |= np.where((magnitude > 0) & (magnitude < 100), bit, np.uint64(0))
+    return pd.DataFrame(masks, index=dataframe.index)
+
+
+def add_pattern_masks(dataframe: DataFrame) -> DataFrame:
+    """
+    Adds MASK_COLUMNS for the full pattern set to ``dataframe`` (unless already there) and returns it.
+    """
+    if not all(col in dataframe.columns for col in MASK_COLUMNS):
+        for col, values in scan_patterns(dataframe).items():
+            dataframe[col] = values
+    return dataframe
+
+
+def pattern_values(dataframe: DataFrame, name: str) -> Series:
+    """
+    The TA-Lib output of pattern ``name`` (-200..200, int32), read back from the masks.
+    """
+    add_pattern_masks(dataframe)
+    bit = pattern_mask([name])
+    bull, bear, strong, weak = ((dataframe[col].to_numpy(np.uint64) & bit) != 0 for col in MASK_COLUMNS)
+    magnitude = np.where(strong, 200, np.where(weak, 80, 100))
+    values = np.where(bull, magnitude, np.where(bear, -magnitude, 0)).astype(np.int32)
+    return pd.Series(values, index=dataframe.index)
+
+
+def any_pattern(dataframe: DataFrame, names: Iterable[str], direction: str = 'any') -> Series:
+    """
+    True where any of ``names`` fired in ``direction`` ('bull', 'bear' or 'any').
+    """
+    add_pattern_masks(dataframe)
+    mask = pattern_mask(names)
+    columns = {'bull': ['cdl_bull'], 'bear': ['cdl_bear'], 'any': ['cdl_bull', 'cdl_bear']}[direction]
+    fired = np.zeros(len(dataframe), dtype=bool)
+    for col in columns:
+        fired |= (dataframe[col].to_numpy(np.uint64) & mask) != 0
+    return pd.Series(fired, index=dataframe.index)
@@ -0,0 +1,292 @@
+"""
+Parallel indicator population for backtests, with an on-disk cache of the results.
+
+NFIX-sized strategies spend seconds per pair in ``populate_indicators``, and
+backtesting runs that pass single threaded for the whole whitelist on every
+start. The data-prep stage fans it out over a process pool and writes every
+analyzed frame as an uncompressed Arrow IPC file. Reading one back maps the file
+and converts it to pandas in a single copy; the frame is not a zero-copy view,
+since Arrow's views are read-only and strategies write into their frames:
+
+    user_data/analyzed_cache/<strategy>/<code>-<params>-<config>/<pair>-<timeframe>-<data>.arrow
+
+``code`` hashes the strategy source and the tradeboddy sources, ``params`` its
+parameter values and ``config`` the config values informative pairs are picked by
+(stake currency, trading mode, exchange); ``data`` is the OHLCV frame handed to
+``populate_indicators``. Every frame the strategy reads through ``self.dp`` while
+populating (the informative and BTC frames of NFIX) is recorded in a ``.json`` next
+to the ``.arrow`` file with its data key, and read again on load, so a changed
+strategy, shared indicator, hyperopt result or data download of any of those frames
+misses the cache. Other inputs (files the strategy reads itself, the clock, ...)
+are not keyed: clear the cache after changing them.
+
+Prepare the cache (same config, timerange and pairs as the backtest):
+
+    python -m tradeboddy.dataprep --strategy NostalgiaForInfinityX --timerange 20200101- --workers 8
+
+and let the strategy read it in backtest/hyperopt runs:
+
+    analyzed_cache = None
+
+    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        if self.config['runmode'].value in ('backtest', 'hyperopt'):
+            if self.analyzed_cache is None:
+                self.analyzed_cache = AnalyzedCache.for_strategy(self)
+            return self.analyzed_cache.populate(metadata['pair'], self.timeframe, dataframe,
+                                                lambda df: self.do_indicators(df, metadata))
+        return self.do_indicators(dataframe, metadata)
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+from pandas import DataFrame
+
+from tradeboddy.informative_cache import parameters_key
+from tradeboddy.prescreen import USER_DATA, backtest_config, load_strategy, pair_to_filename
+from tradeboddy.snapshot import OHLCV, source_key
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = 'analyzed_cache'
+
+# config values that change which informative frames a strategy reads
+CONFIG_KEYS = ('stake_currency', 'trading_mode', 'margin_mode', 'candle_type_def')
+
+# strategies loaded by this worker process, by name
+_strategies = {}
+
+
+def data_key(dataframe: DataFrame) -> str:
+    """
+    Hash of the candle dates and OHLCV values of a frame.
+    """
+    h = hashlib.sha1()
+    h.update(dataframe['date'].astype(str).iloc[[0, -1]].str.cat().encode() if len(dataframe) else b'')
+    h.update(np.ascontiguousarray(dataframe[OHLCV].to_numpy(float)).tobytes())
+    return h.hexdigest()[:16]
+
+
+def config_key(config: dict) -> str:
+    """
+    Hash of the ``CONFIG_KEYS`` values and the exchange name of a config.
+    """
+    values = [(k, str(config.get(k))) for k in CONFIG_KEYS]
+    values.append(('exchange', str(config.get('exchange', {}).get('name'))))
+    return hashlib.sha1(repr(values).encode()).hexdigest()[:8]
+
+
+class _RecordingProvider:
+    """
+    Wraps a DataProvider and records the data key of every frame read from it.
+    """
+
+    def __init__(self, dp):
+        self._dp = dp
+        self.reads: List[Tuple[str, str, Optional[str], str, str]] = []
+
+    def __getattr__(self, name):
+        return getattr(self._dp, name)
+
+    def _read(self, method: str, pair: str, timeframe: Optional[str] = None, candle_type: str = '') -> DataFrame:
+        dataframe = getattr(self._dp, method)(pair, timeframe, candle_type)
+        self.reads.append((method, pair, timeframe, str(candle_type), data_key(dataframe)))
+        return dataframe
+
+    def get_pair_dataframe(self, pair: str, timeframe: Optional[str] = None, candle_type: str = '') -> DataFrame:
+        return self._read('get_pair_dataframe', pair, timeframe, candle_type)
+
+    def historic_ohlcv(self, pair: str, timeframe: Optional[str] = None, candle_type: str = '') -> DataFrame:
+        return self._read('historic_ohlcv', pair, timeframe, candle_type)
+
+
+class AnalyzedCache:
+
+    def __init__(self, directory: Path, strategy=None):
+        self.directory = Path(directory)
+        # the frames read through strategy.dp are part of the key
+        self.strategy = strategy
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_strategy(cls, strategy) -> 'AnalyzedCache':
+        user_data = Path(strategy.config.get('user_data_dir', USER_DATA))
+        key = f"{source_key(strategy.__class__)}-{parameters_key(strategy)}-{config_key(strategy.config)}"
+        # frames of a strategy pruned by tradeboddy.pruning lack the dead columns
+        if getattr(strategy, 'pruning_key', None):
+            key += f"-{strategy.pruning_key}"
+        return cls(user_data / CACHE_DIR / strategy.__class__.__name__ / key, strategy)
+
+    def path(self, pair: str, timeframe: str, dataframe: DataFrame) -> Path:
+        return self.directory / f"{pair_to_filename(pair)}-{timeframe}-{data_key(dataframe)}.arrow"
+
+    def _reads_unchanged(self, path: Path) -> bool:
+        # the frames read while populating still have the data keys recorded then
+        try:
+            reads = json.loads(path.with_suffix('.json').read_text())
+        except (OSError, ValueError):
+            return False
+        if reads and getattr(self.strategy, 'dp', None) is None:
+            return False
+        for method, pair, timeframe, candle_type, key in reads:
+            try:
+                dataframe = getattr(self.strategy.dp, method)(pair, timeframe, candle_type)
+            except Exception:
+                return False
+            if data_key(dataframe) != key:
+                return False
+        return True
+
+    def load(self, pair: str, timeframe: str, dataframe: DataFrame) -> Optional[DataFrame]:
+        path = self.path(pair, timeframe, dataframe)
+        if not path.is_file() or not self._reads_unchanged(path):
+            return None
+        try:
+            # the table's buffers point into the mapped file, to_pandas() makes the one (writable) copy
+            with pa.memory_map(str(path), 'r') as source:
+                frame = pa.ipc.open_file(source).read_all().to_pandas()
+        except Exception as e:
+            logger.warning(f"Analyzed cache: could not read {path.name}: {e}")
+            return None
+        if len(frame) != len(dataframe):
+            return None
+        frame.index = dataframe.index
+        return frame
+
+    def store(self, pair: str, timeframe: str, dataframe: DataFrame, analyzed: DataFrame,
+              reads: List[Tuple] = ()) -> None:
+        """
+        Write ``analyzed``; ``reads`` are the ``(method, pair, timeframe, candle_type, data key)``
+        of the frames read through ``dp`` to populate it.
+        """
+        path = self.path(pair, timeframe, dataframe)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            # the reads first, an .arrow file without them is a miss
+            path.with_suffix('.json').write_text(json.dumps([list(r) for r in reads]))
+            table = pa.Table.from_pandas(analyzed.reset_index(drop=True), preserve_index=False)
+            with pa.OSFile(str(tmp), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp, path)
+        except Exception as e:
+            tmp.unlink(missing_ok=True)
+            logger.warning(f"Analyzed cache: could not write {path.name}: {e}")
+
+    def populate(self, pair: str, timeframe: str, dataframe: DataFrame,
+                 populate: Callable[[DataFrame], DataFrame]) -> DataFrame:
+        cached = self.load(pair, timeframe, dataframe)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        dp = getattr(self.strategy, 'dp', None)
+        if dp is None:
+            analyzed = populate(dataframe.copy())
+            self.store(pair, timeframe, dataframe, analyzed)
+            return analyzed
+        recorder = _RecordingProvider(dp)
+        self.strategy.dp = recorder
+        try:
+            analyzed = populate(dataframe.copy())
+        finally:
+            self.strategy.dp = dp
+        self.store(pair, timeframe, dataframe, analyzed, recorder.reads)
+        return analyzed
+
+
+def load_backtest_candles(config: dict, pair: str, timeframe: str, startup_candles: int) -> Optional[DataFrame]:
+    """
+    Candles for ``pair`` the way backtesting loads them: config timerange plus the startup candles.
+    """
+    from freqtrade.configuration import TimeRange
+    from freqtrade.data.history import load_pair_history
+    from freqtrade.enums import CandleType
+
+    df = load_pair_history(
+        pair=pair, timeframe=timeframe, datadir=Path(config['datadir']),
+        timerange=TimeRange.parse_timerange(config.get('timerange')),
+        startup_candles=startup_candles,
+        data_format=config.get('dataformat_ohlcv', 'json'),
+        candle_type=config.get('candle_type_def', CandleType.SPOT),
+    )
+    return None if df.empty else df
+
+
+def prepare_pair(name: str, strategy_path: Path, base_config: dict, pair: str) -> dict:
+    """
+    Populate one pair into the cache. Never raises, errors are reported in the result.
+    """
+    result = {'pair': pair, 'status': None, 'seconds': 0.0}
+    started = time.perf_counter()
+    try:
+        if name not in _strategies:
+            _strategies[name] = load_strategy(name, strategy_path, base_config)
+        strategy = _strategies[name]
+        candles = load_backtest_candles(base_config, pair, strategy.timeframe, strategy.startup_candle_count)
+        if candles is None:
+            result['status'] = 'no data'
+        else:
+            if hasattr(strategy, 'analyzed_cache'):
+                # the strategy loads and stores through its own AnalyzedCache.populate()
+                hits = getattr(strategy.analyzed_cache, 'hits', 0)
+                strategy.advise_indicators(candles.copy(), {'pair': pair})
+                cached = getattr(strategy.analyzed_cache, 'hits', 0) > hits
+            else:
+                cache = AnalyzedCache.for_strategy(strategy)
+                cache.populate(pair, strategy.timeframe, candles,
+                               lambda df: strategy.advise_indicators(df, {'pair': pair}))
+                cached = cache.hits > 0
+            result['status'] = 'cached' if cached else 'populated'
+    except Exception as e:
+        result['status'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 2)
+    return result
+
+
+def prepare(name: str, strategy_path: Path, pairs: List[str], base_config: dict, workers: int = 4) -> DataFrame:
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(prepare_pair, name, strategy_path, base_config, pair) for pair in pairs]
+        for future in as_completed(futures):
+            res = future.result()
+            results.append(res)
+            logger.info(f"{res['pair']}: {res['status']} ({res['seconds']}s)")
+    return DataFrame(results).sort_values('pair').reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Populate indicators for all pairs in parallel into the analyzed cache.')
+    parser.add_argument('--strategy', required=True)
+    parser.add_argument('--config', default=str(USER_DATA / 'config.json'))
+    parser.add_argument('--strategies-dir', default=str(USER_DATA / 'strategies'))
+    parser.add_argument('--datadir', default=None, help='defaults to the datadir of the config')
+    parser.add_argument('--timerange', default=None, help='same timerange as the backtest')
+    parser.add_argument('--pairs', nargs='+', default=None, help='defaults to the config whitelist')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    base_config = backtest_config(Path(args.config), Path(args.datadir) if args.datadir else None)
+    if args.timerange:
+        base_config['timerange'] = args.timerange
+    pairs = args.pairs or base_config['exchange']['pair_whitelist']
+    strategy_path = Path(args.strategies_dir) / args.strategy
+
+    started = time.perf_counter()
+    report = prepare(args.strategy, strategy_path, pairs, base_config, args.workers)
+    print(report.to_string(index=False))
+    print(f"\n{len(pairs)} pairs prepared in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
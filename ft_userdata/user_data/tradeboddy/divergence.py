@@ -0,0 +1,101 @@
+"""
+Price/oscillator divergences over a bounded lookback, without nested shift loops.
+
+DIV_v1's ``divergence()`` compares the current swing low with the one ``i`` candles
+back for every ``i`` up to 14, and for each ``i`` checks that nothing in between is
+lower by and-ing ``i - 1`` more shifted Series, about a hundred Series per call.
+"Nothing in between is lower" is a running minimum, which grows by one candle per
+step of ``i``, so the whole scan is one pass per lookback step:
+
+    flags = divergences(dataframe, 'rsi')
+    dataframe['bullish_divergence'] = flags['bullish_divergence']
+
+``flags`` has ``bullish_divergence`` / ``hidden_bullish_divergence`` from the swing
+lows and ``bearish_divergence`` / ``hidden_bearish_divergence`` from the swing highs,
+for any oscillator column (rsi, mfi, cci, ...). Other pivots, e.g. HarmonicDivergence's
+``pivot_lows``, go through ``low_divergences()`` / ``high_divergences()`` once
+forward-filled.
+"""
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def swing_lows(series: Series) -> Series:
+    """
+    Value of the last candle that is not above the one before it and not above the one after it,
+    forward-filled from the candle after it (when it is known to be a low).
+    """
+    values = series.to_numpy(float)
+    prev, prev2 = _shift(values, 1), _shift(values, 2)
+    lows = np.where((prev <= prev2) & (values >= prev), prev, np.nan)
+    return pd.Series(lows, index=series.index).ffill()
+
+
+def swing_highs(series: Series) -> Series:
+    """
+    Value of the last candle that is not below the one before it and not below the one after it,
+    forward-filled from the candle after it.
+    """
+    values = series.to_numpy(float)
+    prev, prev2 = _shift(values, 1), _shift(values, 2)
+    highs = np.where((prev >= prev2) & (values <= prev), prev, np.nan)
+    return pd.Series(highs, index=series.index).ffill()
+
+
+def _scan(price: np.ndarray, source: np.ndarray, lookback: int, sign: float) -> Tuple[np.ndarray, np.ndarray]:
+    # lows for sign=1, highs (as lows of the negated values) for sign=-1
+    price = sign * price
+    source = sign * source
+    regular = np.zeros(len(price), dtype=bool)
+    hidden = np.zeros(len(price), dtype=bool)
+    between = np.full(len(price), np.inf)
+    with np.errstate(invalid='ignore'):
+        for i in range(2, lookback + 1):
+            # lowest pivot of the i - 1 candles between the current and the earlier one
+            between = np.minimum(between, _shift(price, i - 1))
+            earlier, earlier_source = _shift(price, i), _shift(source, i)
+            clear = earlier <= between
+            regular |= clear & (price < earlier) & (source > earlier_source)
+            hidden |= clear & (price > earlier) & (source < earlier_source)
+        latest = price <= _shift(price, 1)
+    return regular & latest, hidden & latest
+
+
+def low_divergences(price_lows: Series, source_lows: Series, lookback: int = 14) -> DataFrame:
+    """
+    ``bullish_divergence``: the price low is lower than a low up to ``lookback`` candles back with no
+    lower low in between, and the oscillator low is higher. ``hidden_bullish_divergence``: higher
+    price low, lower oscillator low. Both only where the price low did not rise on this candle.
+    """
+    regular, hidden = _scan(price_lows.to_numpy(float), source_lows.to_numpy(float), lookback, 1.0)
+    return pd.DataFrame({'bullish_divergence': regular, 'hidden_bullish_divergence': hidden},
+                        index=price_lows.index)
+
+
+def high_divergences(price_highs: Series, source_highs: Series, lookback: int = 14) -> DataFrame:
+    """
+    ``bearish_divergence``: higher price high with no higher high in between and a lower oscillator
+    high. ``hidden_bearish_divergence``: lower price high, higher oscillator high.
+    """
+    regular, hidden = _scan(price_highs.to_numpy(float), source_highs.to_numpy(float), lookback, -1.0)
+    return pd.DataFrame({'bearish_divergence': regular, 'hidden_bearish_divergence': hidden},
+                        index=price_highs.index)
+
+
+def divergences(dataframe: DataFrame, source: str = 'rsi', price: str = 'close', lookback: int = 14) -> DataFrame:
+    """
+    All four divergence flags between the swing lows/highs of ``price`` and of ``source``.
+    """
+    lows = low_divergences(swing_lows(dataframe[price]), swing_lows(dataframe[source]), lookback)
+    highs = high_divergences(swing_highs(dataframe[price]), swing_highs(dataframe[source]), lookback)
+    return pd.concat([lows, highs], axis=1)
@@ -0,0 +1,220 @@
+"""
+Array-native replacements for the finta indicators used by the CryptoFrog family.
+
+``fta.VFI``, ``fta.SQZMI``, ``fta.DMI``, ``fta.ADX`` and ``fta.MFI`` build many
+intermediate Series and use row-wise ``DataFrame.apply`` for their conditional
+steps. The functions here take the same arguments and return the same values,
+computing the conditional steps with numpy and the windows with the same pandas
+rolling/ewm calls finta uses. Unlike ``fta.DMI``/``fta.ADX`` they do not add
+``up_move``/``down_move``/``plus``/``minus`` columns to the input frame.
+
+``frog_indicators()`` computes all five in one pass, sharing the typical price,
+true range and directional movement between them (``fta.ADX`` recomputes DMI):
+
+    fi = frog_indicators(dataframe)
+    dataframe['mfi'] = fi['mfi']
+    ...
+
+Running the module benchmarks against finta on synthetic candles:
+
+    python -m tradeboddy.finta_native --rows 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+
+def typical_price(ohlc: DataFrame) -> Series:
+    return pd.Series((ohlc['high'] + ohlc['low'] + ohlc['close']) / 3, name='TP')
+
+
+def true_range(ohlc: DataFrame) -> Series:
+    high = ohlc['high'].to_numpy(float)
+    low = ohlc['low'].to_numpy(float)
+    prev_close = ohlc['close'].shift().to_numpy(float)
+    tr = np.fmax(np.fmax(np.abs(high - low), np.abs(high - prev_close)), np.abs(prev_close - low))
+    return pd.Series(tr, index=ohlc.index, name='TR')
+
+
+def directional_movement(ohlc: DataFrame):
+    up_move = ohlc['high'].diff().to_numpy(float)
+    down_move = -ohlc['low'].diff().to_numpy(float)
+    plus = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    return pd.Series(plus, index=ohlc.index), pd.Series(minus, index=ohlc.index)
+
+
+def _mfi(tp: Series, volume: Series, period: int) -> Series:
+    rmf = (tp * volume).to_numpy(float)
+    delta = tp.diff().to_numpy(float)
+    pos = pd.Series(np.where(delta > 0, rmf, 0.0), index=tp.index)
+    neg = pd.Series(np.where(delta < 0, rmf, 0.0), index=tp.index)
+    mfratio = pos.rolling(window=period).sum() / neg.rolling(window=period).sum()
+    return pd.Series(100 - (100 / (1 + mfratio)), name=f"{period} period MFI")
+
+
+def _sqzmi(close: Series, tr: Series, period: int) -> Series:
+    std = close.rolling(window=period).std()
+    middle = close.rolling(window=period).mean()
+    bb_upper = (middle + 2 * std).to_numpy()
+    bb_lower = (middle - 2 * std).to_numpy()
+    kc_middle = close.ewm(span=period, adjust=True).mean()
+    atr = tr.rolling(center=False, window=10).mean()
+    kc_upper = (kc_middle + 1.5 * atr).to_numpy()
+    kc_lower = (kc_middle - 1.5 * atr).to_numpy()
+    sqz = (bb_lower > kc_lower) & (bb_upper < kc_upper)
+    return pd.Series(sqz, index=close.index, name=f"{period} period SQZMI")
+
+
+def _vfi(ohlc: DataFrame, tp: Series, period: int, smoothing_factor: int,
+         factor: float, vfactor: float, adjust: bool) -> Series:
+    vinter = np.log(tp).diff().rolling(window=30).std()
+    cutoff = np.nan_to_num((factor * vinter * ohlc['close']).to_numpy(float))
+    price_change = np.nan_to_num(tp.diff().to_numpy(float))
+    volume = ohlc['volume']
+    mav = volume.rolling(center=False, window=period).mean()
+    mav_prev = mav.shift()
+
+    vol = volume.to_numpy(float)
+    cap = vfactor * mav_prev.to_numpy(float)
+    added_vol = np.where(vol > cap, cap, vol)
+    multiplier = np.where(price_change > cutoff, 1, np.where(price_change < 0 - cutoff, -1, 0))
+
+    raw_sum = pd.Series(multiplier * added_vol, index=ohlc.index).rolling(window=period).sum()
+    raw_value = raw_sum / mav_prev
+    return pd.Series(
+        raw_value.ewm(ignore_na=False, min_periods=smoothing_factor - 1,
+                      span=smoothing_factor, adjust=adjust).mean(),
+        name='VFI',
+    )
+
+
+def _dmi(plus: Series, minus: Series, atr: Series, period: int, adjust: bool) -> DataFrame:
+    diplus = pd.Series(100 * (plus / atr).ewm(alpha=1 / period, adjust=adjust).mean(), name='DI+')
+    diminus = pd.Series(100 * (minus / atr).ewm(alpha=1 / period, adjust=adjust).mean(), name='DI-')
+    return pd.concat([diplus, diminus], axis=1)
+
+
+def _adx(dmi: DataFrame, period: int, adjust: bool) -> Series:
+    return pd.Series(
+        100 * (abs(dmi['DI+'] - dmi['DI-']) / (dmi['DI+'] + dmi['DI-'])).ewm(alpha=1 / period, adjust=adjust).mean(),
+        name=f"{period} period ADX.",
+    )
+
+
+def MFI(ohlc: DataFrame, period: int = 14) -> Series:
+    return _mfi(typical_price(ohlc), ohlc['volume'], period)
+
+
+def SQZMI(ohlc: DataFrame, period: int = 20, MA: Series = None) -> Series:
+    # finta ignores MA as well, the bands are always built on an SMA
+    return _sqzmi(ohlc['close'], true_range(ohlc), period)
+
+
+def VFI(ohlc: DataFrame, period: int = 130, smoothing_factor: int = 3, factor: float = 0.2,
+        vfactor: float = 2.5, adjust: bool = True) -> Series:
+    return _vfi(ohlc, typical_price(ohlc), period, smoothing_factor, factor, vfactor, adjust)
+
+
+def DMI(ohlc: DataFrame, period: int = 14, adjust: bool = True) -> DataFrame:
+    plus, minus = directional_movement(ohlc)
+    atr = true_range(ohlc).rolling(center=False, window=period).mean()
+    return _dmi(plus, minus, atr, period, adjust)
+
+
+def ADX(ohlc: DataFrame, period: int = 14, adjust: bool = True) -> Series:
+    return _adx(DMI(ohlc, period, adjust), period, adjust)
+
+
+def frog_indicators(ohlc: DataFrame, mfi_period: int = 14, sqzmi_period: int = 20,
+                    vfi_period: int = 14, dmi_period: int = 14) -> dict:
+    """
+    MFI, SQZMI, VFI, DMI+/- and ADX as used by CryptoFrog's do_indicators, sharing intermediates.
+    """
+    tp = typical_price(ohlc)
+    tr = true_range(ohlc)
+    plus, minus = directional_movement(ohlc)
+    dmi = _dmi(plus, minus, tr.rolling(center=False, window=dmi_period).mean(), dmi_period, True)
+    return {
+        'mfi': _mfi(tp, ohlc['volume'], mfi_period),
+        'sqzmi': _sqzmi(ohlc['close'], tr, sqzmi_period),
+        'vfi': _vfi(ohlc, tp, vfi_period, 3, 0.2, 2.5, True),
+        'dmi_plus': dmi['DI+'],
+        'dmi_minus': dmi['DI-'],
+        'adx': _adx(dmi, dmi_period, True),
+    }
+
+
+def synthetic_candles(rows: int, seed: int = 0) -> DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, rows)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.002, rows))
+    return DataFrame({
+        'date': pd.date_range('2021-01-01', periods=rows, freq='5min', tz='UTC'),
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + spread),
+        'low': np.minimum(open_, close) * (1 - spread),
+        'close': close,
+        'volume': rng.lognormal(10, 1, rows),
+    })
+
+
+def benchmark(rows: int = 100000, repeat: int = 3) -> DataFrame:
+    from finta import TA as fta
+
+    df = synthetic_candles(rows)
+
+    def finta_all(frame):
+        frame = frame.copy()
+        dmi = fta.DMI(frame, period=14)
+        return {
+            'mfi': fta.MFI(frame),
+            'sqzmi': fta.SQZMI(frame),
+            'vfi': fta.VFI(frame, period=14),
+            'dmi_plus': dmi['DI+'],
+            'dmi_minus': dmi['DI-'],
+            'adx': fta.ADX(frame, period=14),
+        }
+
+    def timed(func):
+        best = np.inf
+        for _ in range(repeat):
+            started = time.perf_counter()
+            out = func(df)
+            best = min(best, time.perf_counter() - started)
+        return best, out
+
+    finta_time, expected = timed(finta_all)
+    native_time, actual = timed(frog_indicators)
+    rows_out = []
+    for name in expected:
+        a = expected[name].to_numpy(float)
+        b = actual[name].to_numpy(float)
+        rows_out.append({
+            'indicator': name,
+            'max_abs_diff': float(np.nanmax(np.abs(a - b))) if np.isfinite(a).any() else 0.0,
+            'nan_mismatch': int((np.isnan(a) != np.isnan(b)).sum()),
+        })
+    report = DataFrame(rows_out)
+    report.attrs['finta_s'] = finta_time
+    report.attrs['native_s'] = native_time
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark native finta replacements against finta.')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+    report = benchmark(args.rows, args.repeat)
+    print(report.to_string(index=False))
+    finta_s, native_s = report.attrs['finta_s'], report.attrs['native_s']
+    print(f"\nfinta: {finta_s:.3f}s  native: {native_s:.3f}s  speedup: {finta_s / native_s:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
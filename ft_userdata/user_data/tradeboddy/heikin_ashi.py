@@ -0,0 +1,172 @@
+"""
+Heikin-Ashi candles without the per-row Python loop.
+
+``HA()`` (CryptoFrog family, MultiMA_TSL3_Mod, ...) and ``qtpylib.heikinashi``
+build the HA open row by row, on a full copy of the dataframe. The recursion
+
+    ha_open[0] = (open[0] + close[0]) / 2
+    ha_open[i] = (ha_open[i - 1] + ha_close[i - 1]) / 2
+
+is a first-order linear filter, i.e. an EMA with ``alpha=0.5`` over
+``[ha_open[0], ha_close[0], ..., ha_close[n - 2]]``, so it runs as one
+``ewm(adjust=False)`` pass. Halving is exact in floating point, so the results are
+bit-identical to the loops.
+
+    dataframe = HA(dataframe, 4)                     # adds HA_* / Smooth_HA_* in place
+    heikinashi = heikinashi(dataframe)               # drop-in for qtpylib.heikinashi
+    open_sha, close_sha, low_sha = heikin_ashi(informative_1d, smooth_inputs=True, length=30)
+
+``ha_update()`` extends existing HA columns by the newest candle(s) only, continuing
+the open recursion and the smoothing EMAs from the last computed row.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import talib
+from pandas import DataFrame, Series
+
+HA_COLUMNS = ['HA_Open', 'HA_Close', 'HA_High', 'HA_Low']
+SMOOTH_COLUMNS = {'HA_Open': 'Smooth_HA_O', 'HA_Close': 'Smooth_HA_C',
+                  'HA_High': 'Smooth_HA_H', 'HA_Low': 'Smooth_HA_L'}
+
+
+def _ohlc(dataframe: DataFrame):
+    return tuple(dataframe[col].to_numpy(float) for col in ('open', 'high', 'low', 'close'))
+
+
+def ha_open(ha_close: np.ndarray, seed: float) -> np.ndarray:
+    """
+    HA open recursion started at ``seed``, as an alpha=0.5 EMA over the shifted HA close.
+    """
+    if len(ha_close) == 0:
+        return np.empty(0)
+    x = np.empty(len(ha_close))
+    x[0] = seed
+    x[1:] = ha_close[:-1]
+    return pd.Series(x).ewm(alpha=0.5, adjust=False).mean().to_numpy()
+
+
+def ha_arrays(open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+              close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    HA open, high, low and close for raw OHLC arrays.
+    """
+    hc = (open_ + high + low + close) / 4
+    ho = ha_open(hc, (open_[0] + close[0]) / 2 if len(open_) else np.nan)
+    return ho, np.fmax(np.fmax(ho, hc), high), np.fmin(np.fmin(ho, hc), low), hc
+
+
+def _smooth(smoothing) -> Optional[int]:
+    if smoothing is None:
+        return None
+    sml = abs(int(smoothing))
+    return sml if sml > 0 else None
+
+
+def HA(dataframe: DataFrame, smoothing=None) -> DataFrame:
+    """
+    Adds HA_Open/HA_Close/HA_High/HA_Low (and Smooth_HA_* EMAs of ``smoothing`` periods)
+    to ``dataframe`` in place and returns it.
+    """
+    ho, hh, hl, hc = ha_arrays(*_ohlc(dataframe))
+    dataframe['HA_Close'] = hc
+    dataframe['HA_Open'] = ho
+    dataframe['HA_High'] = hh
+    dataframe['HA_Low'] = hl
+
+    sml = _smooth(smoothing)
+    if sml is not None:
+        for col, values in zip(HA_COLUMNS, (ho, hc, hh, hl)):
+            dataframe[SMOOTH_COLUMNS[col]] = talib.EMA(values, timeperiod=sml)
+    return dataframe
+
+
+def ema_next(prev: float, value: float, period: int) -> float:
+    """
+    Next value of a talib EMA, given its previous value.
+    """
+    return ((value - prev) * (2.0 / (period + 1))) + prev
+
+
+def ha_next(prev_open: float, prev_close: float, open_: float, high: float,
+            low: float, close: float) -> Tuple[float, float, float, float]:
+    """
+    HA open, high, low and close of a new candle from the previous HA open and close.
+    """
+    hc = (open_ + high + low + close) / 4
+    ho = (prev_open + prev_close) / 2
+    return ho, max(ho, hc, high), min(ho, hc, low), hc
+
+
+def ha_update(dataframe: DataFrame, smoothing=None) -> DataFrame:
+    """
+    Like ``HA()``, but only computes the rows after the last row with a HA_Open value
+    (typically the newest candle of a restored or appended frame).
+    """
+    if 'HA_Open' not in dataframe.columns or dataframe.empty:
+        return HA(dataframe, smoothing)
+    done = dataframe['HA_Open'].notna().to_numpy()
+    start = len(done) - int(np.argmax(done[::-1])) if done.any() else 0
+    sml = _smooth(smoothing)
+    if start == 0 or (sml is not None and start < sml):
+        return HA(dataframe, smoothing)
+    if start == len(dataframe):
+        return dataframe
+
+    open_, high, low, close = _ohlc(dataframe)
+    values = {col: dataframe[col].to_numpy(float).copy() for col in HA_COLUMNS}
+    smoothed = {}
+    if sml is not None:
+        smoothed = {col: dataframe[SMOOTH_COLUMNS[col]].to_numpy(float).copy() for col in HA_COLUMNS}
+    for i in range(start, len(dataframe)):
+        ho, hh, hl, hc = ha_next(values['HA_Open'][i - 1], values['HA_Close'][i - 1],
+                                 open_[i], high[i], low[i], close[i])
+        for col, value in zip(HA_COLUMNS, (ho, hc, hh, hl)):
+            values[col][i] = value
+            if sml is not None:
+                smoothed[col][i] = ema_next(smoothed[col][i - 1], value, sml)
+
+    for col in HA_COLUMNS:
+        dataframe[col] = values[col]
+        if sml is not None:
+            dataframe[SMOOTH_COLUMNS[col]] = smoothed[col]
+    return dataframe
+
+
+def heikinashi(bars: DataFrame) -> DataFrame:
+    """
+    Drop-in for ``qtpylib.heikinashi``: a new frame with open/high/low/close HA columns.
+    """
+    ho, hh, hl, hc = ha_arrays(*_ohlc(bars))
+    return pd.DataFrame(index=bars.index, data={'open': ho, 'high': hh, 'low': hl, 'close': hc})
+
+
+def ha_typical_price(bars: DataFrame) -> Series:
+    res = (bars['ha_high'] + bars['ha_low'] + bars['ha_close']) / 3
+    return Series(index=bars.index, data=res)
+
+
+def heikin_ashi(dataframe: DataFrame, smooth_inputs: bool = False, smooth_outputs: bool = False,
+                length: int = 10) -> Tuple[Series, Series, Series]:
+    """
+    NFIX's smoothed Heikin-Ashi, returning (open, close, low).
+
+    Unlike ``HA()`` the open is the midpoint of the previous (smoothed) candle, not the
+    recursive HA open. Inputs and outputs are smoothed with an EMA of ``length`` periods.
+    """
+    index = dataframe.index
+    open_, high, low, close = (np.nan_to_num(a, nan=0.0) for a in _ohlc(dataframe))
+    if smooth_inputs:
+        open_, high, low, close = (talib.EMA(a, timeperiod=length) for a in (open_, high, low, close))
+
+    prev_open = np.concatenate(([np.nan], open_[:-1]))
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    outputs = (
+        np.nan_to_num((prev_open + prev_close) / 2, nan=0.0),
+        np.nan_to_num((open_ + high + low + close) / 4, nan=0.0),
+        np.nan_to_num(np.fmin(np.fmin(low, open_), close), nan=0.0),
+    )
+    if smooth_outputs:
+        outputs = tuple(talib.EMA(a, timeperiod=length) for a in outputs)
+    return tuple(pd.Series(a, index=index) for a in outputs)
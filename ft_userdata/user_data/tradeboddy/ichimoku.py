@@ -0,0 +1,129 @@
+"""
+Ichimoku cloud on shared rolling extrema, without the lookahead span by default.
+
+``technical.indicators.ichimoku`` recomputes rolling highs and lows for the
+conversion, base and lagging periods on every call, and strategies call it on
+the 5m frame, the 1h frame and their Heikin-Ashi versions. ``Ichimoku`` takes the
+extrema from ``RollingExtrema`` (one sparse table per column, every window
+computed once per frame), so a second call on the same frame, or a hyperopt
+grid of periods, only adds the windows it has not seen yet.
+
+Only the columns a strategy asks for are built. ``chikou_span`` is the close
+*displacement - 1 candles ahead*; it is left out unless ``lookahead=True`` is
+passed explicitly, for plotting or for strategies that shift it back themselves:
+
+    ichi = Ichimoku.of(dataframe).lines(20, 60, 120, 30, columns=['tenkan_sen', 'kijun_sen', 'cloud_green'])
+    dataframe['tenkan_sen'] = ichi['tenkan_sen']
+
+For hyperopt, ``grid()`` returns the requested columns for every combination of
+periods in one frame, named by ``column_name()``:
+
+    grid = Ichimoku.of(dataframe).grid([9, 20], [26, 60], [52, 120], [26, 30], columns=['cloud_green'])
+    dataframe = pd.concat([dataframe, grid], axis=1)
+    green = dataframe[column_name('cloud_green', 20, 60, 120, 30)]
+
+The values are those of ``technical.indicators.ichimoku``.
+"""
+from itertools import product
+from typing import Dict, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+from tradeboddy.protections import RollingExtrema
+
+CAUSAL_COLUMNS = ('tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b',
+                  'leading_senkou_span_a', 'leading_senkou_span_b', 'cloud_green', 'cloud_red')
+LOOKAHEAD_COLUMNS = ('chikou_span',)
+
+
+def column_name(column: str, conversion_line_period: int, base_line_periods: int, laggin_span: int,
+                displacement: int) -> str:
+    return f"{column}_{conversion_line_period}_{base_line_periods}_{laggin_span}_{displacement}"
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    # Series.shift() for positive and negative periods
+    out = np.full(len(values), np.nan)
+    if periods >= 0:
+        out[periods:] = values[:len(values) - periods] if periods < len(values) else []
+    elif -periods < len(values):
+        out[:periods] = values[-periods:]
+    return out
+
+
+class Ichimoku(RollingExtrema):
+
+    def midpoint(self, period: int) -> np.ndarray:
+        """
+        Middle of the highest high and lowest low of the last ``period`` candles.
+        """
+        return (self.rolling('high', 'max', period) + self.rolling('low', 'min', period)) / 2
+
+    def arrays(self, conversion_line_period: int = 9, base_line_periods: int = 26, laggin_span: int = 52,
+               displacement: int = 26, columns: Iterable[str] = CAUSAL_COLUMNS,
+               lookahead: bool = False) -> Dict[str, np.ndarray]:
+        columns = list(columns)
+        unknown = [col for col in columns if col not in CAUSAL_COLUMNS + LOOKAHEAD_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown Ichimoku columns {unknown}")
+        if not lookahead and any(col in LOOKAHEAD_COLUMNS for col in columns):
+            raise ValueError("chikou_span looks into the future, pass lookahead=True to get it anyway")
+
+        out: Dict[str, np.ndarray] = {}
+
+        def get(col: str) -> np.ndarray:
+            if col not in out:
+                if col == 'tenkan_sen':
+                    out[col] = self.midpoint(conversion_line_period)
+                elif col == 'kijun_sen':
+                    out[col] = self.midpoint(base_line_periods)
+                elif col == 'leading_senkou_span_a':
+                    out[col] = (get('tenkan_sen') + get('kijun_sen')) / 2
+                elif col == 'leading_senkou_span_b':
+                    out[col] = self.midpoint(laggin_span)
+                elif col in ('senkou_span_a', 'senkou_span_b'):
+                    out[col] = _shift(get('leading_' + col), displacement - 1)
+                elif col == 'chikou_span':
+                    out[col] = _shift(self.candles['close'], -displacement + 1)
+                else:
+                    a, b = get('senkou_span_a'), get('senkou_span_b')
+                    out[col] = a > b if col == 'cloud_green' else b > a
+            return out[col]
+
+        with np.errstate(invalid='ignore'):
+            return {col: get(col) for col in columns}
+
+    def lines(self, conversion_line_period: int = 9, base_line_periods: int = 26, laggin_span: int = 52,
+              displacement: int = 26, columns: Iterable[str] = CAUSAL_COLUMNS,
+              lookahead: bool = False) -> Dict[str, Series]:
+        """
+        ``columns`` of ``technical.indicators.ichimoku`` with these periods, as Series.
+        """
+        arrays = self.arrays(conversion_line_period, base_line_periods, laggin_span, displacement,
+                             columns, lookahead)
+        return {col: self._series(values) for col, values in arrays.items()}
+
+    def grid(self, conversion_line_periods: Sequence[int], base_line_periods: Sequence[int],
+             laggin_spans: Sequence[int], displacements: Sequence[int],
+             columns: Iterable[str] = ('cloud_green', 'cloud_red')) -> DataFrame:
+        """
+        ``columns`` for every combination of the periods, one frame named by ``column_name()``.
+        """
+        columns = list(columns)
+        block = {}
+        for periods in product(conversion_line_periods, base_line_periods, laggin_spans, displacements):
+            for col, values in self.arrays(*periods, columns=columns).items():
+                block[column_name(col, *periods)] = values
+        return pd.DataFrame(block, index=self.index)
+
+
+def ichimoku(dataframe: DataFrame, conversion_line_period: int = 9, base_line_periods: int = 26,
+             laggin_span: int = 52, displacement: int = 26, columns: Iterable[str] = CAUSAL_COLUMNS,
+             lookahead: bool = False) -> Dict[str, Series]:
+    """
+    ``technical.indicators.ichimoku`` replacement, see ``Ichimoku.lines()``.
+    """
+    return Ichimoku.of(dataframe).lines(conversion_line_period, base_line_periods, laggin_span, displacement,
+                                        columns, lookahead)
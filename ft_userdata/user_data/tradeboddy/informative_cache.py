@@ -0,0 +1,105 @@
+"""
+Cache for informative timeframe indicators.
+
+A 5m strategy with a 1h informative pair calls its ``*_indicators`` function on
+the 1h frame every 5m candle, although the 1h frame only gets a new closed
+candle every 12th call (every 288th for 1d). ``InformativeCache`` keeps the
+last populated informative frame per (pair, timeframe) and only runs the
+populate function again once the key changes:
+
+    (pair, informative timeframe, last closed informative candle, parameter key)
+
+Usage inside ``populate_indicators``:
+
+    informative = self.dp.get_pair_dataframe(pair=metadata['pair'], timeframe=self.informative_timeframe)
+    informative = self.informative_cache.get(
+        metadata['pair'], self.informative_timeframe, informative,
+        lambda df: self.slow_tf_indicators(df, metadata),
+        params_key=parameters_key(self))
+
+The returned frame is always a copy, since ``merge_informative_pair`` renames the
+columns of the frame it is given.
+"""
+import hashlib
+import logging
+from typing import Callable, Dict, Tuple
+
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+
+def parameters_key(strategy) -> str:
+    """
+    Short hash of the current values of all hyperoptable parameters of a strategy.
+    Falls back to the buy/sell params dicts for strategies without parameter objects.
+    """
+    values = []
+    if hasattr(strategy, 'enumerate_parameters'):
+        for name, param in strategy.enumerate_parameters():
+            values.append((name, param.value))
+    if not values:
+        for attr in ('buy_params', 'sell_params'):
+            values.extend(sorted(getattr(strategy, attr, {}).items()))
+    return hashlib.sha1(repr(sorted(values, key=lambda v: v[0])).encode()).hexdigest()[:12]
+
+
+def candle_key(informative: DataFrame) -> Tuple:
+    """
+    Identify the last closed candle of an informative frame.
+    """
+    return informative['date'].iloc[-1], len(informative)
+
+
+class InformativeCache:
+
+    def __init__(self, log_every: int = 500):
+        self.hits = 0
+        self.misses = 0
+        self.log_every = log_every
+        self._frames: Dict[Tuple[str, str], Tuple[Tuple, DataFrame]] = {}
+
+    def get(self, pair: str, timeframe: str, informative: DataFrame,
+            populate: Callable[[DataFrame], DataFrame], params_key: str = '') -> DataFrame:
+        if informative is None or informative.empty:
+            return populate(informative)
+
+        key = candle_key(informative) + (params_key,)
+        cached = self._frames.get((pair, timeframe))
+        if cached is not None and cached[0] == key:
+            self.hits += 1
+            frame = cached[1]
+        else:
+            self.misses += 1
+            frame = populate(informative)
+            self._frames[(pair, timeframe)] = (key, frame)
+            logger.debug(f"Informative cache miss for {pair} {timeframe} at {key[0]}")
+
+        if self.log_every and (self.hits + self.misses) % self.log_every == 0:
+            self.log_stats()
+
+        return frame.copy()
+
+    def invalidate(self, pair: str = None) -> None:
+        if pair is None:
+            self._frames.clear()
+        else:
+            for key in [k for k in self._frames if k[0] == pair]:
+                del self._frames[key]
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hit_ratio,
+            'entries': len(self._frames),
+        }
+
+    def log_stats(self) -> None:
+        logger.info(f"Informative cache: {self.hits} hits, {self.misses} misses "
+                    f"({self.hit_ratio:.1%} hit ratio), {len(self._frames)} entries")
@@ -0,0 +1,107 @@
+"""
+Support and resistance levels tracked from event masks, without per-row loops.
+
+Dracula's ``SupResFinder`` walks the frame with scalar ``df['col'][i]`` lookups and
+decides whether candle ``i`` is a support/resistance candle from candle ``i + 1``,
+so the ``support`` / ``resistance`` value on a row depends on the next candle.
+Here the events are boolean masks and the level is the value at the last event,
+forward-filled with one ``maximum.accumulate`` over the event positions:
+
+    dataframe['support'] = support_levels(dataframe)
+    dataframe['resistance'] = resistance_levels(dataframe)
+
+By default the levels are *confirmed at close*: an event only moves the level on
+the candle that confirms it, so every row only depends on candles that have
+closed, in backtests as in dry/live runs. That is the ``SupResFinder`` column
+shifted by one candle, ``df['support'].shift(1)`` here is ``SupResFinder``'s
+``df['support'].shift(2)``. ``confirmed=False`` gives the ``SupResFinder`` values
+themselves, lookahead included.
+"""
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+
+def _next(values: np.ndarray, fill) -> np.ndarray:
+    out = np.empty_like(values)
+    out[:-1] = values[1:]
+    out[-1:] = fill
+    return out
+
+
+def track_levels(events: np.ndarray, values: np.ndarray, initial: float, delay: int = 0) -> np.ndarray:
+    """
+    ``values`` on the last row where ``events`` is true, ``initial`` before the first event.
+    With ``delay`` an event only moves the level ``delay`` candles later.
+    """
+    events = np.asarray(events, dtype=bool)
+    values = np.asarray(values, dtype=float)
+    idx = np.arange(len(events))
+    last = np.maximum.accumulate(np.where(events, idx, -1)) if len(events) else idx
+    levels = np.where(last >= 0, values[np.maximum(last, 0)] if len(values) else values, initial)
+    if delay > 0:
+        levels[delay:] = levels[:len(levels) - delay].copy()
+        levels[:delay] = initial
+    return levels
+
+
+def reversal_events(touch: np.ndarray, open_: np.ndarray, close: np.ndarray, side: str) -> np.ndarray:
+    """
+    Touch candles against the move that the next candle does not continue: for ``side='support'``
+    a red candle touching the lower band, followed by a candle that is green or off the band
+    (``'resistance'``: green on the upper band, then red or off the band).
+
+    The mask is aligned to the touch candle, it is only known at the close of the candle after it.
+    The last candle has no next candle and is never an event.
+    """
+    touch = np.asarray(touch, dtype=float)
+    open_ = np.asarray(open_, dtype=float)
+    close = np.asarray(close, dtype=float)
+    if side == 'support':
+        against, turn = close < open_, close > open_
+    elif side == 'resistance':
+        against, turn = close > open_, close < open_
+    else:
+        raise ValueError(f"side must be 'support' or 'resistance', not {side!r}")
+    release = (_next(touch, np.nan) == 0) | _next(turn, False)
+    events = (touch == 1) & against & release
+    events[-1:] = False
+    return events
+
+
+def _levels(dataframe: DataFrame, touch: str, side: str, confirmed: bool) -> Series:
+    o = dataframe['open'].to_numpy(float)
+    c = dataframe['close'].to_numpy(float)
+    n = len(c)
+    if n == 0:
+        return pd.Series(np.zeros(0), index=dataframe.index)
+    events = reversal_events(dataframe[touch].to_numpy(float), o, c, side)
+    # the first candle seeds the level
+    events[0] = False
+    if side == 'support':
+        values, initial = np.minimum(o, c), c[0]
+    else:
+        values, initial = np.maximum(o, c), o[0]
+    if confirmed:
+        levels = track_levels(events, values, initial, delay=1)
+    else:
+        # SupResFinder leaves the second to last candle out as well
+        events[n - 2:] = False
+        levels = track_levels(events, values, initial)
+    return pd.Series(levels, index=dataframe.index)
+
+
+def support_levels(dataframe: DataFrame, touch: str = 'bb_bbl_i', confirmed: bool = True) -> Series:
+    """
+    Body low of the last support candle (``reversal_events(side='support')`` on the ``touch`` column),
+    the first close before any.
+    """
+    return _levels(dataframe, touch, 'support', confirmed)
+
+
+def resistance_levels(dataframe: DataFrame, touch: str = 'bb_bbh_i', confirmed: bool = True) -> Series:
+    """
+    Body high of the last resistance candle (``reversal_events(side='resistance')`` on the ``touch``
+    column), the first open before any.
+    """
+    return _levels(dataframe, touch, 'resistance', confirmed)
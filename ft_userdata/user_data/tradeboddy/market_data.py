@@ -0,0 +1,215 @@
+"""
+Loop-scoped order book / ticker snapshots.
+
+``confirm_trade_entry``, ``check_buy_timeout``, ``check_sell_timeout`` and
+``get_current_price`` in Schism, Martin, CryptoFrog and friends each call
+``self.dp.orderbook(pair, 1)`` or ``self.dp.ticker(pair)``, so the same top of
+book is fetched several times per pair per bot loop. ``MarketSnapshot`` sits in
+front of the DataProvider:
+
+* within one bot loop every pair is fetched at most once (``new_loop()`` starts a loop),
+* entries older than ``ttl`` seconds are evicted at the start of the next loop,
+* ``prefetch()`` fills the snapshot for a list of pairs, using a single bulk ticker
+  request when the exchange supports it.
+
+freqtrade's DataProvider has no public bulk ticker call. The bulk request goes
+through the exchange the DataProvider keeps as ``_exchange`` and its
+``get_tickers()``, as in the 2021-2023 freqtrade releases the strategies here
+target. A source with a public ``tickers()`` (like ``FakeExchange``) is used
+as is. Without either, the bulk request is skipped with one log message, and
+``prefetch(..., single_tickers=False)`` leaves the tickers to be fetched on demand.
+
+The data source only needs ``orderbook(pair, maximum)`` and ``ticker(pair)``, so a
+``FakeExchange`` (or any stub) can stand in for the DataProvider, and the clock is
+injectable.
+
+    market = MarketSnapshot(ttl=5)
+
+    def bot_loop_start(self, **kwargs) -> None:
+        self.market.bind(self.dp)
+        self.market.new_loop()
+
+    def confirm_trade_entry(self, pair, ...):
+        current_price = self.market.top_of_book(pair, book_side(self.config, 'entry'))
+"""
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def book_side(config: dict, side: str) -> str:
+    """
+    Order book side ('bid' or 'ask') used to price a long entry or exit.
+    Understands both entry_pricing/exit_pricing and the older bid_strategy/ask_strategy keys.
+    """
+    if side == 'entry':
+        pricing = config.get('entry_pricing') or config.get('bid_strategy', {})
+        same, other = 'bid', 'ask'
+    else:
+        pricing = config.get('exit_pricing') or config.get('ask_strategy', {})
+        same, other = 'ask', 'bid'
+    price_side = pricing.get('price_side', 'same')
+    if price_side == 'same':
+        return same
+    if price_side == 'other':
+        return other
+    return price_side
+
+
+def use_order_book(config: dict, side: str) -> bool:
+    if side == 'entry':
+        pricing = config.get('entry_pricing') or config.get('bid_strategy', {})
+    else:
+        pricing = config.get('exit_pricing') or config.get('ask_strategy', {})
+    return pricing.get('use_order_book', False)
+
+
+class MarketSnapshot:
+
+    def __init__(self, source=None, ttl: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.source = source
+        self.ttl = ttl
+        self.clock = clock
+        self.loop = 0
+        self.hits = 0
+        self.misses = 0
+        self._warned_bulk = False
+        # key -> (loop, fetched_at, value)
+        self._orderbooks: Dict[str, Tuple[int, float, dict]] = {}
+        self._tickers: Dict[str, Tuple[int, float, dict]] = {}
+
+    def bind(self, source) -> None:
+        self.source = source
+
+    def new_loop(self) -> None:
+        self.loop += 1
+        now = self.clock()
+        for entries in (self._orderbooks, self._tickers):
+            for pair in [p for p, (_, fetched_at, _) in entries.items() if now - fetched_at > self.ttl]:
+                del entries[pair]
+
+    def _fresh(self, entry) -> bool:
+        return entry is not None and (entry[0] == self.loop or self.clock() - entry[1] <= self.ttl)
+
+    def _source(self):
+        if self.source is None:
+            raise RuntimeError("MarketSnapshot has no data source, call bind(self.dp) first")
+        return self.source
+
+    def orderbook(self, pair: str, maximum: int = 1) -> dict:
+        entry = self._orderbooks.get(pair)
+        if self._fresh(entry) and len(entry[2]['bids']) >= maximum and len(entry[2]['asks']) >= maximum:
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+        ob = self._source().orderbook(pair, maximum)
+        self._orderbooks[pair] = (self.loop, self.clock(), ob)
+        return ob
+
+    def ticker(self, pair: str) -> dict:
+        entry = self._tickers.get(pair)
+        if self._fresh(entry):
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+        ticker = self._source().ticker(pair)
+        self._tickers[pair] = (self.loop, self.clock(), ticker)
+        return ticker
+
+    def top_of_book(self, pair: str, side: str) -> float:
+        """
+        Best price on the 'bid' or 'ask' side of the order book.
+        """
+        return self.orderbook(pair, 1)[f"{side}s"][0][0]
+
+    def current_rate(self, pair: str, config: dict, side: str = 'exit') -> float:
+        """
+        Price the way freqtrade would, from the order book or from the ticker's last price.
+        """
+        if use_order_book(config, side):
+            return self.top_of_book(pair, book_side(config, side))
+        return self.ticker(pair)['last']
+
+    def prefetch(self, pairs: List[str], orderbook: bool = True, maximum: int = 1,
+                 single_tickers: bool = True) -> None:
+        """
+        Fill the snapshot for all ``pairs`` at the start of a loop. Without a bulk ticker
+        request, tickers are fetched one by one unless ``single_tickers`` is False.
+        """
+        source = self._source()
+        if orderbook:
+            for pair in pairs:
+                if not self._fresh(self._orderbooks.get(pair)):
+                    self._orderbooks[pair] = (self.loop, self.clock(), source.orderbook(pair, maximum))
+                    self.misses += 1
+            return
+
+        tickers = self._bulk_tickers(source)
+        if tickers is None and not single_tickers:
+            return
+        now = self.clock()
+        for pair in pairs:
+            if self._fresh(self._tickers.get(pair)):
+                continue
+            ticker = tickers.get(pair) if tickers is not None else source.ticker(pair)
+            if ticker:
+                self._tickers[pair] = (self.loop, now, ticker)
+                self.misses += 1
+
+    def _bulk_tickers(self, source) -> Optional[dict]:
+        if hasattr(source, 'tickers'):
+            return source.tickers()
+        # private to the DataProvider, see the module docstring
+        exchange = getattr(source, '_exchange', None)
+        if exchange is None or not hasattr(exchange, 'get_tickers'):
+            if not self._warned_bulk:
+                self._warned_bulk = True
+                logger.info(f"{type(source).__name__} has no _exchange.get_tickers(), "
+                            f"no bulk ticker requests")
+            return None
+        try:
+            return exchange.get_tickers()
+        except Exception as e:
+            logger.debug(f"Bulk ticker fetch failed: {e}")
+        return None
+
+    def stats(self) -> dict:
+        return {
+            'loop': self.loop,
+            'hits': self.hits,
+            'misses': self.misses,
+            'orderbooks': len(self._orderbooks),
+            'tickers': len(self._tickers),
+        }
+
+
+class FakeExchange:
+    """
+    Minimal stand-in for the DataProvider, serving fixed prices and counting requests.
+    """
+
+    def __init__(self, prices: Dict[str, float], spread: float = 0.001):
+        self.prices = prices
+        self.spread = spread
+        self.calls = {'orderbook': 0, 'ticker': 0, 'tickers': 0}
+
+    def orderbook(self, pair: str, maximum: int) -> dict:
+        self.calls['orderbook'] += 1
+        price = self.prices[pair]
+        return {
+            'bids': [[price * (1 - self.spread * (i + 1)), 1.0] for i in range(maximum)],
+            'asks': [[price * (1 + self.spread * (i + 1)), 1.0] for i in range(maximum)],
+        }
+
+    def ticker(self, pair: str) -> dict:
+        self.calls['ticker'] += 1
+        price = self.prices[pair]
+        return {'symbol': pair, 'last': price, 'bid': price * (1 - self.spread), 'ask': price * (1 + self.spread)}
+
+    def tickers(self) -> dict:
+        self.calls['tickers'] += 1
+        return {pair: {'symbol': pair, 'last': price, 'bid': price * (1 - self.spread),
+                       'ask': price * (1 + self.spread)}
+                for pair, price in self.prices.items()}
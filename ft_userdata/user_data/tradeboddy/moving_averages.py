@@ -0,0 +1,207 @@
+"""
+Many moving averages of one source from one shared EMA cascade.
+
+DEMA, TEMA, zema and T3 (HPotter's) are all sums of the same cascaded EMAs:
+``EMA(n)``, ``EMA(EMA(n))``, ... up to six deep for T3. The helpers copied into
+the strategies compute every average on its own, so a 5m NFI frame computes the
+EMA of the close for a length several times per pair, and a ``.range`` hyperopt
+loop does it once per value and per loop. ``MovingAverages`` keeps every EMA of
+the cascade it computed, per (length, depth), and builds the averages from them:
+
+    averages = MovingAverages(dataframe['close'])
+    attach(dataframe, averages.columns('ema', (8, 12, 26, 50, 200)))   # ema_8, ema_12, ...
+    dataframe['zema_61'] = averages.get('zema', 61)                    # reuses EMA(61)
+
+A hyperopt ``.range`` loop becomes one block of columns:
+
+    attach(dataframe, averages.columns('t3', self.t3_periods.range, name='T3_{length}'))
+
+``KINDS`` are ``ema``, ``dema``, ``tema``, ``t3``, ``zema``, ``sma``, ``wma``,
+``hma`` (qtpylib's hull_moving_average) and ``vidya`` (technical's VIDYA), with
+the values of those functions bit for bit. ``pmax()`` is the PMAX of the NFI
+family on top of it.
+"""
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import talib
+from pandas import DataFrame, Index, Series
+
+KINDS = ('ema', 'dema', 'tema', 't3', 'zema', 'sma', 'wma', 'hma', 'vidya')
+
+# pmax() MAtype -> kind, 3 is TA-Lib's T3 and 8 the VWMA
+PMAX_KINDS = {1: 'ema', 2: 'dema', 4: 'sma', 5: 'vidya', 6: 'tema', 7: 'wma', 9: 'zema'}
+
+
+class MovingAverages:
+    """
+    Moving averages of one source, every EMA of the cascade computed once.
+    """
+
+    def __init__(self, source: Union[Series, np.ndarray], index: Optional[Index] = None):
+        self.index: Optional[Index] = getattr(source, 'index', None) if index is None else index
+        self.source = np.ascontiguousarray(np.asarray(source, dtype=float))
+        # (length, depth) -> EMA applied depth times
+        self._emas: Dict[Tuple[int, int], np.ndarray] = {}
+        # (kind, length) -> values
+        self._values: Dict[Tuple[str, int], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def ema(self, length: int, depth: int = 1) -> np.ndarray:
+        """
+        EMA of the EMA ... of the source, ``depth`` EMAs deep.
+        """
+        length = int(length)
+        key = (length, depth)
+        if key not in self._emas:
+            prev = self.source if depth == 1 else self.ema(length, depth - 1)
+            self._emas[key] = talib.EMA(prev, length)
+        return self._emas[key]
+
+    def get(self, kind: str, length: int) -> np.ndarray:
+        """
+        The ``kind`` moving average of ``length``, see ``KINDS``.
+        """
+        kind = kind.lower()
+        length = int(length)
+        if kind == 'ema':
+            return self.ema(length)
+        key = (kind, length)
+        if key not in self._values:
+            if kind not in KINDS:
+                raise ValueError(f"Unknown moving average {kind!r}, use one of {KINDS}")
+            self._values[key] = getattr(self, f'_{kind}')(length)
+        return self._values[key]
+
+    def columns(self, kinds: Union[str, Iterable[str]], lengths: Iterable[int],
+                name: str = '{kind}_{length}') -> Dict[str, np.ndarray]:
+        """
+        ``{name: values}`` of every kind and length, for ``attach()``; ``name`` is formatted with
+        ``kind`` and ``length``.
+        """
+        kinds = (kinds,) if isinstance(kinds, str) else tuple(kinds)
+        lengths = tuple(lengths)
+        return {name.format(kind=kind, length=length): self.get(kind, length)
+                for kind in kinds for length in lengths}
+
+    def block(self, kinds: Union[str, Iterable[str]], lengths: Iterable[int],
+              name: str = '{kind}_{length}') -> DataFrame:
+        """
+        ``columns()`` as a DataFrame on the source's index.
+        """
+        return pd.DataFrame(self.columns(kinds, lengths, name), index=self.index)
+
+    def _dema(self, length: int) -> np.ndarray:
+        # as talib.DEMA
+        return 2 * self.ema(length) - self.ema(length, 2)
+
+    def _tema(self, length: int) -> np.ndarray:
+        # as talib.TEMA
+        return 3 * self.ema(length) - 3 * self.ema(length, 2) + self.ema(length, 3)
+
+    def _zema(self, length: int) -> np.ndarray:
+        ema1 = self.ema(length)
+        return ema1 + (ema1 - self.ema(length, 2))
+
+    def _t3(self, length: int) -> np.ndarray:
+        # T3 Average by HPotter on Tradingview, b = 0.7 (not TA-Lib's T3)
+        b = 0.7
+        c1 = -b * b * b
+        c2 = 3 * b * b + 3 * b * b * b
+        c3 = -6 * b * b - 3 * b - 3 * b * b * b
+        c4 = 1 + 3 * b + b * b * b + 3 * b * b
+        return (c1 * self.ema(length, 6) + c2 * self.ema(length, 5) + c3 * self.ema(length, 4)
+                + c4 * self.ema(length, 3))
+
+    def _sma(self, length: int) -> np.ndarray:
+        return talib.SMA(self.source, length)
+
+    def _wma(self, length: int) -> np.ndarray:
+        return talib.WMA(self.source, length)
+
+    def _hma(self, length: int) -> np.ndarray:
+        # qtpylib.hull_moving_average, on exponentially weighted means
+        source = pd.Series(self.source)
+        half = source.ewm(span=length / 2, min_periods=length).mean()
+        full = source.ewm(span=length, min_periods=length).mean()
+        return (2 * half - full).ewm(span=np.sqrt(length), min_periods=length).mean().to_numpy()
+
+    def _vidya(self, length: int) -> np.ndarray:
+        # technical.indicators.VIDYA with the Chande momentum oscillator as volatility index
+        alpha = 2 / (length + 1)
+        momm = np.concatenate(([np.nan], np.diff(self.source)))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            m1 = np.where(momm >= 0, momm, 0.0)
+            m2 = np.where(momm >= 0, 0.0, -momm)
+            sm1 = pd.Series(m1).rolling(length).sum().to_numpy()
+            sm2 = pd.Series(m2).rolling(length).sum().to_numpy()
+            k = np.abs(100 * (sm1 - sm2) / (sm1 + sm2)) / 100
+        # the copied function fills every NaN (the close included) with 0
+        k = np.where(np.isnan(k), 0.0, k).tolist()
+        close = np.where(np.isnan(self.source), 0.0, self.source).tolist()
+        vidya = [0.0] * len(close)
+        for i in range(length, len(close)):
+            vidya[i] = alpha * k[i] * close[i] + (1 - alpha * k[i]) * vidya[i - 1]
+        return np.array(vidya)
+
+
+def pmax(df: DataFrame, period: int, multiplier: int, length: int, MAtype: int, src: int,
+         averages: Optional[MovingAverages] = None) -> Tuple[Series, np.ndarray]:
+    """
+    Profit Maximizer of the NFI family: ``(pm, pmx)``, the PMAX line and ``'up'`` / ``'down'``
+    (``'nan'`` while the line is 0).
+
+    ``src`` 1 is the close, 2 hl2, 3 ohlc4. ``MAtype`` 1 EMA, 2 DEMA, 3 T3 (TA-Lib's), 4 SMA,
+    5 VIDYA, 6 TEMA, 7 WMA, 8 VWMA, 9 zema; 5, 7, 8 and 9 are on the close whatever ``src`` is.
+    ``averages`` are the ``MovingAverages`` of the ``src`` prices, to share their EMAs.
+    """
+    period, multiplier, length, MAtype, src = int(period), int(multiplier), int(length), int(MAtype), int(src)
+    if src == 1:
+        masrc = df['close']
+    elif src == 2:
+        masrc = (df['high'] + df['low']) / 2
+    elif src == 3:
+        masrc = (df['high'] + df['low'] + df['close'] + df['open']) / 4
+    else:
+        raise ValueError(f"Unknown pmax src {src}, use 1 (close), 2 (hl2) or 3 (ohlc4)")
+    close = df['close'].to_numpy(float)
+    if MAtype in (5, 7, 9) and src != 1:
+        mavalue = MovingAverages(close).get(PMAX_KINDS[MAtype], length)
+    elif MAtype in PMAX_KINDS:
+        mavalue = (averages or MovingAverages(masrc)).get(PMAX_KINDS[MAtype], length)
+    elif MAtype == 3:
+        mavalue = talib.T3(masrc.to_numpy(float), length)
+    elif MAtype == 8:
+        volume = df['volume'].to_numpy(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mavalue = talib.SMA(close * volume, length) / talib.SMA(volume, length)
+    else:
+        raise ValueError(f"Unknown pmax MAtype {MAtype}")
+
+    atr = talib.ATR(df['high'].to_numpy(float), df['low'].to_numpy(float), close, period)
+    basic_ub = (mavalue + ((multiplier / 10) * atr)).tolist()
+    basic_lb = (mavalue - ((multiplier / 10) * atr)).tolist()
+    ma = mavalue.tolist()
+
+    n = len(ma)
+    final_ub = [0.0] * n
+    final_lb = [0.0] * n
+    pm_arr = [0.0] * n
+    for i in range(period, n):
+        final_ub[i] = basic_ub[i] if (basic_ub[i] < final_ub[i - 1] or ma[i - 1] > final_ub[i - 1]) else final_ub[i - 1]
+        final_lb[i] = basic_lb[i] if (basic_lb[i] > final_lb[i - 1] or ma[i - 1] < final_lb[i - 1]) else final_lb[i - 1]
+        prev = pm_arr[i - 1]
+        pm_arr[i] = (
+            final_ub[i] if (prev == final_ub[i - 1] and ma[i] <= final_ub[i])
+            else final_lb[i] if (prev == final_ub[i - 1] and ma[i] > final_ub[i])
+            else final_lb[i] if (prev == final_lb[i - 1] and ma[i] >= final_lb[i])
+            else final_ub[i] if (prev == final_lb[i - 1] and ma[i] < final_lb[i])
+            else 0.0)
+
+    pm_arr = np.array(pm_arr)
+    # Mark the trend direction up/down; 'nan' as numpy 1 made of the np.NaN of the copies
+    pmx = np.where((pm_arr > 0.00), np.where((mavalue < pm_arr), 'down', 'up'), 'nan')
+    return pd.Series(pm_arr, index=df.index), pmx
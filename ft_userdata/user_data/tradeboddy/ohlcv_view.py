@@ -0,0 +1,257 @@
+"""
+Zero-copy OHLCV input for the indicator helpers strategies carry around.
+
+The helpers pasted into most strategies (EWO, williams_r, chaikin_money_flow,
+T3, the pump/dump warnings, ...) start with ``dataframe.copy()`` or build
+intermediate columns on the frame, so every call copies the whole analyzed
+frame - hundreds of columns by the time ``normal_tf_indicators`` runs. The
+versions here take an ``OHLCVView``, which holds the candle columns as contiguous
+float64 arrays (views into the frame where its layout allows), and return plain
+numpy arrays or dicts of arrays:
+
+    candles = OHLCVView.of(dataframe)
+    attach(dataframe, {
+        'r_14': williams_r(candles, 14),
+        'r_480': williams_r(candles, 480),
+        'cmf': chaikin_money_flow(candles, 20),
+        **dump_warning(candles, self.buy_threshold.value),
+    })
+
+``attach()`` adds all columns with one block assignment instead of one insert
+per column. All helpers also accept a DataFrame and return the same values as
+the copied-in originals.
+"""
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import talib
+from pandas import DataFrame, Index
+
+from tradeboddy.moving_averages import MovingAverages
+from tradeboddy.rolling import rolling_count
+
+
+class OHLCVView:
+    """
+    Read-only contiguous float64 arrays of the candle columns of a frame.
+    """
+    __slots__ = ('index', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, dataframe: DataFrame):
+        self.index: Index = dataframe.index
+        for col in ('open', 'high', 'low', 'close', 'volume'):
+            setattr(self, col, np.ascontiguousarray(dataframe[col].to_numpy(float)))
+
+    @classmethod
+    def of(cls, candles: Union['OHLCVView', DataFrame]) -> 'OHLCVView':
+        return candles if isinstance(candles, cls) else cls(candles)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+Candles = Union[OHLCVView, DataFrame]
+
+
+def attach(dataframe: DataFrame, columns: Dict[str, np.ndarray], index: Optional[Index] = None) -> DataFrame:
+    """
+    Assign ``columns`` to ``dataframe`` in one block and return it.
+
+    ``index`` is the index the arrays belong to, when they were computed on
+    another frame (e.g. BTC candles); they are aligned on it like a Series would be.
+    """
+    if columns:
+        block = DataFrame(columns, index=dataframe.index if index is None else index)
+        dataframe[list(block.columns)] = block
+    return dataframe
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def _rolling(values: np.ndarray, window: int, **kwargs):
+    # pandas' rolling kernels on a Series wrapping the array, no copy of the frame
+    return pd.Series(values, copy=False).rolling(window, **kwargs)
+
+
+def _count(flags: np.ndarray, window: int) -> np.ndarray:
+    return rolling_count(pd.Series(flags, copy=False), window).to_numpy()
+
+
+def _crossed_below(series1: np.ndarray, series2: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid='ignore'):
+        return (series1 < series2) & (_shift(series1, 1) >= _shift(series2, 1))
+
+
+def _crossed_above(series1: np.ndarray, series2: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid='ignore'):
+        return (series1 > series2) & (_shift(series1, 1) <= _shift(series2, 1))
+
+
+def EWO(candles: Candles, ema_length: int = 5, ema2_length: int = 35) -> np.ndarray:
+    """
+    Elliot Wave Oscillator as a percentage of the low.
+    """
+    c = OHLCVView.of(candles)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (talib.EMA(c.close, ema_length) - talib.EMA(c.close, ema2_length)) / c.low * 100
+
+
+def ewo(candles: Candles, sma1_length: int = 5, sma2_length: int = 35,
+        averages: Optional[MovingAverages] = None) -> np.ndarray:
+    """
+    Elliot Wave Oscillator as a percentage of the close; ``averages`` of the close share their EMAs.
+    """
+    c = OHLCVView.of(candles)
+    averages = averages or MovingAverages(c.close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (averages.ema(sma1_length) - averages.ema(sma2_length)) / c.close * 100
+
+
+def williams_r(candles: Candles, period: int = 14) -> np.ndarray:
+    """
+    Williams %R, from -100 (close at the lowest low) to 0 (close at the highest high).
+    """
+    c = OHLCVView.of(candles)
+    highest_high = _rolling(c.high, period).max().to_numpy()
+    lowest_low = _rolling(c.low, period).min().to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (highest_high - c.close) / (highest_high - lowest_low) * -100
+
+
+def chaikin_money_flow(candles: Candles, n: int = 20, fillna: bool = False) -> np.ndarray:
+    """
+    Chaikin Money Flow (CMF), the money flow volume of the last ``n`` candles over their volume.
+    """
+    c = OHLCVView.of(candles)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mfv = ((c.close - c.low) - (c.high - c.close)) / (c.high - c.low)
+        mfv = np.where(np.isnan(mfv), 0.0, mfv) * c.volume
+        cmf = (_rolling(mfv, n, min_periods=0).sum().to_numpy()
+               / _rolling(c.volume, n, min_periods=0).sum().to_numpy())
+    if fillna:
+        cmf = np.where(np.isfinite(cmf), cmf, 0.0)
+    return cmf
+
+
+def T3(candles: Candles, length: int = 5, averages: Optional[MovingAverages] = None) -> np.ndarray:
+    """
+    T3 Average by HPotter on Tradingview (six chained EMAs, b = 0.7).
+    """
+    return (averages or MovingAverages(OHLCVView.of(candles).close)).get('t3', length)
+
+
+def VWAPB(candles: Candles, window_size: int = 20, num_of_std: float = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rolling VWAP (as qtpylib.rolling_vwap) with bands ``num_of_std`` rolling deviations away.
+    """
+    c = OHLCVView.of(candles)
+    typical = (c.high + c.low + c.close) / 3
+    left = _rolling(c.volume * typical, window_size, min_periods=window_size).sum().to_numpy()
+    right = _rolling(c.volume, window_size, min_periods=window_size).sum().to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vwap = left / right
+    vwap = pd.Series(np.where(np.isinf(vwap), np.nan, vwap)).ffill().to_numpy()
+    rolling_std = _rolling(vwap, window_size).std().to_numpy()
+    return vwap - rolling_std * num_of_std, vwap, vwap + rolling_std * num_of_std
+
+
+def pump_warning(candles: Candles, perc: float = 15) -> np.ndarray:
+    """
+    1 on green candles whose high-low range exceeds ``perc`` percent of the low, else 0.
+    """
+    c = OHLCVView.of(candles)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return ((c.close > c.open) & ((c.high - c.low) / c.low > perc / 100)).astype('int')
+
+
+PUMP_WARNING2_DEFAULTS = {
+    'pct_change_timeframe': 8,
+    'pct_change_max': 0.15,
+    'pct_change_min': -0.15,
+    'pct_change_short_timeframe': 8,
+    'pct_change_short_max': 0.08,
+    'pct_change_short_min': -0.08,
+    'ispumping': 0.4,
+    'islongpumping': 0.48,
+    'isshortpumping': 0.10,
+    'ispumping_rolling': 20,
+    'islongpumping_rolling': 30,
+    'isshortpumping_rolling': 10,
+    'recentispumping_rolling': 300,
+}
+
+
+def pump_warning2(candles: Candles, params: dict) -> np.ndarray:
+    """
+    True while any of the pump detectors fired within ``recentispumping_rolling`` candles.
+
+    ``params`` overrides PUMP_WARNING2_DEFAULTS; like the original, ``islongpumping_rolling``
+    is always the default.
+    """
+    c = OHLCVView.of(candles)
+    p = {**PUMP_WARNING2_DEFAULTS, **{k: v for k, v in params.items() if k != 'islongpumping_rolling'}}
+    close = pd.Series(c.close, copy=False)
+    with np.errstate(invalid='ignore'):
+        pct_change = close.pct_change(periods=p['pct_change_timeframe']).to_numpy()
+        pct_change_int = ((pct_change > p['pct_change_max']) | (pct_change < p['pct_change_min'])).astype('int')
+        pct_change_short = close.pct_change(periods=p['pct_change_short_timeframe']).to_numpy()
+        pct_change_int_short = ((pct_change_short > p['pct_change_short_max'])
+                                | (pct_change_short < p['pct_change_short_min'])).astype('int')
+    recent = np.zeros(len(c), dtype=bool)
+    for flags, rolling, threshold in ((pct_change_int, 'ispumping_rolling', 'ispumping'),
+                                      (pct_change_int, 'islongpumping_rolling', 'islongpumping'),
+                                      (pct_change_int_short, 'isshortpumping_rolling', 'isshortpumping')):
+        # counts of 0/1 flags, so the rolling sums and the rolling max > 0 are exact window counts
+        pumping = _count(flags, p[rolling]) >= p[threshold]
+        recent |= _count(pumping, p['recentispumping_rolling']) > 0
+    return recent
+
+
+def dump_warning(candles: Candles, buy_threshold: float, day_candles: int = 288) -> Dict[str, np.ndarray]:
+    """
+    The pair_threshold/pair_diff (last candle dump) and pair_5m/pair_1d/pair_5m_1d_diff
+    (one day back) columns of the original, which wrote them into the frame.
+    """
+    c = OHLCVView.of(candles)
+
+    def past_source(periods: int) -> np.ndarray:
+        return (_shift(c.open, periods) + _shift(c.close, periods)
+                + _shift(c.high, periods) + _shift(c.low, periods)) / 4
+
+    source = past_source(1)
+    past_close = _shift(c.close, 1)
+    threshold = source * buy_threshold
+    source_1d = past_source(day_candles)
+    return {
+        'pair_threshold': threshold,
+        'pair_diff': threshold - (_shift(past_close, 1) - past_close),
+        'pair_5m': source,
+        'pair_1d': source_1d,
+        'pair_5m_1d_diff': source - source_1d,
+    }
+
+
+def momdiv(candles: Candles, mom_length: int = 10, bb_length: int = 20, bb_dev: float = 2.0,
+           lookback: int = 30) -> Dict[str, np.ndarray]:
+    """
+    Momentum divergence: momentum crossing its Bollinger bands, and closes at new highs/lows.
+    """
+    c = OHLCVView.of(candles)
+    mom = talib.MOM(c.close, mom_length)
+    upperband, _, lowerband = talib.BBANDS(mom, timeperiod=bb_length, nbdevup=bb_dev, nbdevdn=bb_dev, matype=0)
+    with np.errstate(invalid='ignore'):
+        return {
+            'momdiv_mom': mom,
+            'momdiv_upperb': upperband,
+            'momdiv_lowerb': lowerband,
+            'momdiv_buy': _crossed_below(mom, lowerband),
+            'momdiv_sell': _crossed_above(mom, upperband),
+            'momdiv_coh': c.high >= _rolling(c.high, lookback).max().to_numpy(),
+            'momdiv_col': c.low <= _rolling(c.low, lookback).min().to_numpy(),
+        }
@@ -0,0 +1,155 @@
+"""
+Session pivot levels, computed once per closed informative candle.
+
+The NFI family copies ``pivot_points(dataframe, mode='fibonacci')`` into every
+strategy and calls it on the whole 1d informative frame (and on the BTC 1d frame)
+on every 5m candle, although the levels only change when a day closes. Every
+row's levels only depend on the candle before it, so ``SessionPivots`` keeps the
+levels per (pair, timeframe) and, keyed on the last closed candle like
+``InformativeCache``, returns them as they are until a new candle arrives, then
+computes the new rows only:
+
+    informative_1d['pivot'], informative_1d['res1'], informative_1d['res2'], informative_1d['res3'], \\
+        informative_1d['sup1'], informative_1d['sup2'], informative_1d['sup3'] = \\
+        pivot_points(informative_1d, mode='fibonacci', pair=metadata['pair'], timeframe='1d')
+
+Modes: ``classic`` (the NFI ``simple``), ``fibonacci``, ``camarilla`` and
+``woodie``. Without ``pair`` it is the plain function, the values are those of the
+copied helper in both cases.
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+from tradeboddy.informative_cache import candle_key
+
+LEVELS = ('pivot', 'res1', 'res2', 'res3', 'sup1', 'sup2', 'sup3')
+MODES = ('classic', 'fibonacci', 'camarilla', 'woodie')
+
+# (pair, timeframe) -> levels of the last frame seen
+_by_pair: Dict[Tuple[str, str], 'SessionPivots'] = {}
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    out = np.empty(len(values))
+    out[:1] = np.nan
+    out[1:] = values[:-1]
+    return out
+
+
+def pivot_levels(high: np.ndarray, low: np.ndarray, close: np.ndarray, mode: str = 'fibonacci') -> Dict[str, np.ndarray]:
+    """
+    ``LEVELS`` of every row from the candle before it, NaN on the first row.
+    """
+    if mode == 'simple':
+        mode = 'classic'
+    if mode not in MODES:
+        raise ValueError(f"Unknown pivot mode {mode!r}, use one of {MODES}")
+    hl_range = _shift(high - low)
+    if mode == 'woodie':
+        pivot = _shift(high + low + 2 * close) / 4
+    else:
+        pivot = _shift(high + low + close) / 3
+    if mode == 'classic':
+        res1, sup1 = pivot * 2 - _shift(low), pivot * 2 - _shift(high)
+        res2, sup2 = pivot + hl_range, pivot - hl_range
+        res3, sup3 = pivot * 2 + _shift(high - 2 * low), pivot * 2 - _shift(2 * high - low)
+    elif mode == 'fibonacci':
+        res1, sup1 = pivot + 0.382 * hl_range, pivot - 0.382 * hl_range
+        res2, sup2 = pivot + 0.618 * hl_range, pivot - 0.618 * hl_range
+        res3, sup3 = pivot + 1 * hl_range, pivot - 1 * hl_range
+    elif mode == 'camarilla':
+        prev_close = _shift(close)
+        res1, sup1 = prev_close + hl_range * 1.1 / 12, prev_close - hl_range * 1.1 / 12
+        res2, sup2 = prev_close + hl_range * 1.1 / 6, prev_close - hl_range * 1.1 / 6
+        res3, sup3 = prev_close + hl_range * 1.1 / 4, prev_close - hl_range * 1.1 / 4
+    else:
+        res1, sup1 = pivot * 2 - _shift(low), pivot * 2 - _shift(high)
+        res2, sup2 = pivot + hl_range, pivot - hl_range
+        res3, sup3 = _shift(high) + 2 * (pivot - _shift(low)), _shift(low) - 2 * (_shift(high) - pivot)
+    return dict(zip(LEVELS, (pivot, res1, res2, res3, sup1, sup2, sup3)))
+
+
+class SessionPivots:
+    """
+    Pivot levels of one pair's frame, carried over to the next frame of the same pair.
+    """
+
+    def __init__(self, dataframe: DataFrame):
+        self._reset(dataframe)
+
+    def _reset(self, dataframe: DataFrame) -> None:
+        self.key = candle_key(dataframe)
+        self.dates = dataframe['date'].to_numpy('datetime64[ns]')
+        self.candles = {col: dataframe[col].to_numpy(float, copy=True) for col in ('high', 'low', 'close')}
+        # mode -> LEVELS
+        self._levels: Dict[str, Dict[str, np.ndarray]] = {}
+
+    @classmethod
+    def for_pair(cls, pair: str, timeframe: str, dataframe: DataFrame) -> 'SessionPivots':
+        pivots = _by_pair.get((pair, timeframe))
+        if pivots is None:
+            pivots = _by_pair[(pair, timeframe)] = cls(dataframe)
+        elif candle_key(dataframe) != pivots.key:
+            pivots.update(dataframe)
+        return pivots
+
+    def update(self, dataframe: DataFrame) -> 'SessionPivots':
+        """
+        Move to ``dataframe``, the previous frame with candles dropped at the start and/or appended
+        at the end; only the appended rows are computed. Anything else starts over.
+        """
+        dates = dataframe['date'].to_numpy('datetime64[ns]')
+        new = {col: dataframe[col].to_numpy(float, copy=True) for col in self.candles}
+        start = self._overlap(new, dates)
+        if start is None:
+            self._reset(dataframe)
+            return self
+        kept = len(self.dates) - start
+        levels = {}
+        for mode, old in self._levels.items():
+            # the first appended row needs the last kept candle
+            first = max(kept - 1, 0)
+            tail = pivot_levels(new['high'][first:], new['low'][first:], new['close'][first:], mode)
+            levels[mode] = {name: np.concatenate((old[name][start:], tail[name][kept - first:])) for name in LEVELS}
+            if start:
+                for values in levels[mode].values():
+                    # the new first row has no candle before it
+                    values[:1] = np.nan
+        self.key, self.dates, self.candles = candle_key(dataframe), dates, new
+        self._levels = levels
+        return self
+
+    def _overlap(self, new: Dict[str, np.ndarray], dates: np.ndarray) -> Optional[int]:
+        # row of the previous frame where the new one starts, if the candles they share are equal
+        if not len(dates) or not len(self.dates):
+            return None
+        start = int(np.searchsorted(self.dates, dates[0]))
+        kept = len(self.dates) - start
+        if start >= len(self.dates) or kept > len(dates) or not np.array_equal(self.dates[start:], dates[:kept]):
+            return None
+        for col, values in self.candles.items():
+            if not np.array_equal(values[start:], new[col][:kept], equal_nan=True):
+                return None
+        return start
+
+    def levels(self, mode: str = 'fibonacci') -> Dict[str, np.ndarray]:
+        if mode not in self._levels:
+            self._levels[mode] = pivot_levels(self.candles['high'], self.candles['low'], self.candles['close'], mode)
+        return self._levels[mode]
+
+
+def pivot_points(dataframe: DataFrame, mode: str = 'fibonacci', pair: Optional[str] = None,
+                 timeframe: Optional[str] = None) -> Tuple[Series, ...]:
+    """
+    ``(pivot, res1, res2, res3, sup1, sup2, sup3)`` of ``dataframe``. With ``pair`` the levels are
+    kept for the next call with the same pair and timeframe, see ``SessionPivots``.
+    """
+    if pair is None or dataframe.empty:
+        levels = pivot_levels(dataframe['high'].to_numpy(float), dataframe['low'].to_numpy(float),
+                              dataframe['close'].to_numpy(float), mode)
+    else:
+        levels = SessionPivots.for_pair(pair, timeframe, dataframe).levels(mode)
+    return tuple(pd.Series(levels[name], index=dataframe.index, copy=True) for name in LEVELS)
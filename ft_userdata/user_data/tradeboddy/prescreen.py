@@ -0,0 +1,355 @@
+"""
+Fast ROI / stoploss pre-screen for the strategies directory.
+
+Full backtests of all strategies take far too long to triage which ones deserve
+attention on our pairs. The pre-screen runs each strategy's
+``populate_indicators`` / buy / sell functions once per pair on local feather
+data, then simulates the trades with array operations:
+
+* one open trade per pair, entries and signal exits fill at the next candle's open,
+* exits by sell signal, ``minimal_roi`` table, fixed stoploss and trailing stoploss
+  (``trailing_stop_positive`` / ``_offset`` / ``trailing_only_offset_is_reached``),
+* ``custom_stoploss``: the pHSL / pPF / pSL curve as arrays when it compiles
+  (``tradeboddy.stoploss_curve``), any other one called per candle on the highest
+  price seen before the candle (``StoplossCallback``, slower).
+
+Other custom callbacks (``custom_sell``, protections, ...) are ignored, so the numbers are only meant for ranking
+strategies against each other, not as a replacement for ``freqtrade backtesting``.
+
+    python -m tradeboddy.prescreen --pairs BTC/USDT:USDT PAXG/USDT:USDT --days 180 --workers 8
+    python -m tradeboddy.prescreen --filter 'BB_RPB_TSL*' --export prescreen.csv
+"""
+import argparse
+import copy
+import fnmatch
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from tradeboddy.stoploss_curve import StoplossCallback, StoplossCurve
+
+logger = logging.getLogger(__name__)
+
+USER_DATA = Path(__file__).resolve().parents[1]
+
+
+def pair_to_filename(pair: str) -> str:
+    return pair.replace('/', '_').replace(':', '_')
+
+
+def load_candles(datadir: Path, pair: str, timeframe: str, days: Optional[int] = None) -> Optional[DataFrame]:
+    """
+    Load freqtrade feather data for spot or futures markets.
+    """
+    stem = pair_to_filename(pair)
+    for name in (f"{stem}-{timeframe}-futures.feather", f"{stem}-{timeframe}.feather"):
+        path = Path(datadir) / name
+        if path.is_file():
+            df = pd.read_feather(path)
+            if days:
+                df = df[df['date'] >= df['date'].iloc[-1] - pd.Timedelta(days=days)]
+            return df.reset_index(drop=True)
+    return None
+
+
+def roi_thresholds(minimal_roi: Dict, minutes: np.ndarray) -> np.ndarray:
+    """
+    ROI threshold for each trade duration in minutes (step function of the ROI table).
+    """
+    table = sorted((int(k), float(v)) for k, v in minimal_roi.items())
+    keys = np.array([k for k, _ in table])
+    values = np.array([v for _, v in table])
+    idx = np.searchsorted(keys, minutes, side='right') - 1
+    return np.where(idx >= 0, values[np.clip(idx, 0, None)], np.inf)
+
+
+class Simulator:
+    """
+    Trade simulation over the signal columns of one analyzed pair.
+    """
+
+    def __init__(self, minimal_roi: Dict, stoploss: float, trailing_stop: bool = False,
+                 trailing_stop_positive: Optional[float] = None,
+                 trailing_stop_positive_offset: float = 0.0,
+                 trailing_only_offset_is_reached: bool = False,
+                 use_sell_signal: bool = True, fee: float = 0.001, window: int = 512,
+                 custom_stoploss: Optional[Union[StoplossCurve, StoplossCallback]] = None):
+        self.minimal_roi = minimal_roi
+        self.stoploss = stoploss
+        self.trailing_stop = trailing_stop
+        self.trailing_stop_positive = trailing_stop_positive
+        self.trailing_stop_positive_offset = trailing_stop_positive_offset or 0.0
+        self.trailing_only_offset_is_reached = trailing_only_offset_is_reached
+        self.use_sell_signal = use_sell_signal
+        self.fee = fee
+        self.window = window
+        self.custom_stoploss = custom_stoploss
+
+    @classmethod
+    def from_strategy(cls, strategy, fee: float = 0.001) -> 'Simulator':
+        return cls(
+            minimal_roi=strategy.minimal_roi,
+            stoploss=strategy.stoploss,
+            trailing_stop=getattr(strategy, 'trailing_stop', False),
+            trailing_stop_positive=getattr(strategy, 'trailing_stop_positive', None),
+            trailing_stop_positive_offset=getattr(strategy, 'trailing_stop_positive_offset', 0.0),
+            trailing_only_offset_is_reached=getattr(strategy, 'trailing_only_offset_is_reached', False),
+            use_sell_signal=getattr(strategy, 'use_sell_signal', getattr(strategy, 'use_exit_signal', True)),
+            fee=fee,
+            custom_stoploss=custom_stoploss_curve(strategy),
+        )
+
+    def _exit(self, e: int, stop: int, o, h, l, minutes, exit_signal, dataframe=None, pair: str = ''):
+        """
+        Find the exit of a trade opened at the open of candle ``e`` within ``[e, stop)``.
+        Returns (exit index, exit rate) or None if the trade is still open at ``stop``.
+        """
+        rate = o[e]
+        sl_price = rate * (1 + self.stoploss)
+
+        # stoploss uses the highest price seen before the candle to stay causal
+        prev_high = np.maximum.accumulate(np.concatenate(([rate], h[e:stop - 1])))
+        stop_price = np.full(stop - e, sl_price)
+        if self.trailing_stop:
+            max_profit = prev_high / rate - 1
+            if self.trailing_stop_positive is not None:
+                reached = max_profit > self.trailing_stop_positive_offset
+                distance = np.where(reached, self.trailing_stop_positive, -self.stoploss)
+                trails = reached | (not self.trailing_only_offset_is_reached)
+            else:
+                distance = np.full(stop - e, -self.stoploss)
+                trails = np.ones(stop - e, dtype=bool)
+            stop_price = np.where(trails, np.maximum(stop_price, prev_high * (1 - distance)), stop_price)
+        if isinstance(self.custom_stoploss, StoplossCallback):
+            stop_price = np.maximum(stop_price, self.custom_stoploss.stop_prices(
+                rate, h[e:stop], self.fee, self.stoploss, analyzed=dataframe, start=e, pair=pair))
+        elif self.custom_stoploss is not None:
+            stop_price = np.maximum(stop_price, self.custom_stoploss.stop_prices(rate, h[e:stop], self.fee, self.stoploss))
+
+        roi_price = rate * (1 + roi_thresholds(self.minimal_roi, minutes[e:stop] - minutes[e]))
+
+        signal = np.zeros(stop - e, dtype=bool)
+        if self.use_sell_signal:
+            # a sell signal on candle j - 1 exits at the open of candle j
+            signal[1:] = exit_signal[e:stop - 1]
+
+        stop_hit = l[e:stop] <= stop_price
+        roi_hit = h[e:stop] >= roi_price
+        hit = signal | stop_hit | roi_hit
+        if not hit.any():
+            return None
+        k = int(hit.argmax())
+        j = e + k
+        if signal[k]:
+            return j, o[j]
+        if stop_hit[k]:
+            return j, min(o[j], stop_price[k]) if k > 0 else stop_price[k]
+        return j, max(o[j], roi_price[k]) if k > 0 else roi_price[k]
+
+    def run(self, dataframe: DataFrame, enter: Optional[np.ndarray] = None,
+            exit_signal: Optional[np.ndarray] = None, pair: str = '') -> DataFrame:
+        """
+        Simulate the trades of one pair. ``enter`` / ``exit_signal`` default to the
+        signal columns of ``dataframe``; ``pair`` is handed to a ``custom_stoploss`` callback.
+        """
+        columns = ['open_index', 'close_index', 'open_date', 'close_date', 'open_rate', 'close_rate', 'profit_ratio']
+        if len(dataframe) == 0:
+            return DataFrame(columns=columns)
+        o = dataframe['open'].to_numpy(float)
+        h = dataframe['high'].to_numpy(float)
+        l = dataframe['low'].to_numpy(float)
+        minutes = ((dataframe['date'] - dataframe['date'].iloc[0]).dt.total_seconds() // 60).to_numpy()
+        if enter is None:
+            enter = signal_column(dataframe, ('enter_long', 'buy'))
+        if exit_signal is None:
+            exit_signal = signal_column(dataframe, ('exit_long', 'sell'))
+
+        n = len(dataframe)
+        dates = dataframe['date'].to_numpy()
+        entries = np.flatnonzero(enter[:-1]) + 1
+        trades = []
+        pos = 0
+        while True:
+            i = np.searchsorted(entries, pos)
+            if i >= len(entries):
+                break
+            e = int(entries[i])
+            # look for the exit in a window that doubles until it is found
+            span = self.window
+            while True:
+                stop = min(n, e + span)
+                found = self._exit(e, stop, o, h, l, minutes, exit_signal, dataframe, pair)
+                if found is not None or stop == n:
+                    break
+                span *= 2
+            if found is None:
+                # still open at the end of the data, close at the last close
+                found = (n - 1, dataframe['close'].iat[-1])
+            j, rate = found
+            profit = (rate * (1 - self.fee)) / (o[e] * (1 + self.fee)) - 1
+            trades.append((e, j, dates[e], dates[j], o[e], rate, profit))
+            pos = j + 1
+        return DataFrame(trades, columns=columns)
+
+
+def custom_stoploss_curve(strategy) -> Optional[Union[StoplossCurve, StoplossCallback]]:
+    """
+    The compiled ``custom_stoploss`` of a strategy using it, or the callback itself when it
+    does not compile (or differs from its compiled curve).
+    """
+    if not getattr(strategy, 'use_custom_stoploss', False):
+        return None
+    name = type(strategy).__name__
+    curve = StoplossCurve.compile(type(strategy))
+    if curve is None:
+        logger.warning(f"{name}: custom_stoploss does not compile to a curve, calling it per candle")
+        return StoplossCallback(strategy)
+    try:
+        return curve.bind(strategy)
+    except Exception as e:
+        logger.warning(f"{name}: custom_stoploss not compiled ({e}), calling it per candle")
+        return StoplossCallback(strategy)
+
+
+def signal_column(dataframe: DataFrame, names) -> np.ndarray:
+    for name in names:
+        if name in dataframe:
+            return (dataframe[name].fillna(0).to_numpy() == 1)
+    return np.zeros(len(dataframe), dtype=bool)
+
+
+def trade_stats(trades: DataFrame) -> dict:
+    """
+    Summary of the trades of one or more pairs, the drawdown over the trades in closing order.
+    """
+    if 'close_date' in trades and len(trades):
+        trades = trades.sort_values(['close_date', 'open_date'], kind='stable')
+    profits = trades['profit_ratio'].to_numpy(float)
+    equity = np.cumsum(profits)
+    drawdown = np.max(np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:] - equity) if len(equity) else 0.0
+    return {
+        'trades': len(profits),
+        'profit_pct': float(profits.sum() * 100),
+        'avg_profit_pct': float(profits.mean() * 100) if len(profits) else 0.0,
+        'win_rate': float((profits > 0).mean()) if len(profits) else 0.0,
+        'max_drawdown_pct': float(drawdown * 100),
+    }
+
+
+def load_strategy(name: str, strategy_path: Path, base_config: dict):
+    from freqtrade.data.dataprovider import DataProvider
+    from freqtrade.resolvers import StrategyResolver
+
+    config = copy.deepcopy(base_config)
+    config['strategy'] = name
+    config['strategy_path'] = str(strategy_path)
+    strategy = StrategyResolver.load_strategy(config)
+    strategy.dp = DataProvider(config, None)
+    return strategy
+
+
+def backtest_config(config_file: Path, datadir: Optional[Path]) -> dict:
+    from freqtrade.configuration import Configuration
+    from freqtrade.enums import RunMode
+
+    args = {'config': [str(config_file)], 'user_data_dir': str(USER_DATA)}
+    if datadir:
+        args['datadir'] = str(datadir)
+    return Configuration(args, RunMode.BACKTEST).get_config()
+
+
+def screen_strategy(name: str, strategy_path: Path, pairs: List[str], base_config: dict,
+                    days: Optional[int] = None, fee: float = 0.001) -> dict:
+    """
+    Populate and simulate one strategy on all pairs. Never raises, errors are reported in the result.
+    """
+    result = {'strategy': name, 'timeframe': None, 'error': None}
+    started = time.perf_counter()
+    try:
+        strategy = load_strategy(name, strategy_path, base_config)
+        result['timeframe'] = strategy.timeframe
+        simulator = Simulator.from_strategy(strategy, fee=fee)
+        all_trades = []
+        for pair in pairs:
+            candles = load_candles(base_config['datadir'], pair, strategy.timeframe, days)
+            if candles is None:
+                continue
+            metadata = {'pair': pair}
+            df = strategy.advise_indicators(candles, metadata)
+            df = strategy.advise_entry(df, metadata)
+            df = strategy.advise_exit(df, metadata)
+            all_trades.append(simulator.run(df, pair=pair))
+        if not all_trades:
+            result['error'] = f"no {strategy.timeframe} data"
+        else:
+            result.update(trade_stats(pd.concat(all_trades, ignore_index=True)))
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 2)
+    return result
+
+
+def discover(strategies_dir: Path, patterns: Optional[List[str]] = None) -> List[Path]:
+    files = sorted(p for p in Path(strategies_dir).glob('*/*.py') if p.stem == p.parent.name)
+    if patterns:
+        files = [p for p in files if any(fnmatch.fnmatch(p.stem, pat) for pat in patterns)]
+    return files
+
+
+def run_prescreen(files: List[Path], pairs: List[str], base_config: dict, workers: int = 4,
+                  days: Optional[int] = None, fee: float = 0.001) -> DataFrame:
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(screen_strategy, f.stem, f.parent, pairs, base_config, days, fee)
+                   for f in files]
+        for future in as_completed(futures):
+            res = future.result()
+            results.append(res)
+            logger.info(f"{res['strategy']}: {res.get('trades', 0)} trades, "
+                        f"{res.get('profit_pct', 0):.2f}% ({res['seconds']}s)"
+                        + (f" - {res['error']}" if res['error'] else ''))
+    report = DataFrame(results)
+    if 'profit_pct' in report:
+        report = report.sort_values('profit_pct', ascending=False, na_position='last')
+    return report.reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--config', default=str(USER_DATA / 'config.json'))
+    parser.add_argument('--strategies-dir', default=str(USER_DATA / 'strategies'))
+    parser.add_argument('--datadir', default=None, help='defaults to the datadir of the config')
+    parser.add_argument('--pairs', nargs='+', default=None, help='defaults to the config whitelist')
+    parser.add_argument('--filter', nargs='+', default=None, help='strategy name patterns')
+    parser.add_argument('--days', type=int, default=None)
+    parser.add_argument('--fee', type=float, default=0.001)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--export', default=None, help='write the report to this .csv or .json file')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    base_config = backtest_config(Path(args.config), Path(args.datadir) if args.datadir else None)
+    pairs = args.pairs or base_config['exchange']['pair_whitelist']
+    files = discover(Path(args.strategies_dir), args.filter)
+    started = time.perf_counter()
+    report = run_prescreen(files, pairs, base_config, args.workers, args.days, args.fee)
+    elapsed = time.perf_counter() - started
+
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(report.to_string(index=False))
+    print(f"\n{len(files)} strategies screened in {elapsed:.1f}s")
+    if args.export:
+        if args.export.endswith('.json'):
+            report.to_json(args.export, orient='records', indent=2)
+        else:
+            report.to_csv(args.export, index=False)
+
+
+if __name__ == '__main__':
+    main()
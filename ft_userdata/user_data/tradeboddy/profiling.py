@@ -0,0 +1,326 @@
+"""
+Opt-in profiler for strategy callbacks and the helpers they call.
+
+Many helpers copy the whole analyzed frame to read a few columns
+(``dump_warning()``'s ``dataframe.copy().shift(288)``, ``pump_warning*()``,
+``SSLChannels_ATR``, ...). The profiler wraps every function defined in the
+strategy's module(s), i.e. the ``populate_*`` / ``custom_*`` methods, the
+strategy's own helper methods and the module level helpers, and records per call
+path:
+
+    calls, time_s, self_s   wall time, including / excluding the wrapped callees
+    alloc_mb                peak traced allocation above the level at the call (tracemalloc)
+    copies, shifts          DataFrame.copy() / DataFrame.shift() calls made directly in the function
+    copied_mb               size of the frames copied or shifted
+    inserts                 new columns set on a DataFrame
+    max_rss_mb              peak resident size of the process when the call returned
+
+    with StrategyProfiler(strategy) as profiler:
+        dataframe = strategy.advise_indicators(candles, {'pair': pair})
+    print(profiler.report().to_string(index=False))
+    profiler.write_folded(Path('profile.folded'))    # flamegraph.pl / speedscope input
+
+or from the command line, on local feather data:
+
+    python -m tradeboddy.profiling --strategy BB_RPB_TSL_SMA_Tranz --pairs BTC/USDT --days 30
+"""
+import argparse
+import functools
+import inspect
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from pandas import DataFrame
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR = 'profiles'
+COUNTERS = ('copies', 'shifts', 'copied_bytes', 'inserts')
+_INHERITED = object()
+
+
+def max_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    # kilobytes on Linux, bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class _Frame:
+    __slots__ = ('path', 'started', 'child_time', 'base', 'peak', 'counters')
+
+    def __init__(self, path: Tuple[str, ...], base: int):
+        self.path = path
+        self.started = time.perf_counter()
+        self.child_time = 0.0
+        self.base = base
+        self.peak = base
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+
+class StrategyProfiler:
+    """
+    Wraps the strategy's functions and pandas' copy/shift/column setters while active.
+    Only one profiler can be active at a time.
+    """
+
+    def __init__(self, strategy, trace_memory: bool = True):
+        self.strategy = strategy
+        self.trace_memory = trace_memory
+        self.stats: Dict[Tuple[str, ...], dict] = {}
+        self._stack: List[_Frame] = []
+        self._patched: List[Tuple[object, str, object]] = []
+        self._in_pandas = False
+        self._started_tracing = False
+
+    def __enter__(self) -> 'StrategyProfiler':
+        self.install()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.uninstall()
+
+    # --- installation -----------------------------------------------------------------
+
+    def _modules(self) -> Tuple[list, set]:
+        classes = [cls for cls in type(self.strategy).__mro__
+                   if not cls.__module__.startswith(('freqtrade', 'builtins', 'abc'))]
+        modules = {sys.modules[cls.__module__] for cls in classes if cls.__module__ in sys.modules}
+        return classes, modules
+
+    def _patch(self, owner, name: str, value) -> None:
+        # inherited class attributes are restored by deleting the override
+        original = vars(owner).get(name, _INHERITED)
+        self._patched.append((owner, name, original))
+        setattr(owner, name, value)
+
+    def install(self) -> None:
+        if self._patched:
+            return
+        classes, modules = self._modules()
+        for cls in classes:
+            for name, attr in list(vars(cls).items()):
+                if name.startswith('__'):
+                    continue
+                if inspect.isfunction(attr):
+                    self._patch(cls, name, self._wrap(attr, f"{cls.__name__}.{name}"))
+                elif isinstance(attr, staticmethod) and inspect.isfunction(attr.__func__):
+                    self._patch(cls, name, staticmethod(self._wrap(attr.__func__, f"{cls.__name__}.{name}")))
+        for module in modules:
+            for name, obj in list(vars(module).items()):
+                if inspect.isfunction(obj) and obj.__module__ != __name__ \
+                        and (obj.__module__ == module.__name__ or obj.__module__.startswith('tradeboddy.')):
+                    self._patch(module, name, self._wrap(obj, obj.__name__))
+
+        self._patch(DataFrame, 'copy', self._count_pandas(DataFrame.copy, 'copies'))
+        self._patch(DataFrame, 'shift', self._count_pandas(DataFrame.shift, 'shifts'))
+        self._patch(DataFrame, '__setitem__', self._count_setitem(DataFrame.__setitem__))
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def uninstall(self) -> None:
+        for owner, name, original in reversed(self._patched):
+            if original is _INHERITED:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._patched = []
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    # --- wrappers ---------------------------------------------------------------------
+
+    def _traced(self) -> Tuple[int, int]:
+        return tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+
+    def _wrap(self, func: Callable, label: str) -> Callable:
+        profiler = self
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parent = profiler._stack[-1] if profiler._stack else None
+            current, peak = profiler._traced()
+            if parent is not None:
+                parent.peak = max(parent.peak, peak)
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            frame = _Frame((parent.path if parent else ()) + (label,), current)
+            profiler._stack.append(frame)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler._stack.pop()
+                profiler._record(frame, parent)
+
+        return wrapper
+
+    def _record(self, frame: _Frame, parent: Optional[_Frame]) -> None:
+        elapsed = time.perf_counter() - frame.started
+        _, peak = self._traced()
+        peak = max(peak, frame.peak)
+        if parent is not None:
+            parent.child_time += elapsed
+            parent.peak = max(parent.peak, peak)
+        stat = self.stats.setdefault(frame.path, dict(calls=0, time=0.0, self_time=0.0, alloc=0,
+                                                      max_rss=0, **dict.fromkeys(COUNTERS, 0)))
+        stat['calls'] += 1
+        stat['time'] += elapsed
+        stat['self_time'] += elapsed - frame.child_time
+        stat['alloc'] = max(stat['alloc'], peak - frame.base)
+        stat['max_rss'] = max(stat['max_rss'], max_rss_bytes())
+        for key in COUNTERS:
+            stat[key] += frame.counters[key]
+
+    def _count_pandas(self, method: Callable, counter: str) -> Callable:
+        profiler = self
+
+        @functools.wraps(method)
+        def wrapper(df, *args, **kwargs):
+            if profiler._in_pandas or not profiler._stack:
+                return method(df, *args, **kwargs)
+            profiler._in_pandas = True
+            try:
+                counters = profiler._stack[-1].counters
+                counters[counter] += 1
+                counters['copied_bytes'] += int(df.memory_usage(index=True, deep=False).sum())
+                return method(df, *args, **kwargs)
+            finally:
+                profiler._in_pandas = False
+
+        return wrapper
+
+    def _count_setitem(self, method: Callable) -> Callable:
+        profiler = self
+
+        @functools.wraps(method)
+        def wrapper(df, key, value):
+            if not profiler._in_pandas and profiler._stack and isinstance(key, str) and key not in df.columns:
+                profiler._stack[-1].counters['inserts'] += 1
+            return method(df, key, value)
+
+        return wrapper
+
+    # --- reports ----------------------------------------------------------------------
+
+    def report(self, flat: bool = False) -> DataFrame:
+        """
+        One row per call path, children below their caller and siblings by time; with
+        ``flat`` one row per function, summed over its call paths.
+        """
+        rows = []
+        for path, stat in self.stats.items():
+            rows.append({
+                'path': path,
+                'function': path[-1] if flat else '  ' * (len(path) - 1) + path[-1],
+                'calls': stat['calls'],
+                'time_s': round(stat['time'], 4),
+                'self_s': round(stat['self_time'], 4),
+                'alloc_mb': round(stat['alloc'] / 2 ** 20, 2),
+                'copies': stat['copies'],
+                'shifts': stat['shifts'],
+                'copied_mb': round(stat['copied_bytes'] / 2 ** 20, 2),
+                'inserts': stat['inserts'],
+                'max_rss_mb': round(stat['max_rss'] / 2 ** 20, 1),
+            })
+        if not rows:
+            return DataFrame()
+        report = DataFrame(rows)
+        if flat:
+            report = report.groupby('function', as_index=False).agg(
+                calls=('calls', 'sum'), self_s=('self_s', 'sum'), alloc_mb=('alloc_mb', 'max'),
+                copies=('copies', 'sum'), shifts=('shifts', 'sum'), copied_mb=('copied_mb', 'sum'),
+                inserts=('inserts', 'sum'), max_rss_mb=('max_rss_mb', 'max'))
+            return report.sort_values(['copied_mb', 'self_s'], ascending=False).reset_index(drop=True)
+
+        # depth first, the most expensive subtree first
+        times = {row['path']: row['time_s'] for row in rows}
+
+        def sort_key(path):
+            return tuple((-times.get(path[:i + 1], 0.0), path[i]) for i in range(len(path)))
+
+        report = report.iloc[sorted(range(len(rows)), key=lambda i: sort_key(rows[i]['path']))]
+        return report.drop(columns='path').reset_index(drop=True)
+
+    def folded(self, value: str = 'self_time') -> List[str]:
+        """
+        Collapsed stacks (``caller;callee value``), self time in microseconds by default.
+        """
+        lines = []
+        for path, stat in self.stats.items():
+            amount = stat[value] * 1e6 if value in ('time', 'self_time') else stat[value]
+            if amount > 0:
+                lines.append(f"{';'.join(path)} {int(round(amount))}")
+        return lines
+
+    def write_folded(self, path: Path, value: str = 'self_time') -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('\n'.join(self.folded(value)) + '\n')
+        return path
+
+
+def profile_pairs(strategy, pairs: List[str], datadir: Path, days: Optional[int] = None,
+                  trace_memory: bool = True) -> StrategyProfiler:
+    """
+    Profile indicator, entry and exit population of ``strategy`` on local data for ``pairs``.
+    """
+    from tradeboddy.prescreen import load_candles
+
+    profiler = StrategyProfiler(strategy, trace_memory=trace_memory)
+    for pair in pairs:
+        candles = load_candles(datadir, pair, strategy.timeframe, days)
+        if candles is None:
+            logger.warning(f"No {strategy.timeframe} data for {pair}")
+            continue
+        metadata = {'pair': pair}
+        with profiler:
+            df = strategy.advise_indicators(candles, metadata)
+            df = strategy.advise_entry(df, metadata)
+            strategy.advise_exit(df, metadata)
+    return profiler
+
+
+def main(argv=None):
+    from tradeboddy.prescreen import USER_DATA, backtest_config, load_strategy
+
+    parser = argparse.ArgumentParser(description='Profile time, allocations and DataFrame copies of a strategy per helper call.')
+    parser.add_argument('--config', default=str(USER_DATA / 'config.json'))
+    parser.add_argument('--strategy', required=True)
+    parser.add_argument('--strategies-dir', default=str(USER_DATA / 'strategies'))
+    parser.add_argument('--datadir', default=None, help='defaults to the datadir of the config')
+    parser.add_argument('--pairs', nargs='+', default=None, help='defaults to the first pair of the whitelist')
+    parser.add_argument('--days', type=int, default=None)
+    parser.add_argument('--flat', action='store_true', help='one row per function instead of per call path')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc, which slows the run down')
+    parser.add_argument('--folded', default=None,
+                        help=f'collapsed stacks output, defaults to {PROFILES_DIR}/<strategy>.folded')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    config = backtest_config(Path(args.config), Path(args.datadir) if args.datadir else None)
+    pairs = args.pairs or config['exchange']['pair_whitelist'][:1]
+    strategy = load_strategy(args.strategy, Path(args.strategies_dir) / args.strategy, config)
+    profiler = profile_pairs(strategy, pairs, config['datadir'], args.days, not args.no_memory)
+
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(profiler.report(flat=args.flat).to_string(index=False))
+    folded = profiler.write_folded(Path(args.folded) if args.folded
+                                   else USER_DATA / PROFILES_DIR / f"{args.strategy}.folded")
+    print(f"\nCollapsed stacks written to {folded}")
+
+
+if __name__ == '__main__':
+    main()
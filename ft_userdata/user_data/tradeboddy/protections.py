@@ -0,0 +1,239 @@
+"""
+Rolling extrema shared by the dip/pump protection features.
+
+The NFI family builds its protections from ``range_percent_change`` (HL/OC over
+5..48 candles), ``top_percent_change`` (0/2/12/144), ``range_maxgap``,
+``range_height`` and ``safe_pump``, each calling ``rolling(length).max()`` /
+``.min()`` on the candle columns again - ``safe_pump`` alone runs five rolling
+extrema and is called 36 times on the 1h frame. ``ProtectionFeatures`` computes
+every (column, window) extremum once, from a sparse table per column (the
+extremum of any window is the extremum of two overlapping power-of-two blocks),
+and derives the ratios from those:
+
+    protection = ProtectionFeatures.of(informative_1h)
+    informative_1h['oc_pct_change_48'] = protection.range_percent_change('OC', 48)
+    informative_1h['safe_pump_48_10'] = protection.safe_pump(48, thresh, pull_thresh)
+
+``RollingExtrema`` is the shared core (also used by ``tradeboddy.ichimoku``);
+``of()`` returns the same instance for the same frame, so strategy helpers
+taking a dataframe can call it on every use. In live/dry_run,
+``ProtectionFeatures.for_pair()`` keeps one instance per pair and timeframe and,
+when the next candle arrives, only computes the new rows of every cached
+window instead of the whole frame.
+
+The values match the pandas expressions they replace, NaN for incomplete windows
+included.
+"""
+import weakref
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+COLUMNS = ('open', 'high', 'low', 'close')
+
+# (class, id(frame)) -> (weak reference to the frame, instance); identity alone could be reused by a new frame
+_by_frame: Dict[Tuple[type, int], Tuple[weakref.ref, 'RollingExtrema']] = {}
+# (class, pair, timeframe) -> instance, for the incremental updates in live/dry_run
+_by_pair: Dict[Tuple[type, str, str], 'RollingExtrema'] = {}
+
+
+def _candles(dataframe: DataFrame) -> Dict[str, np.ndarray]:
+    # copies, a view would keep the frame's whole float block alive in the per-pair cache
+    return {col: dataframe[col].to_numpy(float, copy=True) for col in COLUMNS}
+
+
+def _sparse_levels(values: np.ndarray, levels: list, op, window: int) -> list:
+    """
+    Extend ``levels`` (level k holds ``op`` over the 2**k values starting at each row) to cover ``window``.
+    """
+    if not levels:
+        levels.append(values)
+    while 2 ** len(levels) <= window:
+        prev, span = levels[-1], 2 ** (len(levels) - 1)
+        levels.append(op(prev[:-span], prev[span:]) if len(prev) > span else prev[:0])
+    return levels
+
+
+def _window_extrema(values: np.ndarray, levels: list, op, window: int) -> np.ndarray:
+    n = len(values)
+    out = np.full(n, np.nan)
+    if window > n or window < 1:
+        return out
+    k = window.bit_length() - 1
+    block = levels[k]
+    span = 1 << k
+    out[window - 1:] = op(block[:n - window + 1], block[window - span:n - span + 1])
+    # pandas needs ``window`` valid values, a NaN anywhere in the window makes it NaN
+    nans = np.isnan(values)
+    if nans.any():
+        counts = np.concatenate(([0], np.cumsum(nans)))
+        out[window - 1:][(counts[window:] - counts[:n - window + 1]) > 0] = np.nan
+    return out
+
+
+def rolling_extrema(values: np.ndarray, window: int, op=np.fmax) -> np.ndarray:
+    """
+    ``rolling(window).max()`` (``op=np.fmax``) or ``.min()`` (``op=np.fmin``) of ``values``.
+    """
+    return _window_extrema(values, _sparse_levels(values, [], op, window), op, window)
+
+
+class RollingExtrema:
+    """
+    Rolling max/min of the candle columns of a frame, each (column, window) computed once.
+    """
+
+    def __init__(self, dataframe: DataFrame):
+        self._reset(dataframe)
+
+    def _reset(self, dataframe: DataFrame) -> None:
+        self.index = dataframe.index
+        self.dates = dataframe['date'].to_numpy('datetime64[ns]') if 'date' in dataframe.columns else None
+        self.candles = _candles(dataframe)
+        # (column, 'max'/'min') -> sparse table, built lazily up to the largest window asked for
+        self._levels: Dict[Tuple[str, str], list] = {}
+        # (column, 'max'/'min', window) -> rolling extremum
+        self._extrema: Dict[Tuple[str, str, int], np.ndarray] = {}
+
+    @classmethod
+    def of(cls, dataframe: DataFrame) -> 'RollingExtrema':
+        """
+        The features of ``dataframe``, reused for as long as the frame and its candles are unchanged.
+        """
+        entry = _by_frame.get((cls, id(dataframe)))
+        if entry is not None and entry[0]() is dataframe and entry[1].matches(dataframe):
+            return entry[1]
+        features = cls(dataframe)
+        features._register(dataframe)
+        return features
+
+    @classmethod
+    def for_pair(cls, strategy, pair: str, timeframe: str, dataframe: DataFrame) -> 'RollingExtrema':
+        """
+        Like ``of()``, but in live/dry_run the features of ``pair`` carry over to the next
+        candle's frame and only the new rows are computed.
+        """
+        if strategy.config['runmode'].value not in ('live', 'dry_run'):
+            return cls.of(dataframe)
+        features = _by_pair.get((cls, pair, timeframe))
+        if features is None:
+            features = _by_pair[(cls, pair, timeframe)] = cls(dataframe)
+        else:
+            features.update(dataframe)
+        features._register(dataframe)
+        return features
+
+    def _register(self, dataframe: DataFrame) -> None:
+        key = (type(self), id(dataframe))
+        _by_frame[key] = (weakref.ref(dataframe, lambda _, key=key: _by_frame.pop(key, None)), self)
+
+    def matches(self, dataframe: DataFrame) -> bool:
+        if len(dataframe) != len(self.index) or not dataframe.index.equals(self.index):
+            return False
+        return all(np.array_equal(dataframe[col].to_numpy(float), self.candles[col], equal_nan=True)
+                   for col in COLUMNS)
+
+    def update(self, dataframe: DataFrame) -> 'RollingExtrema':
+        """
+        Move to ``dataframe``, the previous frame with candles dropped at the start and/or
+        appended at the end. Cached windows are shifted and only the new rows computed;
+        anything else (different candles, no ``date`` column) starts over.
+        """
+        new = _candles(dataframe)
+        dates = dataframe['date'].to_numpy('datetime64[ns]') if 'date' in dataframe.columns else None
+        start = self._overlap(new, dates)
+        if start is None:
+            self._reset(dataframe)
+            return self
+        n, kept = len(dataframe), len(self.index) - start
+        extrema = {}
+        for (col, kind, window), old in self._extrema.items():
+            values = new[col]
+            op = np.fmax if kind == 'max' else np.fmin
+            out = np.empty(n)
+            out[:kept] = old[start:]
+            out[:min(window - 1, n)] = np.nan
+            # the new rows need the window - 1 rows before them
+            first = max(kept - window + 1, 0)
+            out[kept:] = rolling_extrema(values[first:], window, op)[kept - first:]
+            extrema[(col, kind, window)] = out
+        self.index, self.dates, self.candles = dataframe.index, dates, new
+        self._levels = {}
+        self._extrema = extrema
+        return self
+
+    def _overlap(self, new: Dict[str, np.ndarray], dates: Optional[np.ndarray]) -> Optional[int]:
+        # row of the previous frame where the new one starts, if the candles they share are equal
+        if dates is None or self.dates is None or not len(dates) or not len(self.dates):
+            return None
+        start = int(np.searchsorted(self.dates, dates[0]))
+        kept = len(self.dates) - start
+        if start >= len(self.dates) or self.dates[start] != dates[0] or kept > len(dates):
+            return None
+        if not np.array_equal(self.dates[start:], dates[:kept]):
+            return None
+        for col in COLUMNS:
+            if not np.array_equal(self.candles[col][start:], new[col][:kept], equal_nan=True):
+                return None
+        return start
+
+    def rolling(self, column: str, kind: str, window: int) -> np.ndarray:
+        """
+        ``dataframe[column].rolling(window).max()`` (``kind='max'``) or ``.min()``, computed once.
+        """
+        key = (column, kind, window)
+        if key not in self._extrema:
+            values = self.candles[column]
+            op = np.fmax if kind == 'max' else np.fmin
+            levels = _sparse_levels(values, self._levels.setdefault((column, kind), []), op, window)
+            self._extrema[key] = _window_extrema(values, levels, op, window)
+        return self._extrema[key]
+
+    def _series(self, values: np.ndarray) -> Series:
+        return pd.Series(values, index=self.index)
+
+
+class ProtectionFeatures(RollingExtrema):
+
+    def range_percent_change(self, method: str, length: int) -> Series:
+        """
+        Rolling percentage change maximum: High to Low ('HL') or Open to Close ('OC').
+        """
+        if method == 'HL':
+            top, bottom = self.rolling('high', 'max', length), self.rolling('low', 'min', length)
+        elif method == 'OC':
+            top, bottom = self.rolling('open', 'max', length), self.rolling('close', 'min', length)
+        else:
+            raise ValueError(f"Method {method} not defined!")
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._series((top - bottom) / bottom)
+
+    def top_percent_change(self, length: int) -> Series:
+        """
+        Percentage change of the current close from the range maximum open.
+        """
+        close = self.candles['close']
+        top = self.candles['open'] if length == 0 else self.rolling('open', 'max', length)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._series((top - close) / close)
+
+    def range_maxgap(self, length: int) -> Series:
+        """
+        Maximum price gap across the interval.
+        """
+        return self._series(self.rolling('open', 'max', length) - self.rolling('close', 'min', length))
+
+    def range_height(self, length: int) -> Series:
+        """
+        Current close distance to the range bottom.
+        """
+        return self._series(self.candles['close'] - self.rolling('close', 'min', length))
+
+    def safe_pump(self, length: int, thresh: float, pull_thresh: float) -> Series:
+        """
+        Whether an entry after a pump is safe: small OC change, or pulled back far enough.
+        """
+        return ((self.range_percent_change('OC', length) < thresh)
+                | (self.range_maxgap(length) / pull_thresh > self.range_height(length)))
@@ -0,0 +1,1107 @@
+"""
+Dead indicator elimination: skip the columns a strategy computes but never reads.
+
+Many strategies compute far more than they use. Persia populates every
+indicator x period of its search space while its parameters pick six of them,
+MarketChyperHyperStrategy's ``market_cipher`` keeps ``wtVwap`` and crossing
+columns nobody reads, and NFIX computes columns only read by conditions whose
+``buy_condition_N_enable`` is off. The tracer walks every method of the strategy
+with its active parameters: ``for`` loops over static values (module constants,
+class attributes, parameter values, config) are unrolled and ``if`` tests on
+such values are decided, so a disabled condition reads nothing. Freqtrade's
+signal columns, the callbacks (``custom_sell``, ``custom_stoploss``, ...) and
+``plot_config`` are the roots; an assignment to a column is kept only if something
+live reads the column, and a loop over static values keeps only the iterations
+that assign something live. Merged informative columns (``<col>_1h``,
+``btc_<col>``, ``resample_<N>_<col>``) count as reads of ``<col>``.
+
+    python -m tradeboddy.pruning --strategy Persia --days 30
+
+prunes the strategy, runs the original and the pruned methods on local data,
+checks that the signals and all remaining columns are identical, reports the
+time and frame memory saved per pair and writes the plan to
+``user_data/pruning/<strategy>.json``. Strategies opt in to applying a verified plan:
+
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        IndicatorPruner.apply(self)
+
+The plan is checked on the first ``populate_indicators`` call, once freqtrade has
+loaded the parameters, and ignored if the code, a parameter or any class attribute
+or config value the tracer evaluated has changed since, and in hyperopt.
+"""
+import argparse
+import ast
+import builtins
+import copy
+import hashlib
+import inspect
+import json
+import logging
+import operator
+import re
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from tradeboddy.snapshot import source_key
+
+logger = logging.getLogger(__name__)
+
+PRUNING_DIR = 'pruning'
+# read by freqtrade itself
+ROOT_COLUMNS = ('date', 'open', 'high', 'low', 'close', 'volume', 'buy', 'sell', 'buy_tag', 'exit_tag',
+                'enter_long', 'exit_long', 'enter_short', 'exit_short', 'enter_tag')
+SIGNAL_COLUMNS = ROOT_COLUMNS[6:]
+# largest static loop that is unrolled
+MAX_ITERATIONS = 4096
+
+_PREFIX = re.compile(r'^(?:btc_|resample_\d+_)')
+_SUFFIX = re.compile(r'_\d+[mhdwM]$')
+_UNKNOWN = object()
+_CALLS = {name: getattr(builtins, name) for name in (
+    'abs', 'bool', 'dict', 'enumerate', 'float', 'getattr', 'int', 'len', 'list', 'max', 'min', 'range',
+    'reversed', 'round', 'set', 'sorted', 'str', 'tuple', 'zip')}
+_METHODS = {
+    str: {'format', 'replace', 'lower', 'upper', 'split', 'strip', 'startswith', 'endswith', 'join'},
+    dict: {'get', 'keys', 'values', 'items'},
+}
+_BINOPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+           ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod, ast.Pow: operator.pow}
+_COMPARE = {ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le,
+            ast.Gt: operator.gt, ast.GtE: operator.ge, ast.Is: operator.is_, ast.IsNot: operator.is_not,
+            ast.In: lambda a, b: a in b, ast.NotIn: lambda a, b: a not in b}
+_UNARY = {ast.Not: operator.not_, ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Invert: operator.invert}
+# frame attributes and methods whose result depends on every column
+_WHOLE_FRAME = {'T', 'all', 'any', 'columns', 'corr', 'count', 'describe', 'drop_duplicates', 'dropna', 'duplicated',
+                'equals', 'filter', 'items', 'iterrows', 'itertuples', 'keys', 'max', 'mean', 'min', 'select_dtypes',
+                'std', 'sum', 'to_csv', 'to_dict', 'to_json', 'to_numpy', 'to_parquet', 'to_pickle', 'to_records',
+                'values'}
+# statements that neither compute nor decide anything
+_NEUTRAL = (ast.Pass, ast.Continue, ast.Raise)
+
+
+class _Unknown(Exception):
+    pass
+
+
+def _is_data(value) -> bool:
+    return isinstance(value, (pd.DataFrame, pd.Series, pd.Index, np.ndarray))
+
+
+def _assumable(value) -> bool:
+    # parameters and plain data; anything else has no stable repr to compare
+    value = getattr(value, 'value', value)
+    return value is None or isinstance(value, (bool, int, float, str, tuple, list, dict, set, frozenset))
+
+
+def _digest(value) -> str:
+    # parameters compare by value, their repr is not stable across freqtrade versions
+    value = getattr(value, 'value', value)
+    return hashlib.sha1(repr(value).encode()).hexdigest()[:12]
+
+
+class _Scope:
+    """
+    Static values of a function's locals, falling back to the module globals for non-locals.
+    """
+
+    def __init__(self, module_globals: dict, local_names: Set[str], env: dict, strategy=None,
+                 assumptions: Optional[dict] = None, state: Set[str] = frozenset()):
+        self.globals = module_globals
+        self.local_names = local_names
+        self.env = env
+        self.strategy = strategy
+        # attributes of the strategy its methods change, never static
+        self.state = state
+        # ('self', attr) / ('config', key) -> digest of every strategy value a decision depended on
+        self.assumptions = {} if assumptions is None else assumptions
+
+    def copy(self) -> '_Scope':
+        return _Scope(self.globals, self.local_names, dict(self.env), self.strategy, self.assumptions, self.state)
+
+    def lookup(self, name: str):
+        if name in self.env:
+            value = self.env[name]
+            if value is _UNKNOWN:
+                raise _Unknown(name)
+            return value
+        if name in self.local_names:
+            raise _Unknown(name)
+        if name in self.globals:
+            return self.globals[name]
+        if name in _CALLS:
+            return _CALLS[name]
+        raise _Unknown(name)
+
+    def bind(self, target: ast.expr, value) -> None:
+        if isinstance(target, ast.Name):
+            self.env[target.id] = _UNKNOWN if value is _UNKNOWN or _is_data(value) else value
+        elif isinstance(target, (ast.Tuple, ast.List)) and value is not _UNKNOWN \
+                and isinstance(value, (tuple, list)) and len(value) == len(target.elts) \
+                and not any(isinstance(elt, ast.Starred) for elt in target.elts):
+            for elt, item in zip(target.elts, value):
+                self.bind(elt, item)
+        else:
+            self.forget(_stored_names(target))
+
+    def forget(self, names) -> None:
+        for name in names:
+            self.env[name] = _UNKNOWN
+
+    def evaluate(self, node: ast.expr):
+        """
+        Value of ``node`` if it only depends on static values, ``_UNKNOWN`` otherwise.
+        """
+        try:
+            value = self._eval(node)
+        except Exception:
+            return _UNKNOWN
+        return _UNKNOWN if _is_data(value) else value
+
+    def _eval(self, node: ast.expr):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return self.lookup(node.id)
+        if isinstance(node, ast.Attribute):
+            if node.attr.startswith('_'):
+                raise _Unknown(node.attr)
+            base = self._eval(node.value)
+            if _is_data(base) or base is self.strategy is not None and node.attr in self.state:
+                raise _Unknown(node.attr)
+            value = getattr(base, node.attr)
+            # the config is compared by the keys read from it
+            if self.strategy is not None and base is self.strategy and node.attr != 'config' and _assumable(value):
+                self.assumptions[('self', node.attr)] = _digest(value)
+            return value
+        if isinstance(node, ast.Subscript):
+            base = self._eval(node.value)
+            if _is_data(base):
+                raise _Unknown('subscript')
+            key = self._eval(node.slice)
+            value = base[key]
+            if self.strategy is not None and base is getattr(self.strategy, 'config', None) \
+                    and isinstance(key, str) and _assumable(value):
+                self.assumptions[('config', key)] = _digest(value)
+            return value
+        if isinstance(node, ast.Slice):
+            return slice(*(None if part is None else self._eval(part)
+                           for part in (node.lower, node.upper, node.step)))
+        if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+            items = [self._eval(elt) for elt in node.elts]
+            return {ast.Tuple: tuple, ast.List: list, ast.Set: set}[type(node)](items)
+        if isinstance(node, ast.Dict):
+            if any(key is None for key in node.keys):
+                raise _Unknown('dict unpacking')
+            return {self._eval(key): self._eval(value) for key, value in zip(node.keys, node.values)}
+        if isinstance(node, ast.BoolOp):
+            value = None
+            for operand in node.values:
+                value = self._eval(operand)
+                if isinstance(node.op, ast.And) != bool(value):
+                    return value
+            return value
+        if isinstance(node, ast.UnaryOp):
+            return _UNARY[type(node.op)](self._eval(node.operand))
+        if isinstance(node, ast.BinOp):
+            return _BINOPS[type(node.op)](self._eval(node.left), self._eval(node.right))
+        if isinstance(node, ast.Compare):
+            left = self._eval(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._eval(comparator)
+                if not _COMPARE[type(op)](left, right):
+                    return False
+                left = right
+            return True
+        if isinstance(node, ast.IfExp):
+            return self._eval(node.body) if self._eval(node.test) else self._eval(node.orelse)
+        if isinstance(node, ast.JoinedStr):
+            return ''.join(self._eval(value) for value in node.values)
+        if isinstance(node, ast.FormattedValue):
+            value = self._eval(node.value)
+            value = {115: str, 114: repr, 97: ascii}.get(node.conversion, lambda v: v)(value)
+            return format(value, self._eval(node.format_spec) if node.format_spec else '')
+        if isinstance(node, ast.Call):
+            return self._call(node)
+        if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+            items = []
+            self._comprehension(node, node.generators, dict(self.env), items)
+            if isinstance(node, ast.DictComp):
+                return dict(items)
+            return set(items) if isinstance(node, ast.SetComp) else items
+        raise _Unknown(type(node).__name__)
+
+    def _comprehension(self, node, generators: list, env: dict, items: list) -> None:
+        scope = _Scope(self.globals, self.local_names, env, self.strategy, self.assumptions, self.state)
+        if not generators:
+            if isinstance(node, ast.DictComp):
+                items.append((scope._eval(node.key), scope._eval(node.value)))
+            else:
+                items.append(scope._eval(node.elt))
+            if len(items) > MAX_ITERATIONS:
+                raise _Unknown('comprehension')
+            return
+        generator = generators[0]
+        if generator.is_async:
+            raise _Unknown('async')
+        for item in scope._eval(generator.iter):
+            inner = scope.copy()
+            inner.bind(generator.target, item)
+            if all(inner._eval(test) for test in generator.ifs):
+                self._comprehension(node, generators[1:], inner.env, items)
+
+    def _call(self, node: ast.Call):
+        base = None
+        if isinstance(node.func, ast.Attribute):
+            base = self._eval(node.func.value)
+            if node.func.attr not in _METHODS.get(type(base), ()):
+                raise _Unknown(node.func.attr)
+            func = getattr(base, node.func.attr)
+        else:
+            func = self._eval(node.func)
+            if not any(func is allowed for allowed in _CALLS.values()):
+                raise _Unknown('call')
+        args = []
+        for arg in node.args:
+            if isinstance(arg, ast.Starred):
+                raise _Unknown('starred')
+            value = self._eval(arg)
+            if isinstance(value, range) and len(value) > MAX_ITERATIONS:
+                raise _Unknown('range')
+            args.append(value)
+        kwargs = {kw.arg: self._eval(kw.value) for kw in node.keywords if kw.arg is not None}
+        if len(kwargs) != len(node.keywords):
+            raise _Unknown('kwargs')
+        if func is getattr:
+            if not isinstance(args[1], str) or args[1].startswith('_') \
+                    or args[0] is self.strategy is not None and args[1] in self.state:
+                raise _Unknown('getattr')
+            value = getattr(*args)
+            if self.strategy is not None and args[0] is self.strategy and _assumable(value):
+                self.assumptions[('self', args[1])] = _digest(value)
+            return value
+        value = func(*args, **kwargs)
+        if self.strategy is not None and base is getattr(self.strategy, 'config', None) \
+                and node.func.attr == 'get' and isinstance(args[0], str) and _assumable(value):
+            self.assumptions[('config', args[0])] = _digest(value)
+        return value
+
+
+def _stored_names(node: ast.AST) -> Set[str]:
+    return {sub.id for sub in ast.walk(node) if isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Store)}
+
+
+def _loaded_names(node: ast.AST) -> Set[str]:
+    return {sub.id for sub in ast.walk(node) if isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Load)}
+
+
+def _strings(value, out: Set[str]) -> None:
+    # the column names a static value can hold
+    if isinstance(value, str):
+        out.add(value)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        out.update(item for item in value if isinstance(item, str))
+    elif isinstance(value, dict):
+        out.update(item for item in list(value) + list(value.values()) if isinstance(item, str))
+
+
+def _pattern(node: ast.expr, scope: _Scope) -> Optional[str]:
+    """
+    Regex of the strings an f-string or string concatenation with unknown parts can produce.
+    """
+    if isinstance(node, ast.JoinedStr):
+        parts = node.values
+    elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        parts, stack = [], [node]
+        while stack:
+            part = stack.pop()
+            if isinstance(part, ast.BinOp) and isinstance(part.op, ast.Add):
+                stack += [part.right, part.left]
+            else:
+                parts.append(part)
+    else:
+        return None
+    regex, literal = '', False
+    for part in parts:
+        value = scope.evaluate(part)
+        if isinstance(value, str):
+            regex += re.escape(value)
+            literal = literal or bool(value)
+        else:
+            regex += '.*'
+    return regex if literal else None
+
+
+class _Columns:
+    """
+    Live column names and name patterns; ``<col>_1h``, ``btc_<col>`` or ``resample_<N>_<col>`` keep ``<col>`` alive.
+    """
+
+    def __init__(self, suffixes: Set[str]):
+        self.suffixes = sorted(suffixes)
+        self.names: Set[str] = set()
+        self.cores: Set[str] = set()
+        self.patterns: Dict[str, re.Pattern] = {}
+
+    def __len__(self) -> int:
+        return len(self.names) + len(self.patterns)
+
+    def add(self, names, patterns=()) -> None:
+        for name in names:
+            if name not in self.names:
+                self.names.add(name)
+                stack = [name]
+                while stack:
+                    core = stack.pop()
+                    if core in self.cores:
+                        continue
+                    self.cores.add(core)
+                    stack += [stripped for stripped in (_PREFIX.sub('', core), _SUFFIX.sub('', core))
+                              if stripped and stripped != core]
+        for pattern in patterns:
+            if pattern not in self.patterns:
+                self.patterns[pattern] = re.compile(pattern)
+
+    def live(self, column: str) -> bool:
+        if column in self.cores:
+            return True
+        if not self.patterns:
+            return False
+        variants = [column, f"btc_{column}"]
+        variants += [f"{variant}_{suffix}" for variant in variants for suffix in self.suffixes]
+        return any(pattern.fullmatch(variant) for pattern in self.patterns.values() for variant in variants)
+
+
+class _Occurrence:
+    """
+    One execution of a statement in the trace of a function.
+    """
+    __slots__ = ('node', 'kind', 'defs', 'names', 'patterns', 'vdefs', 'kills', 'vuses', 'loops', 'live')
+
+    def __init__(self, node: ast.stmt, kind: str, names: Set[str], patterns: Set[str], vuses: Set[str],
+                 loops: tuple, defs: Set[str] = frozenset(), vdefs: Set[str] = frozenset(),
+                 kills: Set[str] = frozenset()):
+        self.node = node
+        # 'assign' (removable), 'effect', 'control' (if/for/while/with/try header) or 'neutral'
+        self.kind = kind
+        self.defs = defs
+        self.names = names
+        self.patterns = patterns
+        self.vdefs = vdefs
+        self.kills = kills
+        self.vuses = vuses
+        # ((for node, iteration key), ...) of the unrolled loops around it
+        self.loops = loops
+        self.live = True
+
+
+class _Tracer:
+    """
+    Walks a function with the static values known to it and records every statement it executes.
+    """
+
+    def __init__(self, module_globals: dict, mutating: Set[str], strategy=None, assumptions=None,
+                 state: Set[str] = frozenset(), frames: Set[str] = frozenset()):
+        self.globals = module_globals
+        self.mutating = mutating
+        self.strategy = strategy
+        self.state = state
+        # names that hold frames somewhere in the module
+        self.frames = frames
+        self.assumptions = {} if assumptions is None else assumptions
+        self.trace: List[_Occurrence] = []
+        # for node -> iteration keys, None where its iterable was not static
+        self.iterations: Dict[ast.For, Optional[list]] = {}
+        self.prunable = True
+
+    def function(self, fn: ast.FunctionDef, is_method: bool, prunable: bool) -> List[_Occurrence]:
+        args = fn.args
+        params = {arg.arg for arg in args.posonlyargs + args.args + args.kwonlyargs}
+        params |= {arg.arg for arg in (args.vararg, args.kwarg) if arg is not None}
+        env = dict.fromkeys(params, _UNKNOWN)
+        strategy = self.strategy if is_method and args.args and args.args[0].arg == 'self' else None
+        if strategy is not None:
+            env['self'] = strategy
+        scope = _Scope(self.globals, params | _stored_names(fn), env, strategy, self.assumptions, self.state)
+        self.trace, self.prunable = [], prunable
+        self.block(fn.body, scope, True, ())
+        return self.trace
+
+    def block(self, stmts: List[ast.stmt], scope: _Scope, certain: bool, loops: tuple) -> None:
+        for stmt in stmts:
+            self.statement(stmt, scope, certain, loops)
+
+    def branches(self, blocks: List[List[ast.stmt]], scope: _Scope, loops: tuple) -> None:
+        # blocks of which any subset may run: traced on copies, their assignments unknown afterwards
+        assigned = set()
+        for block in blocks:
+            self.block(block, scope.copy(), False, loops)
+            for stmt in block:
+                assigned |= _stored_names(stmt)
+        scope.forget(assigned)
+
+    def loop(self, stmt: ast.stmt, scope: _Scope, loops: tuple) -> None:
+        # twice, so the second pass sees the values carried over from the previous iteration
+        assigned = set().union(*(_stored_names(s) for s in stmt.body))
+        if isinstance(stmt, (ast.For, ast.AsyncFor)):
+            assigned |= _stored_names(stmt.target)
+        scope.forget(assigned)
+        for _ in range(2):
+            self.block(stmt.body, scope.copy(), False, loops)
+        self.branches([stmt.orelse], scope, loops)
+
+    def statement(self, stmt: ast.stmt, scope: _Scope, certain: bool, loops: tuple) -> None:
+        if isinstance(stmt, ast.If):
+            self.record(stmt, 'control', scope, loops, [stmt.test])
+            test = scope.evaluate(stmt.test)
+            if test is _UNKNOWN:
+                self.branches([stmt.body, stmt.orelse], scope, loops)
+            else:
+                self.block(stmt.body if test else stmt.orelse, scope, certain, loops)
+        elif isinstance(stmt, ast.For):
+            self.record(stmt, 'control', scope, loops, [stmt.iter])
+            self.for_loop(stmt, scope, certain, loops)
+        elif isinstance(stmt, (ast.AsyncFor, ast.While)):
+            self.record(stmt, 'control', scope, loops, [getattr(stmt, 'iter', None) or stmt.test])
+            self.loop(stmt, scope, loops)
+        elif isinstance(stmt, (ast.With, ast.AsyncWith)):
+            self.record(stmt, 'control', scope, loops, [item.context_expr for item in stmt.items])
+            scope.forget(set().union(*(_stored_names(item) for item in stmt.items)))
+            self.block(stmt.body, scope, certain, loops)
+        elif isinstance(stmt, ast.Try):
+            self.record(stmt, 'control', scope, loops, [])
+            self.branches([stmt.body + stmt.orelse] + [handler.body for handler in stmt.handlers], scope, loops)
+            self.block(stmt.finalbody, scope, certain, loops)
+        elif isinstance(stmt, (ast.Assign, ast.AugAssign, ast.AnnAssign)) and stmt.value is not None:
+            self.assignment(stmt, scope, certain, loops)
+        elif isinstance(stmt, _NEUTRAL) or (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant)):
+            self.record(stmt, 'neutral', scope, loops, [stmt])
+        else:
+            self.record(stmt, 'effect', scope, loops, [stmt])
+            scope.forget(_stored_names(stmt))
+
+    def for_loop(self, stmt: ast.For, scope: _Scope, certain: bool, loops: tuple) -> None:
+        items = scope.evaluate(stmt.iter)
+        try:
+            items = None if items is _UNKNOWN or isinstance(items, (str, bytes)) else list(items)
+        except TypeError:
+            items = None
+        if items is None or len(items) > MAX_ITERATIONS:
+            self.iterations[stmt] = None
+            self.loop(stmt, scope, loops)
+            return
+        # the values of the enclosing loop variables when this loop starts, plus the item
+        outer = [scope.env.get(loop.target.id, _UNKNOWN) for loop, _ in loops
+                 if isinstance(loop.target, ast.Name)]
+        keys = self.iterations.setdefault(stmt, [])
+        for item in items:
+            key = tuple(outer) + (item,)
+            if keys is not None:
+                keys.append(key)
+            scope.bind(stmt.target, item)
+            # the loop variables are rebound for every item
+            self.trace.append(_Occurrence(stmt, 'control', set(), set(), set(), loops + ((stmt, key),),
+                                          kills=_stored_names(stmt.target) if certain else set()))
+            self.block(stmt.body, scope, certain, loops + ((stmt, key),))
+        self.branches([stmt.orelse], scope, loops)
+
+    def assignment(self, stmt, scope: _Scope, certain: bool, loops: tuple) -> None:
+        targets = stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+        augmented = isinstance(stmt, ast.AugAssign)
+        defs, vdefs, implicit, exprs = set(), set(), set(), [stmt.value]
+        removable = self.prunable and not self.mutates(stmt.value)
+        for target in targets:
+            removable &= self.target(target, scope, augmented, defs, vdefs, implicit, exprs)
+        kills = set() if augmented or not certain else vdefs
+        self.record(stmt, 'assign' if removable else 'effect', scope, loops, exprs, defs=defs, vdefs=vdefs,
+                    kills=kills, names=implicit, vuses=vdefs if augmented else set())
+        if isinstance(stmt, ast.Assign):
+            value = scope.evaluate(stmt.value)
+            for target in targets:
+                scope.bind(target, value)
+        elif augmented and isinstance(stmt.target, ast.Name):
+            scope.bind(stmt.target, scope.evaluate(ast.BinOp(stmt.target, stmt.op, stmt.value)))
+        else:
+            scope.forget(vdefs)
+
+    def target(self, target: ast.expr, scope: _Scope, augmented: bool, defs: Set[str], vdefs: Set[str],
+               implicit: Set[str], exprs: list) -> bool:
+        """
+        Collect what ``target`` assigns; False if it is anything but local names and frame columns.
+        """
+        if isinstance(target, ast.Name):
+            vdefs.add(target.id)
+            return True
+        if isinstance(target, (ast.Tuple, ast.List)):
+            return all([self.target(elt, scope, augmented, defs, vdefs, implicit, exprs) for elt in target.elts])
+        if isinstance(target, ast.Starred):
+            return self.target(target.value, scope, augmented, defs, vdefs, implicit, exprs)
+        if not isinstance(target, ast.Subscript):
+            exprs.append(target)
+            return False
+        base, key, partial = target.value, target.slice, augmented
+        if isinstance(base, ast.Attribute) and base.attr in ('loc', 'at'):
+            if not (isinstance(key, ast.Tuple) and len(key.elts) == 2):
+                exprs.append(target)
+                return False
+            exprs.append(key.elts[0])
+            base, key, partial = base.value, key.elts[1], True
+        exprs += [base, key]
+        # frames are locals without a static value; dicts and attributes of self are state
+        if not isinstance(base, ast.Name) or base.id == 'self' or scope.evaluate(base) is not _UNKNOWN:
+            return False
+        columns = scope.evaluate(key)
+        if isinstance(columns, str):
+            columns = [columns]
+        if not isinstance(columns, (list, tuple)) or not columns or not all(isinstance(c, str) for c in columns):
+            return False
+        defs.update(columns)
+        if partial:
+            # rows not selected keep the previous values
+            implicit.update(columns)
+        return True
+
+    def mutates(self, node: ast.expr) -> bool:
+        for sub in ast.walk(node):
+            if not isinstance(sub, ast.Call):
+                continue
+            if any(kw.arg == 'inplace' for kw in sub.keywords):
+                return True
+            func = sub.func
+            if isinstance(func, ast.Name) and func.id in self.mutating:
+                return True
+            if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) \
+                    and func.value.id in ('self', 'cls') and func.attr in self.mutating:
+                return True
+        return False
+
+    def reads(self, node: ast.AST, scope: _Scope, names: Set[str], patterns: Set[str]) -> None:
+        stack = [node]
+        while stack:
+            sub = stack.pop()
+            if isinstance(sub, ast.Constant) and isinstance(sub.value, str):
+                names.add(sub.value)
+                # eval()/query() expressions
+                names.update(re.findall(r'[A-Za-z_]\w*', sub.value))
+            elif isinstance(sub, (ast.JoinedStr, ast.BinOp, ast.ListComp, ast.SetComp, ast.GeneratorExp,
+                                  ast.DictComp)):
+                value = scope.evaluate(sub)
+                if value is _UNKNOWN and isinstance(sub, ast.DictComp):
+                    # the keys may be static when the values are not
+                    value = scope.evaluate(ast.ListComp(sub.key, sub.generators))
+                if value is not _UNKNOWN:
+                    _strings(value, names)
+                    continue
+                pattern = _pattern(sub, scope)
+                if pattern is not None:
+                    patterns.add(pattern)
+                    continue
+            elif isinstance(sub, ast.Lambda):
+                # rename(columns=lambda s: f"btc_{s}") names columns, it does not read them
+                names.update(const.value for const in ast.walk(sub.body)
+                             if isinstance(const, ast.Constant) and isinstance(const.value, str))
+                continue
+            elif isinstance(sub, ast.Attribute):
+                if sub.attr in ('intersection', 'difference') and isinstance(sub.value, ast.Attribute) \
+                        and sub.value.attr == 'columns':
+                    # only the columns passed in are read
+                    continue
+                if sub.attr in _WHOLE_FRAME and isinstance(sub.value, ast.Name) and sub.value.id in self.frames:
+                    patterns.add('.*')
+            elif isinstance(sub, ast.Subscript):
+                _strings(scope.evaluate(sub.slice), names)
+            elif isinstance(sub, ast.Call):
+                for arg in sub.args + [kw.value for kw in sub.keywords]:
+                    if isinstance(arg, (ast.Name, ast.Attribute, ast.Subscript)):
+                        _strings(scope.evaluate(arg), names)
+            elif isinstance(sub, ast.Compare):
+                for operand in [sub.left] + sub.comparators:
+                    if isinstance(operand, (ast.Name, ast.Attribute)):
+                        _strings(scope.evaluate(operand), names)
+            stack.extend(ast.iter_child_nodes(sub))
+
+    def record(self, stmt: ast.stmt, kind: str, scope: _Scope, loops: tuple, exprs: list,
+               names: Set[str] = frozenset(), vuses: Set[str] = frozenset(), **kwargs) -> None:
+        names, patterns, vuses = set(names), set(), set(vuses)
+        for expr in exprs:
+            if expr is None:
+                continue
+            self.reads(expr, scope, names, patterns)
+            vuses |= _loaded_names(expr)
+        if kind == 'assign' and not self.prunable:
+            kind = 'effect'
+        self.trace.append(_Occurrence(stmt, kind, names, patterns, vuses, loops, **kwargs))
+
+
+def _mutating(tree: ast.Module) -> Set[str]:
+    """
+    Functions and methods that write into a frame passed to them or into ``self``, directly or by calling one.
+    """
+    functions = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.setdefault(node.name, []).append(node)
+
+    def writes(fn) -> bool:
+        params = {arg.arg for arg in fn.args.posonlyargs + fn.args.args + fn.args.kwonlyargs}
+        for sub in ast.walk(fn):
+            if isinstance(sub, ast.Call) and any(kw.arg == 'inplace' for kw in sub.keywords):
+                return True
+            if isinstance(sub, (ast.Subscript, ast.Attribute)) and isinstance(sub.ctx, ast.Store):
+                base = sub.value
+                while isinstance(base, (ast.Subscript, ast.Attribute)):
+                    base = base.value
+                if isinstance(base, ast.Name) and base.id in params:
+                    return True
+        return False
+
+    mutating = {name for name, fns in functions.items() if any(writes(fn) for fn in fns)}
+    changed = True
+    while changed:
+        changed = False
+        for name, fns in functions.items():
+            if name in mutating:
+                continue
+            for fn in fns:
+                calls = {sub.func.id if isinstance(sub.func, ast.Name) else sub.func.attr
+                         for sub in ast.walk(fn) if isinstance(sub, ast.Call)
+                         and isinstance(sub.func, (ast.Name, ast.Attribute))}
+                if calls & mutating:
+                    mutating.add(name)
+                    changed = True
+                    break
+    return mutating
+
+
+def _frames(tree: ast.Module) -> Set[str]:
+    """
+    Names annotated as DataFrame or assigned a column anywhere in the module.
+    """
+    frames = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.arg) and node.annotation is not None and 'DataFrame' in ast.unparse(node.annotation):
+            frames.add(node.arg)
+        elif isinstance(node, ast.Subscript) and isinstance(node.ctx, ast.Store):
+            base = node.value.value if isinstance(node.value, ast.Attribute) else node.value
+            if isinstance(base, ast.Name):
+                frames.add(base.id)
+    return frames
+
+
+def _state(classes: List[ast.ClassDef]) -> Set[str]:
+    """
+    Attributes of ``self`` assigned, changed in place or handed out in the methods of ``classes``.
+    """
+    state = set()
+    for node in (sub for klass in classes for sub in ast.walk(klass)):
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'self':
+            if isinstance(node.ctx, (ast.Store, ast.Del)):
+                state.add(node.attr)
+        elif isinstance(node, (ast.Subscript, ast.Attribute)) and isinstance(node.ctx, (ast.Store, ast.Del)) \
+                or isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) \
+                and node.func.attr not in _METHODS[str] | _METHODS[dict] | {'copy', 'count', 'index', 'resolve'}:
+            base = node.func.value if isinstance(node, ast.Call) else node.value
+            while isinstance(base, (ast.Subscript, ast.Attribute)) and not (
+                    isinstance(base, ast.Attribute) and isinstance(base.value, ast.Name) and base.value.id == 'self'):
+                base = base.value
+            if isinstance(base, ast.Attribute) and isinstance(base.value, ast.Name) and base.value.id == 'self':
+                state.add(base.attr)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'setattr':
+            # any attribute may change
+            return {None}
+    return state
+
+
+def _position(node: ast.AST) -> Tuple[int, int]:
+    return node.lineno, node.col_offset
+
+
+def _literal(value) -> bool:
+    # iteration keys go into a set literal in the rewritten loop
+    try:
+        return ast.literal_eval(repr(value)) == value and hash(value) is not None
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return False
+
+
+def _plain(value):
+    # numpy scalars as the Python values they compare and hash equal to
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return tuple(_plain(item) for item in value)
+    return value
+
+
+def _tuples(value):
+    # JSON turns the iteration keys into lists
+    return tuple(_tuples(item) for item in value) if isinstance(value, list) else value
+
+
+class IndicatorPruner:
+    """
+    The statements and loop iterations of a strategy's methods whose columns nothing reads.
+    """
+
+    def __init__(self, strategy, plan: Optional[dict] = None):
+        self.strategy = strategy
+        cls = type(strategy)
+        self.filename = inspect.getsourcefile(cls)
+        self.tree = ast.parse(Path(self.filename).read_text(), self.filename)
+        self.globals = sys.modules[cls.__module__].__dict__
+        self.methods = self._methods()
+        if plan is None:
+            plan = self.analyze()
+        self.plan = plan
+
+    def _methods(self) -> Dict[str, ast.FunctionDef]:
+        """
+        Methods of the strategy defined in its file that can be recompiled on their own.
+        """
+        classes = {klass.__name__: klass for klass in type(self.strategy).__mro__}
+        methods = {}
+        for node in self.tree.body:
+            if not isinstance(node, ast.ClassDef) or node.name not in classes:
+                continue
+            klass = classes[node.name]
+            for fn in node.body:
+                if not isinstance(fn, ast.FunctionDef) or fn.decorator_list or fn.name.startswith('__'):
+                    continue
+                # zero-argument super() needs the class cell
+                if any(isinstance(sub, ast.Name) and sub.id in ('super', '__class__') for sub in ast.walk(fn)):
+                    continue
+                resolved = getattr(type(self.strategy), fn.name, None)
+                if resolved is not None and vars(klass).get(fn.name) is resolved and fn.name not in methods:
+                    methods[fn.name] = fn
+        return methods
+
+    # --- analysis ---------------------------------------------------------------------
+
+    def _roots(self, columns: _Columns) -> None:
+        columns.add(ROOT_COLUMNS)
+        names = set()
+
+        def collect(value, depth=0):
+            _strings(value, names)
+            if depth < 4 and isinstance(value, dict):
+                for item in value.values():
+                    collect(item, depth + 1)
+
+        collect(getattr(self.strategy, 'plot_config', None) or {})
+        columns.add(names)
+
+    def analyze(self) -> dict:
+        mutating = _mutating(self.tree)
+        assumptions = {}
+        names = {klass.__name__ for klass in type(self.strategy).__mro__}
+        state = _state([node for node in self.tree.body if isinstance(node, ast.ClassDef) and node.name in names])
+        strategy = None if None in state else self.strategy
+        tracer = _Tracer(self.globals, mutating, strategy, assumptions, state, _frames(self.tree))
+        traces = {}
+        for node in ast.walk(self.tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            prunable = self.methods.get(node.name) is node
+            traces[node] = tracer.function(node, True, prunable)
+
+        suffixes = {s.value for s in ast.walk(self.tree) if isinstance(s, ast.Constant)
+                    and isinstance(s.value, str) and re.fullmatch(r'\d+[mhdwM]', s.value)}
+        columns = _Columns(suffixes | {'5m', '15m', '30m', '1h', '4h', '1d'})
+        self._roots(columns)
+        while True:
+            size = len(columns)
+            for trace in traces.values():
+                live_vars = set()
+                for occ in reversed(trace):
+                    if occ.kind == 'assign':
+                        occ.live = any(columns.live(col) for col in occ.defs) or bool(occ.vdefs & live_vars)
+                    else:
+                        occ.live = occ.kind != 'neutral' or bool(occ.vuses)
+                    if occ.live:
+                        live_vars -= occ.kills
+                        live_vars |= occ.vuses
+                        columns.add(occ.names, occ.patterns)
+            if len(columns) == size:
+                break
+        return self._plan(traces, tracer.iterations, assumptions, columns)
+
+    def _plan(self, traces: dict, iterations: dict, assumptions: dict, columns: _Columns) -> dict:
+        removed, filters, dead_columns = {}, {}, set()
+        for fn, trace in traces.items():
+            if self.methods.get(fn.name) is not fn:
+                continue
+            by_node, by_iteration = {}, {}
+            for occ in trace:
+                by_node.setdefault(occ.node, []).append(occ)
+                for loop, key in occ.loops:
+                    live = occ.live and occ.kind in ('assign', 'effect')
+                    by_iteration.setdefault(loop, {})
+                    by_iteration[loop][key] = by_iteration[loop].get(key, False) or live
+            positions = []
+            for node, occs in by_node.items():
+                if all(occ.kind == 'assign' and not occ.live for occ in occs):
+                    positions.append(_position(node))
+                    dead_columns.update(col for occ in occs for col in occ.defs)
+            loop_filters = []
+            for loop, keys in by_iteration.items():
+                seen = iterations.get(loop)
+                live = [_plain(key) for key, is_live in keys.items() if is_live]
+                if seen is None or len(live) == len(keys) or not all(_literal(key) for key in live) \
+                        or any(isinstance(sub, (ast.Break, ast.Return)) for sub in ast.walk(loop)):
+                    continue
+                chain = next(occ.loops for occ in trace if any(l is loop for l, _ in occ.loops))
+                enclosing = [l for l, _ in chain[:[l for l, _ in chain].index(loop)]]
+                outer = [l.target.id for l in enclosing if isinstance(l.target, ast.Name)]
+                if not isinstance(loop.target, ast.Name) \
+                        or set(outer) & set().union(*(_stored_names(s) for s in loop.body)):
+                    continue
+                for occ in trace:
+                    if any(l is loop and not keys[key] for l, key in occ.loops):
+                        dead_columns.update(occ.defs)
+                loop_filters.append({'at': list(_position(loop)), 'outer': outer, 'live': live})
+            if positions:
+                removed[fn.name] = sorted(positions)
+            if loop_filters:
+                filters[fn.name] = loop_filters
+        dead_columns = sorted(col for col in dead_columns if not columns.live(col))
+        plan = {
+            'strategy': type(self.strategy).__name__,
+            'code': source_key(type(self.strategy)),
+            'assumptions': sorted([kind, name, digest] for (kind, name), digest in assumptions.items()),
+            'removed': {name: [list(pos) for pos in positions] for name, positions in removed.items()},
+            'filters': filters,
+            'columns': dead_columns,
+        }
+        plan['key'] = hashlib.sha1(json.dumps(plan, sort_keys=True).encode()).hexdigest()[:12]
+        return plan
+
+    # --- runtime ----------------------------------------------------------------------
+
+    def valid(self) -> bool:
+        """
+        Whether the plan was made for this code and these parameters, class attributes and config.
+        """
+        if self.plan.get('code') != source_key(type(self.strategy)):
+            return False
+        for kind, name, digest in self.plan.get('assumptions', []):
+            try:
+                value = getattr(self.strategy, name) if kind == 'self' else self.strategy.config.get(name)
+            except AttributeError:
+                return False
+            if _digest(value) != digest:
+                return False
+        return True
+
+    def compile(self, name: str):
+        """
+        ``name`` without the removed statements and dead loop iterations, as a function.
+        """
+        fn = copy.deepcopy(self.methods[name])
+        removed = {tuple(pos) for pos in self.plan['removed'].get(name, [])}
+        filters = {tuple(f['at']): f for f in self.plan['filters'].get(name, [])}
+        _Rewriter(removed, filters).visit(fn)
+        ast.fix_missing_locations(fn)
+        code = compile(ast.Module(body=[fn], type_ignores=[]), self.filename, 'exec')
+        namespace = {}
+        exec(code, self.globals, namespace)
+        return namespace[name]
+
+    def install(self) -> int:
+        """
+        Replace the pruned methods on the strategy instance; returns how many.
+        """
+        names = sorted(set(self.plan['removed']) | set(self.plan['filters']))
+        for name in names:
+            setattr(self.strategy, name, types.MethodType(self.compile(name), self.strategy))
+        self.strategy.pruning_key = self.plan['key']
+        return len(names)
+
+    def uninstall(self) -> None:
+        for name in set(self.plan['removed']) | set(self.plan['filters']):
+            vars(self.strategy).pop(name, None)
+        vars(self.strategy).pop('pruning_key', None)
+
+    @staticmethod
+    def plan_path(strategy) -> Path:
+        from tradeboddy.prescreen import USER_DATA
+
+        user_data = Path(strategy.config.get('user_data_dir', USER_DATA))
+        return user_data / PRUNING_DIR / f"{type(strategy).__name__}.json"
+
+    @classmethod
+    def apply(cls, strategy) -> None:
+        """
+        Prune ``strategy`` with its verified plan, if there is one, on the first ``populate_indicators`` call.
+        """
+        path = cls.plan_path(strategy)
+        if not path.is_file():
+            return
+        plan = json.loads(path.read_text())
+        for loop_filters in plan['filters'].values():
+            for loop_filter in loop_filters:
+                loop_filter['live'] = [_tuples(key) for key in loop_filter['live']]
+        # known before the first call, so caches of analyzed frames can tell pruned ones apart
+        strategy.pruning_key = plan['key']
+
+        def populate_indicators(dataframe: DataFrame, metadata: dict) -> DataFrame:
+            del strategy.populate_indicators
+            if strategy.config['runmode'].value == 'hyperopt':
+                del strategy.pruning_key
+            else:
+                pruner = cls(strategy, plan)
+                if pruner.valid():
+                    count = pruner.install()
+                    logger.info(f"{type(strategy).__name__}: pruned {count} methods, "
+                                f"{len(plan['columns'])} columns are not computed")
+                else:
+                    del strategy.pruning_key
+                    logger.warning(f"{type(strategy).__name__}: pruning plan {path.name} is out of date, "
+                                   f"run python -m tradeboddy.pruning again")
+            return strategy.populate_indicators(dataframe, metadata)
+
+        strategy.populate_indicators = populate_indicators
+
+
+class _Rewriter(ast.NodeTransformer):
+
+    def __init__(self, removed: Set[Tuple[int, int]], filters: Dict[Tuple[int, int], dict]):
+        self.removed = removed
+        self.filters = filters
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        super().generic_visit(node)
+        for field in ('body', 'orelse', 'finalbody'):
+            stmts = getattr(node, field, None)
+            if isinstance(stmts, list) and stmts and isinstance(stmts[0], ast.stmt):
+                kept = [stmt for stmt in stmts if _position(stmt) not in self.removed]
+                if not kept and (field == 'body' or isinstance(node, ast.Try) and field == 'finalbody'):
+                    kept = [ast.Pass()]
+                setattr(node, field, kept)
+        return node
+
+    def visit_For(self, node: ast.For) -> ast.AST:
+        node = self.generic_visit(node)
+        loop_filter = self.filters.get(_position(node))
+        if loop_filter is None:
+            return node
+        # for x in (_live_item for _live_item in <iter> if (<outer vars>, _live_item) in {<live keys>})
+        key = ast.Tuple([ast.Name(name, ast.Load()) for name in loop_filter['outer']]
+                        + [ast.Name('_live_item', ast.Load())], ast.Load())
+        live = ast.Set([ast.parse(repr(k), mode='eval').body for k in loop_filter['live']]) \
+            if loop_filter['live'] else ast.Call(ast.Name('set', ast.Load()), [], [])
+        node.iter = ast.GeneratorExp(ast.Name('_live_item', ast.Load()), [ast.comprehension(
+            ast.Name('_live_item', ast.Store()), node.iter, [ast.Compare(key, [ast.In()], [live])], 0)])
+        return node
+
+
+def frame_bytes(dataframe: DataFrame) -> int:
+    return int(dataframe.memory_usage(index=True, deep=True).sum())
+
+
+def _run(strategy, candles: DataFrame, pair: str) -> Tuple[DataFrame, float]:
+    started = time.perf_counter()
+    metadata = {'pair': pair}
+    df = strategy.advise_indicators(candles.copy(), metadata)
+    df = strategy.advise_entry(df, metadata)
+    df = strategy.advise_exit(df, metadata)
+    return df, time.perf_counter() - started
+
+
+def _differences(original: DataFrame, pruned: DataFrame) -> List[str]:
+    missing = [col for col in SIGNAL_COLUMNS if col in original.columns and col not in pruned.columns]
+    changed = [col for col in pruned.columns if col in original.columns
+               and not original[col].reset_index(drop=True).equals(pruned[col].reset_index(drop=True))]
+    return missing + changed
+
+
+def verify(pruner: IndicatorPruner, pairs: List[str], datadir: Path, days: Optional[int] = None) -> DataFrame:
+    """
+    Original against pruned on local data for ``pairs``: time, frame memory and columns that differ.
+    """
+    from tradeboddy.prescreen import load_candles
+
+    strategy = pruner.strategy
+    rows = []
+    for pair in pairs:
+        candles = load_candles(datadir, pair, strategy.timeframe, days)
+        if candles is None:
+            logger.warning(f"No {strategy.timeframe} data for {pair}")
+            continue
+        original, original_s = _run(strategy, candles, pair)
+        pruner.install()
+        try:
+            pruned, pruned_s = _run(strategy, candles, pair)
+        finally:
+            pruner.uninstall()
+        differences = _differences(original, pruned)
+        rows.append({
+            'pair': pair,
+            'columns': len(original.columns),
+            'pruned_columns': len(pruned.columns),
+            'time_s': round(original_s, 3),
+            'pruned_time_s': round(pruned_s, 3),
+            'saved_s': round(original_s - pruned_s, 3),
+            'frame_mb': round(frame_bytes(original) / 2 ** 20, 2),
+            'saved_mb': round((frame_bytes(original) - frame_bytes(pruned)) / 2 ** 20, 2),
+            'identical': not differences,
+            'differences': ' '.join(differences[:10]),
+        })
+    return DataFrame(rows)
+
+
+def main(argv=None):
+    from tradeboddy.prescreen import USER_DATA, backtest_config, load_strategy
+
+    parser = argparse.ArgumentParser(description='Find and skip the indicators a strategy computes but never reads.')
+    parser.add_argument('--config', default=str(USER_DATA / 'config.json'))
+    parser.add_argument('--strategy', required=True)
+    parser.add_argument('--strategies-dir', default=str(USER_DATA / 'strategies'))
+    parser.add_argument('--datadir', default=None, help='defaults to the datadir of the config')
+    parser.add_argument('--pairs', nargs='+', default=None, help='defaults to the first pair of the whitelist')
+    parser.add_argument('--days', type=int, default=None)
+    parser.add_argument('--static', action='store_true', help='only list what would be pruned, do not run or write')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    config = backtest_config(Path(args.config), Path(args.datadir) if args.datadir else None)
+    strategy = load_strategy(args.strategy, Path(args.strategies_dir) / args.strategy, config)
+    # start from the unpruned strategy, whether or not a plan was applied
+    vars(strategy).pop('populate_indicators', None)
+    vars(strategy).pop('pruning_key', None)
+    pruner = IndicatorPruner(strategy)
+    plan = pruner.plan
+    statements = sum(len(positions) for positions in plan['removed'].values())
+    loops = sum(len(loop_filters) for loop_filters in plan['filters'].values())
+    print(f"{args.strategy}: {statements} statements removed and {loops} loops narrowed in "
+          f"{len(set(plan['removed']) | set(plan['filters']))} methods")
+    print(f"Columns no longer computed ({len(plan['columns'])}): {' '.join(plan['columns'])}")
+    if args.static or not (plan['removed'] or plan['filters']):
+        return
+
+    pairs = args.pairs or config['exchange']['pair_whitelist'][:1]
+    report = verify(pruner, pairs, config['datadir'], args.days)
+    if report.empty:
+        print("No data to verify the plan on, nothing written")
+        return
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(report.to_string(index=False))
+    print(f"\nSaved per pair: {report['saved_s'].mean():.3f}s of {report['time_s'].mean():.3f}s, "
+          f"{report['saved_mb'].mean():.2f} of {report['frame_mb'].mean():.2f} MB")
+    if not report['identical'].all():
+        print("Pruned results differ from the original, plan not written")
+        return
+    path = IndicatorPruner.plan_path(strategy)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(plan, indent=1))
+    print(f"Plan written to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+Resampled candles kept up to date incrementally, merged back through a row map.
+
+``technical.util.resample_to_interval`` copies the whole frame, resamples it
+with ``DataFrame.resample().agg()`` and ``resampled_merge`` joins the result
+back with ``merge()``, copying the frame again and forward-filling all of it.
+Strategies do this in ``populate_indicators``, on every candle, for the whole
+history. ``Resampler`` aggregates the OHLCV columns straight from numpy arrays,
+maps every resampled bar to the base row it is merged on once, and in
+live/dry_run ``for_pair()`` keeps the bars of each pair so the next candle only
+re-aggregates the bars at both ends of the window:
+
+    resampler = Resampler.for_pair(self, metadata['pair'], self.timeframe, dataframe, 15)
+    resampled = self.resampled_tf_indicators(resampler.bars(), metadata)
+    dataframe = resampler.merge(dataframe, resampled, fill_na=True)
+
+``resample_to_interval()`` and ``resampled_merge()`` are drop-in replacements
+for the ``technical.util`` functions. The frames and ``resample_<N>_*`` columns
+are the same, except that ``resampled_merge()`` leaves ``resampled`` as it was.
+"""
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+TICKER_INTERVAL_MINUTES = {
+    '1m': 1, '5m': 5, '15m': 15, '30m': 30, '1h': 60, '60m': 60, '2h': 120,
+    '4h': 240, '6h': 360, '12h': 720, '1d': 1440, '1w': 10080,
+}
+MINUTE = 60 * 10 ** 9
+DAY = 1440 * MINUTE
+
+# (pair, timeframe, interval) -> instance, for the incremental updates in live/dry_run
+_by_pair: Dict[Tuple[str, str, int], 'Resampler'] = {}
+
+
+def _minutes(interval: Union[int, str]) -> int:
+    return TICKER_INTERVAL_MINUTES[interval] if isinstance(interval, str) else int(interval)
+
+
+def _dates(dataframe: DataFrame) -> np.ndarray:
+    # UTC nanoseconds
+    return dataframe['date'].to_numpy('datetime64[ns]').view('i8')
+
+
+def compute_interval(dates: np.ndarray) -> int:
+    """
+    Smallest step between ``dates`` (nanoseconds) in whole minutes, as ``technical.util.compute_interval``.
+    """
+    if len(dates) < 2:
+        raise ValueError("Cannot compute the interval of less than two candles")
+    return int(np.diff(dates).min() // MINUTE)
+
+
+def _first_valid(values: np.ndarray, starts: np.ndarray, ends: np.ndarray, last: bool = False) -> np.ndarray:
+    # first (or last) non-NaN value of every group, NaN for all-NaN groups, like groupby first/last
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == len(values):
+        return values[ends - 1 if last else starts]
+    if last:
+        pos = np.searchsorted(valid, ends) - 1
+        found = pos >= 0
+        found[found] = valid[pos[found]] >= starts[found]
+    else:
+        pos = np.searchsorted(valid, starts)
+        found = pos < len(valid)
+        found[found] = valid[pos[found]] < ends[found]
+    out = np.full(len(starts), np.nan)
+    out[found] = values[valid[pos[found]]]
+    return out
+
+
+def _sum(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    # groupby sum: NaN skipped, Kahan-compensated in row order, one vector step per position in the groups
+    sizes = ends - starts
+    total, compensation = np.zeros(len(starts)), np.zeros(len(starts))
+    for position in range(int(sizes.max()) if len(sizes) else 0):
+        groups = np.flatnonzero((sizes > position) & ~np.isnan(values[np.minimum(starts + position, ends - 1)]))
+        y = values[starts[groups] + position] - compensation[groups]
+        t = total[groups] + y
+        comp = t - total[groups] - y
+        compensation[groups] = np.where(np.isnan(comp), 0.0, comp)
+        total[groups] = t
+    return total
+
+
+def _aggregate(dates: np.ndarray, candles: Dict[str, np.ndarray], origin: int,
+               step: int) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Labels, first rows (plus the end) and OHLCV of the non-empty ``step`` bins from ``origin``.
+    """
+    codes = (dates - origin) // step
+    starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1]))) if len(codes) else codes[:0]
+    bounds = np.append(starts, len(dates))
+    ends = bounds[1:]
+    bars = {}
+    if len(starts):
+        bars['open'] = _first_valid(candles['open'], starts, ends)
+        bars['high'] = np.fmax.reduceat(candles['high'], starts)
+        bars['low'] = np.fmin.reduceat(candles['low'], starts)
+        bars['close'] = _first_valid(candles['close'], starts, ends, last=True)
+        bars['volume'] = _sum(candles['volume'], starts, ends)
+    else:
+        bars = {col: np.empty(0) for col in COLUMNS}
+    return origin + codes[starts] * step, bounds, bars
+
+
+def _merge_rows(dates: np.ndarray, bar_dates: np.ndarray) -> np.ndarray:
+    """
+    For every row of the base frame, the resampled bar merged on it (-1 for none).
+
+    As ``resampled_merge``, a bar lands on the base candle that opens one base
+    interval before the bar closes, the last candle the bar is made of.
+    """
+    offset = (compute_interval(bar_dates) - compute_interval(dates)) * MINUTE
+    if offset <= 0:
+        raise ValueError("Tried to merge a faster timeframe to a slower timeframe. Upsampling is not possible.")
+    rows = np.full(len(dates), -1)
+    merge_dates = bar_dates + offset
+    pos = np.searchsorted(dates, merge_dates)
+    found = pos < len(dates)
+    found[found] = dates[pos[found]] == merge_dates[found]
+    rows[pos[found]] = np.flatnonzero(found)
+    return rows
+
+
+def _merge(original: DataFrame, resampled: DataFrame, rows: np.ndarray, interval: int,
+           fill_na: bool) -> DataFrame:
+    block = resampled.reset_index(drop=True).reindex(rows)
+    block.columns = [f"resample_{interval}_{col}" for col in resampled.columns]
+    # shallow copy: the columns of ``original`` are shared, not copied, and it is left untouched
+    dataframe = original.copy(deep=False)
+    dataframe.index = pd.RangeIndex(len(dataframe))
+    dataframe[list(block.columns)] = block.set_axis(dataframe.index)
+    if fill_na:
+        # like ``fillna(method='ffill')`` on the merged frame, every column, but only those with gaps are rewritten
+        gaps = dataframe.columns[dataframe.isna().any().to_numpy()]
+        if len(gaps):
+            dataframe[list(gaps)] = dataframe[list(gaps)].ffill()
+    return dataframe
+
+
+class Resampler:
+    """
+    The candles of a frame aggregated to ``interval`` minutes, with the rows they merge back on.
+    """
+
+    def __init__(self, dataframe: DataFrame, interval: Union[int, str]):
+        self.interval = _minutes(interval)
+        self.step = self.interval * MINUTE
+        self._reset(dataframe)
+
+    def _reset(self, dataframe: DataFrame) -> None:
+        self.date_dtype = dataframe['date'].dtype
+        self.dates = _dates(dataframe)
+        self.candles = {col: dataframe[col].to_numpy(float, copy=True) for col in COLUMNS}
+        self.origin = self._origin(dataframe)
+        self.labels, self.bounds, self._bars = _aggregate(self.dates, self.candles, self.origin, self.step)
+        self._rows: Optional[np.ndarray] = None
+
+    def _origin(self, dataframe: DataFrame) -> int:
+        # DataFrame.resample's default origin: midnight of the first day
+        return dataframe['date'].iloc[0].normalize().value if len(dataframe) else 0
+
+    @classmethod
+    def for_pair(cls, strategy, pair: str, timeframe: str, dataframe: DataFrame,
+                 interval: Union[int, str]) -> 'Resampler':
+        """
+        A ``Resampler`` of ``dataframe``; in live/dry_run the bars of ``pair`` carry over to
+        the next candle's frame and only the bars at both ends are aggregated again.
+        """
+        if strategy.config['runmode'].value not in ('live', 'dry_run'):
+            return cls(dataframe, interval)
+        key = (pair, timeframe, _minutes(interval))
+        resampler = _by_pair.get(key)
+        if resampler is None:
+            resampler = _by_pair[key] = cls(dataframe, interval)
+        else:
+            resampler.update(dataframe)
+        return resampler
+
+    def update(self, dataframe: DataFrame) -> 'Resampler':
+        """
+        Move to ``dataframe``, the previous frame with candles dropped at the start and/or
+        appended at the end. The bars in between are kept, the first (now partial) and the
+        last (possibly extended) bar are aggregated again; anything else starts over.
+        """
+        dates = _dates(dataframe)
+        candles = {col: dataframe[col].to_numpy(float, copy=True) for col in COLUMNS}
+        start = self._overlap(dates, candles)
+        origin = self._origin(dataframe)
+        if start is None or (origin != self.origin and DAY % self.step):
+            self._reset(dataframe)
+            return self
+        # bars that start inside the kept rows, except the last one, are complete and unchanged
+        first = int(np.searchsorted(self.bounds[:-1], start))
+        last = len(self.labels) - 1
+        if first >= last:
+            self._reset(dataframe)
+            return self
+        head, tail = self.bounds[first] - start, self.bounds[last] - start
+
+        def part(lo: int, hi: int):
+            return _aggregate(dates[lo:hi], {col: values[lo:hi] for col, values in candles.items()},
+                              origin, self.step)
+
+        head_labels, head_bounds, head_bars = part(0, head)
+        tail_labels, tail_bounds, tail_bars = part(tail, len(dates))
+        self.labels = np.concatenate((head_labels, self.labels[first:last], tail_labels))
+        self.bounds = np.concatenate((head_bounds[:-1], self.bounds[first:last] - start, tail_bounds + tail))
+        self._bars = {col: np.concatenate((head_bars[col], self._bars[col][first:last], tail_bars[col]))
+                      for col in COLUMNS}
+        self.date_dtype, self.dates, self.candles, self.origin = dataframe['date'].dtype, dates, candles, origin
+        self._rows = None
+        return self
+
+    def _overlap(self, dates: np.ndarray, candles: Dict[str, np.ndarray]) -> Optional[int]:
+        # row of the previous frame where the new one starts, if the candles they share are equal
+        if not len(dates) or not len(self.dates):
+            return None
+        start = int(np.searchsorted(self.dates, dates[0]))
+        kept = len(self.dates) - start
+        if start >= len(self.dates) or self.dates[start] != dates[0] or kept > len(dates):
+            return None
+        if not np.array_equal(self.dates[start:], dates[:kept]):
+            return None
+        for col in COLUMNS:
+            if not np.array_equal(self.candles[col][start:], candles[col][:kept], equal_nan=True):
+                return None
+        return start
+
+    def _complete(self) -> np.ndarray:
+        # ``dropna()`` of the resampled frame: bars with a NaN open, high, low or close are left out
+        return ~np.isnan(np.vstack([self._bars[col] for col in COLUMNS[:4]])).any(axis=0)
+
+    def bars(self) -> DataFrame:
+        """
+        The resampled candles, as ``technical.util.resample_to_interval``.
+        """
+        keep = self._complete()
+        dates = pd.DatetimeIndex(self.labels[keep].view('datetime64[ns]'))
+        tz = getattr(self.date_dtype, 'tz', None)
+        if tz is not None:
+            dates = dates.tz_localize('UTC').tz_convert(tz)
+        bars = {'date': dates.astype(self.date_dtype)}
+        bars.update({col: self._bars[col][keep] for col in COLUMNS})
+        return DataFrame(bars)
+
+    def merge(self, original: DataFrame, resampled: DataFrame, fill_na: bool = True) -> DataFrame:
+        """
+        ``resampled`` (``bars()`` with indicators added) merged into ``original``, the frame
+        this resampler was built from, as ``technical.util.resampled_merge``.
+        """
+        keep = self._complete()
+        if len(resampled) != int(keep.sum()) or len(original) != len(self.dates):
+            return resampled_merge(original, resampled, fill_na)
+        bar_dates = self.labels[keep]
+        if self._rows is None:
+            self._rows = _merge_rows(self.dates, bar_dates)
+        return _merge(original, resampled, self._rows, compute_interval(bar_dates), fill_na)
+
+
+def resample_to_interval(dataframe: DataFrame, interval: Union[int, str]) -> DataFrame:
+    """
+    ``technical.util.resample_to_interval`` replacement: OHLCV of ``dataframe`` in ``interval`` minutes.
+    """
+    return Resampler(dataframe, interval).bars()
+
+
+def resampled_merge(original: DataFrame, resampled: DataFrame, fill_na: bool = True) -> DataFrame:
+    """
+    ``technical.util.resampled_merge`` replacement: ``resampled`` as ``resample_<N>_*`` columns of ``original``.
+    """
+    bar_dates = _dates(resampled)
+    return _merge(original, resampled, _merge_rows(_dates(original), bar_dates),
+                  compute_interval(bar_dates), fill_na)
@@ -0,0 +1,217 @@
+"""
+Rolling-window primitives that replace ``rolling(...).apply(...)`` callbacks.
+
+``rolling(n).apply(func)`` calls back into Python once per window, which costs
+more than everything else in ``populate_indicators`` for several strategies. The
+callbacks used in this tree only ask simple questions about a window, and these
+functions answer them with shifts and cumulative sums, returning the same values
+(NaN where the callback would not have been called):
+
+    rolling_any(s, n)               rolling(n).apply(lambda x: x.any())
+    rolling_all(s, n)               rolling(n).apply(lambda x: x.all())
+    exceeds_prev_max(s, n, mult)    rolling(n).apply(self.bbw_expansion)
+    weighted_lag(s, n, first, last) rolling(n, min_periods=1).apply(lambda x: first * x.iloc[0] + last * x.iloc[-1])
+    turning_point(s, n, support)    rolling(n).apply(self.is_support / self.is_resistance, raw=True)
+    bars_since(cond)                bars since ``cond`` was last true
+    rolling_count(flags, n)         rolling(n).sum() of 0/1 flags, counted exactly
+
+Scan the strategies for call sites that still use ``rolling(...).apply(``:
+
+    python -m tradeboddy.rolling
+"""
+import argparse
+import ast
+import re
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import Series
+
+STRATEGIES = Path(__file__).resolve().parents[1] / 'strategies'
+
+
+def _complete(series: Series, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Rows where pandas would call the callback: at least ``min_periods`` non-NaN values in the window.
+    """
+    min_periods = window if min_periods is None else min_periods
+    count = series.notna().astype(int).rolling(window, min_periods=0).sum().to_numpy()
+    return count >= min_periods
+
+
+def _window_count(flags: np.ndarray, window: int) -> np.ndarray:
+    csum = np.concatenate(([0], np.cumsum(flags)))
+    start = np.maximum(np.arange(1, len(flags) + 1) - window, 0)
+    return csum[1:] - csum[start]
+
+
+def rolling_any(series: Series, window: int) -> Series:
+    """
+    1.0 if any value of the last ``window`` values is truthy, else 0.0 (NaN for incomplete windows).
+    """
+    values = series.to_numpy(float)
+    hits = _window_count(np.isnan(values) | (values != 0), window)
+    out = np.where(hits > 0, 1.0, 0.0)
+    out[~_complete(series, window)] = np.nan
+    return pd.Series(out, index=series.index)
+
+
+def rolling_all(series: Series, window: int) -> Series:
+    """
+    1.0 if all of the last ``window`` values are truthy, else 0.0 (NaN for incomplete windows).
+    """
+    values = series.to_numpy(float)
+    misses = _window_count(values == 0, window)
+    out = np.where(misses == 0, 1.0, 0.0)
+    out[~_complete(series, window)] = np.nan
+    return pd.Series(out, index=series.index)
+
+
+def exceeds_prev_max(series: Series, window: int, mult: float = 1.1) -> Series:
+    """
+    1.0 if the current value is above ``mult`` times the maximum of the previous
+    ``window - 1`` values (floored at 0), else 0.0. NaN for incomplete windows.
+    """
+    values = series.to_numpy(float)
+    prev_max = np.zeros(len(values))
+    for k in range(1, window):
+        shifted = np.concatenate((np.full(min(k, len(values)), -np.inf), values[:-k] if k < len(values) else []))
+        prev_max = np.maximum(prev_max, np.nan_to_num(shifted, nan=-np.inf))
+    out = np.where(values > prev_max * mult, 1.0, 0.0)
+    out[~_complete(series, window)] = np.nan
+    return pd.Series(out, index=series.index)
+
+
+def weighted_lag(series: Series, window: int, first: float = 1.0, last: float = 1.0,
+                 min_periods: Optional[int] = None) -> Series:
+    """
+    ``first`` times the oldest plus ``last`` times the newest value of each window.
+    Windows at the start are truncated, as with ``rolling(window, min_periods=...)``.
+    """
+    values = series.to_numpy(float)
+    oldest = np.empty(len(values))
+    lag = window - 1
+    oldest[:lag] = values[0] if len(values) else np.nan
+    oldest[lag:] = values[:len(values) - lag]
+    out = first * oldest + last * values
+    out[~_complete(series, window, min_periods)] = np.nan
+    return pd.Series(out, index=series.index)
+
+
+def turning_point(series: Series, window: int, support: bool = True, center: bool = False) -> Series:
+    """
+    NFIX's is_support/is_resistance over each window: 1.0 if the values strictly fall
+    (support) or rise (resistance) for the steps in the first half of the window and turn
+    for the rest, else 0.0. NaN for incomplete windows.
+    """
+    values = series.to_numpy(float)
+    n = len(values)
+    out = np.ones(n, dtype=bool)
+    for step in range(window - 1):
+        # step j compares x[j] with x[j + 1], the window ending at i starts at i - window + 1
+        lag = window - 1 - step
+        older = np.concatenate((np.full(min(lag, n), np.nan), values[:n - lag] if lag < n else []))
+        newer = np.concatenate((np.full(min(lag - 1, n), np.nan), values[:n - lag + 1] if lag - 1 < n else []))
+        falling = step < window / 2
+        out &= (older > newer) if falling == support else (older < newer)
+    result = np.where(out, 1.0, 0.0)
+    result[~_complete(series, window)] = np.nan
+    result = pd.Series(result, index=series.index)
+    if center:
+        result = result.shift(-((window - 1) // 2))
+    return result
+
+
+def bars_since(condition: Series) -> Series:
+    """
+    Number of candles since ``condition`` was last true (0 on the candle itself, NaN before the first).
+    """
+    flags = condition.fillna(False).to_numpy(bool)
+    idx = np.arange(len(flags), dtype=float)
+    last = pd.Series(np.where(flags, idx, np.nan)).ffill().to_numpy()
+    return pd.Series(idx - last, index=condition.index)
+
+
+def rolling_count(flags: Series, window: int) -> Series:
+    """
+    Number of truthy values among the last ``window`` values (NaN for incomplete windows).
+    """
+    values = flags.to_numpy(float)
+    out = _window_count(np.isnan(values) | (values != 0), window).astype(float)
+    out[~_complete(flags, window)] = np.nan
+    return pd.Series(out, index=flags.index)
+
+
+# name of the applied callable (or lambda body) -> primitive
+PATTERNS = [
+    (re.compile(r'^x\.any\(\)$'), 'rolling_any'),
+    (re.compile(r'^x\.all\(\)$'), 'rolling_all'),
+    (re.compile(r'bbw_expansion$'), 'exceeds_prev_max'),
+    (re.compile(r'is_(support|resistance)\(x\)$'), 'turning_point'),
+    (re.compile(r'^x\.iloc\[0\] \+ [\d.]+ \* x\.iloc\[-1\]$'), 'weighted_lag'),
+]
+
+
+def _callback(node: ast.AST) -> str:
+    if isinstance(node, ast.Lambda):
+        arg = node.args.args[0].arg if node.args.args else 'x'
+        body = ast.unparse(node.body)
+        return re.sub(rf'\b{arg}\b', 'x', body)
+    return ast.unparse(node)
+
+
+def scan_file(path: Path) -> List[dict]:
+    try:
+        tree = ast.parse(path.read_text(), filename=str(path))
+    except (SyntaxError, UnicodeDecodeError):
+        return []
+    found = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr == 'apply' and isinstance(node.func.value, ast.Call)):
+            continue
+        rolling = node.func.value
+        if not (isinstance(rolling.func, ast.Attribute) and rolling.func.attr == 'rolling'):
+            continue
+        callback = _callback(node.args[0]) if node.args else ''
+        primitive = next((name for pattern, name in PATTERNS if pattern.search(callback)), None)
+        found.append({
+            'file': str(path),
+            'line': node.lineno,
+            'rolling': ', '.join([ast.unparse(a) for a in rolling.args]
+                                 + [f"{k.arg}={ast.unparse(k.value)}" for k in rolling.keywords]),
+            'callback': callback,
+            'primitive': primitive,
+        })
+    return found
+
+
+def scan(root: Path = STRATEGIES) -> List[dict]:
+    found = []
+    for path in sorted(Path(root).rglob('*.py')):
+        found += scan_file(path)
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find rolling().apply() call sites and the primitive replacing them.')
+    parser.add_argument('path', nargs='?', default=str(STRATEGIES))
+    parser.add_argument('--unmapped', action='store_true', help='only list call sites without a primitive')
+    args = parser.parse_args(argv)
+
+    root = Path(args.path)
+    found = scan_file(root) if root.is_file() else scan(root)
+    if args.unmapped:
+        found = [f for f in found if f['primitive'] is None]
+    for f in found:
+        location = Path(f['file']).relative_to(root) if root.is_dir() else f['file']
+        print(f"{location}:{f['line']}  rolling({f['rolling']}).apply({f['callback']})  "
+              f"-> {f['primitive'] or 'no primitive'}")
+    mapped = sum(1 for f in found if f['primitive'])
+    print(f"\n{len(found)} call sites, {mapped} with a primitive")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+Warm-restart snapshots of analyzed dataframes and strategy state.
+
+After a restart every strategy recomputes ``startup_candle_count`` candles of
+indicators for every pair. ``AnalyzedSnapshot`` writes the analyzed frames
+(feather, one file per pair and timeframe) and any tracked state dicts such as
+``custom_info`` (pickle) below ``user_data/snapshots/<strategy>/``. It saves every
+``every`` new candles and when the bot shuts down.
+
+On the first ``populate()`` call for a pair after a restart the snapshot is
+validated against the strategy and tradeboddy sources, its parameter values and
+the OHLCV data freqtrade handed in. If it matches, the cached rows are reused and only the
+missing tail is computed, on the tail plus ``warmup`` candles of history.
+Any mismatch falls back to a full ``populate_indicators`` run.
+
+Only the analyzed frame is saved, not the carry of recursive indicators, so the
+snapshot is meant for strategies whose indicators only look back a fixed window
+of at most ``warmup`` candles (SMA, rolling max/min, RSI of TA-Lib's window, ...),
+where the tail computed on ``warmup`` candles equals the one of a full run.
+EMA chains, SAR, EWO on EMAs or pmax depend on the whole history and never
+reproduce the cached values from ``warmup`` candles: the short run also
+recomputes the last cached candle, and when it differs (``np.allclose``) the
+snapshot falls back to a full run, after having paid for the short one. Do not
+use it for such strategies.
+
+Usage inside a strategy:
+
+    snapshot = None
+
+    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        if self.config['runmode'].value in ('live', 'dry_run'):
+            if self.snapshot is None:
+                self.snapshot = AnalyzedSnapshot.for_strategy(self)
+                self.snapshot.track('custom_info', self.custom_info)
+            return self.snapshot.populate(metadata['pair'], self.timeframe, dataframe,
+                                          lambda df: self.do_indicators(df, metadata),
+                                          warmup=self.startup_candle_count)
+        return self.do_indicators(dataframe, metadata)
+"""
+import atexit
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import rapidjson
+from pandas import DataFrame
+
+from tradeboddy.informative_cache import parameters_key
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+OHLCV = ['open', 'high', 'low', 'close', 'volume']
+
+
+@lru_cache(maxsize=None)
+def package_key() -> str:
+    """
+    Hash of all tradeboddy sources, most indicators of the strategies are computed there.
+    """
+    h = hashlib.sha1()
+    for path in sorted(Path(__file__).resolve().parent.glob('*.py')):
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()[:12]
+
+
+def source_key(cls) -> str:
+    """
+    Hash of the source file defining a strategy class and of the tradeboddy sources,
+    so code changes invalidate snapshots.
+    """
+    try:
+        source = Path(inspect.getsourcefile(cls)).read_bytes()
+    except (TypeError, OSError):
+        source = cls.__qualname__.encode()
+    return hashlib.sha1(source + package_key().encode()).hexdigest()[:12]
+
+
+def _atomic_write(path: Path, write: Callable[[Path], None]) -> None:
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _same_values(a: DataFrame, b: DataFrame) -> bool:
+    """
+    True if both frames hold the same values, numeric columns compared with ``np.allclose``.
+    """
+    for col in a.columns:
+        x, y = a[col].to_numpy(), b[col].to_numpy()
+        if x.dtype.kind in 'biuf' and y.dtype.kind in 'biuf':
+            if not np.allclose(x.astype(float), y.astype(float), equal_nan=True):
+                return False
+        elif not (pd.isna(x) & pd.isna(y) | (x == y)).all():
+            return False
+    return True
+
+
+class AnalyzedSnapshot:
+
+    def __init__(self, directory: Path, every: int = 12, params_key: str = '', code_key: str = ''):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.every = every
+        self.params_key = params_key
+        self.code_key = code_key
+        self.restored = 0
+        self._frames: Dict[Tuple[str, str], Tuple[DataFrame, list]] = {}
+        self._pending: Dict[Tuple[str, str], int] = {}
+        self._seen = set()
+        self._state: Dict[str, dict] = {}
+        self._saved_state = self._load_state()
+        atexit.register(self.save)
+
+    @classmethod
+    def for_strategy(cls, strategy, every: int = 12) -> 'AnalyzedSnapshot':
+        name = strategy.__class__.__name__
+        user_data = Path(strategy.config.get('user_data_dir', Path(__file__).resolve().parents[1]))
+        return cls(user_data / 'snapshots' / name, every=every,
+                   params_key=parameters_key(strategy), code_key=source_key(strategy.__class__))
+
+    def track(self, name: str, state: dict) -> None:
+        """
+        Persist ``state`` with the snapshot. Saved content is restored into it in place.
+        """
+        self._state[name] = state
+        if name in self._saved_state:
+            state.update(self._saved_state[name])
+            logger.info(f"Snapshot: restored {len(state)} '{name}' entries")
+
+    def populate(self, pair: str, timeframe: str, dataframe: DataFrame,
+                 populate: Callable[[DataFrame], DataFrame], warmup: int) -> DataFrame:
+        key = (pair, timeframe)
+        result = None
+        if key not in self._seen:
+            self._seen.add(key)
+            result = self._resume(pair, timeframe, dataframe, populate, warmup)
+        if result is None:
+            result = populate(dataframe)
+
+        previous = self._frames.get(key)
+        if previous is None or previous[0]['date'].iloc[-1] != result['date'].iloc[-1]:
+            self._pending[key] = self._pending.get(key, 0) + 1
+        self._frames[key] = (result, list(result.columns))
+        if self._pending[key] >= self.every:
+            self._save_frame(key)
+            self._save_state()
+        return result
+
+    def save(self) -> None:
+        for key in list(self._frames):
+            self._save_frame(key)
+        self._save_state()
+
+    def _paths(self, pair: str, timeframe: str) -> Tuple[Path, Path]:
+        stem = f"{pair.replace('/', '_').replace(':', '_')}-{timeframe}"
+        return self.directory / f"{stem}.feather", self.directory / f"{stem}.json"
+
+    def _meta(self, frame: DataFrame, columns: list) -> dict:
+        return {
+            'version': SNAPSHOT_VERSION,
+            'params': self.params_key,
+            'code': self.code_key,
+            'columns': columns,
+            'last_date': str(frame['date'].iloc[-1]),
+            'rows': len(frame),
+        }
+
+    def _save_frame(self, key: Tuple[str, str]) -> None:
+        frame, columns = self._frames[key]
+        data_path, meta_path = self._paths(*key)
+        try:
+            _atomic_write(data_path, lambda p: frame[columns].reset_index(drop=True).to_feather(p))
+            _atomic_write(meta_path, lambda p: p.write_text(rapidjson.dumps(self._meta(frame, columns))))
+            self._pending[key] = 0
+        except Exception as e:
+            logger.warning(f"Snapshot: could not save {key[0]} {key[1]}: {e}")
+
+    def _load(self, pair: str, timeframe: str) -> Optional[DataFrame]:
+        data_path, meta_path = self._paths(pair, timeframe)
+        if not data_path.is_file() or not meta_path.is_file():
+            return None
+        try:
+            meta = rapidjson.loads(meta_path.read_text())
+            if (meta.get('version') != SNAPSHOT_VERSION or meta.get('params') != self.params_key
+                    or meta.get('code') != self.code_key):
+                logger.info(f"Snapshot for {pair} {timeframe} is outdated, ignoring it")
+                return None
+            frame = pd.read_feather(data_path)
+        except Exception as e:
+            logger.warning(f"Snapshot: could not load {pair} {timeframe}: {e}")
+            return None
+        if list(frame.columns) != meta['columns'] or len(frame) != meta['rows']:
+            return None
+        return frame
+
+    def _resume(self, pair: str, timeframe: str, dataframe: DataFrame,
+                populate: Callable[[DataFrame], DataFrame], warmup: int) -> Optional[DataFrame]:
+        cached = self._load(pair, timeframe)
+        if cached is None or cached.empty or dataframe.empty:
+            return None
+
+        dates = dataframe['date']
+        last = cached['date'].iloc[-1]
+        head = cached[cached['date'] >= dates.iloc[0]]
+        known = dataframe[dates <= last]
+        missing = len(dataframe) - len(known)
+        # The snapshot has to cover the start of the new frame without gaps,
+        # and recomputing the tail must be cheaper than a full run.
+        if head.empty or len(head) != len(known) or missing > len(dataframe) - warmup:
+            return None
+        if not (head['date'].values == known['date'].values).all():
+            return None
+        if not np.allclose(head[OHLCV].to_numpy(float), known[OHLCV].to_numpy(float), equal_nan=True):
+            logger.info(f"Snapshot for {pair} {timeframe} does not match the exchange data, ignoring it")
+            return None
+
+        head = head.reset_index(drop=True)
+        if missing:
+            # the short run includes at least the last cached candle to check it against
+            window = populate(dataframe.iloc[-(missing + max(warmup, 1)):].copy())
+            if list(window.columns) != list(head.columns):
+                return None
+            if not _same_values(window.iloc[[-missing - 1]], head.iloc[[-1]]):
+                logger.info(f"Snapshot for {pair} {timeframe}: indicators on {warmup} candles of "
+                            f"history differ from the cached ones, running them on the full frame")
+                return None
+            result = pd.concat([head, window.iloc[-missing:]], ignore_index=True)
+        else:
+            result = head
+        result.index = dataframe.index
+
+        self.restored += 1
+        logger.info(f"Snapshot: resumed {pair} {timeframe} from {len(head)} cached candles, "
+                    f"computed {missing} new candles")
+        return result
+
+    def _load_state(self) -> dict:
+        path = self.directory / 'state.pickle'
+        if not path.is_file():
+            return {}
+        try:
+            with path.open('rb') as f:
+                saved = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Snapshot: could not load state: {e}")
+            return {}
+        if saved.get('params') != self.params_key or saved.get('code') != self.code_key:
+            return {}
+        return saved.get('state', {})
+
+    def _save_state(self) -> None:
+        if not self._state:
+            return
+        saved = {'params': self.params_key, 'code': self.code_key, 'state': self._state}
+        try:
+            _atomic_write(self.directory / 'state.pickle',
+                          lambda p: p.write_bytes(pickle.dumps(saved, protocol=pickle.HIGHEST_PROTOCOL)))
+        except Exception as e:
+            logger.warning(f"Snapshot: could not save state: {e}")
@@ -0,0 +1,170 @@
+"""
+Write-behind state store for small per-pair strategy state.
+
+NFI's ``Cache.save()`` rewrites the whole JSON file (and deep-copies the data)
+every time ``custom_sell`` / ``confirm_trade_exit`` touch a profit target, in
+backtests as well. ``JournaledStore`` keeps the state in a dict and, when
+persistent, hands every change to a background thread that appends it to a
+journal next to the JSON file:
+
+    data-nfi-profit_target_by_pair.json           compacted state, same format as before
+    data-nfi-profit_target_by_pair.json.journal   one {"op": ..., "key": ..., "value": ...} per line
+
+Every ``compact_every`` changes, and on shutdown, the journal is folded back into
+the JSON file. Loading reads the JSON file and replays the journal, so nothing is
+lost between compactions. Writers never touch the filesystem themselves.
+
+    store = JournaledStore.for_strategy(self, 'data-nfi-profit_target_by_pair.json')
+    store.set(pair, {'rate': rate, ...})
+    store.pop(pair)
+    store.data.get(pair)
+
+Outside live/dry_run (backtest, hyperopt, ...) the store is memory only.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+import rapidjson
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class JournaledStore:
+
+    def __init__(self, path: Optional[Path] = None, compact_every: int = 100,
+                 flush_interval: float = 1.0):
+        self.path = Path(path) if path is not None else None
+        self.journal_path = self.path.with_name(self.path.name + '.journal') if self.path else None
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+        self.data: dict = {}
+        self._journaled = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        if self.path is not None:
+            self._load()
+            self._writer = threading.Thread(target=self._run, name=f"store-{self.path.name}", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    @classmethod
+    def for_strategy(cls, strategy, filename: str, **kwargs) -> 'JournaledStore':
+        if strategy.config['runmode'].value in ('live', 'dry_run'):
+            return cls(Path(strategy.config['user_data_dir']) / filename, **kwargs)
+        return cls(None, **kwargs)
+
+    @property
+    def persistent(self) -> bool:
+        return self.path is not None
+
+    def set(self, key: str, value: Any) -> None:
+        if self.data.get(key) == value:
+            return
+        self.data[key] = value
+        if self.persistent:
+            self._queue.put(('set', key, value))
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        if key not in self.data:
+            return default
+        value = self.data.pop(key)
+        if self.persistent:
+            self._queue.put(('pop', key, None))
+        return value
+
+    def flush(self) -> None:
+        """
+        Block until all queued changes are journaled and compact the journal.
+        """
+        if self.persistent and self._writer is not None and self._writer.is_alive():
+            done = threading.Event()
+            self._queue.put(('compact', None, done))
+            done.wait()
+
+    def close(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            self.flush()
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def _load(self) -> None:
+        if self.path.is_file():
+            try:
+                self.data = rapidjson.loads(self.path.read_text(), number_mode=rapidjson.NM_NATIVE)
+            except (rapidjson.JSONDecodeError, OSError) as e:
+                logger.error(f"Failed to load JSON from {self.path}: {e}")
+        if self.journal_path.is_file():
+            replayed = 0
+            for line in self.journal_path.read_text().splitlines():
+                try:
+                    entry = rapidjson.loads(line, number_mode=rapidjson.NM_NATIVE)
+                except rapidjson.JSONDecodeError:
+                    # a torn last line from a crash mid-write
+                    continue
+                if entry['op'] == 'set':
+                    self.data[entry['key']] = entry['value']
+                else:
+                    self.data.pop(entry['key'], None)
+                replayed += 1
+            if replayed:
+                logger.info(f"Replayed {replayed} journal entries for {self.path.name}")
+            self._compact()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if item is _STOP:
+                return
+            batch = [item]
+            # drain what is already queued, so one write covers a burst of changes
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+            if _STOP in batch:
+                return
+
+    def _write(self, batch: list) -> None:
+        lines = []
+        waiters = []
+        for item in batch:
+            if item is _STOP:
+                continue
+            op, key, value = item
+            if op == 'compact':
+                waiters.append(value)
+                continue
+            lines.append(rapidjson.dumps({'op': op, 'key': key, 'value': value if op == 'set' else None},
+                                         number_mode=rapidjson.NM_NATIVE))
+        try:
+            if lines:
+                with self.journal_path.open('a') as f:
+                    f.write('\n'.join(lines) + '\n')
+                self._journaled += len(lines)
+            if waiters or self._journaled >= self.compact_every:
+                self._compact()
+        except OSError as e:
+            logger.warning(f"Could not write {self.journal_path}: {e}")
+        for done in waiters:
+            done.set()
+
+    def _compact(self) -> None:
+        # a shallow copy is enough, values are replaced rather than mutated
+        snapshot = dict(self.data)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        tmp.write_text(rapidjson.dumps(snapshot, number_mode=rapidjson.NM_NATIVE))
+        os.replace(tmp, self.path)
+        self.journal_path.unlink(missing_ok=True)
+        self._journaled = 0
@@ -0,0 +1,322 @@
+"""
+The pHSL / pPF / pSL ``custom_stoploss`` of the ClucHAnix / BB_RPB_TSL family as a vectorized curve.
+
+About 30 strategies share the same ``custom_stoploss``: the hard stoploss profit
+``pHSL`` below ``pPF_1``, linear interpolation from ``pSL_1`` to ``pSL_2`` up to
+``pPF_2``, then a stop that rises with the profit. As a Python callback it is
+called per trade per candle. ``StoplossCurve.compile()`` reads the strategy's
+``custom_stoploss`` source and, when it is one of the known forms of that curve,
+returns the curve with the parameter names it uses:
+
+    curve = StoplossCurve.compile(type(strategy))
+    if curve is not None:
+        stoploss = curve.bind(strategy).stoploss(profits)   # custom_stoploss() of every profit
+
+Anything else (tag dependent branches, other curves) does not compile and keeps
+its callback. ``bind()`` checks the curve against the callback on a grid of
+profits and refuses to bind when they differ in any bit. ``StoplossCallback``
+has the same ``stop_prices()`` for those, calling ``custom_stoploss`` per candle.
+
+The parameters can be arrays, e.g. one row per hyperopt variant, and
+``stop_hits()`` finds where each variant's stop is hit in one pass over a trade:
+
+    variants = curve.bind(strategy, pSL_2=np.linspace(0.02, 0.06, 500)[:, None])
+    hits = variants.stop_hits(open_rate, highs, lows, fee=0.001, stoploss=strategy.stoploss)
+"""
+import ast
+import inspect
+import logging
+import textwrap
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PARAMETERS = ('HSL', 'PF_1', 'SL_1', 'PF_2', 'SL_2')
+
+_CURVE = '''
+if current_profit > PF_2:
+    sl_profit = SL_2 + (current_profit - PF_2)
+elif current_profit > PF_1:
+    sl_profit = SL_1 + ((current_profit - PF_1) * (SL_2 - SL_1) / (PF_2 - PF_1))
+else:
+    sl_profit = HSL
+'''
+# (template, whether sl_profit >= current_profit returns -0.99)
+_TEMPLATES = (
+    (_CURVE + '''
+if sl_profit >= current_profit:
+    return -0.99
+return stoploss_from_open(sl_profit, current_profit)
+''', True),
+    (_CURVE + '''
+return stoploss_from_open(sl_profit, current_profit)
+''', False),
+    # below PF_1 sl_profit is HSL anyway
+    (_CURVE + '''
+if current_profit > PF_1:
+    return stoploss_from_open(sl_profit, current_profit)
+else:
+    return stoploss_from_open(HSL, current_profit)
+return stoploss_from_open(HSL, current_profit)
+''', False),
+)
+
+
+def stoploss_from_open(open_relative_stop, current_profit):
+    """
+    ``freqtrade.strategy.stoploss_from_open()`` (long, no leverage) over arrays.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoploss = 1 - ((1 + open_relative_stop) / (1 + current_profit))
+    return np.where(current_profit == -1, 1.0, np.maximum(stoploss, 0.0))
+
+
+def _bindings(body: list) -> Tuple[Dict[str, tuple], list]:
+    # leading ``NAME = self.<param>.value`` / ``NAME = <number>`` statements, and the rest
+    bindings = {}
+    for i, stmt in enumerate(body):
+        if not (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name)):
+            return bindings, body[i:]
+        value = stmt.value
+        if (isinstance(value, ast.Attribute) and value.attr == 'value' and isinstance(value.value, ast.Attribute)
+                and isinstance(value.value.value, ast.Name) and value.value.value.id == 'self'):
+            bindings[stmt.targets[0].id] = ('param', value.value.attr)
+        elif _number(value) is not None:
+            bindings[stmt.targets[0].id] = ('const', _number(value))
+        else:
+            return bindings, body[i:]
+    return bindings, []
+
+
+def _number(node) -> Optional[float]:
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        inner = _number(node.operand)
+        return None if inner is None else -inner
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return float(node.value)
+    return None
+
+
+def _match(template, node, bindings: Dict[str, tuple], captured: Dict[str, tuple]) -> bool:
+    # structural comparison, the PARAMETERS names of the template match a bound name or a number
+    if isinstance(template, ast.Name) and template.id in PARAMETERS:
+        if isinstance(node, ast.Name) and node.id in bindings:
+            source = bindings[node.id]
+        elif _number(node) is not None:
+            source = ('const', _number(node))
+        else:
+            return False
+        return captured.setdefault(template.id, source) == source
+    if type(template) is not type(node):
+        return False
+    if isinstance(template, list):
+        return len(template) == len(node) and all(_match(t, n, bindings, captured) for t, n in zip(template, node))
+    if not isinstance(template, ast.AST):
+        return template == node
+    for field in template._fields:
+        if field in ('ctx', 'type_comment', 'kind'):
+            continue
+        if not _match(getattr(template, field, None), getattr(node, field, None), bindings, captured):
+            return False
+    return True
+
+
+class StoplossCurve:
+    """
+    Piecewise stoploss curve, parameters are numbers or arrays that broadcast against the profits.
+    """
+
+    def __init__(self, hsl, pf_1, sl_1, pf_2, sl_2, guard: bool = True,
+                 sources: Optional[Dict[str, tuple]] = None):
+        self.hsl, self.pf_1, self.sl_1, self.pf_2, self.sl_2 = hsl, pf_1, sl_1, pf_2, sl_2
+        self.guard = guard
+        # PARAMETERS -> ('param', attribute) / ('const', value), for bind()
+        self.sources = sources or {}
+
+    @classmethod
+    def compile(cls, strategy_class) -> Optional['StoplossCurve']:
+        """
+        The curve of ``strategy_class.custom_stoploss``, None when it is not one of the known forms.
+        """
+        method = getattr(strategy_class, 'custom_stoploss', None)
+        try:
+            tree = ast.parse(textwrap.dedent(inspect.getsource(method)))
+        except (TypeError, OSError, SyntaxError):
+            return None
+        body = tree.body[0].body if tree.body and isinstance(tree.body[0], ast.FunctionDef) else []
+        if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant):
+            body = body[1:]
+        bindings, rest = _bindings(body)
+        # a leading ``sl_profit = ...`` is overwritten by every branch of the curve
+        bindings.pop('sl_profit', None)
+        for template, guard in _TEMPLATES:
+            captured = {}
+            if _match(ast.parse(template).body, rest, bindings, captured):
+                values = {name: source[1] if source[0] == 'const' else None for name, source in captured.items()}
+                return cls(*(values[name] for name in PARAMETERS), guard=guard, sources=captured)
+        return None
+
+    def bind(self, strategy, check: bool = True, **overrides) -> 'StoplossCurve':
+        """
+        The curve with the strategy's current parameter values; ``overrides`` by parameter
+        attribute (``pSL_2=...``) replace them, e.g. with arrays for hyperopt.
+        """
+        values = []
+        for name in PARAMETERS:
+            kind, source = self.sources[name]
+            if kind == 'const':
+                values.append(source)
+            elif source in overrides:
+                values.append(overrides[source])
+            else:
+                values.append(getattr(strategy, source).value)
+        curve = StoplossCurve(*values, guard=self.guard, sources=self.sources)
+        if check and not overrides and not curve.matches(strategy):
+            raise ValueError(f"{type(strategy).__name__}.custom_stoploss differs from its compiled curve")
+        return curve
+
+    def sl_profit(self, current_profit):
+        """
+        Stop as profit relative to the open rate.
+        """
+        p = np.asarray(current_profit, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rising = self.sl_2 + (p - self.pf_2)
+            between = self.sl_1 + ((p - self.pf_1) * (self.sl_2 - self.sl_1) / (self.pf_2 - self.pf_1))
+        return np.where(p > self.pf_2, rising, np.where(p > self.pf_1, between, self.hsl))
+
+    def stoploss(self, current_profit):
+        """
+        What ``custom_stoploss`` returns for each ``current_profit``.
+        """
+        p = np.asarray(current_profit, dtype=float)
+        sl_profit = self.sl_profit(p)
+        stoploss = stoploss_from_open(sl_profit, p)
+        if self.guard:
+            stoploss = np.where(sl_profit >= p, -0.99, stoploss)
+        return stoploss
+
+    def matches(self, strategy, profits: Optional[np.ndarray] = None) -> bool:
+        """
+        Whether ``stoploss()`` is bit for bit the strategy's ``custom_stoploss`` on ``profits``.
+        """
+        if profits is None:
+            edges = np.array([self.hsl, self.pf_1, self.sl_1, self.pf_2, self.sl_2], dtype=float)
+            profits = np.unique(np.concatenate((np.linspace(-0.5, 1.0, 301), edges, np.nextafter(edges, np.inf))))
+        expected = np.array([strategy.custom_stoploss(pair='', trade=None, current_time=None, current_rate=0.0,
+                                                      current_profit=float(p)) for p in profits], dtype=float)
+        return np.array_equal(self.stoploss(profits), expected)
+
+    def stop_prices(self, open_rate: float, highs: np.ndarray, fee: float = 0.0, stoploss: float = -0.99):
+        """
+        Stop price on each candle of a trade opened at ``open_rate`` when ``custom_stoploss`` is
+        evaluated on the highest price seen before the candle: the initial ``stoploss``, raised
+        (never lowered) by the custom stop.
+        """
+        highs = np.asarray(highs, dtype=float)
+        prev_high = np.maximum.accumulate(np.concatenate(([open_rate], highs[:-1])))
+        profit = prev_high * (1 - fee) / (open_rate * (1 + fee)) - 1
+        distance = np.abs(self.stoploss(profit))
+        # freqtrade ignores a custom stoploss of 0
+        candidate = np.where(distance != 0, prev_high * (1 - distance), -np.inf)
+        return np.maximum(np.maximum.accumulate(candidate, axis=-1), open_rate * (1 + stoploss))
+
+    def stop_hits(self, open_rate: float, highs: np.ndarray, lows: np.ndarray, fee: float = 0.0,
+                  stoploss: float = -0.99) -> np.ndarray:
+        """
+        Candle (index into ``highs``/``lows``) where the stop is hit, -1 if never, per variant.
+        """
+        hit = np.asarray(lows, dtype=float) <= self.stop_prices(open_rate, highs, fee, stoploss)
+        return np.where(hit.any(axis=-1), hit.argmax(axis=-1), -1)
+
+
+class _Trade:
+    """
+    The attributes of a freqtrade ``Trade`` the ``custom_stoploss`` callbacks read.
+    """
+
+    def __init__(self, pair: str, open_rate: float, open_date, fee: float, buy_tag=None):
+        self.pair = pair
+        self.open_rate = open_rate
+        self.open_date_utc = open_date
+        self.open_date = open_date.tz_convert(None) if getattr(open_date, 'tzinfo', None) else open_date
+        self.fee_open = self.fee_close = fee
+        self.buy_tag = self.enter_tag = buy_tag
+        self.is_open = True
+
+    def calc_profit_ratio(self, rate: float) -> float:
+        return rate * (1 - self.fee_close) / (self.open_rate * (1 + self.fee_open)) - 1
+
+
+class _AnalyzedProvider:
+    """
+    Wraps a DataProvider; ``get_analyzed_dataframe()`` returns the candles closed before
+    ``current``, as in backtesting.
+    """
+
+    def __init__(self, dp, analyzed):
+        self._dp = dp
+        self.analyzed = analyzed
+        self.current = 0
+
+    def __getattr__(self, name):
+        return getattr(self._dp, name)
+
+    def get_analyzed_dataframe(self, pair: str, timeframe: str):
+        closed = self.analyzed.iloc[:self.current]
+        return closed, closed['date'].iat[-1] if len(closed) else None
+
+
+class StoplossCallback:
+    """
+    A strategy's ``custom_stoploss`` called per candle, for callbacks that do not compile.
+    """
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.failed = False
+
+    def stop_prices(self, open_rate: float, highs: np.ndarray, fee: float = 0.0, stoploss: float = -0.99,
+                    analyzed=None, start: int = 0, pair: str = '') -> np.ndarray:
+        """
+        ``StoplossCurve.stop_prices()`` of the callback, for a trade opened at candle ``start``
+        of ``analyzed``.
+        """
+        highs = np.asarray(highs, dtype=float)
+        floor = np.full(len(highs), open_rate * (1 + stoploss))
+        if self.failed or analyzed is None:
+            return floor
+        prev_high = np.maximum.accumulate(np.concatenate(([open_rate], highs[:-1])))
+        profit = prev_high * (1 - fee) / (open_rate * (1 + fee)) - 1
+        times = analyzed['date'].iloc[start:start + len(highs)]
+        tag = None
+        for col in ('enter_tag', 'buy_tag'):
+            if col in analyzed and start > 0:
+                # the tag of the signal candle, as freqtrade takes it
+                tag = analyzed[col].iat[start - 1]
+                break
+        trade = _Trade(pair, open_rate, times.iat[0], fee, tag)
+        dp = getattr(self.strategy, 'dp', None)
+        provider = _AnalyzedProvider(dp, analyzed)
+        self.strategy.dp = provider
+        distance = np.zeros(len(highs))
+        try:
+            for k, current_time in enumerate(times):
+                provider.current = start + k
+                value = self.strategy.custom_stoploss(pair=pair, trade=trade, current_time=current_time,
+                                                      current_rate=float(prev_high[k]),
+                                                      current_profit=float(profit[k]))
+                # None keeps the stop, like 0
+                distance[k] = abs(value) if value is not None else 0.0
+        except Exception as e:
+            logger.warning(f"{type(self.strategy).__name__}: custom_stoploss failed in the simulation, "
+                           f"it is not simulated ({type(e).__name__}: {e})")
+            self.failed = True
+            return floor
+        finally:
+            self.strategy.dp = dp
+        # freqtrade ignores a custom stoploss of 0
+        candidate = np.where(distance != 0, prev_high * (1 - distance), -np.inf)
+        return np.maximum(np.maximum.accumulate(candidate), floor)
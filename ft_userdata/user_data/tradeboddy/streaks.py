@@ -0,0 +1,103 @@
+"""
+Streak and run-length counters without per-row loops.
+
+NFI's ``calc_streaks()`` walks ``logic_table.iloc[1:].itertuples()`` for every
+pair on every candle, and the TD Sequential / NASOS counters use
+``groupby((s != s.shift()).cumsum()).cumcount()``. All of them are run lengths,
+which come out of one ``maximum.accumulate`` over the run start positions:
+
+    dataframe['streak'] = calc_streaks(dataframe['close'])
+    dataframe['seq_buy'] = consecutive_count(dataframe['close'] < dataframe['close'].shift(4))
+    dataframe['barssince_last_buy'] = bars_since_event(dataframe['pre_buy_switch'])
+
+For a series that only grew at the end (a restored snapshot, an appended candle),
+``calc_streaks(series, previous)`` keeps the previous values and extends them with
+``next_streak()``.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas import Series
+
+
+def _run_start_positions(start: np.ndarray) -> np.ndarray:
+    idx = np.arange(len(start))
+    return np.maximum.accumulate(np.where(start, idx, 0))
+
+
+def run_lengths(values) -> np.ndarray:
+    """
+    Length of the run of equal values ending at each row (1 on the first row of a run).
+    """
+    a = np.asarray(values)
+    if len(a) == 0:
+        return np.zeros(0, dtype=int)
+    start = np.ones(len(a), dtype=bool)
+    start[1:] = a[1:] != a[:-1]
+    return np.arange(len(a)) - _run_start_positions(start) + 1
+
+
+def consecutive_count(condition: Series) -> Series:
+    """
+    How many candles in a row ``condition`` has been true, 0 where it is false.
+    Same as ``cond * (cond.groupby((cond != cond.shift()).cumsum()).cumcount() + 1)``.
+    """
+    flags = condition.to_numpy(bool)
+    return pd.Series(np.where(flags, run_lengths(flags), 0), index=condition.index)
+
+
+def bars_since_event(events: Series) -> Series:
+    """
+    Candles since the last non-zero value of ``events`` (0 on the event itself), counted
+    from the first row before the first event. Same as ``events.groupby(events.cumsum()).cumcount()``
+    for 0/1 events.
+    """
+    start = events.to_numpy(float) != 0
+    if len(start):
+        start[0] = True
+    return pd.Series(np.arange(len(start)) - _run_start_positions(start), index=events.index)
+
+
+def streak_signs(series: Series) -> np.ndarray:
+    """
+    +1 for a close at or above the previous one, 0 for an equal close, -1 otherwise (0 on the first row).
+    """
+    values = series.to_numpy(float)
+    prev = np.concatenate(([np.nan], values[:-1]))
+    signs = np.where(values == prev, 0, np.where(values >= prev, 1, -1))
+    if len(signs):
+        signs[0] = 0
+    return signs
+
+
+def next_streak(prev_streak: int, prev_value: float, value: float) -> int:
+    """
+    Streak of a new candle, given the streak and value of the one before.
+    """
+    if value == prev_value:
+        return 0
+    if value >= prev_value:
+        return prev_streak + 1 if prev_streak >= 0 else 1
+    return prev_streak - 1 if prev_streak < 0 else -1
+
+
+def calc_streaks(series: Series, previous: Optional[Series] = None) -> Series:
+    """
+    Signed streaks: +n after n rises in a row, -n after n falls, 0 after an unchanged value.
+
+    ``previous`` is an earlier result for a prefix of ``series`` (same index labels); its
+    values are reused and only the new rows are computed.
+    """
+    if previous is not None and 0 < len(previous) <= len(series) \
+            and series.index[len(previous) - 1] == previous.index[-1]:
+        values = series.to_numpy(float)
+        out = np.empty(len(series), dtype=int)
+        known = len(previous)
+        out[:known] = previous.to_numpy()
+        for i in range(known, len(series)):
+            out[i] = next_streak(out[i - 1], values[i - 1], values[i])
+        return pd.Series(out, index=series.index)
+
+    signs = streak_signs(series)
+    return pd.Series(signs * run_lengths(signs), index=series.index)
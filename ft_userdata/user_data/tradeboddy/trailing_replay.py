@@ -0,0 +1,343 @@
+"""
+Trailing buy/sell state machines, shared by live trading and a sub-candle replay for backtests.
+
+The trailing classes (TrailingBuyStrat2, the BB_RPB_TSL_*Tranz TrailingBuy classes,
+UziChanTB2) run their trailing logic in ``confirm_trade_entry`` /
+``confirm_trade_exit``, which freqtrade calls on every tick while a signal is up.
+That only happens in live/dry_run, and the durations are measured with
+``datetime.now()``, so the policies could not be backtested. The state machines
+live here now, with the time taken from ``strategy_now()``:
+
+    val = trailing_buy_step(self, pair, dataframe, rate)         # confirm_trade_entry
+    val = trailing_sell_step(self, pair, dataframe, rate)        # confirm_trade_exit
+    current_time = strategy_now(self)                            # instead of datetime.now(timezone.utc)
+
+``replay_trailing_buy()`` drives the same step over detail (1m) candles in a
+backtest: every detail close is a tick, the clock is set to its close time and the
+strategy sees the last main-timeframe candle closed at that time:
+
+    detail = self.dp.get_pair_dataframe(pair, '1m')
+    entries = replay_trailing_buy(self, pair, dataframe, detail)
+    dataframe['buy'] = replayed_entry_signals(dataframe, entries)
+    dataframe['buy_tag'] = replayed_entry_tags(dataframe, entries)
+
+Strategies with a fixed offset and no time-based rules (NASOS' TrailingBuyStrat)
+use the vectorized ``trailing_buy_signals()`` instead.
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+logger = logging.getLogger(__name__)
+
+_UNITS = {'m': 'min', 'h': 'h', 'd': 'D', 'w': 'W'}
+
+
+class ReplayClock:
+    """
+    Clock a replay sets to the time of the tick being replayed.
+    """
+
+    def __init__(self, start: Optional[datetime] = None):
+        self.current = start
+
+    def __call__(self) -> datetime:
+        return self.current
+
+    def set(self, when) -> None:
+        when = pd.Timestamp(when)
+        self.current = (when if when.tzinfo else when.tz_localize('UTC')).to_pydatetime()
+
+
+def strategy_now(strategy) -> datetime:
+    """
+    The strategy's ``clock`` if one is injected, else the current UTC time.
+    """
+    clock = getattr(strategy, 'clock', None)
+    return clock() if clock is not None else datetime.now(timezone.utc)
+
+
+def timeframe_delta(timeframe: str) -> pd.Timedelta:
+    return pd.Timedelta(int(timeframe[:-1]), unit=_UNITS[timeframe[-1]])
+
+
+def trailing_buy_step(strategy, pair: str, dataframe: DataFrame, current_price: float) -> bool:
+    """
+    One ``confirm_trade_entry`` call of the trailing buy: starts, ratchets or stops the
+    trailing for ``pair`` and returns True when the order should go through.
+    """
+    val = False
+    if len(dataframe) >= 1:
+        last_candle = dataframe.iloc[-1].squeeze()
+        trailing_buy = strategy.trailing_buy(pair)
+        trailing_buy_offset = strategy.trailing_buy_offset(dataframe, pair, current_price)
+
+        if trailing_buy['allow_trailing']:
+            if not trailing_buy['trailing_buy_order_started'] and (last_candle['buy'] == 1):
+                # start trailing buy
+                trailing_buy['trailing_buy_order_started'] = True
+                trailing_buy['trailing_buy_order_uplimit'] = last_candle['close']
+                trailing_buy['start_trailing_price'] = last_candle['close']
+                trailing_buy['buy_tag'] = last_candle['buy_tag']
+                trailing_buy['start_trailing_time'] = strategy_now(strategy)
+                trailing_buy['offset'] = 0
+
+                strategy.trailing_buy_info(pair, current_price)
+                logger.info(f'start trailing buy for {pair} at {last_candle["close"]}')
+
+            elif trailing_buy['trailing_buy_order_started']:
+                start_price = trailing_buy['start_trailing_price']
+                ratio = "%.2f" % ((start_price - current_price) / start_price * 100)
+                if trailing_buy_offset == 'forcebuy':
+                    # buy in custom conditions
+                    val = True
+                    strategy.trailing_buy_info(pair, current_price)
+                    logger.info(f"price OK for {pair} ({ratio} %, {current_price}), order may not be triggered if all slots are full")
+
+                elif trailing_buy_offset is None:
+                    # stop trailing buy custom conditions
+                    strategy.trailing_buy(pair, reinit=True)
+                    logger.info(f'STOP trailing buy for {pair} because "trailing buy offset" returned None')
+
+                elif current_price < trailing_buy['trailing_buy_order_uplimit']:
+                    # update uplimit
+                    old_uplimit = trailing_buy['trailing_buy_order_uplimit']
+                    trailing_buy['trailing_buy_order_uplimit'] = min(current_price * (1 + trailing_buy_offset), old_uplimit)
+                    trailing_buy['offset'] = trailing_buy_offset
+                    strategy.trailing_buy_info(pair, current_price)
+                    logger.info(f"update trailing buy for {pair} at {old_uplimit} -> {trailing_buy['trailing_buy_order_uplimit']}")
+
+                elif current_price < (start_price * (1 + strategy.trailing_buy_max_buy)):
+                    # buy ! current price > uplimit && lower thant starting price
+                    val = True
+                    strategy.trailing_buy_info(pair, current_price)
+                    logger.info(f"current price ({current_price}) > uplimit ({trailing_buy['trailing_buy_order_uplimit']}) and lower than starting price price ({(start_price * (1 + strategy.trailing_buy_max_buy))}). OK for {pair} ({ratio} %), order may not be triggered if all slots are full")
+
+                elif current_price > (start_price * (1 + strategy.trailing_buy_max_stop)):
+                    # stop trailing buy because price is too high
+                    strategy.trailing_buy(pair, reinit=True)
+                    strategy.trailing_buy_info(pair, current_price)
+                    logger.info(f'STOP trailing buy for {pair} because of the price is higher than starting price * {1 + strategy.trailing_buy_max_stop}')
+                else:
+                    # uplimit > current_price > max_price, continue trailing and wait for the price to go down
+                    strategy.trailing_buy_info(pair, current_price)
+                    logger.info(f'price too high for {pair} !')
+        else:
+            logger.info(f"Wait for next buy signal for {pair}")
+
+    if val:
+        strategy.trailing_buy_info(pair, current_price)
+        strategy.trailing_buy(pair, reinit=True)
+        logger.info(f'STOP trailing buy for {pair} because I buy it')
+    return val
+
+
+def trailing_sell_step(strategy, pair: str, dataframe: DataFrame, current_price: float) -> bool:
+    """
+    One ``confirm_trade_exit`` call of the trailing sell, the mirror image of ``trailing_buy_step()``.
+    """
+    val = False
+    if len(dataframe) >= 1:
+        last_candle = dataframe.iloc[-1].squeeze()
+        trailing_sell = strategy.trailing_sell(pair)
+        trailing_sell_offset = strategy.trailing_sell_offset(dataframe, pair, current_price)
+
+        if trailing_sell['allow_sell_trailing']:
+            if not trailing_sell['trailing_sell_order_started'] and (last_candle['sell'] != 0):
+                trailing_sell['trailing_sell_order_started'] = True
+                trailing_sell['trailing_sell_order_downlimit'] = last_candle['close']
+                trailing_sell['start_trailing_sell_price'] = last_candle['close']
+                trailing_sell['sell_tag'] = last_candle['sell_tag']
+                trailing_sell['start_trailing_time'] = strategy_now(strategy)
+                trailing_sell['offset'] = 0
+
+                strategy.trailing_sell_info(pair, current_price)
+                logger.info(f'start trailing sell for {pair} at {last_candle["close"]}')
+
+            elif trailing_sell['trailing_sell_order_started']:
+                start_price = trailing_sell['start_trailing_sell_price']
+                ratio = "%.2f" % ((current_price - start_price) / start_price * 100)
+                if trailing_sell_offset == 'forcesell':
+                    # sell in custom conditions
+                    val = True
+                    strategy.trailing_sell_info(pair, current_price)
+                    logger.info(f"FORCESELL for {pair} ({ratio} %, {current_price})")
+
+                elif trailing_sell_offset is None:
+                    # stop trailing sell custom conditions
+                    strategy.trailing_sell(pair, reinit=True)
+                    logger.info(f'STOP trailing sell for {pair} because "trailing sell offset" returned None')
+
+                elif current_price > trailing_sell['trailing_sell_order_downlimit']:
+                    # update downlimit
+                    old_downlimit = trailing_sell['trailing_sell_order_downlimit']
+                    trailing_sell['trailing_sell_order_downlimit'] = max(current_price * (1 - trailing_sell_offset), old_downlimit)
+                    trailing_sell['offset'] = trailing_sell_offset
+                    strategy.trailing_sell_info(pair, current_price)
+                    logger.info(f"update trailing sell for {pair} at {old_downlimit} -> {trailing_sell['trailing_sell_order_downlimit']}")
+
+                elif current_price > (start_price * (1 - strategy.trailing_sell_max_sell)):
+                    # sell! current price < downlimit && higher than starting price
+                    val = True
+                    strategy.trailing_sell_info(pair, current_price)
+                    logger.info(f"current price ({current_price}) < downlimit ({trailing_sell['trailing_sell_order_downlimit']}) but higher than starting price ({(start_price * (1 + strategy.trailing_sell_max_sell))}). OK for {pair} ({ratio} %)")
+
+                elif current_price < (start_price * (1 - strategy.trailing_sell_max_stop)):
+                    # stop trailing, sell fast, price too low
+                    val = True
+                    strategy.trailing_sell_info(pair, current_price)
+                    logger.info(f'STOP trailing sell for {pair} because of the price is much lower than starting price * {1 + strategy.trailing_sell_max_stop}')
+                else:
+                    # uplimit > current_price > max_price, continue trailing and wait for the price to go down
+                    strategy.trailing_sell_info(pair, current_price)
+                    logger.info(f'price too low for {pair} !')
+        else:
+            logger.info(f"Wait for next sell signal for {pair}")
+
+    if val:
+        strategy.trailing_sell_info(pair, current_price)
+        strategy.trailing_sell(pair, reinit=True)
+        logger.info(f'STOP trailing sell for {pair} because I SOLD it')
+    return val
+
+
+def replay_trailing_buy(strategy, pair: str, analyzed: DataFrame, detail: DataFrame,
+                        timeframe: Optional[str] = None, detail_timeframe: str = '1m') -> DataFrame:
+    """
+    Run ``trailing_buy_step()`` over the closes of ``detail`` and return the entries it
+    took: the main candle they were decided on (``date``), the candle they fill in
+    (``candle``), the tick time, the rate and the buy tag.
+
+    Open trades are not tracked, so every entry is reported; the trailing state of
+    ``pair`` is reset before and after the replay.
+    """
+    period = timeframe_delta(timeframe or strategy.timeframe)
+    candle_close = (analyzed['date'] + period).to_numpy('datetime64[ns]')
+    tick_time = (detail['date'] + timeframe_delta(detail_timeframe)).to_numpy('datetime64[ns]')
+    tick_price = detail['close'].to_numpy(float)
+    first_tick = np.searchsorted(tick_time, candle_close, side='left')
+    buy = analyzed['buy'].fillna(0).to_numpy() == 1
+    # while trailing, populate_buy_trend keeps the buy signal up on every candle
+    forced = analyzed.assign(buy=1)
+
+    previous_clock = getattr(strategy, 'clock', None)
+    strategy.clock = clock = ReplayClock()
+    # the per-tick logging is meant for live trading
+    previous_level = logger.level
+    debug_mode = getattr(strategy, 'debug_mode', False)
+    logger.setLevel(logging.WARNING)
+    strategy.debug_mode = False
+    strategy.trailing_buy(pair, reinit=True)
+    entries = []
+    try:
+        for i in range(len(analyzed)):
+            trailing_buy = strategy.trailing_buy(pair)
+            started = trailing_buy['trailing_buy_order_started']
+            if buy[i] and not started:
+                trailing_buy['allow_trailing'] = True
+            elif not started:
+                continue
+            frame = (analyzed if buy[i] else forced).iloc[:i + 1]
+            end = first_tick[i + 1] if i + 1 < len(analyzed) else len(tick_time)
+            for j in range(first_tick[i], end):
+                clock.set(tick_time[j])
+                buy_tag = strategy.trailing_buy(pair)['buy_tag']
+                if trailing_buy_step(strategy, pair, frame, tick_price[j]):
+                    entries.append({
+                        'date': analyzed['date'].iloc[i],
+                        'candle': analyzed['date'].iloc[i] + period,
+                        'tick': clock(),
+                        'rate': tick_price[j],
+                        'buy_tag': buy_tag,
+                    })
+                    break
+                if not strategy.trailing_buy(pair)['trailing_buy_order_started']:
+                    # stopped, wait for the next signal
+                    break
+    finally:
+        strategy.trailing_buy(pair, reinit=True)
+        strategy.clock = previous_clock
+        strategy.debug_mode = debug_mode
+        logger.setLevel(previous_level)
+    return DataFrame(entries, columns=['date', 'candle', 'tick', 'rate', 'buy_tag'])
+
+
+def replayed_entry_signals(analyzed: DataFrame, entries: DataFrame) -> Series:
+    """
+    1 on the candles the replayed entries fill in, 0 elsewhere. Backtesting fills a
+    signal on the next open, so no tick price of the signal candle is used.
+    """
+    return analyzed['date'].isin(entries['candle']).astype(int)
+
+
+def replayed_entry_tags(analyzed: DataFrame, entries: DataFrame) -> Series:
+    """
+    ``buy_tag`` column to go with ``replayed_entry_signals()``: each entry's tag on the candle
+    it fills in, cleared on the candle its signal came from.
+    """
+    if 'buy_tag' in analyzed:
+        tags = analyzed['buy_tag'].astype(object)
+    else:
+        tags = pd.Series(None, index=analyzed.index, dtype=object)
+    tags = tags.mask(analyzed['date'].isin(entries['date']), None)
+    # the last entry wins if two fill in the same candle
+    filled = entries.drop_duplicates('candle', keep='last').set_index('candle')['buy_tag']
+    fill = analyzed['date'].isin(filled.index)
+    tags[fill] = filled.reindex(analyzed['date'][fill]).to_numpy(object)
+    return tags
+
+
+def ratchet(prices: np.ndarray, start_price: float, offset: float, max_buy: float = 0.0,
+            max_stop: Optional[float] = None) -> Tuple[Optional[int], Optional[str]]:
+    """
+    First tick of a fixed-offset trailing buy started at ``start_price`` that buys or
+    stops, as (position, 'buy' | 'stop'), or (None, None) if it still trails after ``prices``.
+
+    The uplimit before each tick is ``min(start_price, price * (1 + offset) of all earlier
+    ticks)``, so the whole path is one running minimum, searched in growing chunks.
+    """
+    buy_level = start_price * (1 + max_buy)
+    stop_level = start_price * (1 + max_stop) if max_stop is not None else np.inf
+    uplimit = start_price
+    pos, chunk = 0, 64
+    while pos < len(prices):
+        seg = prices[pos:pos + chunk]
+        limits = np.fmin.accumulate(np.concatenate(([uplimit], seg[:-1] * (1 + offset))))
+        hit = (seg >= limits) & ((seg < buy_level) | (seg > stop_level))
+        if hit.any():
+            k = int(np.argmax(hit))
+            return pos + k, 'buy' if seg[k] < buy_level else 'stop'
+        uplimit = np.fmin(limits[-1], seg[-1] * (1 + offset))
+        pos += len(seg)
+        chunk *= 2
+    return None, None
+
+
+def trailing_buy_signals(pre_buy: Series, price: Series, offset: float, max_buy: float = 0.0,
+                         max_stop: Optional[float] = None) -> Series:
+    """
+    Buy signals of a fixed-offset trailing buy over one price per candle: trailing starts
+    on a ``pre_buy`` candle and buys on the first later candle at or above the uplimit
+    and below ``start * (1 + max_buy)``.
+    """
+    pre = pre_buy.fillna(0).to_numpy() == 1
+    values = price.to_numpy(float)
+    out = np.zeros(len(values), dtype=int)
+    starts = np.flatnonzero(pre)
+    pos = 0
+    while True:
+        k = np.searchsorted(starts, pos)
+        if k == len(starts):
+            break
+        s = starts[k]
+        hit, outcome = ratchet(values[s + 1:], values[s], offset, max_buy, max_stop)
+        if hit is None:
+            break
+        if outcome == 'buy':
+            out[s + 1 + hit] = 1
+        pos = s + 2 + hit
+    return pd.Series(out, index=price.index)